@@ -1,4803 +1,9428 @@
-""" SYNTH-CORONA: MUSICAL TYPEWRITER
-
-    This is a little code language for creating chiptunes. It features a highly
-    modular design which can be applied to instruments, pitches, sequences,
-    and patterns.
-
-    Version 1.3.0
-
-"""
-
-#TODO: SeqLine does not handle ADJUST steps -- should it?
-#TODO: Should SeqLine step pitch & pan by delta*frameslice?
-#      What happens if we apply Speed(Seq,2) etc?
-import wave
-import sys, random, time
-
-
-# Major headers
-HEADERS = {"CFG", "INS", "MDL", "SEQ", "PAT", "BLK", "SNG", "IMP"}
-# Reserved symbols (which cannot be used in names)
-# Note: Names can contain numbers, but they cannot begin with a number.
-RESERVED = "+-*/%rixlvcsnmtjkpy{}[]()<>.,|"
-# List of operators
-OPERATORS = "+-=*/%rixlvsnmtjkpy"
-# Rendering chunk size -- atm, only determines how often progress label
-# is updated (in samples).
-CHUNK = 1028*1
-# Maximum signal value, as written in a SC file (absolute value).
-MAX_VAL = 9
-
-# Indicates that we are parsing an Instrument
-INST = 0
-# Indicates that we are parsing a pitch
-TONE = 1
-# Indicates that we are parsing a Sequence
-SEQN = 2
-# Indicates that we are parsing a generic module
-MDLE = 3
-
-# Time it takes a non-sustain Instrument to release to 0, in ms
-INS_REL_TIME = 6
-# Instrument signal codes -- These are sent in as const values in step()
-# to send the Instrument special instructions.
-# Tells Inst to use the delta value as const.
-DELTA = -1
-# Tells the Inst to stop, triggering any release operations.
-STOP = -2
-# Tells the Inst that this is a step adjustment. ADJUST is done regularly when
-# a module ends and is reset, in order to sync it with whatever extra amount
-# it was stepped previously. Accordingly, Insts should step the delta value
-# exactly, without applying rate or frequency adjustments.
-ADJUST = -3
-# Tells modules inside an instrument to release--specifically Envelope.
-# Inst does not pass on STOP commands, because nested Insts might not need to
-# stop (i.e., a waveform should not stop). We send release instead, to let
-# modules know a release has occurred, but that they should not stop.
-RELEASE = -4
-
-class SCParseError(Exception):
-    """ Exception for syntax errors discovered while parsing a SC file. """
-
-    def __init__(self, msg="", line=0):
-        """ Initializer
-
-            Keyword Arguments:
-            msg -- Message describing the error.
-            line -- The line number of where the error was tripped.
-        """
-        self.message = msg + " Line: " + str(line)
-
-    def __str__(self):
-        """ Returns the error message (with line number). """
-        return self.message
-
-class SCModule:
-    """ Base class for Modules in SynthCorona.
-
-        Modules are used to create Instruments, Sequences, and Song Patterns,
-        as well as controlling pitch.
-
-        Each module generally performs a single simple function, but they can
-        be combined and nested to create complex patterns and operations.
-    """
-
-    def step(self, delta, const=-1):
-        """ Steps the module forward in time.
-
-            Delta is the local time amount by which to step, which is used
-            by most modules. However, certain modules are designed to operate
-            independently of things like pitch require a constant time amount,
-            which is provided by const.
-
-            Additionally, some negative const values are used to send modules
-            the following commands:
-                DELTA (const = -1): Use the delta value for const value.
-                STOP (const = -2): Tells the module to stop, or Insts to release.
-                ADJUST (const = -3): Indicates a special time-adjustment. This
-                        tells modules to advance by delta exactly, without applying
-                        any rate modifications. When const=ADJUST, we generally
-                        assume that delta=get_extra() from some previous module,
-                        or from this module, before it was reset.
-
-            Arguments:
-            delta -- Local time slice.
-            const -- Constant time value, or command signal.
-        """
-        raise NotImplementedException()
-
-    def step_tails(self, delta, const=-1):
-        """ Steps any tails in the module forward in time.
-
-            Tails are sustaining sounds in Instruments & Sequences that have
-            been released but are not yet silent.
-
-            Arguments:
-            delta -- Local time slice.
-            const -- Constant time value.
-        """
-        raise NotImplementedException()
-
-    def read(self, tails=False,stereo=True,signal=True):
-        """ Reads the module at its current position.
-
-            (Occasionally, other upkeep steps are occur here as well. See
-            individual modules for details.)
-
-            The tails argument determines whether we will read sustaining notes
-            or active instruments. One important thing to note is that certain
-            modules like Val do not behave differently based on tails. In
-            certain cases this means Val ends up getting read twice and is
-            doubled. To prevent this, modules that do not apply to tails have
-            a property "no_tails". Use getattr() to check for this field, and
-            do not perform a second read() on it if you find it. (An example of
-            this process can be found in Pattern.)
-
-            The signal argument is not currently used. It was added for a change
-            that did not end up being beneficial, but I have left it in in case
-            it becomes useful. As a note, signals are represented within the
-            range [-9,9], which corresponds to how they are depicted in SC code.
-
-            Arguments:
-            tails -- Whether we are reading tails or active sounds.
-            stereo -- Whether we are reading in stereo.
-            signal -- Whether we are reading a signal value, or a simple number.
-        """
-        raise NotImplementedException()
-
-    def reset(self):
-        """ Performs a small reset on a module.
-
-            This is interpreted as a simple refreshing of the cycle throughout
-            the song. Some modules do not entirely clear all of their parameters
-            during reset(), but merely prepare themselves to begin again.
-
-            When a module needs to be full re-initialized, clear() is the
-            appropriate method to use.
-
-            When resetting a finished module, it is often necessary to account
-            for the small amount of time that has passed the completion mark
-            (this avoids subtle distortions due to accumulating lost time).
-            The standard process for this is as follows:
-
-                extra = mdl.get_extra() # Store the amount of extra time.
-                mdl.reset()             # Reset the module.
-                mdl.step(extra,ADJUST)  # Adjust-step the module by extra
-
-            If you are moving to a new module (i.e., in Pattern), you will
-            do mdlB.step(extra,ADJUST), to pass the extra time on to the next
-            module.
-        """
-        raise NotImplementedException()
-
-    def clear(self):
-        """ Performs a full clear on the module.
-
-            This resets the module to its initial state. This function is a
-            deeper refresh than reset(), which is intended for basic cycling
-            of completed modules.
-        """
-        raise NotImplementedException()
-
-    def done(self):
-        """ Checks if the module is finished.
-        """
-        raise NotImplementedException()
-
-    def has_tails(self):
-        """ Checks if any nested Sequences have sustaining notes.
-        """
-        raise NotImplementedException()
-    
-    def get_extra(self):
-        """ If the module is done, reports how much time we have advanced after
-            finishing.
-
-            In another sense -- this is how far the cursor has passed the end
-            of this module. Whenever a module finishes, generally there is some
-            extra time, which we will have to account for when resetting or
-            moving to a new module.
-
-            (See reset() for an outline of how to process this extra time.)
-        """
-        raise NotImplementedException()
-
-    def length(self):
-        """ Reports the module length.
-
-            Note: In certain situations, an accurate length cannot be known.
-            (For example, a Set with modules of different lengths.)
-        """
-        raise NotImplementedException()
-
-    # This is being replaced with set_pitch, which will express pitch in cents, not hz;
-    # We will add up all pitch shifts & calculate frequency on the fly in Inst.
-    #
-    #def set_freq(self,freq):
-    #    """ For Instruments, sets the current frequency.
-    #
-    #        Since Instruments are often nested within other modules, this
-    #        must be a module function, so they can pass the frequency along
-    #        to any Insts they may contain.
-    #
-    #        Arguments:
-    #        freq -- The frequency (in Hz)
-    #    """
-    #    raise NotImplementedException()
-
-    def set_pitch(self, pitch):
-        """ Sets the pitch of this module. This applies to Instruments, who determine
-            their playback speed with it, as well as Sequences, for whom it represents
-            an overall pitch-shift value, which will be added to the instruments' pitch.
-
-            For other modules, they will likely need to pass this pitch along
-            to relevant nested modules, in order to apply it properly to child Instruments
-            or Sequences.
-
-            Arguments:
-            pitch -- The pitch/pitch shift amount (in cents, floating point)
-        """
-        raise NotImplementedException()
-
-    def clone(self):
-        """ Creates a deep copy of the module and returns it.
-        """
-        raise NotImplementedException()
-
-class SynthCorona:
-    """ Core SynthCorona class.
-
-        Handles parsing an SC file into a modules and song data, as well as
-        rendering that data into a Wave audio file.
-    """
-
-    def __init__(self):
-        """ Empty initializer.
-
-            Once initialized, call parse() to load song data and populate.
-        """
-
-        self.path = ""
-        self.srcname = ""
-        self.cfg = dict()
-        self.insts = dict()
-        self.modules = dict()
-        self.seqs = dict()
-        self.songs = []
-        self.tones = self.buildTones()
-        # see def buildFreqs for explanation
-        #self.freqs = self.buildFreqs()
-
-        self.tempo = 120
-        self.stereo = True
-        self.beat = 4
-        self.rate = 44100
-        self.depth = 16
-        self.normalize = True
-        self.freq = 440
-        self.framesperstep = (60*self.rate)/(self.tempo*self.beat)
-        self.frameslice = 1/self.framesperstep
-        self.rel_time = INS_REL_TIME*self.rate/1000
-
-        self.curParseModule = "None"
-
-    def buildTones(self):
-        """ Builds the tones dictionary, which maps note/oct codes to their
-            value in cents. This corresponds directly to how notes are
-            depicted in SC -- i.e. "C4", "a2", "D#6", "F 3", etc.
-
-            Generates 10 octaves (0-9).
-        """
-
-        slts = ["C", "d", "D", "e", "E", "F", "g", "G", "a", "A", "b", "B"]
-        dlts = ["C ", "C#", "Db", "D ", "D#", "Eb", "E ", "F ", "F#", "Gb",
-                "G ", "G#", "Ab", "A ", "A#", "Bb", "B ", ]
-        dvals = [0, 1, 1, 2, 3, 4, 4, 5, 6, 6, 7, 8, 9, 9, 10, 11, 11]
-        ky = dict()
-
-        for oct in range(10):
-            for step in range(len(slts)):
-                nm = slts[step]+str(oct)
-                ky[nm] = (12*oct+step)*100
-            for inx in range(len(dlts)):
-                nm = dlts[inx]+str(oct)
-                ky[nm] = (12*oct+dvals[inx])*100
-        return ky
-
-    # Currently not going to do this. It's a little slower, but for maximum pitch-shift-ability,
-    # we are going to calculate frequency on the fly instead of pre-baking.
-    #
-    #def buildFreqs(self):
-    #    """ Builds a list of pre-baked frequencies for each cent in the 10 octaves
-    #        of the tones array. When pitches are read in SC, we will access the
-    #        corresponding index of this array, rather than calculating on the fly.
-    #    """
-
-    #    freqs = []
-    #    for i in range(12000):
-    #        freqs.append(calc_freq(i-self.tones["A4"]))
-    #    return freqs
-
-    def parse(self, filename):
-        """ Parses the SC file at filename and loads its information into this
-            instance of SynthCorona.
-
-            Arguments:
-            filename -- The path of the file to parse.
-
-            Throws SCParseError if any SC syntax errors are found while parsing.
-        """
-
-        # We pull the directory from the SC path, to use for importing files
-        # from the same folder, without needing an absolute path.
-        fldr = filename.rfind("\\")
-        if(fldr < filename.rfind("/")):
-            fldr = filename.rfind("/")
-        if(fldr < 0):
-            fldr = 0
-        self.path = filename[0:fldr+1]
-        self.srcname = filename[fldr+1:len(filename)].split(".")[0]
-
-        # The SC file text, split into lines.
-        text = open(filename).read()
-        text = text.splitlines()
-
-        # Parser states, indicating what type of chunk we are parsing.
-        CFG = 0
-        INS = 1
-        MDL = 2
-        SEQ = 3
-        BLK = 4
-        SNG = 5
-
-        # Current parser block. This is changed by block headers.
-        state = CFG
-
-        # These variables affect Sequences. We'll reuse them for each Seq we
-        # parse, but they need to be preserved across multiple lines while each
-        # Sequence is being parsed.
-
-        # The name that identifies a Sequence in SC code & in seqs Dict
-        seqName = ""
-        # Panning module to be applied to a whole Sequence.
-        seqPan = None
-        # The individual lines of a Sequence.
-        seqLines = []
-        # File name for current song. Empty string will use source name.
-        songName = ""
-        # Holds each Sequence-level module in the current song. We will
-        # add new modules to this for each line under the SNG header.
-        songSteps = []
-
-        # Main parsing loop.
-        for i in range(len(text)):
-            line = text[i]
-
-            # Identify and omit commented lines
-            cmt = line.find("//")
-            if(cmt >= 0):
-                line = line[0:cmt]
-
-            if(line != "" and not(line.isspace())):
-                # Import Header -- loads imported file into this SynthCorona
-                if(line.startswith(("IMP", "imp"))):
-                    line = line[4:len(line)].strip()
-                    if(line.find("\\")<0 and line.find("/")<0):
-                        line = self.path + line
-                        print("IMPORTING: " + line)
-                    tmp = SynthCorona()
-                    try:
-                        tmp.parse(line)
-                    except SCParseError:
-                        print("Error importing file: " + line)
-                        raise
-
-                    for i in tmp.insts.values():
-                        i.parent = self
-                    for s in tmp.seqs.values():
-                        s.parent = self
-                    self.modules.update(tmp.modules)
-                    self.insts.update(tmp.insts)
-                    self.seqs.update(tmp.seqs)
-                # Configuration Header
-                elif(line.startswith(("CFG", "cfg"))):
-                    state = CFG
-                # Instrument Header
-                elif(line.startswith(("INS", "ins"))):
-                    state = INS
-                # Module Header
-                elif(line.startswith(("MDL", "mdl"))):
-                    state = MDL
-                # Sequence Header. Clear Seq variables for new Sequence.
-                elif(line.startswith(("SEQ", "seq"))):
-                    seqPan = Val(0)
-                    seqLines = []
-                    state = SEQ
-                    seqName = line[3:len(line)].strip()
-                    # Parse Sequence meta-data
-                    if("<" in seqName):
-                        seqName = seqName.split("<")
-                        if(seqName[1].find(">")<0):
-                            raise SCParseError("Missing '>' in meta tag.",i)
-                        seqName, meta = seqName[0].strip(), seqName[1].split(">")[0].split(",")
-                        for mt in meta:
-                            mt = mt.strip()
-                            # Sets pan / pan module for the whole Sequence.
-                            # (Modules must be loaded: they can't be described in meta)
-                            if(mt.startswith(("pan", "PAN"))):
-                                mt = mt.split("=")[1].lstrip()
-                                if(mt in self.modules):
-                                    seqPan = self.modules[mt].clone()
-                                elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
-                                    invert = False
-                                    if(mt.startswith("-")):
-                                        invert = True
-                                        mt = mt[1:len(mt)]
-                                    num = ""
-                                    while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
-                                        num = num + mt[0]
-                                        mt = mt[1:len(mt)]
-                                    num = float(num)
-                                    seqPan = Val(num)
-                                    if(invert):
-                                        seqPan = Invert(seqPan)
-                    self.curParseModule = "SEQ: " + seqName
-                # Block Header (Blocks are Sequence Modules)
-                # We also accept "PAT" here, cause I always forget & call it that.
-                # Officially, it is "Block", since "Pattern" is a module already.
-                elif(line.startswith(("PAT", "pat", "BLK", "blk"))):
-                    state = BLK
-                # Song Header
-                elif(line.startswith(("SNG", "sng"))):
-                    songSteps = []
-                    songName = ""
-                    state = SNG
-                    self.curParseModule = "SONG"
-                    line = line[3:len(line)].lstrip()
-                    
-                    if(":" in line):
-                        songName = line.split(":")
-                        songName, line = songName[0].strip(), songName[1].strip()
-                        
-                    if(len(line)>0 and not line.isspace()):
-                        self.parseSongLine(line, songSteps,i)
-                        if(i+1>=len(text) or text[i+1][0:3] in HEADERS):
-                            self.songs.append(Song(songSteps,self,songName))
-                # If line doesn't start with Header string, parse based on state
-                else:
-                    # Configuration Chunk
-                    if(state == CFG):
-                        # Sets the master tempo.
-                        if(line.startswith(("TEMPO","TMP","tempo","tmp"))):
-                            line = line.split(":")[1].strip()
-                            self.tempo=int(line)
-                        # Sets the beat length (in song steps)
-                        elif(line.startswith(("BEAT", "beat"))):
-                            line = line.split(":")[1].strip()
-                            self.beat=int(line)
-                        # Sets the audio sample rate
-                        elif(line.startswith(("RATE", "rate"))):
-                            line = line.split(":")[1].strip()
-                            self.rate=int(line)
-                        # Sets the audio bit depth
-                        elif(line.startswith(("DEPTH", "depth"))):
-                            line = line.split(":")[1].strip()
-                            self.depth=int(line)
-                        # Sets the song to Stereo Mode
-                        elif(line.startswith(("STEREO","stereo"))):
-                            self.stereo = True
-                        # Sets the song to Mono mode
-                        elif(line.startswith(("MONO","mono"))):
-                            self.stereo = False
-                        # Sets whether to normalize the audio (T/F)
-                        elif(line.startswith(("NORMALIZE","normalize","NORM","norm"))):
-                            line = line.split(":")[1].strip()
-                            self.normalize=not line.startswith(("F","f","0"))
-
-                        # Update some core values based on rate/tempo/beat
-                        self.framesperstep = (60*self.rate)/(self.tempo*self.beat)
-                        self.frameslice = 1/self.framesperstep
-                        self.rel_time = INS_REL_TIME*self.rate/1000
-                    # Song chunk
-                    elif(state == SNG):
-                        if(len(line)>0 and not line.isspace()):
-                            self.parseSongLine(line, songSteps,i)
-                        if(i+1>=len(text) or text[i+1][0:3] in HEADERS):
-                            self.songs.append(Song(songSteps,self,songName))   
-                    # Instrument / Module chunk
-                    elif(state == INS or state == MDL):
-                        # Separate the module name / description
-                        name = line.split(":")
-                        name, desc = name[0].strip(), name[1].strip()
-                        # Wave period of instruments, in module steps
-                        period = -1
-                        # Whether the instrument loops
-                        loop = True
-                        # Whether the instrument sustains
-                        sus = False
-                        # Panning module of the instrument
-                        pan = Val(0)
-                        # Parse meta data
-                        if("<" in name):
-                            name = name.split("<")
-                            if(name[1].find(">")<0):
-                                raise SCParseError("Missing '>' in meta tag.",i)
-                            name, meta = name[0].strip(), name[1].split(">")[0].split(",")
-                            for mt in meta:
-                                mt = mt.strip()
-                                # Parse wave period
-                                if(mt.startswith(("period", "PERIOD", "prd", "PRD"))):
-                                    mt = mt.split("=")[1].lstrip()
-                                    period = float(mt)
-                                # Parse looping property (T/F)
-                                elif(mt.startswith(("loop", "LOOP", "l", "L"))):
-                                    mt = mt.split("=")[1].lstrip()
-                                    loop = mt.startswith(("T","t","1"))
-                                # Parse sustain property (T/F)
-                                elif(mt.startswith(("sus", "SUS", "SUSTAIN", "sustain", "s", "S"))):
-                                    mt = mt.split("=")[1].lstrip()
-                                    sus = mt.startswith(("T","t","1"))
-                                # Parse the pan value / load a pan module
-                                elif(mt.startswith(("pan", "PAN"))):
-                                    mt = mt.split("=")[1].lstrip()
-                                    if(mt in self.modules):
-                                        pan = self.modules[mt].clone()
-                                    elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
-                                        invert = False
-                                        if(mt.startswith("-")):
-                                            invert = True
-                                            mt = mt[1:len(mt)]
-                                        num = ""
-                                        while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
-                                            num = num + mt[0]
-                                            mt = mt[1:len(mt)]
-                                        num = float(num)
-                                        pan = Val(num)
-                                        if(invert):
-                                            pan = Invert(pan)
-                                # Loads meta properties from another instrument
-                                elif(mt.startswith(("BASE","base"))):
-                                    mt = mt.split("=")[1].lstrip()
-                                    ins = self.insts[mt]
-                                    if(ins != None):
-                                        period = ins.period
-                                        loop = ins.loop
-                                        sus = ins.sus
-                                        pan = ins.pan.clone()
-                        # Parses the description, either as Inst or Module
-                        if(state == INS):
-                            # Identifies module, for error reporting
-                            self.curParseModule = "INS: " + name
-                            self.insts[name] = Inst(self, self.parseModule(desc, INST, i), period, loop, sus,pan)
-                        else:
-                            # Identifies module, for error reporting
-                            self.curParseModule = "MDL: " + name
-                            self.modules[name] = self.parseModule(desc, MDLE, i)
-                    # Block chunk
-                    elif(state == BLK):
-                        # Separate block name / description
-                        name = line.split(":")
-                        name, desc = name[0].strip(), name[1].strip()
-                        # Pan module
-                        pan = Val(0)
-                        # Parse meta data for the block
-                        if("<" in name):
-                            name = name.split("<")
-                            if(name[1].find(">")<0):
-                                raise SCParseError("Missing '>' in meta tag.",i)
-                            name, meta = name[0].strip(), name[1].split(">")[0].split(",")
-                            for mt in meta:
-                                mt = mt.strip()
-                                # Parse pan value / load pan module
-                                if(mt.startswith(("pan", "PAN"))):
-                                    mt = mt.split("=")[1].lstrip()
-                                    if(mt in self.modules):
-                                        pan = self.modules[mt].clone()
-                                    elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
-                                        invert = False
-                                        if(mt.startswith("-")):
-                                            invert = True
-                                            mt = mt[1:len(mt)]
-                                        num = ""
-                                        while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
-                                            num = num + mt[0]
-                                            mt = mt[1:len(mt)]
-                                        num = float(num)
-                                        pan = Val(num)
-                                        if(invert):
-                                            pan = Invert(pan)
-                        # Identifies block, for error reporting
-                        self.curParseModule = "BLOCK: " + name
-                        self.seqs[name] = SeqBlock(self.parseModule(desc,SEQN,i),pan)
-                    # Sequence chunk
-                    elif(state == SEQ):
-                        if(line != "" and not line.isspace()):
-                            # Panning module
-                            pan = Val(0)
-                            # Sequence name
-                            name = line.split(":")[0].strip()
-                            # Parse meta data
-                            if(name.startswith("<")):
-                                name = name[1:len(name)].split(">",1)
-                                if(name[1].find(">")<0):
-                                    raise SCParseError("Missing '>' in meta tag.",i)
-                                name, meta = name[1].strip(), name[0].split(",")
-                                for mt in meta:
-                                    mt = mt.strip()
-                                    # Parse pan value / load pan module
-                                    if(mt.startswith(("pan", "PAN"))):
-                                        mt = mt.split("=")[1].lstrip()
-                                        if(mt in self.modules):
-                                            pan = self.modules[mt].clone()
-                                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
-                                            invert = False
-                                            if(mt.startswith("-")):
-                                                invert = True
-                                                mt = mt[1:len(mt)]
-                                            num = ""
-                                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
-                                                num = num + mt[0]
-                                                mt = mt[1:len(mt)]
-                                            num = float(num)
-                                            pan = Val(num)
-                                            if(invert):
-                                                pan = Invert(pan)
-                            # Identifies module, for error reporting
-                            self.curParseModule = "SEQ: " + name
-                            # Parse the actual sequence data.
-                            # Seq lines start/end with first/last bar in the line.
-                            startInx = line.find("|")
-                            endInx = line.rfind("|")
-                            # Parse the pitch module for this sequence line.
-                            pitch = self.parseModule(name, TONE, i)
-                            # Trim line to sequence data
-                            if(startInx >= 0 and endInx > startInx):
-                                line = line[startInx:endInx]
-                            # Once trimmed, all bars are omitted. Midline bars
-                            # are for visual reference only (i.e. measure lines)
-                            line = line.replace("|", "")
-                            # The sequence pattern
-                            pat = []
-                            # Count variable (probably could do for loop at this point?)
-                            ct = 0
-                            while(ct < len(line)):
-                                # A space indicates silence
-                                if(line[ct] == " "):
-                                    pat.append(None)
-                                # Hyphen indicates we should sustain prev. inst
-                                elif(line[ct] == "-"):
-                                    pat.append("-")
-                                # Inst names represent an attack by that inst
-                                elif(line[ct] in self.insts):
-                                    pat.append(self.insts[line[ct]].clone())
-                                # Raise an Error if we don't recognize the Inst
-                                else:
-                                    raise SCParseError("Unrecognized Instrument in sequence line: " + line[ct],i)
-                                ct += 1
-                            seqLines.append(SeqLine(self, pitch, pat, pan))
-                        # Check if this is the end of Sequence chunk --
-                        # If so, pack up this Sequence & add it to seqs.
-                        if(i+1>=len(text) or text[i+1][0:3] in HEADERS):
-                            self.seqs[seqName] = Sequence(seqLines, self, seqPan)
-            elif(state == SEQ):
-                # Current line is blank, so we are skipping it. However, we still
-                # need to check if it is the end of a Sequence chunk & if so
-                # add the current Sequence to self.seqs
-                if(i+1>=len(text) or text[i+1][0:3] in HEADERS):
-                    self.seqs[seqName] = Sequence(seqLines, self, seqPan)
-            elif(state == SNG):
-                # Current line is blank, but similarly to above, we are checking
-                # to see if it is the end of a Song chunk & if so
-                # add the current Song to self.songs
-                if(i+1>=len(text) or text[i+1][0:3] in HEADERS):
-                    self.songs.append(Song(songSteps,self,songName))
-
-    def render(self, filepath=None):
-        """ Renders the Song into a Wave file.
-
-            Arguments:
-            filepath -- File path to render to. Defaults to same path as src file
-        """
-
-        # Take note of current time; to use for the whole batch.
-        totalStartTime = time.clock()
-            
-        if(filepath == None):
-            filepath = self.path
-
-        if(len(self.songs) > 1):
-            print("Rendering " + str(len(self.songs)) + " songs.")
-        sngcount = 0
-        for song in self.songs:
-            sngcount += 1
-            
-            # Take note of the time before we begin.
-            startTime = time.clock()
-            # Open our output file.
-            if(song.name == ""):
-                fname = self.srcname + ".wav"
-            else:
-                fname = song.name + ".wav"
-            print("RENDERING SONG " + str(sngcount) + "/" + str(len(self.songs)) + ": " + fname)
-            out = wave.open(filepath + fname, 'wb')
-
-            # Set the number of channels in output file.
-            if(self.stereo):
-                out.setnchannels(2)
-            else:
-                out.setnchannels(1)
-            # Set sample width (in bytes)
-            out.setsampwidth(int(self.depth/8))
-            # Set sample rate
-            out.setframerate(self.rate)
-            # Note song length (for process monitoring)
-            # ** Depending on modules in the song, this might not be accurate. **
-            snglen = song.length()
-            # Print song size info
-            print("Song Duration: " + str(int(snglen/self.rate*100)/100))
-            print("Song Sample Length: " + str(int(snglen)+1))
-            # Total number of samples we have processed so far.
-            samps = 0
-            # Process chunk counter for whether we should update progress info
-            count = 0
-            # List of rendered frames.
-            frames = []
-            # List of pre-normalized frames.
-            prenorm = []
-            # Current peak value (for normalization)
-            peak = 0
-            # Value of the last read sample. (We use this after the render loop
-            # to add decay, so it can't be declared within the loop.)
-            dec = -1
-            # Maximum signal absolute value
-            maxI = 2**(self.depth-1)-1
-            # Express max as a ratio of parser MAX_VAL; to save computations
-            max = maxI / MAX_VAL
-            # Number of bytes in audio file depth.
-            bytes = int(self.depth/8)
-            # Whether WAV values are signed or unsigned
-            sgned = bytes!=1
-
-            # Main render loop
-            while(not song.done()):
-                # Read & Render next sample for stereo songs
-                if(self.stereo):
-                    dec = song.read(stereo=True,signal=True)
-                    # Render without normalizing
-                    if(not self.normalize):
-                        valL = int(max*limit(dec[0]))
-                        valR = int(max*limit(dec[1]))
-                        if(bytes == 1):
-                            valL += maxI
-                            valR += maxI
-                        valL = valL.to_bytes(bytes, byteorder="little", signed=sgned)
-                        valR = valR.to_bytes(bytes, byteorder="little", signed=sgned)
-                        frames.append(valL)
-                        frames.append(valR)
-                    # Normalize ON -- read frame & prepare for normalizing
-                    else:
-                        if(abs(dec[0])>peak):
-                            peak = abs(dec[0])
-                        if(abs(dec[1])>peak):
-                            peak = abs(dec[1])
-                        prenorm.append(dec)
-                # Render the next sample for mono songs.
-                else:
-                    dec = song.read(stereo=False,signal=True)
-                    # Render without normalizing
-                    if(not self.normalize):
-                        val = int(max*limit(dec))
-                        if(bytes == 1):
-                            val += maxI
-                        val = val.to_bytes(bytes, byteorder="little", signed=sgned)
-                        frames.append(val)
-                    # Normalize ON -- Read sample & prepare for normalization
-                    else:
-                        if(abs(dec)>peak):
-                            peak = abs(dec)
-                        prenorm.append(dec)
-                song.step(1)
-                count += 1
-                samps += 1
-
-                # Every 512 frames, update progress counter.
-                if(count > 512):
-                    elp = time.clock()-startTime
-                    sys.stdout.write("\r")
-                    ppct = samps/snglen
-                    sys.stdout.write("PROGRESS: " + '{:>5}'.format(str(int(ppct*10000)/100)))
-                    sys.stdout.write(" : RATE: " + '{:>9}'.format(str(int(samps/elp*100)/100)))
-                    sys.stdout.write(" : [")
-                    i = -0.015
-                    while(i < 1):
-                        i += 0.05
-                        if(ppct >= i):
-                            sys.stdout.write("*")
-                        else:
-                            sys.stdout.write(" ")
-                    sys.stdout.write("]")
-                    sys.stdout.flush()
-                    count = 0
-            # If we're normalizing, we need to scale everything now that we know
-            # the final peak value
-            if(self.normalize):
-                # Calculate ratio between peak value & signal maximum
-                # All frames will be scaled by this
-                rtio = (MAX_VAL * 0.9999) / peak
-                for sp in prenorm:
-                    # Normalize & render for stereo songs
-                    if(self.stereo):
-                        dec = [sp[0]*rtio,sp[1]*rtio]
-                        valL = int(dec[0]*max)
-                        valR = int(dec[1]*max)
-                        if(bytes == 1):
-                            valL += maxI
-                            valR += maxI
-                        valL = valL.to_bytes(bytes, byteorder="little", signed=sgned)
-                        valR = valR.to_bytes(bytes, byteorder="little", signed=sgned)
-                        frames.append(valL)
-                        frames.append(valR)
-                    # Normalize & render for mono songs
-                    else:
-                        dec = sp*rtio
-                        val = int(dec*max)
-                        if(bytes == 1):
-                            val += maxI
-                        val = val.to_bytes(bytes, byteorder="little", signed=sgned)
-                        frames.append(val)
-            # Add a bit of decay to the end of the song, to avoid popping.
-            # Decay time, in samples
-            decay = int(0.001*self.rate)
-            for i in range(decay):
-                # Scalar to fade the sample out as i approaches decay.
-                tmp = 1-(i/decay)
-                # Calculate & render decay for stereo songs
-                if(self.stereo):
-                    tmp = [dec[0]*tmp,dec[1]*tmp]
-                    valL = int(max*tmp[0])
-                    valR = int(max*tmp[1])
-                    if(bytes == 1):
-                        valL += maxI
-                        valR += maxI
-                    valL = valL.to_bytes(bytes, byteorder="little", signed=sgned)
-                    valR = valR.to_bytes(bytes, byteorder="little", signed=sgned)
-                    frames.append(valL)
-                    frames.append(valR)
-                # Calculate & render decay for mono songs
-                else:
-                    tmp *= dec
-                    val = int(max*dec)
-                    if(bytes == 1):
-                        val += maxI
-                    val = val.to_bytes(bytes, byteorder="little", signed=sgned)
-                    frames.append(val)
-
-            # One last update to progress printouts -- so we end on 100%.
-            sys.stdout.write("\r")
-            ppct = samps/snglen
-            sys.stdout.write("PROGRESS: " + '{:>5}'.format(str(int(ppct*10000)/100)))
-            sys.stdout.write(" : RATE: " + '{:>9}'.format(str(int(samps/elp*100)/100)))
-            sys.stdout.write(" : [")
-            i = -0.015
-            while(i < 1):
-                i += 0.05
-                sys.stdout.write("*")
-            sys.stdout.write("]")
-            sys.stdout.flush()
-
-            # Write all rendered samples to the WAV file & close it.
-            out.writeframes(b''.join(frames))
-            out.close()
-
-            # We're done! Print how long it took.
-            renderTime = time.clock()-startTime
-            print("\nSONG RENDER TIME: " + str(int(renderTime*100)/100) + "                        ")
-        print("BATCH COMPLETE!")
-        renderTime = time.clock()-totalStartTime
-        print("TOTAL RENDER TIME: " + str(int(renderTime*100)/100))
-
-    def parseModule(self, stng, type, line=0):
-        """ Parses a SynthCorona module from a string.
-
-            This is the method to use if you have a full description string to
-            parse. This uses popModule to isolate operands in binary operations
-            & then wraps them in operator modules as necessary.
-
-            In this method, binary operators are parsed left-to-right, which is in
-            turn the only order of operations in Synth-Corona.
-            So A+B*C = (A+B)*C != A+(B*C)
-
-            Use any grouping module (Pattern, Set, Series) to change the order of
-            operations if necessary.
-
-            Previously created modules/Insts/Sequences can be referenced by
-            name. They will be copied into the new module via clone().
-
-            Arguments:
-            stng -- String containing the module description.
-            type -- Tells us what the module is for. Options: INST, TONE, SEQN, MDLE
-            line -- Current parser line; for error reporting.
-
-            Returns the SynthCorona module.
-        """
-
-        # Parses the first standalone module & sends us [mdl, remaining string]
-        modA = self.popModule(stng, type,line)
-        modA, stng = modA[0], modA[1]
-
-        # Now loop through additional operators & modules until we reach end of line.
-        while(stng != "" and not stng.isspace()):
-            # Whether modA needs to be wrapped in a Cross module.
-            cross = False
-            # Constant-rate indicator. -1 means skip; Any positive value is read as
-            # the rate value for a Const module.
-            const = -1
-            # If const != -1, this indicates whether our Const module should loop.
-            cloop = False
-            # Attack value for constant module
-            catk = 0
-            # Release value for constant module
-            crels = -1
-            # The operator string
-            op = stng.lstrip()[0]
-            stng = stng[1:len(stng)].lstrip()
-
-            if(op == "c"):
-                op = stng[0]
-                stng = stng[1:len(stng)].lstrip()
-                const = 1                
-                # Const currently offers 4 meta tags:
-                #     RATE, R - Playback rate modifier
-                #     LOOP, L - Whether to loop the module
-                #     ATK - Looping attack point
-                #     REL - Looping release point
-                if(len(stng)>0 and stng[0] == "<"):
-                    meta = self.parseMeta(stng,line)
-                    meta, stng = meta[0], meta[1]
-                    #meta = meta[1:len(meta)-1].strip().split(",")
-                    for mt in meta:
-                        if(mt.startswith(("REL","rel"))):
-                            mt = mt.split("=")[1].strip()
-                            crels = float(mt)
-                            if(crels == None or crels <= 0):
-                                crels = -1
-                        elif(mt.startswith(("R", "r", "RATE", "rate"))):
-                            const = float(mt.split("=")[1])
-                            if(const == None or const < 1):
-                                const = 1
-                        elif(mt.startswith(("L", "l", "LOOP", "loop"))):
-                            mt = mt.split("=")[1].strip()
-                            cloop = mt.startswith(("T","t","1"))
-                        elif(mt.startswith(("ATK","atk","ATTACK","attack"))):
-                            mt = mt.split("=")[1].strip()
-                            catk = float(mt)
-                            if(catk == None or catk < 0):
-                                catk = 0
-                                
-            # x indicates a Cross module; flag Cross & carry on
-            if(op == "x"):
-                op = stng[0]
-                stng = stng[1:len(stng)].lstrip()
-                cross = True
-            
-            # Separate out any meta data for the given operation.
-            meta = self.parseMeta(stng,line)
-            meta, stng = meta[0], meta[1]
-
-            # Pop the second operand.
-            mdl = self.popModule(stng, type, line)
-            mdl, stng = mdl[0], mdl[1]
-
-            # Match up our binary operator & wrap them all into a module
-            # + indicates Addition
-            if(op == "+"):                        # addition
-                alead = True
-                for mt in meta:
-                    if(mt.startswith(("LEAD","LD","lead","ld"))):
-                        mt = mt.split("=")[1]
-                        alead = not (mt.startswith("B") or mt.startswith("b"))
-                modA = Add(modA, mdl, alead)
-            # - indicates Subtraction
-            elif(op == "-"):                        # subtraction
-                alead = True
-                for mt in meta:
-                    if(mt.startswith(("LEAD","LD","lead","ld"))):
-                        mt = mt.split("=")[1]
-                        alead = not (mt.startswith("B") or mt.startswith("b"))
-                modA = Subtract(modA, mdl,alead)
-            # r indicates Repetition
-            elif(op == "r"):                        # repetition
-                atk = 0
-                rels = -1
-                for mt in meta:
-                    if(mt.startswith(("REL","rel"))):
-                        mt = mt.split("=")[1].strip()
-                        rels = float(mt)
-                        if(rels == None or rels <= 0):
-                            rels = -1
-                    elif(mt.startswith(("ATK","atk","ATTACK","attack"))):
-                        mt = mt.split("=")[1].strip()
-                        atk = float(mt)
-                        if(atk == None or atk < 0):
-                            atk = 0
-                modA = Repeat(modA, mdl, atk, rels)
-            # * indicates Multiplication.
-            elif(op == "*"):                        # multiplication
-                alead = True
-                for mt in meta:
-                    if(mt.startswith(("LEAD","LD","lead","ld"))):
-                        mt = mt.split("=")[1]
-                        alead = not (mt.startswith("B") or mt.startswith("b"))
-                modA = Multiply(modA, mdl, alead)
-            # / indicates Division.
-            elif(op == "/"):                        # division
-                alead = True
-                for mt in meta:
-                    if(mt.startswith(("LEAD","LD","lead","ld"))):
-                        mt = mt.split("=")[1]
-                        alead = not (mt.startswith("B") or mt.startswith("b"))
-                modA = Divide(modA, mdl)
-            # % indicates Modulus.
-            elif(op == "%"):                        # modulus
-                alead = True
-                for mt in meta:
-                    if(mt.startswith(("LEAD","LD","lead","ld"))):
-                        mt = mt.split("=")[1]
-                        alead = not (mt.startswith("B") or mt.startswith("b"))
-                modA = Modulus(modA, mdl)
-            # i indicates Interpolation.
-            elif(op == "i"):
-                width = Val(1)
-                for mt in meta:
-                    # Width is the duration of the interpolation.
-                    if(mt.startswith(("WID", "WIDTH", "w", "W"))):
-                        mt = mt.split("=")[1]
-                        if(mt in self.modules):
-                            width = self.modules[mt].clone()
-                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
-                            invert = False
-                            if(mt.startswith("-")):
-                                invert = True
-                                mt = mt[1:len(mt)]
-                            num = ""
-                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
-                                num = num + mt[0]
-                                mt = mt[1:len(mt)]
-                            num = float(num)
-                            width = Val(num)
-                            if(invert):
-                                width = Invert(width)
-                        #mt = mt.split("=")[1]
-                        #width = float(mt)
-                        #if(width == None or width <= 0):
-                        #    width = 1
-                modA = LinInterp(modA, mdl, width)
-            # l indicates Level/Volume. 0 is silent, 9 is max, -x is inverted.
-            elif(op == "l"):
-                alead = True
-                for mt in meta:
-                    if(mt.startswith(("LEAD","LD","lead","ld"))):
-                        mt = mt.split("=")[1]
-                        alead = not (mt.startswith("B") or mt.startswith("b"))
-                modA = Level(modA, mdl, alead)
-            # v indicates an Envelope. This applies volume control in constant time.
-            elif(op == "v"):
-                rate = 1
-                loop = False
-                atk = 0
-                rels = -1
-                for mt in meta:
-                    if(mt.startswith(("REL","rel"))):
-                        mt = mt.split("=")[1].strip()
-                        rels = float(mt)
-                        if(rels == None or rels <= 0):
-                            rels = -1
-                    elif(mt.startswith(("R","r","RATE","rate"))):
-                        mt = mt.split("=")[1].strip()
-                        rate = float(mt)
-                        if(rate == None or rate <= 0):
-                            rate = 1
-                    elif(mt.startswith(("L","l","LOOP","loop"))):
-                        mt = mt.split("=")[1].strip()
-                        loop = mt.startswith(("T","t","1"))
-                    elif(mt.startswith(("ATK","atk","ATTACK","attack"))):
-                        mt = mt.split("=")[1].strip()
-                        atk = float(mt)
-                        if(atk == None or atk < 0):
-                            atk = 0
-                modA = Envelope(modA, mdl,
-                        (self.tempo*self.beat)/(60*self.rate)*rate,loop,atk,rels)
-            # s indicates Speed/Playback rate. This is applied to constant time
-            # updates as well, so it does affect pitch!
-            elif(op == "s"):
-                alead = True
-                for mt in meta:
-                    if(mt.startswith(("LEAD","LD","lead","ld"))):
-                        mt = mt.split("=")[1]
-                        alead = not (mt.startswith("B") or mt.startswith("b"))
-                modA = Speed(modA, mdl, alead)
-            # n indicates Length override.
-            elif(op == "n"):
-                modA = Length(modA, mdl)
-            elif(op == "j"):
-                modA = Release(modA, mdl)
-            elif(op == "k"):
-                modA = Attack(modA, mdl)
-            elif(op == "m"):                        # clip
-                alead = True
-                knee = Val(0)
-                for mt in meta:
-                    if(mt.startswith(("LEAD","LD","lead","ld"))):
-                        mt = mt.split("=")[1]
-                        alead = not (mt.startswith("B") or mt.startswith("b"))
-                    if(mt.startswith(("KNEE","knee","KN","kn"))):
-                        mt = mt.split("=")[1]
-                        if(mt in self.modules):
-                            knee = self.modules[mt].clone()
-                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
-                            invert = False
-                            if(mt.startswith("-")):
-                                invert = True
-                                mt = mt[1:len(mt)]
-                            num = ""
-                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
-                                num = num + mt[0]
-                                mt = mt[1:len(mt)]
-                            num = float(num)
-                            knee = Val(num)
-                            if(invert):
-                                knee = Invert(knee)
-                modA = Limit(modA, mdl, alead, knee)
-            elif(op == "y"):
-                wet = Val(1)
-                dry = Val(1)
-                fdbk = Val(0)
-                for mt in meta:
-                    if(mt.startswith(("WET","wet"))):
-                        mt = mt.split("=")[1]
-                        if(mt in self.modules):
-                            wet = self.modules[mt].clone()
-                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
-                            invert = False
-                            if(mt.startswith("-")):
-                                invert = True
-                                mt = mt[1:len(mt)]
-                            num = ""
-                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
-                                num = num + mt[0]
-                                mt = mt[1:len(mt)]
-                            num = float(num)
-                            wet = Val(num)
-                            if(invert):
-                                wet = Invert(wet)            
-                    elif(mt.startswith(("DRY","dry"))):
-                        mt = mt.split("=")[1]
-                        if(mt in self.modules):
-                            dry = self.modules[mt].clone()
-                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
-                            invert = False
-                            if(mt.startswith("-")):
-                                invert = True
-                                mt = mt[1:len(mt)]
-                            num = ""
-                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
-                                num = num + mt[0]
-                                mt = mt[1:len(mt)]
-                            num = float(num)
-                            dry = Val(num)
-                            if(invert):
-                                dry = Invert(knee)
-                    elif(mt.startswith(("FEEDBACK","FDBK","feedback","fdbk","FD","fd"))):
-                        mt = mt.split("=")[1]
-                        if(mt in self.modules):
-                            fdbk = self.modules[mt].clone()
-                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
-                            invert = False
-                            if(mt.startswith("-")):
-                                invert = True
-                                mt = mt[1:len(mt)]
-                            num = ""
-                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
-                                num = num + mt[0]
-                                mt = mt[1:len(mt)]
-                            num = float(num)
-                            fdbk = Val(num)
-                            if(invert):
-                                fdbk = Invert(fdbk)
-                fpstp = (60*self.rate)/(self.tempo*self.beat)
-                modA = Delay(modA,mdl,fpstp,fdbk,wet,dry)
-            elif(op == "p"):
-                alead = True
-                for mt in meta:
-                    if(mt.startswith(("LEAD","LD","lead","ld"))):
-                        mt = mt.split("=")[1]
-                        alead = not (mt.startswith("B") or mt.startswith("b"))
-                modA = Pitch(modA, mdl, alead)
-                                 
-            # If we need to, wrap the operation module in a Cross module.
-            if(cross):
-                modA = Cross(modA)
-                # If we need to, wrap the operation module in a Const module.
-            if(const>0):
-                modA = Const(modA,(self.tempo*self.beat)/(60*self.rate),const,cloop,catk,crels)
-        return modA
-
-    def popModule(self, stng, type, line=0):
-        """ 'Pops' the first fully-described module off the front of the given
-            string and parses it.
-            This method handles parsing of all modules except binary operators,
-            which are handled by parseModule(). Given a string describing a
-            binary operation, this method will parse the first operand.
-            This method is called by parseModule() & is mostly intended to reduce
-            code repetition within that method.
-            Keyword arguments:
-            stng -- String containing the full module description.
-            type -- Tells us what this module is for. Options: INST, TONE, SEQN, MDLE.
-            line -- Current parser line; for error reporting.
-            Returns a 2-tuple: (parsed first module, remaining string).
-        """
-
-        # The module we're parsing.
-        modA = None
-        # Whether we will need to wrap with an Invert (indicated by a '-')
-        invert = False
-        # Whether we will need to wrap with an Absolute value (indicated by a 't')
-        absolute = False
-        # Constant-rate indicator. -1 means skip; Any positive value is read as
-        # the rate value for a Const module.
-        const = -1
-        # If const != -1, this indicates whether our Const module should loop.
-        cloop = False
-        # Attack value for constant module
-        catk = 0
-        # Release value for constant module
-        crels = -1
-
-        stng = stng.lstrip()
-        # Whether we are done pulling prefixes from the string (like "-", "c", "t")
-        pfx = True
-
-        while(pfx):
-            # Throw an error if we are grabbing an empty module.
-            if(stng == "" or stng.isspace()):
-                raise SCParseError("Empty module at " + self.curParseModule + ".",line)
-                return (Val(0), "")
-            # A '-' indicates that we will invert the popped module (Invert).
-            if(stng[0] == "-"):
-                stng = stng[1:len(stng)]
-                invert = not invert
-            # A 'c' indicates that we will apply a constant-rate module (Const).
-            elif(stng[0] == "c"):
-                const = 1
-                stng = stng[1:len(stng)].lstrip()
-                # Const currently offers 2 meta tags: 'r' or 'rate' for the speed,
-                # and 'l' or 'loop' for whether to loop the results.
-                if(len(stng)>0 and stng[0] == "<"):
-                    meta = self.parseMeta(stng)
-                    meta, stng = meta[0], meta[1]
-                    #meta = meta[1:len(meta)-1].strip().split(",")
-                    for mt in meta:
-                        if(mt.startswith(("REL","rel"))):
-                            mt = mt.split("=")[1].strip()
-                            crels = float(mt)
-                            if(crels == None or crels <= 0):
-                                crels = -1
-                        elif(mt.startswith(("R", "r", "RATE", "rate"))):
-                            const = float(mt.split("=")[1])
-                            if(const == None or const < 1):
-                                const = 1
-                        elif(mt.startswith(("L", "l", "LOOP", "loop"))):
-                            mt = mt.split("=")[1].strip()
-                            cloop = mt.startswith(("T","t","1"))
-                        elif(mt.startswith(("ATK","atk","ATTACK","attack"))):
-                            mt = mt.split("=")[1].strip()
-                            catk = float(mt)
-                            if(catk == None or catk < 0):
-                                catk = 0
-            elif(stng[0] == "t"):
-                stng = stng[1:len(stng)]
-                absolute = True
-            else:
-                pfx = False
-
-        value = None
-        # For TONE or generic modules, 2-char pitch literal ("d4").
-        if((type == TONE or type == MDLE) and stng[0:2] in self.tones):
-            value = self.tones[stng[0:2]]
-            stng = stng[2:len(stng)]
-        # For TONE or generic modules, 3-char pitch literal ("C#4")
-        elif((type == TONE or type == MDLE) and stng[0:3] in self.tones):
-            value = self.tones[stng[0:3]]
-            stng = stng[3:len(stng)]
-        # Numeric literal
-        elif(stng[0].isnumeric() or stng[0] == "."):
-            num = ""
-            while(len(stng)>0 and (stng[0].isnumeric() or stng[0] == ".")):
-                num = num + stng[0]
-                stng = stng[1:len(stng)]
-            value = float(num)
-
-        # A value module, either from pitch or numerics parsed above
-        if(value != None):
-            vlength = 1
-            if(len(stng)>0 and stng[0] == "<"):
-                meta = self.parseMeta(stng)
-                meta, stng = meta[0], meta[1]
-                #meta = meta[1:len(meta)-1].strip().split(",")
-                for mt in meta:
-                    if(mt.startswith(("LEN","len","LN","ln"))):
-                        mt = mt.split("=")[1].strip()
-                        vlength = float(mt)
-            modA = Val(value, vlength)
-        # Pattern
-        elif(stng[0] == "["):
-            set = self.extractPattern(stng,line)
-            stng, modA = set[1], self.parsePattern(set[0], type)
-        # Set
-        elif(stng[0] == "{"):
-            set = self.extractSet(stng,line)
-            stng, modA = set[1], self.parseSet(set[0], type)
-        # Series
-        elif(stng[0] == "("):
-            set = self.extractSeries(stng,line)
-            stng, modA = set[1], self.parseSeries(set[0], type)
-        # Otherwise, check if it is a reference to another module.
-        else:
-            i = 0
-            while(i < len(stng) and stng[i] not in RESERVED):
-                i+= 1
-            name = stng[0:i]
-            stng = stng[i:len(stng)]
-            meta = self.parseMeta(stng)
-            meta, stng = meta[0], meta[1]
-            if(type == INST or type == MDLE):
-                if(name in self.insts):
-                    modA = self.insts[name].clone()
-                    for mt in meta:
-                        mt = mt.strip()
-                        if(mt.startswith(("MODULE", "MDL", "module", "mdl"))):
-                            modA = modA.mdl
-                        elif(mt.startswith(("period", "PERIOD", "prd", "PRD"))):
-                            mt = mt.split("=")[1].lstrip()
-                            modA.period = int(mt)
-                        elif(mt.startswith(("loop", "LOOP", "l", "L"))):
-                            mt = mt.split("=")[1].lstrip()
-                            modA.loop = mt.startswith("t") or mt.startswith("T") or mt.startswith("1")
-                        elif(mt.startswith(("sus", "SUS", "SUSTAIN", "sustain", "s", "S"))):
-                            mt = mt.split("=")[1].lstrip()
-                            modA.sus = mt.startswith("t") or mt.startswith("T") or mt.startswith("1")
-                        elif(mt.startswith(("BASE","base"))):
-                            mt = mt.split("=")[1].lstrip()
-                            ins = self.insts[mt]
-                            if(ins != None):
-                                period = ins.period
-                                loop = ins.loop
-                                sus = ins.sus
-                elif(name in self.modules):
-                    modA = self.modules[name].clone()
-                else:
-                    raise SCParseError("Invalid inst: " + name, line)
-                    #print("Error! Invalid inst: " + name + ". Line: " + str(line))
-            elif(type == TONE):
-                if(name in self.tones):
-                    vlength = 1
-                    for mt in meta:
-                        if(mt.startswith(("LEN","len","LN","ln"))):
-                            mt = mt.split("=")[1].strip()
-                            vlength = float(mt)
-                            if(vlength == None or vlength <= 0):
-                                vlength = 1
-                    modA = Val(self.tones[name], vlength)
-                elif(name in self.modules):
-                    modA = self.modules[name].clone()
-                else:
-                    # this is an error
-                    raise SCParseError("Invalid Pitch: " + name, line)
-                    #print("Error! Invalid Pitch: " + name)
-            elif(type == SEQN):
-                if(name in self.seqs):
-                    modA = self.seqs[name].clone()
-                elif(name in self.modules):
-                    modA = SeqBlock(self.modules(),Val(0))
-                else:
-                    # this is an error
-                    raise SCParseError("Invalid Sequence: " + name,line)
-                    #print("Error! Invalid Sequence: \"" + name + "\"")
-        # at this point, we need modA & to've cut modA out of stng
-        # now we'll test for operatens, and add them
-        # wrap modA with any single operatens
-        if(invert):
-            modA = Invert(modA)
-        if(absolute):
-            modA = AbsVal(modA)
-        if(const>0):
-            modA = Const(modA,(self.tempo*self.beat)/(60*self.rate),const,cloop,catk,crels)
-
-        return (modA, stng)
-    
-    def parseMeta(self, stng, line=0):
-        """ Separates out individual meta tags from a meta description.
-
-            Tags must be delimited by commas.
-
-            Arguments:
-            stng -- The meta description. This can include brackets, or not.
-        """
-
-        stng = stng.lstrip()
-
-        if(len(stng)<=0):
-            return ([], stng)
-
-        meta = []
-        if(stng[0] == "<"):
-            endmeta = stng.find(">")
-            if(endmeta<0):
-                raise SCParseError("Missing '>' in meta tag.",line)
-            meta = stng[1:endmeta]
-            stng = stng[endmeta+1:len(stng)]
-            meta = meta.strip().split(",")
-
-        return (meta, stng)
-
-    def extractPattern(self, stng, line=0):
-        """ Separates out a Pattern description from a larger description
-            string, and trims away the brackets.
-
-            Arguments:
-            stng -- A module description.
-            line -- Current parser line, for error reporting.
-
-            Returns a 2-tuple: (pattern description, remaining string)
-        """
-
-        inx = 0
-        brackets = 0
-
-        while(inx < len(stng)):
-            if(stng[inx] == "["):
-                brackets += 1
-            elif(stng[inx] == "]"):
-                brackets -= 1
-            inx += 1
-            if(brackets == 0):
-                return (stng[1:inx-1], stng[inx:len(stng)])
-        if(brackets > 0):
-            raise SCParseError("Expected ']'.",line)
-            #print("Error: Expecting ']' in line " + str(line) + ".")
-        else:
-            raise SCParseError("Expected '['.",line)
-            #print("Error: Expecting '[' in line " + str(line) + ".")
-
-    def extractSet(self, stng, line=0):
-        """ Separates out a Set description from a larger description
-            string, and trims away the brackets.
-
-            Arguments:
-            stng -- A module description.
-            line -- Current parser line, for error reporting.
-
-            Returns a 2-tuple: (set description, remaining string)
-        """
-
-        inx = 0
-        brackets = 0
-
-        while(inx < len(stng)):
-            if(stng[inx] == "{"):
-                brackets += 1
-            elif(stng[inx] == "}"):
-                brackets -= 1
-            inx += 1
-            if(brackets == 0):
-                return (stng[1:inx-1], stng[inx:len(stng)])
-        if(brackets > 0):
-            raise SCParseError("Expected '}'.",line)
-        else:
-            raise SCParseError("Expected '{'.",line)
-
-    def extractSeries(self, stng,line=0):
-        """ Separates out a Series description from a larger description
-            string, and trims away the brackets.
-
-            Arguments:
-            stng -- A module description.
-            line -- Current parser line, for error reporting.
-
-            Returns a 2-tuple: (series description, remaining string)
-        """
-
-        inx = 0
-        brackets = 0
-
-        while(inx < len(stng)):
-            if(stng[inx] == "("):
-                brackets += 1
-            elif(stng[inx] == ")"):
-                brackets -= 1
-            inx += 1
-            if(brackets == 0):
-                return (stng[1:inx-1], stng[inx:len(stng)])
-        if(brackets > 0):
-            raise SCParseError("Expecting ')'.",line)
-        else:
-            raise SCParseError("Expecting '('.",line)
-
-    def parseSongLine(self, stng, mdls, line=0):
-        """ Parses a list of Sequence modules, to be added to the Song.
-
-            This is called for each non-empty line of the SNG chunk, and newly
-            parsed Sequences are added to mdls.
-
-            Arguments:
-            stng -- String representing the line of Sequences.
-            mdls -- List of Song modules. We append new Sequences to this.
-            line -- Current parser line, for error reporting.
-        """
-
-        bits = []
-        brace = 0
-        bracket = 0
-        paren = 0
-        meta = 0
-        inx = 0
-        while(inx < len(stng)):
-            if(stng[inx]=="," and brace == 0
-                    and bracket == 0 and paren == 0 and meta == 0):
-                bits.append(stng[0:inx])
-                stng = stng[inx+1:len(stng)]
-                inx = 0
-            else:
-                if(stng[inx]=="["):
-                    bracket += 1
-                elif(stng[inx]=="]"):
-                    bracket -= 1
-                elif(stng[inx]=="{"):
-                    brace += 1
-                elif(stng[inx]=="}"):
-                    brace -= 1
-                elif(stng[inx]=="("):
-                    paren += 1
-                elif(stng[inx]==")"):
-                    paren -= 1
-                elif(stng[inx]=="<"):
-                    meta += 1
-                elif(stng[inx]==">"):
-                    meta -= 1
-                inx += 1
-        if(len(stng)>0):
-            bits.append(stng)
-
-        for ln in bits:
-            ln = ln.strip()
-            mdls.append(self.parseModule(ln,SEQN,line))
-
-    def parsePattern(self, stng, type, line=0):
-        """ Parse a Pattern module.
-
-            This uses parseModule() for each module, then wraps the list with
-            a Pattern module.
-
-            Arguments:
-            stng -- Pattern description string (bounding brackets removed)
-            type -- The type of module we're parsing. Options: INST, TONE, SEQN, MDLE.
-            line -- Current parser line, for error-reporting.
-        """
-
-        bits = []
-        brace = 0
-        bracket = 0
-        paren = 0
-        meta = 0
-        inx = 0
-        while(inx < len(stng)):
-            if(stng[inx]=="," and brace == 0
-                    and bracket == 0 and paren == 0 and meta == 0):
-                bits.append(stng[0:inx])
-                stng = stng[inx+1:len(stng)]
-                inx = 0
-            else:
-                if(stng[inx]=="["):
-                    bracket += 1
-                elif(stng[inx]=="]"):
-                    bracket -= 1
-                elif(stng[inx]=="{"):
-                    brace += 1
-                elif(stng[inx]=="}"):
-                    brace -= 1
-                elif(stng[inx]=="("):
-                    paren += 1
-                elif(stng[inx]==")"):
-                    paren -= 1
-                elif(stng[inx]=="<"):
-                    meta += 1
-                elif(stng[inx]==">"):
-                    meta -= 1
-                inx += 1
-        if(len(stng)>0):
-            bits.append(stng)
-        ary = []
-        for ln in bits:
-            ary.append(self.parseModule(ln.strip(), type, line))
-        return Pattern(ary)
-
-    def parseSet(self, stng, type, line=0):
-        """ Parse a Set module.
-
-            This uses parseModule() for each module, then wraps the list with
-            a Set module.
-
-            Arguments:
-            stng -- Set description string (bounding brackets removed)
-            type -- The type of module we're parsing. Options: INST, TONE, SEQN, MDLE.
-            line -- Current parser line, for error-reporting.
-        """
-
-        bits = []
-        brace = 0
-        bracket = 0
-        paren = 0
-        meta = 0
-        inx = 0
-        while(inx < len(stng)):
-            if(stng[inx]=="," and brace == 0
-                    and bracket == 0 and paren == 0 and meta == 0):
-                bits.append(stng[0:inx])
-                stng = stng[inx+1:len(stng)]
-                inx = 0
-            else:
-                if(stng[inx]=="["):
-                    bracket += 1
-                elif(stng[inx]=="]"):
-                    bracket -= 1
-                elif(stng[inx]=="{"):
-                    brace += 1
-                elif(stng[inx]=="}"):
-                    brace -= 1
-                elif(stng[inx]=="("):
-                    paren += 1
-                elif(stng[inx]==")"):
-                    paren -= 1
-                elif(stng[inx]=="<"):
-                    meta += 1
-                elif(stng[inx]==">"):
-                    meta -= 1
-                inx += 1
-        if(len(stng)>0):
-            bits.append(stng)
-
-        ary = []
-        for ln in bits:
-            ary.append(self.parseModule(ln.strip(), type, line))
-        return Set(ary)
-
-    def parseSeries(self, stng, type, line=0):
-        """ Parse a Series module.
-
-            This uses parseModule() for each module, then wraps the list with
-            a Series module.
-
-            Arguments:
-            stng -- Series description string (bounding brackets removed)
-            type -- The type of module we're parsing. Options: INST, TONE, SEQN, MDLE.
-            line -- Current parser line, for error-reporting.
-        """
-
-        bits = []
-        brace = 0
-        bracket = 0
-        paren = 0
-        meta = 0
-        inx = 0
-        while(inx < len(stng)):
-            if(stng[inx]=="," and brace == 0
-                    and bracket == 0 and paren == 0 and meta == 0):
-                bits.append(stng[0:inx])
-                stng = stng[inx+1:len(stng)]
-                inx = 0
-            else:
-                if(stng[inx]=="["):
-                    bracket += 1
-                elif(stng[inx]=="]"):
-                    bracket -= 1
-                elif(stng[inx]=="{"):
-                    brace += 1
-                elif(stng[inx]=="}"):
-                    brace -= 1
-                elif(stng[inx]=="("):
-                    paren += 1
-                elif(stng[inx]==")"):
-                    paren -= 1
-                elif(stng[inx]=="<"):
-                    meta += 1
-                elif(stng[inx]==">"):
-                    meta -= 1
-                inx += 1
-        if(len(stng)>0):
-            bits.append(stng)
-
-        ary = []
-        for ln in bits:
-            ary.append(self.parseModule(ln.strip(), type, line))
-        return Series(ary)
-
-
-class SeqLine(SCModule):
-    """ Represents a single line of a Sequence module.
-
-        This corresponds to a single line of the SEQ chunk of a SC file.
-        SeqLine has a single module determining pitch and can play only 1
-        instrument at a time. This is similar to a monophonic "voice" within
-        a piece, though different Instruments can be used in the same SeqLine.
-    """
-
-    def __init__(self, parent, pitch, pat, pan=None, transpose=0):
-        """ Initializes with the given parent and pitch module and the given
-            pattern.
-
-            The pattern data is extracted by SynthCorona.parse() into a list.
-            Each index is either an Instrument or a string: "-" or " ",
-            with hyphens indicating sustain & spaces indicating release/silence.
-
-            Arguments:
-            parent -- The SynthCorona module to which this part belongs.
-            pitch -- Pitch module.
-            pat -- Pattern data list.
-            pan -- Pan module. Defaults to Val(0) (centered) if none is given.
-            transpose -- Pitch transposition amount.
-        """
-
-        self.parent = parent
-        self.seq = None
-        self.pat = pat
-        self.pitch = pitch
-        self.transpose = 0
-        self.pan = pan
-        if(self.pan == None):
-            self.pan = Val(0)
-        self.cur = 0
-        self.curInx = 0
-        if(self.pat[self.curInx] == None or self.pat[self.curInx] == "-"):
-            self.curInst = None
-        else:
-            self.curInst = self.pat[self.curInx]
-
-    def step(self, delta, const=-1):
-        self.cur += delta
-        if(const != ADJUST):
-            self.pitch.step(self.parent.frameslice, 1)
-            self.pan.step(self.parent.frameslice,1)
-            if(self.curInst != None):
-                if(self.cur >= self.parent.framesperstep-self.parent.rel_time and
-                        (self.curInx >= len(self.pat)-1 or self.pat[self.curInx+1] != "-")):
-                    self.curInst.stop()
-                    self.seq.tails.append(self.curInst.clone())
-                    self.curInst = None
-                elif(self.curInst.stopped):
-                    self.seq.tails.append(self.curInst.clone())
-                    self.curInst = None
-                else:
-                    self.curInst.step(delta,const)
-
-        if(self.cur >= self.parent.framesperstep):
-            self.cur %= self.parent.framesperstep
-            self.curInx += 1
-            if(not self.done()):
-                if(self.pat[self.curInx] != "-"):
-                    self.curInst = self.pat[self.curInx]
-
-    def read(self,tails=False,stereo=True,signal=True):
-        if(stereo):
-            if(self.pitch.done()):
-                extra = self.pitch.get_extra()
-                self.pitch.reset()
-                self.pitch.step(extra,ADJUST)
-            if(self.pan.done()):
-                extra = self.pan.get_extra()
-                self.pan.reset()
-                self.pan.step(extra,ADJUST)
-            if(self.curInst != None):
-                # old baked-freqs route
-                #freq = self.parent.freqs[int(self.pitch.read(stereo=False,signal=False))]
-                #if(self.curInst.freq != freq):
-                #    self.curInst.set_freq(freq)
-                
-                # new pitch-only route
-                pitch = self.pitch.read(stereo=False,signal=False)+self.transpose
-                if(self.curInst.pitch != pitch):
-                   self.curInst.set_pitch(pitch)
-                return pan(self.curInst.read(),self.pan.read(stereo=False,signal=False))
-            else:
-                return [0,0]
-        else:
-            if(self.pitch.done()):
-                extra = self.pitch.get_extra()
-                self.pitch.reset()
-                self.pitch.step(extra,ADJUST)
-            if(self.curInst != None):
-                # old baked-freqs route
-                #freq = self.parent.freqs[int(self.pitch.read(stereo=False,signal=False))]
-                #if(self.curInst.freq != freq):
-                #    self.curInst.set_freq(freq)
-
-                # new pitch-only route
-                pitch = self.pitch.read(stereo=False,signal=False)+self.transpose
-                self.curInst.set_pitch(pitch)
-                
-                return self.curInst.read(stereo=False,signal=False)
-            else:
-                return 0
-
-    def reset(self):
-        self.curInx = 0
-        self.cur = 0
-        for p in self.pat:
-            if(p != None and p != "-"):
-                p.clear()
-        if(self.pat[0] != "-"):
-            self.curInst = self.pat[0]
-
-    def clear(self):
-        self.curInx = 0
-        self.cur = 0
-        self.pitch.clear()
-        self.pan.clear()
-        for p in self.pat:
-            if(p != None and p != "-"):
-                p.clear()
-        if(self.pat[0] != "-"):
-            self.curInst = self.pat[0]
-
-    def done(self):
-        return self.curInx >= len(self.pat)
-
-    def has_tails(self):
-        # SeqLine does not deal with tails
-        return False
-
-    def set_pitch(self,pitch):
-        # this sets the transposition amount, not the pitch module
-        self.transpose = pitch
-    
-    def get_extra(self):
-        if(self.done()):
-            return self.cur
-        else:
-            return 0
-
-    def length(self):
-        return len(self.pat)*self.parent.framesperstep
-
-    def clone(self):
-        patclone = []
-        for p in self.pat:
-            if(p != None and p != "-"):
-                patclone.append(p.clone())
-            else:
-                patclone.append(p)
-        return SeqLine(self.parent, self.pitch.clone(), patclone, self.pan.clone(),self.transpose)
-
-    def to_string(self):
-        """ Compiles and returns a string representing this SeqLine.
-
-            This was probably for testing something -- it isn't pretty.
-        """
-        return ("LINE: " + self.pitch.to_string() + ": " + self.pat.to_string())
-
-class Sequence(SCModule):
-    """ Contains sequence data (in the form of SeqLines) for a section/pattern
-        within a song.
-
-        Sequences are Modules, so they can be combined/manipulated as with
-        any other module, though this must be done under the BLK (Block) header
-        of a SC file.
-    """
-
-    def __init__(self, lines, parent, pan=None, pitch=0):
-        """ Initializer.
-
-            Arguments:
-            lines -- The SeqLines that comprise this Sequence.
-            parent -- The SynthCorona parent.
-            pan -- Option panning module (pans the whole pattern).
-            pitch -- Optional pitch shift value (not a module)
-        """
-
-        self.parent = parent
-        self.lines = lines
-        self.pan = pan
-        if(self.pan == None):
-            self.pan = Val(0)
-        self.pitch = pitch
-        self.stopped = False
-        self.len = 0
-        for l in lines:
-            l.seq = self
-            if(l.length() > self.len):
-                self.len = l.length()
-        self.tails = []
-
-    def step(self, delta, const=-1):
-        if(const == STOP):
-            self.stopped = True
-            return
-        if(not self.stopped):
-            self.pan.step(delta,1)
-            for ln in self.lines:
-                # Const is always 1, so you can speed up Seq's without
-                # changing instrument pitches.
-                # However, this means we MUST update Seq's once per sample.
-                if(not ln.done()):
-                    ln.step(delta,1)
-
-    def step_tails(self, delta, const=-1):
-        for t in self.tails:
-            # just a regular step here: we're stepping the Insts in tails
-            t.step(delta,1)
-            if(t.done()):
-                self.tails.remove(t)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        if(tails):
-            if(stereo):
-                sum = [0,0]
-                for t in self.tails:
-                    # we always set tails=F because tails should be an Inst--
-                    # tails is more for Sequences
-                    val = t.read(False,stereo,signal)
-                    sum[0] += val[0]
-                    sum[1] += val[1]
-                return pan(sum,self.pan.read(stereo=False,signal=False))
-            else:
-                sum = 0
-                for t in self.tails:
-                    # we always set tails=F because tails should be an Inst--
-                    # tails is more for Sequences
-                    sum += t.read(False,stereo,signal)
-                return sum
-        else:
-            if(stereo):
-                if(self.pan.done()):
-                    extra = self.pan.get_extra()
-                    self.pan.reset()
-                    self.pan.step(extra,ADJUST)
-                sum = [0,0]
-                if(not self.stopped):
-                    for ln in self.lines:
-                        if(not ln.done()):
-                            val = ln.read(tails,stereo,signal)
-                            sum[0] += val[0]
-                            sum[1] += val[1]
-                return pan(sum,self.pan.read(stereo=False,signal=False))
-            else:
-                sum = 0
-                if(not self.stopped):
-                    for ln in self.lines:
-                        if(not ln.done()):
-                            sum += ln.read(tails,stereo,signal)
-                return sum
-
-    def reset(self):
-        self.pan.reset()
-        for ln in self.lines:
-            ln.reset()
-        self.stopped = False
-
-    def clear(self):
-        self.pan.clear()
-        for ln in self.lines:
-            ln.clear()
-        #self.tails = []
-        self.stopped = False
-
-    def done(self):
-        if(not self.stopped):
-            for ln in self.lines:
-                if(not ln.done()):
-                    return False
-            return True
-        else:
-            return len(self.tails) == 0
-
-    def has_tails(self):
-        return len(self.tails) > 0
-
-    def set_pitch(self, pitch):
-        if(pitch != self.pitch):
-            self.pitch = pitch
-            # Sequence tells its SeqLines what transpose value to have
-            for l in self.lines:
-                l.set_pitch(pitch)
-
-    def get_extra(self):
-        return self.lines[0].get_extra()
-
-    def length(self):
-        if(not self.stopped):
-            return self.len
-        else:
-            len = 0
-            for t in self.tails:
-                if(t.length() > len):
-                    len = t
-            return len
-
-    def clone(self):
-        tlines = []
-        for l in self.lines:
-            tlines.append(l.clone())
-        return Sequence(tlines, self.parent, self.pan.clone(), self.pitch)
-
-class SeqBlock(SCModule):
-    """ Sequence wrapper for modules. When Sequence modules are parsed by the
-        BLK/PAT chunk, they will be packaged in this.
-
-        Like basic Sequences, this has a Sequence-level panning module, pan,
-        which defaults to centered.
-    """
-
-    def __init__(self, module, pan=None):
-        """ Initializer.
-
-            Arguments:
-            module -- The module to be wrapped. Should contain Sequence data.
-            pan -- Optional panning module. Defaults to Val(0)
-        """
-
-        self.module = module
-        if(pan == None):
-            pan = Val(0)
-        self.pan = pan
-
-    def step(self, delta, const=-1):
-        self.pan.step(delta,const)
-        self.module.step(delta,const)
-
-    def step_tails(self, delta, const=-1):
-        self.module.step_tails(delta,const)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        if(stereo):
-            if(self.pan.done()):
-                extra = self.pan.get_extra()
-                self.pan.reset()
-                self.pan.step(extra,ADJUST)
-            return pan(self.module.read(tails,stereo,signal),self.pan.read(stereo=False,signal=False))
-        else:
-            return self.module.read(tails,stereo,signal)
-
-    def reset(self):
-        self.pan.reset()
-        self.module.reset()
-
-    def clear(self):
-        self.pan.clear()
-        self.module.clear()
-
-    def done(self):
-        return self.module.done()
-
-    def has_tails(self):
-        return self.module.has_tails()
-
-    def set_pitch(self, pitch):
-        self.module.set_pitch(pitch)
-
-    def get_extra(self):
-        return self.module.get_extra()
-
-    def length(self):
-        return self.module.length()
-
-    def clone(self):
-        return SeqBlock(self.module.clone(),self.pan.clone())
-
-class Song(SCModule):
-    """ Module class representing a song.
-
-        This is primarily composed of a list of Sequences (or SeqBlock), which
-        are run and read one after the other.
-    """
-
-    def __init__(self, pat, parent, name=""):
-        """ Initializer.
-
-            Arguments:
-            pat -- Sequence pattern that comprises the Song.
-            parent -- SynthCorona that is running this show.
-            name -- Name to render this Song under. Empty string will use
-                    the name from the source file.
-        """
-
-        self.name = name
-        self.pat = pat
-        self.curInx = 0
-        self.parent = parent
-        self.tails = []
-
-    def step(self, delta, const=-1):
-        # Step Sequences that are sustaining (self.tails)
-        for t in self.tails:
-            t.step_tails(delta, const)
-            if(t.done() and not t.has_tails()):
-                self.tails.remove(t)
-        if(self.curInx < len(self.pat)):
-            self.pat[self.curInx].step(delta,delta)
-            # Step sustained notes in current Sequence
-            self.pat[self.curInx].step_tails(delta,delta)
-            if(self.pat[self.curInx].done()):
-                self.pat[self.curInx].step(0,STOP)
-                if(getattr(self.pat[self.curInx], "no_tails", None) == None):
-                    self.tails.append(self.pat[self.curInx])
-                self.curInx += 1
-
-    def read(self,tails=False,stereo=True,signal=False):
-        if(stereo):
-            sum = [0,0]
-            if(self.curInx < len(self.pat)):
-                val = self.pat[self.curInx].read(tails,stereo,signal)
-                sum[0] += val[0]
-                sum[1] += val[1]
-                if(getattr(self.pat[self.curInx], "no_tails", None) == None):
-                    val = self.pat[self.curInx].read(True,stereo,signal)
-                    sum[0] += val[0]
-                    sum[1] += val[1]
-            for t in self.tails:
-                val = t.read(True,stereo,signal)
-                sum[0] += val[0]
-                sum[1] += val[1]
-            return sum
-        else:
-            sum = 0
-            if(self.curInx < len(self.pat)):
-                sum += self.pat[self.curInx].read(tails,stereo,signal)
-                if(getattr(self.pat[self.curInx], "no_tails", None) == None):
-                    # add tails from current Sequence.
-                    sum += self.pat[self.curInx].read(True,stereo,signal)
-            for t in self.tails:
-                # add tails from past Sequences.
-                sum += t.read(True,stereo,signal)
-            return sum
-
-    def reset(self):
-        self.clear()
-
-    def clear(self):
-        self.curInx = 0
-        for p in self.pat:
-            p.clear()
-
-    def done(self):
-        return len(self.tails) == 0 and (self.curInx >= len(self.pat))
-
-    def has_tails(self):
-        return len(self.tails) > 0
-    
-    def get_extra(self):
-        return self.curInx-len(self.pat)
-
-    def length(self):
-        sum = 0
-        for mdl in self.pat:
-            sum += mdl.length()
-        return sum
-
-class Inst(SCModule):
-    """ Module representing an instrument/synth.
-
-        Along with core module functions, Insts also have set_freq(), which
-        sets the current pitch.
-
-        Insts also have several unique properties:
-        period -- Indicates the length of 1 period of the core waveform.
-        loop -- Whether this Inst should loop after its module has finished.
-        sus -- Whether this Inst should sustain (until module completion), after stop().
-        pan -- Instrument-level pan module.
-
-        Pitch is achieved by playing the module at a rate based on the frequency
-        and the wave period. This rate affects delta in step() calls, but it does
-        not affect const, (the constant-time argument).
-
-        Similarly, Inst always uses const to step, to prevent other adjustments
-        to delta from affecting the pitch. The main exception to this is the
-        Speed module, which does affect pitch (by changing the const value).
-
-        Because of the above, you can easily nest Insts within other Insts
-        without affecting pitch.
-    """
-
-    def __init__(self, parent, module, prd=-1, loop=True, sus=False, pan=None):
-        """ Initializer.
-
-            Arguments:
-            parent -- SynthCorona parent.
-            module -- Module for creating the Inst's sound.
-            prd -- Period length. If -1, we will use module.length(), which will
-                work as long as the module describes exactly 1 oscillation.
-            loop -- Whether to loop our module. Default: True.
-            sus -- Whether to sustain our module. Default: False. If true, loop is overrided to False.
-            pan -- Instrument-level panning module. Defaults to centered.
-        """
-
-        if(sus):
-            loop = False
-        self.parent = parent
-        self.mdl = module
-        self.stopped = False
-        self.release = None
-        if(prd < 1):
-            self.period = self.mdl.length()
-        else:
-            self.period = prd
-        self.loop = loop
-        self.sus = sus
-        self.pan = pan
-        if(self.pan == None):
-            self.pan = Val(0)
-        self.rate = 0
-        self.pitch = 0
-        # replacing frequency with pitch
-        #self.freq = 1
-        self.last = 0
-
-    #def set_freq(self, freq):
-    #    self.freq = freq
-    #    self.rate = self.freq*self.period/self.parent.rate
-    #    self.mdl.set_freq(freq)
-    def set_pitch(self, pitch):
-        if(pitch != self.pitch):
-            self.pitch = pitch
-            self.rate = calc_freq(self.pitch)*self.period/self.parent.rate
-        self.mdl.set_pitch(pitch)
-
-    def step(self, delta, const=-1):
-        if(const < 0):
-            # bypass rate adjustment
-            if(const == ADJUST):
-                if(self.stopped):
-                    self.release.step(delta,const)
-                else:
-                    self.mdl.step(delta,const)
-                return
-            # stop command
-            elif(const == STOP):
-                self.mdl.step(0,RELEASE)
-                self.pan.step(0,RELEASE)
-                if(self.sus):
-                    self.release = self.mdl
-                else:
-                    if(not self.mdl.done()):
-                        self.release = Multiply(self.mdl, Const(LinInterp(Val(1),Val(0),Val(self.parent.rel_time)),1,loop=False),False)
-                    else:
-                        self.release = Const(LinInterp(StereoVal([self.last[0],self.last[1]]),Val(0),Val(self.parent.rel_time)),1)
-                self.stopped = True
-                return
-            # release command -- pass this forward to our module
-            elif(const == RELEASE):
-                self.mdl.step(0,const)
-                self.pan.step(0,const)
-                return
-            # otherwise, set const to delta
-            else:
-                const=delta
-        self.pan.step(const*self.rate,const)
-        if(self.stopped):
-            self.release.step(const*self.rate, const)
-        else:
-            self.mdl.step(const*self.rate, const)
-            if(self.done()):
-                if(self.loop):
-                    extra = self.get_extra()
-                    self.reset()
-                    # ADJUST Const tells Inst to bypass its freq. rate
-                    self.step(extra,ADJUST)
-                else:
-                    self.stop()
-
-    def read(self,tails=False,stereo=True,signal=True):
-        if(stereo):
-            if(self.pan.done()):
-                extra = self.pan.get_extra()
-                self.pan.reset()
-                self.pan.step(extra,ADJUST)
-            if(self.stopped):
-                self.last = pan(self.release.read(tails,stereo,signal),self.pan.read(stereo=False,signal=False))
-                return self.last
-            else:
-                if(self.loop or not self.done()):
-                    self.last = pan(self.mdl.read(tails,stereo,signal),self.pan.read(stereo=False,signal=False))
-                    return self.last
-                else:
-                    return [0,0]
-        else:
-            if(self.stopped):
-                val = self.release.read(tails,stereo,signal)
-                self.last = [val,val]
-                return val
-            else:
-                if(self.loop or not self.done()):
-                    val = self.mdl.read(tails,stereo,signal)
-                    self.last = [val,val]
-                    return val
-                else:
-                    return 0
-
-    def reset(self):
-        self.mdl.reset()
-        self.pan.reset()
-
-    def clear(self):
-        self.release = None
-        self.stopped = False
-        self.mdl.clear()
-        self.pan.clear()
-
-    def done(self):
-        if(self.stopped):
-            return self.release.done()
-        else:
-            return self.mdl.done()
-
-    def has_tails(self):
-        return False # maybe? or should we do self.stopped and not self.release.done()?
-
-    def get_extra(self):
-        if(self.stopped):
-            return self.release.get_extra()
-        else:
-            return self.mdl.get_extra()
-
-    def clone(self):
-        cp = Inst(self.parent, self.mdl.clone(), self.period, self.loop, self.sus, self.pan.clone())
-        cp.stopped = self.stopped
-        if(self.release != None):
-            cp.release = self.release.clone()
-        else:
-            cp.release = None
-        cp.rate = self.rate
-        #cp.freq = self.freq
-        cp.pitch = self.pitch
-        return cp
-
-    def length(self):
-        if(self.stopped):
-            return self.release.length()
-        else:
-            return self.mdl.length()
-
-    def stop(self):
-        self.step(0,STOP)
-
-class Val(SCModule):
-    """ Module representing a single fixed value.
-
-        This module has length 1 and always returns its value on read().
-    """
-
-    def __init__(self, val=0, ln=1):
-        self.val = val
-        self.cur = 0
-        self.no_tails = True
-        self.len = ln
-
-    def step(self, delta, const=-1):
-        if(const >= 0 or const == DELTA or const == ADJUST):
-            self.cur += delta
-
-    def step_tails(self, delta, const=-1):
-        #self.step(delta, const)
-        pass
-
-    # 'tails' here is irrelevant; search for "no_tails" property to avoid doubling
-    def read(self,tails=False,stereo=True,signal=True):
-        if(stereo):
-            return [self.val,self.val]
-        else:
-            return self.val
-
-    def reset(self):
-        self.cur = 0
-
-    def clear(self):
-        self.cur = 0
-
-    def done(self):
-        return self.cur >= self.len
-
-    def has_tails(self):
-        return False
-    
-    def get_extra(self):
-        if(self.done()):
-            return self.cur-self.len
-        else:
-            return 0
-
-    def clone(self):
-        tmp = Val(self.val, self.len)
-        tmp.cur = self.cur
-        return tmp
-
-    def length(self):
-        return self.len
-
-    #def set_freq(self, freq):
-    #    pass
-    def set_pitch(self, pitch):
-        pass
-
-class StereoVal(SCModule):
-    """ Module representing a single value, in stereo.
-
-        Right now, the only we place we use this is when creating tails to fade
-        out instruments. It isn't necessary for general purposes, as simply
-        panning a Val module covers that better.
-
-        Like Val, StereoVal has a length of 1.
-    """
-
-    def __init__(self, val=[0,0], ln=1):
-        """ Initializer.
-
-            Arguments:
-            val -- The value, as a 2-tuple or 2-list.
-            ln -- The module length. Defaults to 1.
-        """
-
-        self.val = val
-        self.cur = 0
-        self.no_tails = True
-        self.len = ln
-
-    def step(self, delta, const=-1):
-        if(const >= 0 or const == DELTA or const == ADJUST):
-            self.cur += delta
-
-    def step_tails(self, delta, const=-1):
-        self.step(delta, const)
-
-    # 'tails' here is irrelevant; search for "no_tails" property to avoid doubling
-    def read(self,tails=False,stereo=True,signal=True):
-        if(stereo):
-            return self.val
-        else:
-            return self.val[0]
-
-    def reset(self):
-        self.cur = 0
-
-    def clear(self):
-        self.cur = 0
-
-    def done(self):
-        return self.cur >= self.len
-
-    def has_tails(self):
-        return False
-    
-    def get_extra(self):
-        if(self.done()):
-            return self.cur-self.len
-        else:
-            return 0
-
-    def clone(self):
-        tmp = StereoVal(self.val, self.len)
-        tmp.cur = self.cur
-        return tmp
-
-    def length(self):
-        return self.len
-
-    #def set_freq(self, freq):
-    #    pass
-    def set_pitch(self, pitch):
-        pass
-
-class Pattern(SCModule):
-    """ Represents a sequence of modules, to be played one after the other.
-
-        This differs from Series in that Pattern plays through each of its
-        modules before finishing. Series plays through its current module,
-        finishes, then plays the next one after reset().
-
-        Accordingly, the length of Pattern is the sum of the lengths of its
-        modules.
-    """
-
-    def __init__(self, pat=(Val(0),Val(1))):
-        """ Initializer
-
-            Arguments:
-            pat -- The pattern, as a list of Modules.
-        """
-
-        self.pat = pat
-        self.curInx = 0
-        self.extra = 0
-
-    def step(self, delta, const=-1):
-        if(not self.done()):
-            self.pat[self.curInx].step(delta, const)
-            while(not self.done() and self.pat[self.curInx].done()):
-                self.extra = self.pat[self.curInx].get_extra()
-                self.pat[self.curInx].reset()
-                self.curInx += 1
-                if(not self.done()):
-                    self.pat[self.curInx].step(self.extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        if(tails):
-            if(stereo):
-                cur = None
-                if(self.curInx < len(self.pat)):
-                    cur = self.pat[self.curInx]
-                sum = [0,0]
-                for mdl in self.pat:
-                    if(mdl != cur and getattr(mdl, "no_tails", None) == None):
-                        val = mdl.read(tails,stereo,signal)
-                        sum[0] += val[0]
-                        sum[1] += val[1]
-                    elif(mdl == cur):
-                        val = mdl.read(tails,stereo,signal)
-                        sum[0] += val[0]
-                        sum[1] += val[1]
-                return sum
-            else:
-                cur = None
-                if(self.curInx < len(self.pat)):
-                    cur = self.pat[self.curInx]
-                sum = 0
-                for mdl in self.pat:
-                    if(mdl != cur and getattr(mdl, "no_tails", None) == None):
-                        sum += mdl.read(tails,stereo,signal)
-                    elif(mdl == cur):
-                        sum += mdl.read(tails,stereo,signal)
-                return sum
-        else:
-            if(not self.done()):
-                return self.pat[self.curInx].read(tails,stereo,signal)
-            else:
-                if(stereo):
-                    return [0,0]
-                else:
-                    return 0
-
-    def step_tails(self, delta, const=-1):
-        for mdl in self.pat:
-            mdl.step_tails(delta, const)
-
-    def reset(self):
-        if(not self.done()):
-            self.pat[self.curInx].reset()
-        self.curInx = 0
-
-    def clear(self):
-        self.curInx = 0
-        for p in self.pat:
-            p.clear()
-
-    def done(self):
-        return self.curInx>=len(self.pat)
-
-    def has_tails(self):
-        for m in self.pat:
-            if(m.has_tails()):
-                return True
-        return False
-    
-    def get_extra(self):
-        if(self.done()):
-            return self.extra
-        else:
-            return 0
-
-    def clone(self):
-        pt = []
-        for p in self.pat:
-            pt.append(p.clone())
-        tmp = Pattern(pt)
-        tmp.curInx = self.curInx
-        tmp.extra = self.extra
-        return tmp
-
-    def length(self):
-        sum = 0
-        for p in self.pat:
-            sum += p.length()
-        return sum
-
-    #def set_freq(self, freq):
-    #    for p in self.pat:
-    #        p.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        for p in self.pat:
-            p.set_pitch(pitch)
-
-class Set(SCModule):
-    """ Module for selecting random modules from a set.
-
-        Each time Set is reset (or initialized), a random module is selected,
-        and it will be played the next time through.
-
-        Note: If the modules in the Set have differing lengths, Set.length()
-        will yield unpredictable results. Generally, this is not a problem,
-        but it may cause some unexpected behavior (i.e., the progress bar
-        might exceed 100%).
-    """
-
-    def __init__(self, set=[Val(0)]):
-        self.set = set
-        self.curMod = random.choice(self.set)
-
-    def step(self, delta, const=-1):
-        self.curMod.step(delta, const)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        if(tails):
-            if(stereo):
-                sum = [0,0]
-                for mdl in self.set:
-                    if(mdl != self.curMod and getattr(mdl, "no_tails", None) == None):
-                        val = mdl.read(tails,stereo,signal)
-                        sum[0] += val[0]
-                        sum[1] += val[1]
-                    elif(mdl == self.curMod):
-                        val = mdl.read(tails,stereo,signal)
-                        sum[0] += val[0]
-                        sum[1] += val[1]
-                return sum
-            else:
-                sum = 0
-                for mdl in self.set:
-                    if(mdl != self.curMod and getattr(mdl, "no_tails", None) == None):
-                        sum += mdl.read(tails,stereo,signal)
-                    elif(mdl == self.curMod):
-                        sum += mdl.read(tails,stereo,signal)
-                return sum
-        else:
-            return self.curMod.read(tails,stereo,signal)
-
-    def step_tails(self, delta, const=-1):
-        for mdl in self.set:
-            mdl.step_tails(delta, const)
-
-    def reset(self):
-        self.curMod.reset()
-        self.curMod = random.choice(self.set)
-
-    def clear(self):
-        for m in self.set:
-            m.clear()
-        self.curMod = random.choice(self.set)
-
-    def done(self):
-        return self.curMod.done()
-
-    def has_tails(self):
-        for m in self.set:
-            if(m.has_tails()):
-                return True
-        return False
-    
-    def get_extra(self):
-        return self.curMod.get_extra()
-
-    def clone(self):
-        st = []
-        for s in self.set:
-            st.append(s.clone())
-        tmp = Set(st)
-        tmp.curMod = tmp.set[self.set.index(self.curMod)]
-        return tmp
-
-    def length(self):
-        return self.curMod.length()
-
-    #def set_freq(self, freq):
-    #    for m in self.set:
-    #        m.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        for m in self.set:
-            m.set_pitch(pitch)
-
-class Series(SCModule):
-    """ Module for playing a series of modules as part of a longer pattern.
-
-        Series differs from Pattern in that Series plays modules one at a time--
-        when the current module is finished, Series is done(), and SC moves on.
-        Each time Series is reset, it moves on to the next module in the
-        sequence.
-
-        Note: clear() will fully reset Series, setting the first module to
-        current. Also, different clones of Series operate independently, which
-        means that Series might not work as planned in some situations.
-        Generally, if you have to reference the module containing Series multiple
-        times in the SC code, it won't work properly. Try rephrasing it to use
-        Repeat instead, if possible.
-    """
-    def __init__(self, srs=[Val(0)]):
-        self.srs = srs
-        self.curInx = 0
-
-    def step(self, delta, const=-1):
-        self.srs[self.curInx].step(delta, const)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        if(tails):
-            if(stereo):
-                cur = self.srs[self.curInx]
-                sum = [0,0]
-                for mdl in self.srs:
-                    if(mdl != cur and getattr(mdl, "no_tails", None) == None):
-                        val = mdl.read(tails,stereo,signal)
-                        sum[0] += val[0]
-                        sum[1] += val[1]
-                    elif(mdl == cur):
-                        val = mdl.read(tails,stereo,signal)
-                        sum[0] += val[0]
-                        sum[1] += val[1]
-                return sum
-            else:
-                cur = self.srs[self.curInx]
-                sum = 0
-                for mdl in self.srs:
-                    if(mdl != cur and getattr(mdl, "no_tails", None) == None):
-                        sum += mdl.read(tails,stereo,signal)
-                    elif(mdl == cur):
-                        sum += mdl.read(tails,stereo,signal)
-                return sum
-        else:
-            if(self.srs[self.curInx].done()):
-                # This section probably should never happen -- should we just return 0?
-                extra = self.srs[self.curInx].get_extra()
-                self.srs[self.curInx].reset()
-                self.srs[self.curInx].step(extra,ADJUST)
-            return self.srs[self.curInx].read(tails,stereo,signal)
-
-    def step_tails(self, delta, const=-1):
-        for mdl in self.srs:
-            mdl.step_tails(delta, const)
-
-    def reset(self):
-        self.srs[self.curInx].reset()
-        self.curInx += 1
-        if(self.curInx >= len(self.srs)):
-            self.curInx = 0
-
-    def clear(self):
-        self.curInx = 0
-        for m in self.srs:
-            m.clear()
-
-    def done(self):
-        return self.srs[self.curInx].done()
-
-    def has_tails(self):
-        for m in self.srs:
-            if(m.has_tails()):
-                return True
-        return False
-    
-    def get_extra(self):
-        return self.srs[self.curInx].get_extra()
-
-    def clone(self):
-        sr = []
-        for s in self.srs:
-            sr.append(s.clone())
-        tmp = Series(sr)
-        tmp.curInx = self.curInx
-        return tmp
-
-    def length(self):
-        return self.srs[self.curInx].length()
-
-    #def set_freq(self, freq):
-    #    for s in self.srs:
-    #        s.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        for s in self.srs:
-            s.set_pitch(pitch)
-
-class Invert(SCModule):
-    """ Module for negation.
-
-        Multiplies all output by -1.
-    """
-
-    def __init__(self, mdl):
-        """ Initializer.
-
-            Arguments:
-            mdl -- The module to negate.
-        """
-
-        self.mdl = mdl
-
-    def step(self, delta, const=-1):
-        self.mdl.step(delta, const)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        val = self.mdl.read(tails,stereo,signal)
-        if(stereo):
-            return [-val[0],-val[1]]
-        else:
-            return -val
-
-    def step_tails(self, delta, const=-1):
-        self.mdl.step_tails(delta, const)
-
-    def reset(self):
-        self.mdl.reset()
-
-    def clear(self):
-        self.mdl.clear()
-
-    def done(self):
-        return self.mdl.done()
-
-    def has_tails(self):
-        return self.mdl.has_tails()
-    
-    def get_extra(self):
-        return self.mdl.get_extra()
-
-    def clone(self):
-        return Invert(self.mdl.clone())
-
-    def length(self):
-        return self.mdl.length()
-
-    #def set_freq(self, freq):
-    #    self.mdl.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.mdl.set_pitch(pitch)
-
-class AbsVal(SCModule):
-    """ Module for absolute value.
-
-    """
-
-    def __init__(self, mdl):
-        """ Initializer.
-
-            Arguments:
-            mdl -- Input module.
-        """
-
-        self.mdl = mdl
-
-    def step(self, delta, const=-1):
-        self.mdl.step(delta, const)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        val = self.mdl.read(tails,stereo,signal)
-        if(stereo):
-            return [abs(val[0]),abs(val[1])]
-        else:
-            return abs(val)
-
-    def step_tails(self, delta, const=-1):
-        self.mdl.step_tails(delta, const)
-
-    def reset(self):
-        self.mdl.reset()
-
-    def clear(self):
-        self.mdl.clear()
-
-    def done(self):
-        return self.mdl.done()
-
-    def has_tails(self):
-        return self.mdl.has_tails()
-
-    def get_extra(self):
-        return self.mdl.get_extra()
-
-    def clone(self):
-        return AbsVal(self.mdl.clone())
-
-    def length(self):
-        return self.mdl.length()
-
-    #def set_freq(self, freq):
-    #    self.mdl.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.mdl.set_pitch(pitch)
-
-class Level(SCModule):
-    """ Module for setting the volume of a module.
-
-        This uses signal values, so 9 is max volume; 0 is silence. Negative
-        level values will similarly invert the output.
-    """
-
-    def __init__(self, mdl, env, alead=True):
-        """ Initializer.
-
-            Arguments:
-            mdl -- The input module.
-            env -- The volume level module.
-            alead -- If true, we stop when mdl stops; otherwise, when env stops.
-        """
-
-        self.a = mdl
-        self.b = env
-        self.a_lead = alead
-
-    def step(self, delta, const=-1):
-        self.a.step(delta, const)
-        self.b.step(delta, const)
-        if(self.a_lead):
-            if(self.b.done() and not self.a.done()):
-                extra = self.b.get_extra()
-                self.b.reset()
-                self.b.step(extra,ADJUST)
-        else:
-            if(self.a.done() and not self.b.done()):
-                extra = self.a.get_extra()
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        valA = self.a.read(tails,stereo,signal)
-        valB = self.b.read(False,stereo,True)
-        if(stereo):
-            return [valA[0]*as_decimal(valB[0]),valA[1]*as_decimal(valB[1])]
-        else:
-            return valA*as_decimal(valB)
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta,const)
-        self.b.step_tails(delta,const)
-
-    def reset(self):
-        self.a.reset()
-        self.b.reset()
-
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-
-    def done(self):
-        if(self.a_lead):
-            return self.a.done()
-        else:
-            return self.b.done()
-
-    def has_tails(self):
-        return self.a.has_tails()
-        
-    def get_extra(self):
-        if(self.a_lead):
-            return self.a.get_extra()
-        else:
-            return self.b.get_extra()
-
-    def length(self):
-        if(self.a_lead):
-            return self.a.length()
-        else:
-            return self.b.length()
-
-    def clone(self):
-        return Level(self.a.clone(), self.b.clone(), self.a_lead)
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Envelope(SCModule):
-    """ Volume envelope module.
-
-        This is similar to Level, except the volume module runs in constant
-        time, based on song steps. This lets you create an envelope that
-        doesn't vary based on Instrument pitch.
-
-        Like Level, this uses signal values, so 9 is max volume, 0 is silence.
-        Negative values will similarly invert the output.
-    """
-
-    def __init__(self, mdl, env, rate=1, loop=False, atk=0, rels=-1):
-        """ Initializer.
-
-            Arguments:
-            mdl -- The input module.
-            env -- The envelope module.
-            rate -- Playback rate for the envelope module. 1 is in time with
-                    song steps; 2 is twice as fast; 0.5 half, etc.
-            loop -- Whether to loop when the volume module is finished.
-            atk  -- The attack marker, used when looping.
-            rels -- The release point, in song steps. Will loop up to this
-                    point until STOP, then will play through. -1 for no release.
-        """
-
-        self.a = mdl
-        self.b = env
-        # so you don't have to spend an hour searching in the future --
-        # the reason Const does rate/frameslice & Envelope does just rate
-        # is that we actually are setting the rate in the parser
-        # (don't ask me why though)
-        self.rate = rate
-        self.loop = loop
-        self.attack = atk
-        self.release = rels
-        self.cur = 0
-        self.stopped = False
-
-    def step(self, delta, const=-1):
-        if(const == STOP or const == RELEASE):
-            self.a.step(0,const)
-            self.b.step(0,const)
-            self.stopped = True
-        elif(const == ADJUST):
-            self.cur += delta
-            self.b.step(delta, const)
-        else:
-            if(const == DELTA):
-                const = delta
-            self.a.step(delta, const)
-            self.b.step(const*self.rate, const)
-
-            self.cur += const*self.rate
-            # If a release point is set, we will loop at it until STOP, then play through
-            if(self.release > 0):
-                if(not self.stopped and self.cur >= self.release):
-                    self.cur %= self.release
-                    self.cur += self.attack
-                    self.b.reset()
-                    self.b.step(self.cur,ADJUST)
-
-            if(self.a.done()):
-                extra = self.a.get_extra()
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-            if(self.loop and self.b.done()):
-                extra = self.b.get_extra()
-                extra += self.attack
-                self.b.reset()
-                self.b.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        if(stereo):
-            valA = self.a.read(tails,stereo,signal)
-            valB = self.b.read(False,stereo,True)
-            return [valA[0]*as_decimal(valB[0]),valA[1]*as_decimal(valB[1])]
-        else:
-            return self.a.read(tails,stereo,signal)*as_decimal(self.b.read(False,stereo,True))
-
-    def step_tails(self, delta, const=-1):
-        if(const == DELTA):
-            const = delta
-        self.a.step_tails(delta,const)
-        self.b.step_tails(const*self.rate, const)
-
-    def reset(self):
-        #if(self.loop):
-        #    self.a.reset()
-        #    self.b.reset()
-        #    self.b.step(self.attack,ADJUST)
-        #    self.cur = self.attack
-        self.a.reset()
-        self.b.reset()
-        self.b.step(self.attack,ADJUST)
-        self.cur = self.attack
-        
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-        self.cur = 0
-        self.stopped = False
-
-    def done(self):
-        return self.b.done()
-
-    def has_tails(self):
-        return self.a.has_tails()
-
-    def get_extra(self):
-        return self.b.get_extra()#/self.rate
-
-    def length(self):
-        return self.b.length()/self.rate
-
-    def clone(self):
-        tmp = Envelope(self.a.clone(), self.b.clone(), self.rate, self.loop, self.attack, self.release)
-        tmp.stopped = self.stopped
-        tmp.cur = self.cur
-        return tmp
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Const(SCModule):
-    """ Plays a module in constant time, based on song steps.
-
-    """
-
-    def __init__(self, mdl, frameslice, rate=1, loop=False, atk=0, rels=-1):
-        """ Initializer.
-
-            Arguments:
-            mdl -- Input module.
-            frameslice -- Ratio between song steps and samples (I think...
-                    anyway, this should be SynthCorona.frameslice)
-            rate -- Playback rate. 1 is in time with song steps; 2 is twice as
-                    fast; 0.5 half, etc.
-            loop -- Whether to loop the module once it's finished.
-            atk -- Attack point (for looping).
-            rels -- Release point (for looping). -1 for no release point.
-        """
-
-        self.mdl = mdl
-        self.rate = rate*frameslice
-        self.frameslice = frameslice
-        self.loop = loop
-        self.attack = atk
-        self.release = rels
-        self.cur = 0
-        self.stopped = False
-
-    def step(self, delta, const=-1):
-        if(const == STOP or const == RELEASE):
-            self.mdl.step(0,const)
-            self.stopped = True
-        elif(const == ADJUST):
-            self.cur += delta
-            self.mdl.step(delta, ADJUST)
-        else:
-            if(const == DELTA):
-                const = delta
-            self.mdl.step(const*self.rate,const)
-
-            self.cur += const*self.rate
-            if(self.release > 0):
-                if(not self.stopped and self.cur >= self.release):
-                    self.cur %= self.release
-                    self.cur += self.attack
-                    self.mdl.reset()
-                    self.mdl.step(self.cur,ADJUST)
-
-            if(self.loop and self.mdl.done() and not self.stopped):
-                extra = self.mdl.get_extra()
-                extra += self.attack
-                self.mdl.reset()
-                self.mdl.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        return self.mdl.read(tails,stereo,signal)
-
-    def step_tails(self, delta, const=DELTA):
-        if(const == DELTA):
-            const = delta
-        self.mdl.step_tails(const*self.rate,const)
-
-    def reset(self):
-        #if(self.loop):
-        #    self.mdl.reset()
-        #    self.mdl.step(self.attack,ADJUST)
-        #    self.cur = self.attack
-        # making loop auto-loop only...
-        self.mdl.reset()
-        self.mdl.step(self.attack,ADJUST)
-        self.cur = self.attack
-
-    def clear(self):
-        self.mdl.clear()
-        self.cur = 0
-        self.stopped = False
-
-    def done(self):
-        return self.mdl.done()
-
-    def has_tails(self):
-        return self.mdl.has_tails()
-
-    def get_extra(self):
-        return self.mdl.get_extra()#/self.rate
-
-    def length(self):
-        return self.mdl.length()/self.rate
-
-    def clone(self):
-        tmp = Const(self.mdl.clone(), 1, 1, self.loop, self.attack, self.release)
-        tmp.rate = self.rate
-        tmp.frameslice = self.frameslice
-        tmp.cur = self.cur
-        tmp.stopped = self.stopped
-        return tmp
-
-    #def set_freq(self, freq):
-    #    self.mdl.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.mdl.set_pitch(pitch)
-
-class Speed(SCModule):
-    """ Module for changing playback rate.
-
-        This module modifies both delta and const in step(), so it DOES affect
-        pitch when applied to Inst. However, I have done some witchcraft so if
-        you apply Speed to a Sequence module, it will not be passed down to
-        Insts, so pitch will not be affected.
-    """
-
-    def __init__(self, mdl, rate=Val(1), alead=True):
-        """ Initializer.
-
-            Arguments:
-            mdl -- Input module.
-            rate -- Playback rate module.
-            alead -- If true, we stop when mdl stops; otherwise, when rate stops.
-        """
-
-        self.mdl = mdl
-        self.rate = rate
-        self.a_lead = alead
-
-    def step(self, delta, const=-1):
-        if(const >= 0):
-            self.mdl.step(delta*self.rate.read(stereo=False,signal=False),const*self.rate.read(stereo=False,signal=False))
-        elif(const == DELTA):
-            self.mdl.step(delta*self.rate.read(stereo=False,signal=False),delta*self.rate.read(stereo=False,signal=False))
-        elif(const == STOP or const == RELEASE):
-            self.mdl.step(0,const)
-        elif(const == ADJUST):
-            self.mdl.step(delta, const)
-        self.rate.step(delta,const)
-        if(self.a_lead):
-            if(self.rate.done()):
-                extra = self.rate.get_extra()
-                self.rate.reset()
-                self.rate.step(extra, ADJUST)
-        else:
-            if(self.mdl.done()):
-                extra = self.mdl.get_extra()
-                self.mdl.reset()
-                self.mdl.step(extra, ADJUST)
-
-    def read(self, tails=False,stereo=True,signal=True):
-        return self.mdl.read(tails,stereo,signal)
-
-    def step_tails(self, delta, const=-1):
-        if(const < 0):
-            const = delta
-        self.mdl.step_tails(delta*self.rate.read(stereo=False,signal=False),const*self.rate.read(stereo=False,signal=False))
-
-    def reset(self):
-        self.mdl.reset()
-        self.rate.reset()
-
-    def clear(self):
-        self.mdl.clear()
-        self.rate.clear()
-
-    def done(self):
-        if(self.a_lead):
-            return self.mdl.done()
-        else:
-            return self.rate.done()
-
-    def has_tails(self):
-        return self.mdl.has_tails()
-
-    def get_extra(self):
-        if(self.a_lead):
-            return self.mdl.get_extra()
-        else:
-            return self.rate.get_extra()
-
-    def length(self):
-        if(self.a_lead):
-            rt = self.rate.read(stereo=False,signal=False)
-            if(rt == 0):
-                rt = 0.0000000001
-            return self.mdl.length()/rt
-        else:
-            return self.rate.length()
-
-    def clone(self):
-        return Speed(self.mdl.clone(), self.rate.clone(), self.a_lead)
-
-    #def set_freq(self, freq):
-    #    self.mdl.set_freq(freq)
-    #    self.rate.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.mdl.set_pitch(pitch)
-        self.rate.set_pitch(pitch)
-
-class LinInterp(SCModule):
-    """ Module for linear interpolation between two modules.
-
-        Both modules are updated for the duration. Their outputs are blended
-        based on how far we are through the LinInterp width.
-    """
-
-    def __init__(self, a, b, wid=Val(1)):
-        """ Initializer.
-
-            Arguments:
-            a -- The start module.
-            b -- The end module.
-            wid -- Interpolation width (length).
-        """
-
-        self.a = a
-        self.b = b
-        self.width = wid
-        self.cur = 0
-        self.no_tails = True
-        self.last_width = self.width.read(False,False,False)
-
-    def step(self, delta, const=-1):
-        if(const != STOP and const != RELEASE):
-            self.cur += delta
-        self.width.step(delta,const)
-        if(self.width.done() and not self.done()):
-            extra = self.width.get_extra()
-            self.width.reset()
-            self.width.step(extra,ADJUST)
-        self.a.step(delta,const)
-        if(self.a.done() and not self.done()):
-            extra = self.a.get_extra()
-            self.a.reset()
-            self.a.step(extra,ADJUST)
-        self.b.step(delta,const)
-        if(self.b.done() and not self.done()):
-            extra = self.b.get_extra()
-            self.b.reset()
-            self.b.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        self.last_width = self.width.read(False,False,signal)
-        pct = self.cur / self.last_width
-        valA = self.a.read(tails,stereo,signal)
-        valB = self.b.read(tails,stereo,signal)
-        if(stereo):
-            return [valA[0]*(1-pct)+valB[0]*pct,valA[1]*(1-pct)+valB[1]*pct]
-        else:
-            return valA*(1-pct)+valB*pct
-
-    def step_tails(self, delta, const=-1):
-        self.width.step_tails(delta, const)
-        self.a.step_tails(delta, const)
-        self.b.step_tails(delta, const)
-
-    def reset(self):
-        self.cur = 0
-        #self.width.reset()
-        self.a.reset()
-        self.b.reset()
-
-    def clear(self):
-        self.cur = 0
-        self.width.clear()
-        self.a.clear()
-        self.b.clear()
-
-    def done(self):
-        return self.cur >= self.last_width
-
-    def has_tails(self):
-        return False
-    
-    def get_extra(self):
-        if(self.done()):
-            return self.cur-self.last_width
-        else:
-            return 0
-
-    def clone(self):
-        tmp = LinInterp(self.a.clone(), self.b.clone(), self.width.clone())
-        tmp.cur = self.cur
-        return tmp
-
-    def length(self):
-        return self.last_width
-
-    #def set_freq(self, freq):
-    #    self.width.set_freq(freq)
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.width.set_pitch(pitch)
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Multiply(SCModule):
-    """ Module that multiplies two inputs together.
-    """
-
-    def __init__(self, a, b, alead=True):
-        """ Initializer.
-
-            Arguments:
-            a -- Input A
-            b -- Input B
-            alead -- If true, we stop when A stops; otherwise when B stops.
-        """
-
-        self.a = a
-        self.b = b
-        self.a_lead = alead
-
-    def step(self, delta, const=-1):
-        self.a.step(delta, const)
-        self.b.step(delta, const)
-        if(self.a_lead):
-            if(self.b.done() and not self.a.done()):
-                extra = self.b.get_extra()
-                self.b.reset()
-                self.b.step(extra,ADJUST)
-        else:
-            if(self.a.done() and not self.b.done()):
-                extra = self.a.get_extra()
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        valA = self.a.read(tails,stereo,signal)
-        valB = self.b.read(tails,stereo,False)
-        if(stereo):
-            return [valA[0]*valB[0],valA[1]*valB[1]]
-        else:
-            return valA * valB
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta,const)
-        self.b.step_tails(delta,const)
-
-    def reset(self):
-        self.a.reset()
-        self.b.reset()
-
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-
-    def done(self):
-        if(self.a_lead):
-            return self.a.done()
-        else:
-            return self.b.done()
-
-    def has_tails(self):
-        return self.a.has_tails() or self.b.has_tails()
-        
-    def get_extra(self):
-        if(self.a_lead):
-            return self.a.get_extra()
-        else:
-            return self.b.get_extra()
-
-    def clone(self):
-        return Multiply(self.a.clone(), self.b.clone(), self.a_lead)
-
-    def length(self):
-        if(self.a_lead):
-            return self.a.length()
-        else:
-            return self.b.length()
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Divide(SCModule):
-    """ Module that divides two inputs.
-    """
-
-    def __init__(self, a, b, alead=True):
-        """ Initializer.
-
-            Arguments:
-            a -- Input A.
-            b -- Input B.
-            alead -- If true, we stop when A stops; otherwise, when B stops.
-        """
-        self.a = a
-        self.b = b
-        self.a_lead = alead
-
-    def step(self, delta, const=-1):
-        self.a.step(delta, const)
-        self.b.step(delta, const)
-        if(self.a_lead):
-            if(self.b.done() and not self.a.done()):
-                extra = self.b.get_extra()
-                self.b.reset()
-                self.b.step(extra,ADJUST)
-        else:
-            if(self.a.done() and not self.b.done()):
-                extra = self.a.get_extra()
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        valA = self.a.read(tails,stereo,signal)
-        valB = self.b.read(tails,stereo,False)
-        if(stereo):
-            return [valA[0]/valB[0],valA[1]/valB[1]]
-        else:
-            return valA/valB
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta,const)
-        self.b.step_tails(delta,const)
-
-    def reset(self):
-        self.a.reset()
-        self.b.reset()
-
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-
-    def done(self):
-        if(self.a_lead):
-            return self.a.done()
-        else:
-            return self.b.done()
-
-    def has_tails(self):
-        return self.a.has_tails() or self.b.has_tails()
-        
-    def get_extra(self):
-        if(self.a_lead):
-            return self.a.get_extra()
-        else:
-            return self.b.get_extra()
-
-    def clone(self):
-        return Divide(self.a.clone(), self.b.clone(), self.a_lead)
-
-    def length(self):
-        return lcm(self.a.length(), self.b.length())
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Add(SCModule):
-    """ Module that adds two inputs.
-    """
-
-    def __init__(self, a, b, alead=True):
-        """ Initializer.
-
-            Arguments:
-            a -- Input A.
-            b -- Input B.
-            alead -- If true, we stop when A stops; otherwise, when B stops.
-        """
-
-        self.a = a
-        self.b = b
-        self.a_lead = alead
-
-    def step(self, delta, const=-1):
-        self.a.step(delta, const)
-        self.b.step(delta, const)
-        if(self.a_lead):
-            if(self.b.done() and not self.a.done()):
-                extra = self.b.get_extra()
-                self.b.reset()
-                self.b.step(extra,ADJUST)
-        else:
-            if(self.a.done() and not self.b.done()):
-                extra = self.a.get_extra()
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        valA = self.a.read(tails,stereo,signal)
-        valB = self.b.read(tails,stereo,signal)
-        if(stereo):
-            return [valA[0]+valB[0],valA[1]+valB[1]]
-        else:
-            return valA+valB
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta,const)
-        self.b.step_tails(delta,const)
-
-    def reset(self):
-        self.a.reset()
-        self.b.reset()
-
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-
-    def done(self):
-        if(self.a_lead):
-            return self.a.done()
-        else:
-            return self.b.done()
-
-    def has_tails(self):
-        return self.a.has_tails() or self.b.has_tails()
-        
-    def get_extra(self):
-        if(self.a_lead):
-            return self.a.get_extra()
-        else:
-            return self.b.get_extra()
-
-    def clone(self):
-        return Add(self.a.clone(), self.b.clone(), self.a_lead)
-
-    def length(self):
-        if(self.a_lead):
-            return self.a.length()
-        else:
-            return self.b.length()
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Subtract(SCModule):
-    """ Module that subtracts two inputs.
-    """
-
-    def __init__(self, a, b, alead=True):
-        """ Initializer.
-
-            Arguments:
-            a -- Input A.
-            b -- Input B.
-            alead -- If true, we stop when A stops; otherwise, when B stops.
-        """
-
-        self.a = a
-        self.b = b
-        self.a_lead = alead
-
-    def step(self, delta, const=-1):
-        self.a.step(delta, const)
-        self.b.step(delta, const)
-        if(self.a_lead):
-            if(self.b.done() and not self.a.done()):
-                extra = self.b.get_extra()
-                self.b.reset()
-                self.b.step(extra,ADJUST)
-        else:
-            if(self.a.done() and not self.b.done()):
-                extra = self.a.get_extra()
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        valA = self.a.read(tails,stereo,signal)
-        valB = self.b.read(tails,stereo,signal)
-        if(stereo):
-            return [valA[0]-valB[0],valA[1]-valB[1]]
-        else:
-            return valA-valB
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta,const)
-        self.b.step_tails(delta,const)
-
-    def reset(self):
-        self.a.reset()
-        self.b.reset()
-
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-
-    def done(self):
-        if(self.a_lead):
-            return self.a.done()
-        else:
-            return self.b.done()
-
-    def has_tails(self):
-        return self.a.has_tails() or self.b.has_tails()
-
-    def get_extra(self):
-        if(self.a_lead):
-            return self.a.get_extra()
-        else:
-            return self.b.get_extra()
-
-    def clone(self):
-        return Subtract(self.a.clone(), self.b.clone(), self.a_lead)
-
-    def length(self):
-        if(self.a_lead):
-            return self.a.length()
-        else:
-            return self.b.length()
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Modulus(SCModule):
-    """ Module that performs modulus on two inputs.
-    """
-
-    def __init__(self, a, b, alead=True):
-        """ Initializer.
-
-            Arguments:
-            a -- Input A, the numerator.
-            b -- Input B, the denominator.
-            alead -- If true, we stop when A stops; otherwise, when B stops.
-        """
-
-        self.a = a
-        self.b = b
-        self.a_lead = alead
-
-    def step(self, delta, const=-1):
-        self.a.step(delta, const)
-        self.b.step(delta, const)
-        if(self.a_lead):
-            if(self.b.done() and not self.a.done()):
-                extra = self.b.get_extra()
-                self.b.reset()
-                self.b.step(extra,ADJUST)
-        else:
-            if(self.a.done() and not self.b.done()):
-                extra = self.a.get_extra()
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        valA = self.a.read(tails,stereo,signal)
-        valB = self.b.read(tails,stereo,signal)
-        if(stereo):
-            return [valA[0]%valB[0],valA[1]%valB[1]]
-        else:
-            return valA%valB
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta,const)
-        self.b.step_tails(delta,const)
-
-    def reset(self):
-        self.a.reset()
-        self.b.reset()
-
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-
-    def done(self):
-        if(self.a_lead):
-            return self.a.done()
-        else:
-            return self.b.done()
-
-    def has_tails(self):
-        return self.a.has_tails() or self.b.has_tails()
-
-    def get_extra(self):
-        if(self.a_lead):
-            return self.a.get_extra()
-        else:
-            return self.b.get_extra()
-
-    def clone(self):
-        return Modulus(self.a.clone(), self.b.clone(), self.a_lead)
-
-    def length(self):
-        if(self.a_lead):
-            return self.a.length()
-        else:
-            return self.b.length()
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Repeat(SCModule):
-    """ Module that loops an input a given number of times.
-    """
-
-    def __init__(self, mdl, x, atk=0, rels=-1):
-        """ Initializer.
-
-            Arguments:
-            mdl -- Input module.
-            x -- The number of times to repeat.
-            atk -- The attack point (before this will only be played initially)
-            rels -- The release point (after this will only play on the last round, or after RELEASE/STOP; -1 for no release point)
-        """
-
-        self.a = mdl
-        self.b = x
-        self.resets = 1
-        self.attack = atk
-        self.release = rels
-        self.cur = 0
-        self.stopped = False
-
-    def step(self, delta, const=-1):
-        self.a.step(delta, const)
-        self.b.step(delta, const)
-        self.cur += delta
-        if(const == STOP or const == RELEASE):
-            self.stopped = True
-
-        if(self.b.done() and not self.done()):
-            extra = self.b.get_extra()
-            self.b.reset()
-            self.b.step(extra,ADJUST)
-
-        reps = self.b.read(tails=False,stereo=False,signal=False)
-        if(self.release > 0):
-            while((not self.stopped and (reps < 0 or self.resets < reps)) and self.cur >= self.release):
-                self.cur %= self.release
-                self.cur += self.attack
-                self.a.reset()
-                self.a.step(self.cur,ADJUST)
-                self.resets += 1
-        while(self.a.done() and (reps < 0 or self.resets < reps)):
-            extra = self.a.get_extra()
-            extra += self.attack
-            self.cur = extra
-            self.a.reset()
-            self.a.step(extra,ADJUST)
-            self.resets += 1
-
-    def read(self,tails=False,stereo=True,signal=True):
-        return self.a.read(tails,stereo,signal)
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta,const)
-
-    def reset(self):
-        self.a.reset()
-        self.a.step(self.attack,ADJUST)
-        self.resets = 1
-        self.cur = self.attack
-
-    def clear(self):
-        self.a.clear()
-        self.resets = 1
-        self.cur = 0
-        self.stopped = False
-
-    def done(self):
-        return self.a.done()
-
-    def has_tails(self):
-        return self.a.has_tails()
-
-    def get_extra(self):
-        return self.a.get_extra()
-
-    def clone(self):
-        tmp = Repeat(self.a.clone(), self.b.clone(), self.attack, self.release)
-        tmp.resets = self.resets
-        tmp.cur = self.cur
-        tmp.stopped = self.stopped
-        return tmp
-
-    def length(self):
-        if(self.b.read(stereo=False,signal=False)<0):
-            return 9999999999999
-        else:
-            return self.a.length()*self.b.read(stereo=False,signal=False)
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Cross(SCModule):
-    """ Module for "crossing" a binary operation.
-
-        Normal binary operators run both operand modules (A and B)
-        simultaneously. Cross operations slow down the B module so that A
-        completes a full cycle for each step of B. In a sense, we compute
-        "all of A for each of B".
-
-        Here's an example:
-        Consider [1,2,3,4]*[1,0] --
-        Regularly, our output is [1*1,2*0,3*1,4*0] = [1,0,3,0]
-        If we take the cross of this, [1,2,3,4]x*[1,0] --
-        We get [1*1,2*1,3*1,4*1,1*0,2*0,3*0,4*0] = [1,2,3,4, 0,0,0,0]
-    """
-
-    def __init__(self, mdl):
-        """ Initializer.
-
-            Arguments:
-            mdl -- Input module. Must be a binary operation.
-        """
-        if(hasattr(mdl, "a") and hasattr(mdl, "b")):
-            self.op = mdl
-        else:
-            raise SCParseError("Invalid Operator for Cross module.",line)
-            self.op = mdl
-        self.acount = 1
-        self.bstep = -1
-        self.cur = 0
-        self.len = self.op.a.length()*self.op.b.length()
-
-    def step(self, delta, const=-1):
-        if(self.bstep < 0):
-            self.bstep = 1/(self.op.a.length())
-            self.len = self.op.a.length() * self.op.b.length()
-        self.op.a.step(delta,const)
-        self.acount -= delta*self.bstep
-        if(self.op.a.done() or self.acount > 0):
-            self.op.b.step(delta*self.bstep,const)
-            if(self.op.a.done() and not self.done()):
-                extra = self.op.a.get_extra()
-                self.op.a.reset()
-                self.op.a.step(extra,ADJUST)
-                self.bstep = 1/self.op.a.length()
-                self.len = self.op.a.length()*self.op.b.length()
-                self.acount = 1
-        else:
-            extra = -self.acount * self.op.a.length()
-            self.op.b.step(delta*self.bstep,const)
-            self.op.a.reset()
-            self.op.a.step(extra,ADJUST)
-            self.bstep = 1/self.op.a.length()
-            self.len = self.op.a.length() * self.op.b.length()
-            self.acount += 1
-        self.cur += delta
-
-    def read(self,tails=False,stereo=True,signal=True):
-        return self.op.read(tails,stereo,signal)
-
-    def step_tails(self, delta, const=-1):
-        self.op.a.step_tails(delta,const)
-        self.op.b.step_tails(delta*self.bstep,const)
-
-    def reset(self):
-        self.op.reset()
-        self.cur = 0
-        self.acount = 1
-        self.bstep = 1/(self.op.a.length())
-        self.len = self.op.a.length()*self.op.b.length()
-
-    def clear(self):
-        self.op.clear()
-        self.cur = 0
-        self.acount = 1
-        self.bstep = 1/self.op.a.length()
-        self.len = self.op.a.length()*self.op.b.length()
-
-    def done(self):
-        return self.cur >= self.len
-
-    def has_tails(self):
-        return self.op.has_tails()
-
-    def get_extra(self):
-        if(self.done()):
-            return self.cur-self.len
-        else:
-            return 0
-
-    def clone(self):
-        tmp = Cross(self.op.clone())
-        tmp.bstep = self.bstep
-        tmp.cur = self.cur
-        tmp.acount = self.acount
-        tmp.len = self.len
-        return tmp
-
-    def length(self):
-        return self.op.a.length()*self.op.b.length()
-
-    #def set_freq(self, freq):
-    #    self.op.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.op.set_pitch(pitch)
-
-class Length(SCModule):
-    """ Overrides the length of a given module. This will:
-        - Repeat the module if it stops before length is met.
-        - Halt the module early if the length is met before it ends
-          (may cause pops!)
-
-        This module takes two inputs, A and B, where A is the signal module
-        and B determines the length.
-    """
-
-    def __init__(self, a, b):
-        """ Initializer.
-
-            Arguments:
-            A - The signal module, to be length-overridden.
-            B - The length.
-        """
-
-        self.a = a
-        self.b = b
-        self.cur = 0
-
-    def step(self, delta, const=-1):
-        self.cur += delta
-        self.a.step(delta,const)
-        self.b.step(delta,const)
-
-        if(not self.done()):
-            if(self.a.done()):
-                extra = self.a.get_extra()
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-            if(self.b.done()):
-                extra = self.b.get_extra()
-                self.b.reset()
-                self.b.step(extra,ADJUST)
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta,const)
-        self.b.step_tails(delta,const)
-
-    def read(self, tails=False,stereo=True,signal=True):
-        return self.a.read(tails,stereo,signal)
-
-    def reset(self):
-        self.cur = 0
-        self.a.reset()
-        self.b.reset()
-
-    def clear(self):
-        self.cur = 0
-        self.a.reset()
-        self.b.reset()
-
-    def done(self):
-        return self.cur >= self.b.read(stereo=False)
-
-    def has_tails(self):
-        return False
-
-    def get_extra(self):
-        if(self.done()):
-            return self.cur - self.b.read(stereo=False)
-        else:
-            return 0
-
-    def length(self):
-        return self.b.read(stereo=False)
-
-    #def set_freq(self,freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self,pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-    def clone(self):
-        tmp = Length(self.a.clone(),self.b.clone())
-        tmp.cur = self.cur
-        return tmp
-
-class Limit(SCModule):
-    """ Module that limits (clips) the input signal to a given value.
-        Along with the input module and clipping module, Limit also has
-        a knee module (supplied via meta tags), which can create a buffer
-        area for soft clipping.
-
-        As an example, "Am6" will limit the signal provided by module "A"
-        to 6, and all values above that will be hard-clipped to 6.
-
-        However, "Am<KNEE=2>6" will soft limit "A" to 6, with values above
-        4 (the limit, 6, minus the knee, 2) being reduced by the following 
-        equation:
-
-        Where "x" is signal value, "k" is knee, and "m" is limit.
-
-        f(x) = k(1-(1/((1/k)(x+k-m)+1))) + (m-k)
-
-        In this function, f(x) = (m-k) when x = (m-k),
-        and f(x) approaches m as x approaches infinity
-        (so the signal always falls beneath the limit).
-    """
-
-    def __init__(self, a, b, alead=True, knee=Val(0)):
-        """ Initializer.
-
-            Arguments:
-            a -- Input module.
-            b -- Clip module
-            knee -- Knee module.
-            alead -- If true, we stop when A stops; otherwise, when B stops.
-        """
-
-        self.a = a
-        self.b = b
-        self.knee = knee
-        self.a_lead = alead
-
-    def step(self, delta, const=-1):
-        self.a.step(delta, const)
-        self.b.step(delta, const)
-        self.knee.step(delta, const)
-        if(self.a_lead):
-            if(self.b.done() and not self.a.done()):
-                extra = self.b.get_extra()
-                self.b.reset()
-                self.b.step(extra,ADJUST)
-        else:
-            if(self.a.done() and not self.b.done()):
-                extra = self.a.get_extra()
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-        if(self.knee.done()):
-            extra = self.knee.get_extra()
-            self.knee.reset()
-            self.knee.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        valA = self.a.read(tails,stereo,signal)
-        valB = self.b.read(False,stereo,signal)
-        knee = self.knee.read(False,stereo,signal)
-
-        if(stereo):
-            if(abs(valA[0])>(abs(valB[0])-abs(knee[0]))):
-                valA[0] = self.limit(valA[0],valB[0],knee[0])
-            if(abs(valA[1])>(abs(valB[1])-abs(knee[1]))):
-                valA[1] = self.limit(valA[1],valB[1],knee[1])
-            return valA
-        else:
-            if(abs(valA)>(abs(valB)-abs(knee))):
-                valA = self.limit(valA,valB,knee)
-            return valA
-
-    def limit(self,inp,clp,kne):
-        sign = 1
-        if(inp < 0):
-            sign = -1
-        inp = abs(inp)
-        clp = abs(clp)
-        kne = abs(kne)
-        if(kne == 0):
-            return sign*clp
-        return sign*(kne*(1-(1/((1/kne)*(inp+kne-clp)+1)))+(clp-kne))
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta,const)
-        self.b.step_tails(delta,const)
-        self.knee.step_tails(delta,const)
-
-    def reset(self):
-        self.a.reset()
-        self.b.reset()
-        self.knee.reset()
-
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-        self.knee.clear()
-
-    def done(self):
-        if(self.a_lead):
-            return self.a.done()
-        else:
-            return self.b.done()
-
-    def has_tails(self):
-        return self.a.has_tails()
-
-    def get_extra(self):
-        if(self.a_lead):
-            return self.a.get_extra()
-        else:
-            return self.b.get_extra()
-
-    def clone(self):
-        cln = Limit(self.a.clone(), self.b.clone(), self.a_lead, self.knee.clone())
-        return cln
-
-    def length(self):
-        if(self.a_lead):
-            return self.a.length()
-        else:
-            return self.b.length()
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-    #    self.knee.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-        self.knee.set_pitch(pitch)
-
-class Attack(SCModule):
-    """ Module for setting an attack looping point.
-        Whenever this module loops, it will adjust its input module
-        forward by the Attack value.
-    """
-
-    def __init__(self, mdl, attk):
-        """ Initializer.
-
-            Arguments:
-            mdl -- The input module.
-            attk -- The attack value module.
-        """
-
-        self.a = mdl
-        self.b = attk
-
-    def step(self, delta, const=-1):
-        self.a.step(delta, const)
-        self.b.step(delta, const)
-
-        if(self.b.done()):
-            extra = self.b.get_extra()
-            self.b.reset()
-            self.b.step(extra, ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        val = self.a.read(tails,stereo,signal)
-        if(stereo):
-            return [-val[0],-val[1]]
-        else:
-            return -val
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta, const)
-
-    def reset(self):
-        self.a.reset()
-        self.a.step(self.b.read(tails=False,stereo=False,signal=False),ADJUST)
-
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-
-    def done(self):
-        return self.a.done()
-
-    def has_tails(self):
-        return self.a.has_tails()
-
-    def get_extra(self):
-        return self.a.get_extra()
-
-    def clone(self):
-        return Attack(self.a.clone(),self.b.clone())
-
-    def length(self):
-        return self.a.length()
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Release(SCModule):
-    """ Module for setting an release looping point.
-        If this module has not been stopped by RELEASE, it will
-        halt its input module at the given release point.
-
-        A value of -1 indicates no release point.
-    """
-
-    def __init__(self, mdl, rel):
-        """ Initializer.
-
-            Arguments:
-            mdl -- The input module.
-            rel -- The attack value module.
-        """
-
-        self.a = mdl
-        self.b = rel
-        self.last_rel = -1
-        self.cur = 0
-        self.stopped = False
-
-    def step(self, delta, const=-1):
-        self.b.step(delta,const)
-        if(self.b.done() and not self.done()):
-            extra = self.b.get_extra()
-            self.b.reset()
-            self.b.step(extra,ADJUST)
-
-        self.last_rel = self.b.read(stereo=False,signal=False)
-        if(const == STOP or const == RELEASE):
-            self.stopped = True
-            self.a.step(delta,const)
-        elif(const == ADJUST):
-            self.a.step(delta,const)
-            self.cur += delta
-        else:
-            if(self.stopped or self.cur < self.last_rel or self.last_rel <= 0):
-                self.a.step(delta,const)
-                self.cur += delta
-            else:
-                extra = self.cur - self.last_rel
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-                self.cur = extra
-
-    def read(self,tails=False,stereo=True,signal=True):
-        val = self.a.read(tails,stereo,signal)
-        if(stereo):
-            return [-val[0],-val[1]]
-        else:
-            return -val
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta, const)
-        self.b.step_tails(delta, const)
-
-    def reset(self):
-        self.a.reset()
-        self.cur = 0
-
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-        self.last_rel = -1
-        self.stopped = False
-        self.cur = 0
-
-    def done(self):
-        return self.a.done()
-
-    def has_tails(self):
-        return self.a.has_tails()
-    
-    def get_extra(self):
-        return self.a.get_extra()
-
-    def clone(self):
-        rl = Release(self.a.clone(),self.b.clone())
-        rl.cur = self.cur
-        rl.last_rel = self.last_rel
-        rl.stopped = self.stopped
-        return rl
-
-    def length(self):
-        return self.a.length()
-
-    #def set_freq(self, freq):
-    #    self.a.set_freq(freq)
-    #    self.b.set_freq(freq)
-
-    def set_pitch(self, pitch):
-        self.a.set_pitch(pitch)
-        self.b.set_pitch(pitch)
-
-class Delay:
-    """ Delay Module
-    """
-    def __init__(self, mdl, dly, fpstep, fdbk=Val(0), wet=Val(1), dry=Val(1)):
-        self.mdl = mdl
-        self.dly = dly
-        self.fdbk = fdbk
-        self.wet = wet
-        self.dry = dry
-        self.fpstep = fpstep
-        self.buff = []
-        self.bufamt = -1
-        self.lastbufread = 0
-        self.lastdly = -1
-        # amount of time the buffer has been quiet
-        self.quiettime = 0
-        # buffer read values beneath this are considered silence
-        self.quietgate = 0.1
-
-    def step(self, delta, const=-1):
-        if(not self.mdl.done()):
-            self.mdl.step(delta, const)
-        self.dly.step(delta, const)
-        if(self.dly.done()):
-            extra = self.dly.get_extra()
-            self.dly.reset()
-            self.dly.step(extra,ADJUST)
-        self.fdbk.step(delta, const)
-        if(self.fdbk.done()):
-            extra = self.fdbk.get_extra()
-            self.fdbk.reset()
-            self.fdbk.step(extra,ADJUST)
-        self.wet.step(delta, const)
-        if(self.wet.done()):
-            extra = self.wet.get_extra()
-            self.wet.reset()
-            self.wet.step(extra,ADJUST)
-        self.dry.step(delta, const)
-        if(self.dry.done()):
-            extra = self.dry.get_extra()
-            self.dry.reset()
-            self.dry.step(extra,ADJUST)
-
-    def step_tails(self, delta, const=-1):
-        self.mdl.step_tails(delta, const)
-        self.dly.step_tails(delta, const)
-        self.fdbk.step_tails(delta, const)
-        self.wet.step_tails(delta, const)
-        self.dry.step_tails(delta, const)
-
-    # TODO: Move buffer reading to read_tails
-    # TODO:
-    def read(self, tails=False,stereo=True,signal=True):
-        if(stereo and type(self.lastbufread) == int):
-            self.lastbufread = [self.lastbufread, self.lastbufread]
-        elif(not stereo and type(self.lastbufread) == list):
-            self.lastbufread = 0.5 * (self.lastbufread[0] + self.lastbufread[1])
-            
-        curdly = abs(self.dly.read(tails,False,signal))
-        curdry = self.dry.read(False,stereo,signal)
-        curwet = self.wet.read(False,stereo,signal)
-        curfdbk = self.fdbk.read(False,stereo,signal)
-
-        if(not tails):
-            if(self.lastdly != curdly):
-                self.lastdly = curdly
-                self.bufamt = int(self.lastdly * self.fpstep + 0.5)
-            
-            if(self.mdl.done()):
-                if(stereo):
-                    read = [0,0]
-                else:
-                    read = 0
-            else:
-                read = self.mdl.read(tails,stereo,signal)
-            if(len(self.buff) >= self.bufamt):
-                if(self.bufamt == 0):
-                    wet = read
-                else:
-                    wet = self.buff.pop(0)
-                self.lastbufread = wet               
-            
-                if(stereo):
-                    if(abs(wet[0])>self.quietgate or abs(wet[1])>self.quietgate):
-                        self.quiettime = 0
-                    else:
-                        self.quiettime += 1
-
-                    if(self.bufamt > 0):
-                        tobuff = [read[0]+(wet[0]*curfdbk[0]),read[1]+(wet[1]*curfdbk[1])]
-                        if(len(self.buff) == self.bufamt-1):
-                            self.buff.append(tobuff)
-                        else:
-                            self.buff[self.bufamt] = tobuff
-                    return [(read[0]*curdry[0]) + (wet[0]*curwet[0]),(read[1]*curdry[1]) + (wet[1]*curwet[1])]
-                else:
-                    if(abs(wet)>self.quietgate):
-                        self.quiettime = 0
-                    else:
-                        self.quiettime += 1
-
-                    if(self.bufamt > 0):
-                        tobuff = read + (wet*curfdbk)
-                        if(len(self.buff) == self.bufamt-1):
-                            self.buff.append(tobuff)
-                        else:
-                            self.buff[self.bufamt-1] = tobuff
-                    return (read*curdry) + (wet*curwet)
-            else:
-                if(self.bufamt > 0):
-                    self.buff.append(read)
-                if(stereo):
-                    if(abs(read[0])>self.quietgate or abs(read[1])>self.quietgate):
-                        self.quiettime = 0
-                    else:
-                        self.quiettime += 1
-                    return [(read[0]*curdry[0]) + (self.lastbufread[0]*curwet[0]), (read[1]*curdry[1]) + (self.lastbufread[1]*curwet[1])]
-                else:
-                    if(abs(read)>self.quietgate):
-                        self.quiettime = 0
-                    else:
-                        self.quiettime += 1
-                    return (read*curdry) + (self.lastbufread*curwet)
-        else:
-            read = self.mdl.read(tails, stereo, signal)
-            if(stereo):
-                # add the tails value to the buffer.
-                if(self.bufamt == 0):
-                    # in the case of a 0 delay, there is no buffer & read is wet & dry
-                    return [read[0]*curdry[0] + read[0]*curwet[0],read[1]*curdry[1] + read[1]*curwet[1]]
-                elif(len(self.buff) < self.bufamt + 1):
-                    prv = self.buff[len(self.buff)-1]
-                    self.buff[len(self.buff)-1] = [prv[0]+(read[0]*curdry[0]),prv[1]+(read[1]*curdry[1])]
-                else:
-                    prv = self.buff[self.bufamt]
-                    self.buff[self.bufamt] = [prv[0]+(read[0]*curdry[0]),prv[1]+(read[1]*curdry[1])]
-                return [read[0]*curdry[0],read[1]*curdry[1]]
-            else:
-                if(self.bufamt == 0):
-                    # in the case of a 0 delay, there is no buffer & read is wet & dry
-                    return read*curdry + read*curwet
-                elif(len(self.buff) < self.bufamt +1):
-                    self.buff[len(self.buff)-1] = prv + (read*curdry)
-                else:
-                    self.buff[self.bufamt] = prv + (read*curdry)
-                return read * curdry
-        
-    def reset(self):
-        self.mdl.reset()
-        self.dly.reset()
-        self.wet.reset()
-        self.dry.reset()
-        self.fdbk.reset()
-        
-    def clear(self):
-        self.mdl.clear()
-        self.dly.clear()
-        self.wet.clear()
-        self.dry.clear()
-        self.fdbk.clear()
-        self.buff = []
-        self.lastbufread = 0
-        self.lastdly = -1
-        self.quiettime = 0
-        
-    def done(self):
-        return self.mdl.done() and self.quiettime > self.bufamt
-        
-    def has_tails(self):
-        return self.mdl.has_tails()
-        
-    def get_extra(self):
-        return self.mdl.get_extra()
-        
-    def length(self):
-        return self.mdl.length()
-        
-    #def set_freq(self,freq):
-    #    self.mdl.set_freq(freq)
-
-    def set_pitch(self,pitch):
-        self.mdl.set_pitch(pitch)
-        
-    def clone(self):
-        cln = Delay(self.mdl.clone(), self.dly.clone(), self.fpstep, self.fdbk.clone(), self.wet.clone(), self.dry.clone())
-        newbuf = []
-        for i in self.buff:
-            newbuf.append(i)
-        cln.buff = newbuf
-        cln.bufamt = self.bufamt
-        cln.lastbufread = self.lastbufread
-        cln.lastdly = self.lastdly
-        cln.quiettime = self.quiettime
-        cln.quietgate = self.quietgate
-        return cln
-
-class Pitch(SCModule):
-    """ Module for pitch shifting.
-
-        Adds a given value to all pitch sets.
-    """
-
-    def __init__(self, a, b=Val(0), alead=True):
-        """ Initializer.
-
-            Arguments:
-            a - The input/source module.
-            b - The pitch transposition (in cents +/-)
-            alead - Which module determines the overall length.
-        """
-
-        self.a = a
-        self.b = b
-        self.alead = alead
-        self.lastpitch = 0
-        self.lastshift = b.read(False,False,False)
-        self.a.set_pitch(self.lastshift)
-
-    def step(self, delta, const=-1):
-        self.a.step(delta, const)
-        self.b.step(delta, const)
-        if(self.alead):
-            if(self.b.done() and not self.a.done()):
-                extra = self.b.get_extra()
-                self.b.reset()
-                self.b.step(extra,ADJUST)
-        else:
-            if(self.a.done() and not self.b.done()):
-                extra = self.a.get_extra()
-                self.a.reset()
-                self.a.step(extra,ADJUST)
-
-    def read(self,tails=False,stereo=True,signal=True):
-        val = self.a.read(tails,stereo,signal)
-        shift = self.b.read(False,False,False)
-        if(shift != self.lastshift):
-            self.lastshift = shift
-            shifted = self.lastpitch + self.lastshift
-            self.a.set_pitch(shifted)
-            #shifted = self.lastfreq * (2**(1/1200.0))**self.shift
-            #self.a.set_freq(shifted)
-        if(stereo):
-            return [-val[0],-val[1]]
-        else:
-            return -val
-
-    def step_tails(self, delta, const=-1):
-        self.a.step_tails(delta, const)
-        self.b.step_tails(delta, const)
-
-    def reset(self):
-        self.a.reset()
-        #self.b.reset()
-        #self.shift = self.b.read(False,False,False)
-
-    def clear(self):
-        self.a.clear()
-        self.b.clear()
-        self.shift = self.b.read(False,False,False)
-
-    def done(self):
-        if(self.alead):
-            return self.a.done()
-        else:
-            return self.b.done()
-
-    def has_tails(self):
-        return self.a.has_tails() or self.b.has_tails()
-    
-    def get_extra(self):
-        if(self.alead):
-            return self.a.get_extra()
-        else:
-            return self.b.get_extra()
-
-    def clone(self):
-        cln = Pitch(self.a.clone(),self.b.clone(),self.alead)
-        cln.lastpitch = self.lastpitch
-        cln.lastshift = self.lastshift
-        return cln
-
-    def length(self):
-        if(self.alead):
-            return self.a.length()
-        else:
-            return self.b.length()
-
-    #def set_freq(self, freq):
-    #    self.lastfreq = freq
-    #    shifted = self.lastfreq * (2**(1/1200.0))**self.shift
-    #    self.a.set_freq(shifted)
-
-    def set_pitch(self, pitch):
-        if(pitch != self.lastpitch):
-            self.lastpitch = pitch
-            shifted = self.lastpitch + self.lastshift
-            self.a.set_pitch(shifted)
-
-
-def gcd(a, b):
-    """ Calculates greatest common denominator.
-
-        Arguments:
-        a -- Input A.
-        b -- Inpubt B.
-    """
-    while(b > 0):
-        a, b = b, a % b
-    return a
-
-def lcm(a, b):
-    """ Calculates least common multiple.
-
-        Arguments:
-        a -- Input A.
-        b -- Input B.
-    """
-
-    return a*b/gcd(a,b)
-
-def as_decimal(val):
-    """ Converts SC signal values into decimals.
-
-        Signal values range from -9 to 9, so this simply returns the input
-        divided by 9.
-
-        Arguments:
-        val -- The value to convert to decimal.
-    """
-
-    dec = val/MAX_VAL
-    return dec
-
-def limit(val):
-    """ Hard limits the given signal value.
-
-        This limits to +/-0.9999 * MAX.
-
-        Arguments:
-        val -- The signal value to limit.
-    """
-
-    if(val >= MAX_VAL):
-        return MAX_VAL * 0.9999
-    elif(val <= -MAX_VAL):
-        return -MAX_VAL * 0.9999
-    else:
-        return val
-
-def calc_freq(disp):
-    """ Calculates the frequency of a given pitch.
-
-        This calculation is performed in cents-above-A0. We use A4 as a reference,
-        so the given displacement is shifted by -5700 (the distance from A4 down 
-        to A0 in cents).
-
-        Arguments:
-        disp -- The pitch, expressed as "cents from A0".
-    """
-    return 440.0 * (2**(1/1200.0))**(disp-5700)
-
-def pan(vals, pan):
-    """ Calculates panning.
-
-        Pan amounts range from -9 (100% L) to 9 (100% R). Excessive values
-        will be clipped.
-
-        Arguments:
-        vals -- The stereo pair of signal values.
-        pan -- The panning adjustment.
-    """
-    # pan values should range from -9 (100% L) to 9 (100% R)
-    pan /= 9
-    # clips pan to a max of 100% in either direction
-    if(abs(pan)>1):
-        pan = pan/abs(pan)
-    if(pan == 0):
-        return vals
-    elif(pan < 0):
-        lpan = abs(pan)
-        rtol = vals[1]*lpan
-        #print("PAN=" + str(pan) + "|rtol: " + str(rtol))
-        return [vals[0]+rtol,vals[1]-rtol]
-    else:
-        ltor = vals[0]*pan
-        #print("PAN=" + str(pan) + "|ltor: " + str(ltor))
-        return [vals[0]-ltor,vals[1]+ltor]
+""" SYNTH-CORONA: MUSICAL TYPEWRITER
+
+    This is a little code language for creating chiptunes. It features a highly
+    modular design which can be applied to instruments, pitches, sequences,
+    and patterns.
+
+    Version 1.3.0
+
+"""
+
+#TODO: SeqLine does not handle ADJUST steps -- should it?
+#TODO: Should SeqLine step pitch & pan by delta*frameslice?
+#      What happens if we apply Speed(Seq,2) etc?
+import wave
+import sys, random, time, math
+import bisect
+import hashlib
+import json
+from array import array
+
+
+# Major headers
+HEADERS = {"CFG", "INS", "MDL", "SEQ", "PAT", "BLK", "SNG", "IMP"}
+# Reserved symbols (which cannot be used in names)
+# Note: Names can contain numbers, but they cannot begin with a number.
+RESERVED = "+-*/%rixlvcsnmtjkpyuh{}[]()<>.,|"
+# List of operators
+OPERATORS = "+-=*/%rixlvsnmtjkpyuh"
+# Longest envelope curve (in samples) that Envelope will pre-render.
+ENV_BAKE_MAX = 1 << 20
+# Calls a SongShare logs before it may start its log afresh.
+SHARE_LOG_MAX = 1024
+# Rendering chunk size -- atm, only determines how often progress label
+# is updated (in samples).
+CHUNK = 1028*1
+# Maximum signal value, as written in a SC file (absolute value).
+MAX_VAL = 9
+
+# Indicates that we are parsing an Instrument
+INST = 0
+# Indicates that we are parsing a pitch
+TONE = 1
+# Indicates that we are parsing a Sequence
+SEQN = 2
+# Indicates that we are parsing a generic module
+MDLE = 3
+
+# Time it takes a non-sustain Instrument to release to 0, in ms
+INS_REL_TIME = 6
+# Instrument signal codes -- These are sent in as const values in step()
+# to send the Instrument special instructions.
+# Tells Inst to use the delta value as const.
+DELTA = -1
+# Tells the Inst to stop, triggering any release operations.
+STOP = -2
+# Tells the Inst that this is a step adjustment. ADJUST is done regularly when
+# a module ends and is reset, in order to sync it with whatever extra amount
+# it was stepped previously. Accordingly, Insts should step the delta value
+# exactly, without applying rate or frequency adjustments.
+ADJUST = -3
+# Tells modules inside an instrument to release--specifically Envelope.
+# Inst does not pass on STOP commands, because nested Insts might not need to
+# stop (i.e., a waveform should not stop). We send release instead, to let
+# modules know a release has occurred, but that they should not stop.
+RELEASE = -4
+# Pan gain matrix that leaves a stereo pair untouched (see pan_gains()).
+PAN_IDENTITY = (1,0,0,1)
+
+class SCParseError(Exception):
+    """ Exception for syntax errors discovered while parsing a SC file. """
+
+    def __init__(self, msg="", line=0):
+        """ Initializer
+
+            Keyword Arguments:
+            msg -- Message describing the error.
+            line -- The line number of where the error was tripped.
+        """
+        self.message = msg + " Line: " + str(line)
+
+    def __str__(self):
+        """ Returns the error message (with line number). """
+        return self.message
+
+class SCModule:
+    """ Base class for Modules in SynthCorona.
+
+        Modules are used to create Instruments, Sequences, and Song Patterns,
+        as well as controlling pitch.
+
+        Each module generally performs a single simple function, but they can
+        be combined and nested to create complex patterns and operations.
+    """
+
+    def step(self, delta, const=-1):
+        """ Steps the module forward in time.
+
+            Delta is the local time amount by which to step, which is used
+            by most modules. However, certain modules are designed to operate
+            independently of things like pitch require a constant time amount,
+            which is provided by const.
+
+            Additionally, some negative const values are used to send modules
+            the following commands:
+                DELTA (const = -1): Use the delta value for const value.
+                STOP (const = -2): Tells the module to stop, or Insts to release.
+                ADJUST (const = -3): Indicates a special time-adjustment. This
+                        tells modules to advance by delta exactly, without applying
+                        any rate modifications. When const=ADJUST, we generally
+                        assume that delta=get_extra() from some previous module,
+                        or from this module, before it was reset.
+
+            Arguments:
+            delta -- Local time slice.
+            const -- Constant time value, or command signal.
+        """
+        raise NotImplementedException()
+
+    def step_tails(self, delta, const=-1):
+        """ Steps any tails in the module forward in time.
+
+            Tails are sustaining sounds in Instruments & Sequences that have
+            been released but are not yet silent.
+
+            Arguments:
+            delta -- Local time slice.
+            const -- Constant time value.
+        """
+        raise NotImplementedException()
+
+    def read(self, tails=False,stereo=True,signal=True):
+        """ Reads the module at its current position.
+
+            (Occasionally, other upkeep steps are occur here as well. See
+            individual modules for details.)
+
+            The tails argument determines whether we will read sustaining notes
+            or active instruments. One important thing to note is that certain
+            modules like Val do not behave differently based on tails. In
+            certain cases this means Val ends up getting read twice and is
+            doubled. To prevent this, modules that do not apply to tails have
+            a property "no_tails". Use getattr() to check for this field, and
+            do not perform a second read() on it if you find it. (An example of
+            this process can be found in Pattern.)
+
+            The signal argument is not currently used. It was added for a change
+            that did not end up being beneficial, but I have left it in in case
+            it becomes useful. As a note, signals are represented within the
+            range [-9,9], which corresponds to how they are depicted in SC code.
+
+            Arguments:
+            tails -- Whether we are reading tails or active sounds.
+            stereo -- Whether we are reading in stereo.
+            signal -- Whether we are reading a signal value, or a simple number.
+        """
+        raise NotImplementedException()
+
+    def reset(self):
+        """ Performs a small reset on a module.
+
+            This is interpreted as a simple refreshing of the cycle throughout
+            the song. Some modules do not entirely clear all of their parameters
+            during reset(), but merely prepare themselves to begin again.
+
+            When a module needs to be full re-initialized, clear() is the
+            appropriate method to use.
+
+            When resetting a finished module, it is often necessary to account
+            for the small amount of time that has passed the completion mark
+            (this avoids subtle distortions due to accumulating lost time).
+            The standard process for this is as follows:
+
+                extra = mdl.get_extra() # Store the amount of extra time.
+                mdl.reset()             # Reset the module.
+                mdl.step(extra,ADJUST)  # Adjust-step the module by extra
+
+            If you are moving to a new module (i.e., in Pattern), you will
+            do mdlB.step(extra,ADJUST), to pass the extra time on to the next
+            module.
+        """
+        raise NotImplementedException()
+
+    def clear(self):
+        """ Performs a full clear on the module.
+
+            This resets the module to its initial state. This function is a
+            deeper refresh than reset(), which is intended for basic cycling
+            of completed modules.
+        """
+        raise NotImplementedException()
+
+    def done(self):
+        """ Checks if the module is finished.
+        """
+        raise NotImplementedException()
+
+    def has_tails(self):
+        """ Checks if any nested Sequences have sustaining notes.
+        """
+        raise NotImplementedException()
+
+    def silent_for(self):
+        """ Reports how many of the coming samples (as stepped by 1 at a time)
+            are certain to read as silence, tails included. This is never more
+            than the time left before the module is done. Over that stretch,
+            read() may be skipped altogether, so modules whose reads change
+            their state should report 0.
+
+            By default we can't tell, so this is 0; Sequence-level modules
+            and simple operators override it.
+        """
+        return 0
+
+    def pure(self):
+        """ Checks if the module is a pure function of the time since it was
+            cleared: what it reads doesn't depend on pitch, random choices,
+            STOP/RELEASE signals, or how its time was sliced into steps. Pure
+            modules can be evaluated at any point with value_at(), without
+            stepping through everything before it.
+
+            By default modules are not pure; Vals, Oscs, Patterns, the
+            arithmetic operators and similar simple modules override this,
+            checking their inputs in turn.
+        """
+        return False
+
+    def value_at(self, t):
+        """ Returns what read(stereo=False) would return after clearing the
+            module and stepping it forward by t. Only pure() modules support
+            this. Results may differ from stepping in the last few bits, as
+            the time isn't built up one step at a time.
+
+            Arguments:
+            t -- Local time, from 0 up to length().
+        """
+        raise RuntimeError(type(self).__name__ + " can't be evaluated with value_at()")
+
+    def get_extra(self):
+        """ If the module is done, reports how much time we have advanced after
+            finishing.
+
+            In another sense -- this is how far the cursor has passed the end
+            of this module. Whenever a module finishes, generally there is some
+            extra time, which we will have to account for when resetting or
+            moving to a new module.
+
+            (See reset() for an outline of how to process this extra time.)
+        """
+        raise NotImplementedException()
+
+    # Cached result of calc_length(). None means it must be recalculated.
+    cached_len = None
+    # The module this one is nested in (if any). Length invalidations are
+    # passed up through this chain.
+    owner = None
+
+    def length(self):
+        """ Reports the module length.
+
+            The length is calculated once by calc_length() and cached. Modules
+            whose length can change (i.e. a Set choosing a new module) must call
+            invalidate_length() when that happens.
+
+            Note: In certain situations, an accurate length cannot be known.
+            (For example, a Set with modules of different lengths.)
+        """
+        if(self.cached_len == None):
+            self.cached_len = self.calc_length()
+        return self.cached_len
+
+    def calc_length(self):
+        """ Calculates the module length. This is the uncached version of
+            length(), and is what each module should implement.
+        """
+        raise NotImplementedException()
+
+    def invalidate_length(self):
+        """ Clears the cached length of this module and of every module
+            that contains it, so they will be recalculated on the next length().
+        """
+        mdl = self
+        while(mdl != None):
+            mdl.cached_len = None
+            for tap in mdl.cse_taps:
+                tap.invalidate_length()
+            mdl = mdl.owner
+
+    # CommonTaps reading this module; their lengths follow ours.
+    cse_taps = ()
+
+    # Cached result of fingerprint().
+    fp = None
+    # Playback state (positions, random choices, buffers...), left out of
+    # fingerprint(), so it only describes the definition.
+    STATE_FIELDS = ()
+    # Attributes left out of module_key() and fingerprint(): caches, and
+    # links back up the tree. Subclasses add the ones they set themselves.
+    NOT_KEYED = ("owner", "cached_len", "fp", "cse_taps", "stateless")
+
+    def fingerprint(self):
+        """ Returns a hex digest identifying the module tree, made from its
+            class and parameters (not its STATE_FIELDS), and the fingerprints
+            of the modules nested in it. Unlike module_key(), this is the same from one run to
+            the next, so it can be used to key caches kept on disk, or to match
+            definitions from different files.
+
+            The fingerprint is taken the first time it's asked for, and cached.
+            The parser takes it for each Inst and module definition.
+        """
+        if(self.fp == None):
+            parts = [type(self).__name__]
+            for name in sorted(vars(self)):
+                if(name not in self.NOT_KEYED and name not in self.STATE_FIELDS):
+                    parts.append(name + "=" + value_digest(getattr(self, name)))
+            self.fp = hashlib.sha1("|".join(parts).encode()).hexdigest()
+        return self.fp
+
+    # Attributes that may hold nested modules (or lists of them), for children().
+    CHILD_FIELDS = ("a", "b", "mdl", "op", "module", "rate", "width", "knee",
+            "dly", "fdbk", "wet", "dry", "decay", "duty", "pan", "pitch", "release")
+    CHILD_LISTS = ("pat", "set", "srs", "lines")
+
+    def children(self):
+        """ Returns a list of the modules nested directly inside this one.
+        """
+        kids = []
+        for attr in self.CHILD_FIELDS:
+            mdl = getattr(self, attr, None)
+            if(isinstance(mdl, SCModule)):
+                kids.append(mdl)
+        for attr in self.CHILD_LISTS:
+            lst = getattr(self, attr, None)
+            if(type(lst) == list or type(lst) == tuple):
+                for mdl in lst:
+                    if(isinstance(mdl, SCModule)):
+                        kids.append(mdl)
+        return kids
+
+    # Whether copies of this module may be replaced by one shared copy (see
+    # module_key()). This is false for modules making random choices, and
+    # for modules whose reads change their state.
+    shareable = True
+
+    # Whether our reads can change when we (or our inputs) finish, as with
+    # a LinInterp picking up a new width. See SynthCorona.measure_song().
+    read_timed = False
+
+    # Whether our reads change our state in other ways (i.e. feeding a delay
+    # line). Modules with read_timed set count as well.
+    read_stateful = False
+    # Cached result of stateless_reads().
+    stateless = None
+
+    def stateless_reads(self):
+        """ Checks whether reading this module tree never changes its state,
+            so its reads may be skipped (see silent_for()). This is worked out
+            the first time it's asked for, and cached.
+        """
+        if(self.stateless == None):
+            self.stateless = not (self.read_stateful or self.read_timed)
+            if(self.stateless):
+                for sub in self.children():
+                    if(not sub.stateless_reads()):
+                        self.stateless = False
+                        break
+        return self.stateless
+
+    def quiet_fields(self):
+        """ Returns the names of our fields that only change what we read,
+            never when we finish or how we step our other inputs. These are
+            left out of timing keys (see module_key()).
+        """
+        return ()
+
+    def cse_links(self):
+        """ Lists the inputs SynthCorona.merge_common() may look into, as
+            (field, how) pairs, where how is one of:
+                "same" -- The input is stepped, reset and cleared exactly as
+                        we are, and our done() and get_extra() are its.
+                "trail" -- As "same", except that it is also reset when it
+                        finishes before our "same" input does.
+                "own" -- The input (or list of inputs) is stepped in a way that
+                        only depends on how we are stepped and our timing key.
+            Modules in other fields are never shared. In all cases, we may
+            only check done() and get_extra() on the input while stepping.
+        """
+        return ()
+
+    def own(self, *mdls):
+        """ Marks this module as the owner of the given nested modules, so
+            that changes in their length are passed up to us.
+
+            Arguments:
+            mdls -- The nested modules (or lists of modules).
+        """
+        for mdl in mdls:
+            if(type(mdl) == list or type(mdl) == tuple):
+                for m in mdl:
+                    m.owner = self
+            elif(mdl != None):
+                mdl.owner = self
+
+    # Last pan value read and the gain matrices built from it, for fuse_pan().
+    pan_val = None
+    pan_own = PAN_IDENTITY
+    pan_outer = None
+    pan_fused = PAN_IDENTITY
+    # fuse_pan()'s cache, for the NOT_KEYED of the modules that use it.
+    PAN_CACHE = ("pan_val", "pan_own", "pan_outer", "pan_fused")
+
+    def fuse_pan(self, outer):
+        """ Reads this module's pan and folds it into the given gain matrix.
+
+            The result is cached, and only rebuilt when the pan value or the
+            outer matrix changes.
+
+            Arguments:
+            outer -- Gain matrix of the enclosing modules.
+        """
+        val = self.pan.read(stereo=False,signal=False)
+        if(val != self.pan_val or outer is not self.pan_outer):
+            if(val != self.pan_val):
+                self.pan_val = val
+                self.pan_own = pan_gains(val)
+            self.pan_outer = outer
+            self.pan_fused = mul_gains(outer, self.pan_own)
+        return self.pan_fused
+
+    def read_gained(self, gains, tails=False, signal=True):
+        """ Reads the module in stereo with a pan gain matrix applied.
+
+            Sequence-level modules override this to pass the matrix down to
+            their Insts, so nested pans are applied once per voice.
+
+            Arguments:
+            gains -- Gain matrix to apply (see pan_gains()).
+            tails -- Whether to read tails instead.
+            signal -- Whether to convert the output to signal values.
+        """
+        return apply_gains(self.read(tails,True,signal), gains)
+
+    # This is being replaced with set_pitch, which will express pitch in cents, not hz;
+    # We will add up all pitch shifts & calculate frequency on the fly in Inst.
+    #
+    #def set_freq(self,freq):
+    #    """ For Instruments, sets the current frequency.
+    #
+    #        Since Instruments are often nested within other modules, this
+    #        must be a module function, so they can pass the frequency along
+    #        to any Insts they may contain.
+    #
+    #        Arguments:
+    #        freq -- The frequency (in Hz)
+    #    """
+    #    raise NotImplementedException()
+
+    def set_pitch(self, pitch):
+        """ Sets the pitch of this module. This applies to Instruments, who determine
+            their playback speed with it, as well as Sequences, for whom it represents
+            an overall pitch-shift value, which will be added to the instruments' pitch.
+
+            For other modules, they will likely need to pass this pitch along
+            to relevant nested modules, in order to apply it properly to child Instruments
+            or Sequences.
+
+            Arguments:
+            pitch -- The pitch/pitch shift amount (in cents, floating point)
+        """
+        raise NotImplementedException()
+
+    def clone(self):
+        """ Creates a deep copy of the module and returns it.
+        """
+        raise NotImplementedException()
+
+class SynthCorona:
+    """ Core SynthCorona class.
+
+        Handles parsing an SC file into a modules and song data, as well as
+        rendering that data into a Wave audio file.
+    """
+
+    def __init__(self):
+        """ Empty initializer.
+
+            Once initialized, call parse() to load song data and populate.
+        """
+
+        self.path = ""
+        self.srcname = ""
+        self.cfg = dict()
+        self.insts = dict()
+        self.modules = dict()
+        self.seqs = dict()
+        self.songs = []
+        self.tones = self.buildTones()
+        # frequencies are looked up in the shared FREQS table; see lookup_freq
+
+        self.tempo = 120
+        self.stereo = True
+        self.beat = 4
+        self.rate = 44100
+        self.depth = 16
+        self.normalize = True
+        self.freq = 440
+        self.framesperstep = (60*self.rate)/(self.tempo*self.beat)
+        self.frameslice = 1/self.framesperstep
+        self.rel_time = INS_REL_TIME*self.rate/1000
+        # Control rate for pitch/pan/envelope modules; 0 is strict (per-sample)
+        # and -1 updates at song step boundaries.
+        self.control = 0
+        self.control_lerp = False
+        # Silence threshold (dBFS) for culling released tails; None is off.
+        self.cull = None
+        # How long (ms) a tail must stay below the threshold to be culled.
+        self.cull_hold = 50
+        self.cull_gate = None
+        self.cull_samps = 0
+        # Number of tails culled in the current song.
+        self.culled = 0
+        # Envelope curves baked for our songs, by (envelope module
+        # fingerprint, release, step size); see Envelope.bake(). render()
+        # clears this for each song, so curves (up to ENV_BAKE_MAX doubles
+        # each) aren't held across a whole batch.
+        self.baked = dict()
+        # SongShares started on the current sample, which voices' SongTaps
+        # may still join, by module fingerprint and state (see SongTap).
+        # Songs clear this as they step.
+        self.sharing = dict()
+
+        self.curParseModule = "None"
+
+    def buildTones(self):
+        """ Builds the tones dictionary, which maps note/oct codes to their
+            value in cents. This corresponds directly to how notes are
+            depicted in SC -- i.e. "C4", "a2", "D#6", "F 3", etc.
+
+            Generates 10 octaves (0-9).
+        """
+
+        slts = ["C", "d", "D", "e", "E", "F", "g", "G", "a", "A", "b", "B"]
+        dlts = ["C ", "C#", "Db", "D ", "D#", "Eb", "E ", "F ", "F#", "Gb",
+                "G ", "G#", "Ab", "A ", "A#", "Bb", "B ", ]
+        dvals = [0, 1, 1, 2, 3, 4, 4, 5, 6, 6, 7, 8, 9, 9, 10, 11, 11]
+        ky = dict()
+
+        for oct in range(10):
+            for step in range(len(slts)):
+                nm = slts[step]+str(oct)
+                ky[nm] = (12*oct+step)*100
+            for inx in range(len(dlts)):
+                nm = dlts[inx]+str(oct)
+                ky[nm] = (12*oct+dvals[inx])*100
+        return ky
+
+    def parse(self, filename):
+        """ Parses the SC file at filename and loads its information into this
+            instance of SynthCorona.
+
+            Arguments:
+            filename -- The path of the file to parse.
+
+            Throws SCParseError if any SC syntax errors are found while parsing.
+        """
+
+        # We pull the directory from the SC path, to use for importing files
+        # from the same folder, without needing an absolute path.
+        fldr = filename.rfind("\\")
+        if(fldr < filename.rfind("/")):
+            fldr = filename.rfind("/")
+        if(fldr < 0):
+            fldr = 0
+        self.path = filename[0:fldr+1]
+        self.srcname = filename[fldr+1:len(filename)].split(".")[0]
+
+        # The SC file text, split into lines.
+        text = open(filename).read()
+        text = text.splitlines()
+
+        # Parser states, indicating what type of chunk we are parsing.
+        CFG = 0
+        INS = 1
+        MDL = 2
+        SEQ = 3
+        BLK = 4
+        SNG = 5
+
+        # Current parser block. This is changed by block headers.
+        state = CFG
+
+        # These variables affect Sequences. We'll reuse them for each Seq we
+        # parse, but they need to be preserved across multiple lines while each
+        # Sequence is being parsed.
+
+        # The name that identifies a Sequence in SC code & in seqs Dict
+        seqName = ""
+        # Panning module to be applied to a whole Sequence.
+        seqPan = None
+        # The individual lines of a Sequence.
+        seqLines = []
+        # File name for current song. Empty string will use source name.
+        songName = ""
+        # Holds each Sequence-level module in the current song. We will
+        # add new modules to this for each line under the SNG header.
+        songSteps = []
+
+        # Main parsing loop.
+        for i in range(len(text)):
+            line = text[i]
+
+            # Identify and omit commented lines
+            cmt = line.find("//")
+            if(cmt >= 0):
+                line = line[0:cmt]
+
+            if(line != "" and not(line.isspace())):
+                # Import Header -- loads imported file into this SynthCorona
+                if(line.startswith(("IMP", "imp"))):
+                    line = line[4:len(line)].strip()
+                    if(line.find("\\")<0 and line.find("/")<0):
+                        line = self.path + line
+                        print("IMPORTING: " + line)
+                    tmp = SynthCorona()
+                    # imported Envelopes bake into our cache
+                    tmp.baked = self.baked
+                    try:
+                        tmp.parse(line)
+                    except SCParseError:
+                        print("Error importing file: " + line)
+                        raise
+
+                    for i in tmp.insts.values():
+                        i.parent = self
+                    for s in tmp.seqs.values():
+                        s.parent = self
+                    # tails culled by CULL are counted here, not in tmp
+                    stack = list(tmp.modules.values()) + list(tmp.insts.values()) + list(tmp.seqs.values())
+                    while(len(stack) > 0):
+                        mdl = stack.pop()
+                        if(isinstance(mdl, (Delay, MultiTap, Reverb)) and mdl.parent == tmp):
+                            mdl.parent = self
+                        stack.extend(mdl.children())
+                    # Libraries often import the same files; matching
+                    # definitions are kept as they are, and changed ones noted.
+                    for defs, imps in ((self.modules, tmp.modules), (self.insts, tmp.insts)):
+                        for name, mdl in imps.items():
+                            if(name in defs):
+                                if(defs[name].fingerprint() == mdl.fingerprint()):
+                                    continue
+                                print("REDEFINED: " + name + " (" + line + ")")
+                            defs[name] = mdl
+                    self.seqs.update(tmp.seqs)
+                # Configuration Header
+                elif(line.startswith(("CFG", "cfg"))):
+                    state = CFG
+                # Instrument Header
+                elif(line.startswith(("INS", "ins"))):
+                    state = INS
+                # Module Header
+                elif(line.startswith(("MDL", "mdl"))):
+                    state = MDL
+                # Sequence Header. Clear Seq variables for new Sequence.
+                elif(line.startswith(("SEQ", "seq"))):
+                    seqPan = Val(0)
+                    seqLines = []
+                    state = SEQ
+                    seqName = line[3:len(line)].strip()
+                    # Parse Sequence meta-data
+                    if("<" in seqName):
+                        seqName = seqName.split("<")
+                        if(seqName[1].find(">")<0):
+                            raise SCParseError("Missing '>' in meta tag.",i)
+                        seqName, meta = seqName[0].strip(), seqName[1].split(">")[0].split(",")
+                        for mt in meta:
+                            mt = mt.strip()
+                            # Sets pan / pan module for the whole Sequence.
+                            # (Modules must be loaded: they can't be described in meta)
+                            if(mt.startswith(("pan", "PAN"))):
+                                mt = mt.split("=")[1].lstrip()
+                                if(mt in self.modules):
+                                    seqPan = self.modules[mt].clone()
+                                elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
+                                    invert = False
+                                    if(mt.startswith("-")):
+                                        invert = True
+                                        mt = mt[1:len(mt)]
+                                    num = ""
+                                    while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
+                                        num = num + mt[0]
+                                        mt = mt[1:len(mt)]
+                                    num = float(num)
+                                    seqPan = Val(num)
+                                    if(invert):
+                                        seqPan = Invert(seqPan)
+                    self.curParseModule = "SEQ: " + seqName
+                # Block Header (Blocks are Sequence Modules)
+                # We also accept "PAT" here, cause I always forget & call it that.
+                # Officially, it is "Block", since "Pattern" is a module already.
+                elif(line.startswith(("PAT", "pat", "BLK", "blk"))):
+                    state = BLK
+                # Song Header
+                elif(line.startswith(("SNG", "sng"))):
+                    songSteps = []
+                    songName = ""
+                    state = SNG
+                    self.curParseModule = "SONG"
+                    line = line[3:len(line)].lstrip()
+                    
+                    if(":" in line):
+                        songName = line.split(":")
+                        songName, line = songName[0].strip(), songName[1].strip()
+                        
+                    if(len(line)>0 and not line.isspace()):
+                        self.parseSongLine(line, songSteps,i)
+                        if(i+1>=len(text) or text[i+1][0:3] in HEADERS):
+                            self.songs.append(Song(songSteps,self,songName))
+                # If line doesn't start with Header string, parse based on state
+                else:
+                    # Configuration Chunk
+                    if(state == CFG):
+                        # Sets the master tempo.
+                        if(line.startswith(("TEMPO","TMP","tempo","tmp"))):
+                            line = line.split(":")[1].strip()
+                            self.tempo=int(line)
+                        # Sets the beat length (in song steps)
+                        elif(line.startswith(("BEAT", "beat"))):
+                            line = line.split(":")[1].strip()
+                            self.beat=int(line)
+                        # Sets the audio sample rate
+                        elif(line.startswith(("RATE", "rate"))):
+                            line = line.split(":")[1].strip()
+                            self.rate=int(line)
+                        # Sets the audio bit depth
+                        elif(line.startswith(("DEPTH", "depth"))):
+                            line = line.split(":")[1].strip()
+                            self.depth=int(line)
+                        # Sets the song to Stereo Mode
+                        elif(line.startswith(("STEREO","stereo"))):
+                            self.stereo = True
+                        # Sets the song to Mono mode
+                        elif(line.startswith(("MONO","mono"))):
+                            self.stereo = False
+                        # Sets whether to normalize the audio (T/F)
+                        elif(line.startswith(("NORMALIZE","normalize","NORM","norm"))):
+                            line = line.split(":")[1].strip()
+                            self.normalize=not line.startswith(("F","f","0"))
+                        # Sets the control rate for pitch, pan & envelopes
+                        elif(line.startswith(("CONTROL","control","CTL","ctl"))):
+                            line = line.split(":")[1].strip().split()
+                            if(len(line) == 0 or line[0].upper() == "STRICT"):
+                                self.control = 0
+                            elif(line[0].upper() == "STEP"):
+                                self.control = -1
+                            else:
+                                self.control = float(line[0])
+                            self.control_lerp = len(line) > 1 and line[1].upper() == "LERP"
+                        # Sets how long quiet tails have to be to be culled
+                        elif(line.startswith(("CULLHOLD","cullhold"))):
+                            line = line.split(":")[1].strip()
+                            self.cull_hold = float(line)
+                        # Sets the silence threshold for culling tails
+                        elif(line.startswith(("CULL","cull"))):
+                            line = line.split(":")[1].strip()
+                            if(line.startswith(("OFF","off","F","f"))):
+                                self.cull = None
+                            else:
+                                self.cull = float(line)
+
+                        # Update some core values based on rate/tempo/beat
+                        self.framesperstep = (60*self.rate)/(self.tempo*self.beat)
+                        self.frameslice = 1/self.framesperstep
+                        self.rel_time = INS_REL_TIME*self.rate/1000
+                        if(self.cull == None):
+                            self.cull_gate = None
+                        else:
+                            self.cull_gate = MAX_VAL * 10**(self.cull/20)
+                        self.cull_samps = self.cull_hold*self.rate/1000
+                    # Song chunk
+                    elif(state == SNG):
+                        if(len(line)>0 and not line.isspace()):
+                            self.parseSongLine(line, songSteps,i)
+                        if(i+1>=len(text) or text[i+1][0:3] in HEADERS):
+                            self.songs.append(Song(songSteps,self,songName))   
+                    # Instrument / Module chunk
+                    elif(state == INS or state == MDL):
+                        # Separate the module name / description
+                        name = line.split(":")
+                        name, desc = name[0].strip(), name[1].strip()
+                        # Wave period of instruments, in module steps
+                        period = -1
+                        # Whether the instrument loops
+                        loop = True
+                        # Whether the instrument sustains
+                        sus = False
+                        # Panning module of the instrument
+                        pan = Val(0)
+                        # Parse meta data
+                        if("<" in name):
+                            name = name.split("<")
+                            if(name[1].find(">")<0):
+                                raise SCParseError("Missing '>' in meta tag.",i)
+                            name, meta = name[0].strip(), name[1].split(">")[0].split(",")
+                            for mt in meta:
+                                mt = mt.strip()
+                                # Parse wave period
+                                if(mt.startswith(("period", "PERIOD", "prd", "PRD"))):
+                                    mt = mt.split("=")[1].lstrip()
+                                    period = float(mt)
+                                # Parse looping property (T/F)
+                                elif(mt.startswith(("loop", "LOOP", "l", "L"))):
+                                    mt = mt.split("=")[1].lstrip()
+                                    loop = mt.startswith(("T","t","1"))
+                                # Parse sustain property (T/F)
+                                elif(mt.startswith(("sus", "SUS", "SUSTAIN", "sustain", "s", "S"))):
+                                    mt = mt.split("=")[1].lstrip()
+                                    sus = mt.startswith(("T","t","1"))
+                                # Parse the pan value / load a pan module
+                                elif(mt.startswith(("pan", "PAN"))):
+                                    mt = mt.split("=")[1].lstrip()
+                                    if(mt in self.modules):
+                                        pan = self.modules[mt].clone()
+                                    elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
+                                        invert = False
+                                        if(mt.startswith("-")):
+                                            invert = True
+                                            mt = mt[1:len(mt)]
+                                        num = ""
+                                        while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
+                                            num = num + mt[0]
+                                            mt = mt[1:len(mt)]
+                                        num = float(num)
+                                        pan = Val(num)
+                                        if(invert):
+                                            pan = Invert(pan)
+                                # Loads meta properties from another instrument
+                                elif(mt.startswith(("BASE","base"))):
+                                    mt = mt.split("=")[1].lstrip()
+                                    ins = self.insts[mt]
+                                    if(ins != None):
+                                        period = ins.period
+                                        loop = ins.loop
+                                        sus = ins.sus
+                                        pan = ins.pan.clone()
+                        # Parses the description, either as Inst or Module
+                        if(state == INS):
+                            # Identifies module, for error reporting
+                            self.curParseModule = "INS: " + name
+                            self.insts[name] = Inst(self, self.parseModule(desc, INST, i), period, loop, sus,pan)
+                            self.insts[name].name = name
+                            self.merge_common(self.insts[name])
+                        else:
+                            # Identifies module, for error reporting
+                            self.curParseModule = "MDL: " + name
+                            self.modules[name] = self.parseModule(desc, MDLE, i)
+                    # Block chunk
+                    elif(state == BLK):
+                        # Separate block name / description
+                        name = line.split(":")
+                        name, desc = name[0].strip(), name[1].strip()
+                        # Pan module
+                        pan = Val(0)
+                        # Parse meta data for the block
+                        if("<" in name):
+                            name = name.split("<")
+                            if(name[1].find(">")<0):
+                                raise SCParseError("Missing '>' in meta tag.",i)
+                            name, meta = name[0].strip(), name[1].split(">")[0].split(",")
+                            for mt in meta:
+                                mt = mt.strip()
+                                # Parse pan value / load pan module
+                                if(mt.startswith(("pan", "PAN"))):
+                                    mt = mt.split("=")[1].lstrip()
+                                    if(mt in self.modules):
+                                        pan = self.modules[mt].clone()
+                                    elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
+                                        invert = False
+                                        if(mt.startswith("-")):
+                                            invert = True
+                                            mt = mt[1:len(mt)]
+                                        num = ""
+                                        while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
+                                            num = num + mt[0]
+                                            mt = mt[1:len(mt)]
+                                        num = float(num)
+                                        pan = Val(num)
+                                        if(invert):
+                                            pan = Invert(pan)
+                        # Identifies block, for error reporting
+                        self.curParseModule = "BLOCK: " + name
+                        self.seqs[name] = SeqBlock(self.parseModule(desc,SEQN,i),pan)
+                    # Sequence chunk
+                    elif(state == SEQ):
+                        if(line != "" and not line.isspace()):
+                            # Panning module
+                            pan = Val(0)
+                            # Sequence name
+                            name = line.split(":")[0].strip()
+                            # Parse meta data
+                            if(name.startswith("<")):
+                                name = name[1:len(name)].split(">",1)
+                                if(len(name) < 2):
+                                    raise SCParseError("Missing '>' in meta tag.",i)
+                                name, meta = name[1].strip(), name[0].split(",")
+                                for mt in meta:
+                                    mt = mt.strip()
+                                    # Parse pan value / load pan module
+                                    if(mt.startswith(("pan", "PAN"))):
+                                        mt = mt.split("=")[1].lstrip()
+                                        if(mt in self.modules):
+                                            pan = self.modules[mt].clone()
+                                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
+                                            invert = False
+                                            if(mt.startswith("-")):
+                                                invert = True
+                                                mt = mt[1:len(mt)]
+                                            num = ""
+                                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
+                                                num = num + mt[0]
+                                                mt = mt[1:len(mt)]
+                                            num = float(num)
+                                            pan = Val(num)
+                                            if(invert):
+                                                pan = Invert(pan)
+                            # Identifies module, for error reporting
+                            self.curParseModule = "SEQ: " + name
+                            # Parse the actual sequence data.
+                            # Seq lines start/end with first/last bar in the line.
+                            startInx = line.find("|")
+                            endInx = line.rfind("|")
+                            # Parse the pitch module for this sequence line.
+                            pitch = self.parseModule(name, TONE, i)
+                            # Trim line to sequence data
+                            if(startInx >= 0 and endInx > startInx):
+                                line = line[startInx:endInx]
+                            # Once trimmed, all bars are omitted. Midline bars
+                            # are for visual reference only (i.e. measure lines)
+                            line = line.replace("|", "")
+                            # The sequence pattern
+                            pat = []
+                            # Count variable (probably could do for loop at this point?)
+                            ct = 0
+                            while(ct < len(line)):
+                                # A space indicates silence
+                                if(line[ct] == " "):
+                                    pat.append(None)
+                                # Hyphen indicates we should sustain prev. inst
+                                elif(line[ct] == "-"):
+                                    pat.append("-")
+                                # Inst names represent an attack by that inst
+                                elif(line[ct] in self.insts):
+                                    pat.append(self.insts[line[ct]].clone())
+                                # Raise an Error if we don't recognize the Inst
+                                else:
+                                    raise SCParseError("Unrecognized Instrument in sequence line: " + line[ct],i)
+                                ct += 1
+                            seqLines.append(SeqLine(self, pitch, pat, pan))
+                        # Check if this is the end of Sequence chunk --
+                        # If so, pack up this Sequence & add it to seqs.
+                        if(i+1>=len(text) or text[i+1][0:3] in HEADERS):
+                            self.seqs[seqName] = Sequence(seqLines, self, seqPan)
+            elif(state == SEQ):
+                # Current line is blank, so we are skipping it. However, we still
+                # need to check if it is the end of a Sequence chunk & if so
+                # add the current Sequence to self.seqs
+                if(i+1>=len(text) or text[i+1][0:3] in HEADERS):
+                    self.seqs[seqName] = Sequence(seqLines, self, seqPan)
+            elif(state == SNG):
+                # Current line is blank, but similarly to above, we are checking
+                # to see if it is the end of a Song chunk & if so
+                # add the current Song to self.songs
+                if(i+1>=len(text) or text[i+1][0:3] in HEADERS):
+                    self.songs.append(Song(songSteps,self,songName))
+
+        # Fingerprint the definitions, so imports can be matched up.
+        for mdl in list(self.insts.values()) + list(self.modules.values()):
+            mdl.fingerprint()
+
+    def apply_control(self, mdl, seen=None):
+        """ Wraps the pitch, pan and envelope modules found under the given
+            module in Control modules, per the CONTROL config setting.
+            Constant values are left alone, as is anything in strict mode.
+
+            Arguments:
+            mdl -- Module to search (usually a Song).
+            seen -- Modules already visited; used internally.
+        """
+
+        if(self.control == 0):
+            return
+        if(seen == None):
+            seen = set()
+        if(id(mdl) in seen or isinstance(mdl, Control)):
+            return
+        seen.add(id(mdl))
+        period = self.control
+        if(period < 0):
+            period = self.framesperstep
+        attrs = []
+        if(isinstance(mdl, SeqLine)):
+            attrs = ["pitch", "pan"]
+        elif(isinstance(mdl, (Sequence, SeqBlock, Inst))):
+            attrs = ["pan"]
+        elif(isinstance(mdl, Envelope)):
+            attrs = ["b"]
+        for attr in attrs:
+            sub = getattr(mdl, attr)
+            if(isinstance(sub, SCModule) and not isinstance(sub, (Val, StereoVal, Control))):
+                setattr(mdl, attr, Control(sub, period, self.control_lerp))
+                mdl.own(getattr(mdl, attr))
+        for sub in mdl.children():
+            self.apply_control(sub, seen)
+
+    def share_song_time(self, song):
+        """ Wraps the song-time modules of the Song's voices (the envelope
+            modules of Envelopes, and the inputs of Consts) in SongTaps, so
+            voices whose notes start on the same sample step one copy of each
+            between them. See SongTap.
+
+            Only modules found in the Insts of two or more sequence lines are
+            wrapped, as others never play at once. Modules that can't be
+            shared are left alone (see song_timed()).
+
+            Arguments:
+            song -- The Song to process.
+        """
+
+        found = []
+        lines = dict()
+        stack = [(song, None)]
+        seen = set()
+        while(len(stack) > 0):
+            mdl, line = stack.pop()
+            if(id(mdl) in seen):
+                continue
+            seen.add(id(mdl))
+            if(isinstance(mdl, SeqLine)):
+                line = mdl
+            field = None
+            if(type(mdl) == Envelope):
+                field = "b"
+            elif(type(mdl) == Const):
+                field = "mdl"
+            skip = None
+            if(field != None and line != None):
+                # (if it's wrapped, nothing in it is)
+                skip = getattr(mdl, field)
+                owner, sub = mdl, skip
+                # Controls step their input in one go, the same for all voices
+                if(type(sub) == Control):
+                    owner, field, sub = sub, "mdl", sub.mdl
+                if(song_timed(sub)):
+                    found.append((owner, field, sub))
+                    fp = sub.fingerprint()
+                    if(fp in lines):
+                        lines[fp].add(id(line))
+                    else:
+                        lines[fp] = {id(line)}
+                else:
+                    skip = None
+            for kid in mdl.children():
+                if(kid is not skip):
+                    stack.append((kid, line))
+        for owner, field, sub in found:
+            if(len(lines[sub.fingerprint()]) > 1):
+                setattr(owner, field, SongTap(sub, self.sharing))
+                owner.own(getattr(owner, field))
+
+    def merge_common(self, inst):
+        """ Common-subexpression elimination for an Inst's module graph.
+
+            Looks for identical modules that are stepped in lockstep, as when
+            the same instrument is layered with different pans or levels. The
+            first copy (in the order they are stepped) is wrapped in a
+            CommonLead, and the rest are replaced by CommonTaps reading it.
+
+            Whether two modules are stepped the same way is worked out through
+            their parents' cse_links(), down from the Inst: each module gets a
+            context, which is shared with its parent's if it is stepped just as
+            the parent is, and is otherwise made from the parent's context and
+            its timing key (see module_key()). Copies are merged only if they
+            have the same context; anywhere their timing could differ, they
+            keep their own state.
+
+            Arguments:
+            inst -- The Inst to process.
+        """
+
+        keys = dict()
+        times = dict()
+        groups = dict()
+        order = []
+        stack = [(inst.mdl, ("inst",), inst, "mdl", None)]
+        while(len(stack) > 0):
+            entry = stack.pop()
+            mdl, ctx = entry[0], entry[1]
+            # constants and tables are no cheaper to read through a tap
+            if(const_value(mdl) == None and not isinstance(mdl, (Val, StereoVal, Table, CommonLead, CommonTap))):
+                key = module_key(mdl, keys)
+                if(key != None):
+                    key = (ctx, key)
+                    if(key in groups):
+                        groups[key].append(entry)
+                    else:
+                        groups[key] = [entry]
+                        order.append(key)
+            links = mdl.cse_links()
+            timing = None
+            if(len(links) > 0):
+                timing = module_key(mdl, times, True)
+            lead = None
+            for field, how in links:
+                if(how == "same"):
+                    lead = module_key(timing_core(getattr(mdl, field)), times, True)
+            subs = []
+            for field, how in links:
+                sub = getattr(mdl, field)
+                if(type(sub) == list):
+                    items = list(enumerate(sub))
+                elif(isinstance(sub, SCModule)):
+                    items = [(None, sub)]
+                else:
+                    continue
+                for i, sub in items:
+                    if(how == "same"):
+                        subs.append((sub, ctx, mdl, field, i))
+                    elif(timing == None):
+                        # we can't tell how it's stepped
+                        continue
+                    elif(how == "trail" and lead != None and module_key(timing_core(sub), times, True) == lead):
+                        # it finishes with the lead, so it's never reset early
+                        subs.append((sub, ctx, mdl, field, i))
+                    else:
+                        subs.append((sub, (ctx, timing, field, i), mdl, field, i))
+            # pushed in reverse, so modules come off the stack in step order
+            stack.extend(reversed(subs))
+        merged = set()
+        for key in order:
+            group = [entry for entry in groups[key] if id(entry[0]) not in merged]
+            if(len(group) < 2):
+                continue
+            for entry in group:
+                todo = [entry[0]]
+                while(len(todo) > 0):
+                    mdl = todo.pop()
+                    merged.add(id(mdl))
+                    todo.extend(mdl.children())
+            common = Common(group[0][0])
+            for i in range(len(group)):
+                mdl, ctx, parent, field, inx = group[i]
+                if(i == 0):
+                    sub = CommonLead(common)
+                else:
+                    sub = CommonTap(common)
+                if(inx == None):
+                    setattr(parent, field, sub)
+                else:
+                    getattr(parent, field)[inx] = sub
+                parent.own(sub)
+
+    def mark_song(self, song, timeline):
+        """ Returns a copy of the Song with each Inst in its sequence lines
+            replaced by a NoteMark noting events in the given Timeline. Pitch
+            and pan Controls are applied to the copy, as render() would.
+
+            Arguments:
+            song -- The Song to copy.
+            timeline -- The Timeline for the NoteMarks.
+        """
+
+        copy = Song([p.clone() for p in song.pat], self, song.name)
+        self.apply_control(copy)
+        stack = [copy]
+        seen = set()
+        while(len(stack) > 0):
+            mdl = stack.pop()
+            if(id(mdl) in seen):
+                continue
+            seen.add(id(mdl))
+            if(isinstance(mdl, SeqLine)):
+                timeline.add_line(mdl)
+                for i in range(len(mdl.pat)):
+                    ins = mdl.pat[i]
+                    if(isinstance(ins, Inst)):
+                        voice = None
+                        # Insts with Sets make random choices as they play
+                        if(not ins.loop or ins.sus or has_sets(ins)):
+                            voice = ins
+                        mark = NoteMark(timeline, mdl, ins.name, voice)
+                        if(mdl.curInst is ins):
+                            mdl.curInst = mark
+                        mdl.pat[i] = mark
+            else:
+                # pushed in reverse, so lines are listed in song order
+                stack.extend(reversed(mdl.children()))
+        return copy
+
+    def measure_song(self, song):
+        """ Works out exactly how many samples the Song will render to, tails
+            included, with a timing pass: a copy marked up as in
+            compile_song() is played through to the end, without making any
+            sound for the notes of looping Insts. Other Insts are played as
+            voices, but only read if that can change their timing.
+
+            The pass only steps the copy, unless reading it can change its
+            timing or make random choices (see play_marked()). Random choices
+            are made from the same random state as the render will start
+            from, so Sets choose the same way in both. Returns None (the
+            length can't be known up front) if CULL is set, as tails are then
+            dropped by how they sound. Call this before rendering the Song.
+
+            Arguments:
+            song -- The Song to measure.
+        """
+
+        if(self.cull_gate != None):
+            return None
+        state = random.getstate()
+        timeline = Timeline(song.name, self.rate, self.rel_time)
+        copy = self.mark_song(song, timeline)
+        random.setstate(state)
+        reads = False
+        stack = [copy]
+        seen = set()
+        while(len(stack) > 0):
+            mdl = stack.pop()
+            if(id(mdl) in seen):
+                continue
+            seen.add(id(mdl))
+            if(isinstance(mdl, SeqLine)):
+                # Voices are timed by the pitches the line's reads give
+                # them. If the pitch is a constant, they're given it up
+                # front; the voices themselves are only read if that can
+                # change their timing. Pitch & pan modules are reset as
+                # they're read, which may make random choices; otherwise
+                # they only change what the NoteMarks would play.
+                pitch = const_value(mdl.pitch)
+                voices = False
+                for mark in mdl.pat:
+                    if(isinstance(mark, NoteMark) and mark.voice != None):
+                        mark.read_voice = has_timed_reads(mark.voice)
+                        if(not mark.read_voice):
+                            self.untime_voice(mark.voice)
+                        if(mark.read_voice or pitch == None):
+                            voices = True
+                        else:
+                            mark.set_pitch(pitch+mdl.transpose)
+                if(voices or has_sets(mdl.pitch) or has_sets(mdl.pan)):
+                    reads = True
+                else:
+                    if(pitch == None):
+                        mdl.pitch = Val(0)
+                    mdl.pan = Val(0)
+                continue
+            if(isinstance(mdl, (Sequence, SeqBlock))):
+                # (the same goes for Sequence-level pans)
+                if(has_sets(mdl.pan)):
+                    reads = True
+                else:
+                    mdl.pan = Val(0)
+            elif(reads_time(mdl)):
+                reads = True
+            for sub in mdl.children():
+                if(not (isinstance(mdl, (Sequence, SeqBlock)) and sub is mdl.pan)):
+                    stack.append(sub)
+        samps = self.play_marked(copy, timeline, reads)
+        # leave the render to make the same random choices
+        random.setstate(state)
+        return samps
+
+    def untime_voice(self, voice):
+        """ Swaps the input of each Envelope in a voice for a silent module
+            that never finishes. An Envelope's timing is set by its envelope
+            module alone, so this leaves the voice's timing as it was, while
+            sparing measure_song() from stepping the waveforms. Inputs with
+            Sets are kept, to make the same random choices.
+
+            Arguments:
+            voice -- The voice (an Inst), which must not be read.
+        """
+
+        stack = [voice]
+        while(len(stack) > 0):
+            mdl = stack.pop()
+            if(type(mdl) == Envelope and not has_sets(mdl.a)):
+                mdl.a = Val(0, float("inf"))
+                mdl.own(mdl.a)
+            stack.extend(mdl.children())
+
+    def play_marked(self, copy, timeline, reads=True):
+        """ Plays a Song copy from mark_song() through to the end, as
+            render() would, and returns how many samples it took.
+
+            Arguments:
+            copy -- The Song copy.
+            timeline -- Its Timeline, which is kept up to date with the sample
+                    being played.
+            reads -- Whether the copy has to be read. If not, it is only
+                    stepped, which is quicker.
+        """
+
+        samps = 0
+        while(not copy.done()):
+            quiet = float("inf")
+            if(reads):
+                quiet = copy.silent_for()
+            if(quiet > 1):
+                n = 0
+                while(n < quiet):
+                    timeline.now = samps
+                    copy.step(1)
+                    n += 1
+                    samps += 1
+                    if(copy.done()):
+                        break
+            else:
+                timeline.now = samps
+                copy.read(stereo=self.stereo,signal=True)
+                copy.step(1)
+                samps += 1
+        return samps
+
+    def compile_song(self, song):
+        """ Plays through a copy of the Song without synthesizing its notes,
+            and returns a Timeline of the notes played (see Timeline).
+
+            Each Inst in the copy's sequence lines is replaced by a NoteMark.
+            The copy is stepped and read just as render() does it, so notes
+            land on the samples they will be rendered on. Random choices (Sets)
+            are made afresh, though, so songs using them may come out
+            differently. Call this before rendering the Song.
+
+            Arguments:
+            song -- The Song to compile.
+        """
+
+        # leave the random choices of the render as they would have been
+        state = random.getstate()
+        timeline = Timeline(song.name, self.rate, self.rel_time)
+        copy = self.mark_song(song, timeline)
+        timeline.finish(self.play_marked(copy, timeline))
+        random.setstate(state)
+        return timeline
+
+    def compile(self, filepath=None):
+        """ Writes the Timeline of each Song to a JSON file (see
+            compile_song() and Timeline.to_json()), named as render() names
+            its Wave files. Nothing is rendered.
+
+            Arguments:
+            filepath -- Folder to write to. Defaults to same path as src file
+        """
+
+        if(filepath == None):
+            filepath = self.path
+        for song in self.songs:
+            if(song.name == ""):
+                fname = self.srcname + ".json"
+            else:
+                fname = song.name + ".json"
+            print("COMPILING SONG: " + fname)
+            self.apply_control(song)
+            timeline = self.compile_song(song)
+            out = open(filepath + fname, "w")
+            out.write(timeline.to_json())
+            out.close()
+            print("Notes: " + str(len(timeline.notes)))
+
+    def render(self, filepath=None):
+        """ Renders the Song into a Wave file.
+
+            Arguments:
+            filepath -- File path to render to. Defaults to same path as src file
+        """
+
+        # Take note of current time; to use for the whole batch.
+        totalStartTime = time.perf_counter()
+            
+        if(filepath == None):
+            filepath = self.path
+
+        if(len(self.songs) > 1):
+            print("Rendering " + str(len(self.songs)) + " songs.")
+        sngcount = 0
+        for song in self.songs:
+            sngcount += 1
+            
+            # Take note of the time before we begin.
+            startTime = time.perf_counter()
+            # Drop curves baked for earlier songs, so they aren't held all batch.
+            self.baked.clear()
+            # Open our output file.
+            if(song.name == ""):
+                fname = self.srcname + ".wav"
+            else:
+                fname = song.name + ".wav"
+            print("RENDERING SONG " + str(sngcount) + "/" + str(len(self.songs)) + ": " + fname)
+            out = wave.open(filepath + fname, 'wb')
+
+            # Set the number of channels in output file.
+            if(self.stereo):
+                out.setnchannels(2)
+            else:
+                out.setnchannels(1)
+            # Set sample width (in bytes)
+            out.setsampwidth(int(self.depth/8))
+            # Set sample rate
+            out.setframerate(self.rate)
+            # Decay added to the end of the song, in samples
+            decay = int(0.001*self.rate)
+            # Note song length (for process monitoring)
+            self.apply_control(song)
+            snglen = self.measure_song(song)
+            if(snglen != None):
+                # The length is exact, so the WAV header can be written up front.
+                out.setnframes(snglen+decay)
+                sampinfo = str(snglen)
+            else:
+                # ** Depending on modules in the song, this might not be accurate. **
+                snglen = song.length()
+                sampinfo = str(int(snglen)+1) + " (estimated)"
+            self.share_song_time(song)
+            self.culled = 0
+            # Print song size info
+            print("Song Duration: " + str(int(snglen/self.rate*100)/100))
+            print("Song Sample Length: " + sampinfo)
+            # Total number of samples we have processed so far.
+            samps = 0
+            # Process chunk counter for whether we should update progress info
+            count = 0
+            # List of rendered frames.
+            frames = []
+            # List of pre-normalized frames.
+            prenorm = []
+            # Current peak value (for normalization)
+            peak = 0
+            # Value of the last read sample. (We use this after the render loop
+            # to add decay, so it can't be declared within the loop.)
+            dec = -1
+            # Maximum signal absolute value
+            maxI = 2**(self.depth-1)-1
+            # Express max as a ratio of parser MAX_VAL; to save computations
+            max = maxI / MAX_VAL
+            # Number of bytes in audio file depth.
+            bytes = int(self.depth/8)
+            # Whether WAV values are signed or unsigned
+            sgned = bytes!=1
+
+            # Bytes for one frame of silence, for skipping silent stretches.
+            zero = int(max*limit(0))
+            if(bytes == 1):
+                zero += maxI
+            zero = zero.to_bytes(bytes, byteorder="little", signed=sgned)
+            if(self.stereo):
+                zero = zero*2
+
+            # Main render loop
+            while(not song.done()):
+                # Fast path: if nothing can sound for a while, write a block
+                # of silence and only step the song.
+                quiet = song.silent_for()
+                if(quiet > 1):
+                    n = 0
+                    while(n < quiet):
+                        song.step(1)
+                        n += 1
+                        if(song.done()):
+                            break
+                    if(not self.normalize):
+                        frames.append(zero*n)
+                    elif(self.stereo):
+                        prenorm.extend([[0,0]]*n)
+                    else:
+                        prenorm.extend([0]*n)
+                    if(self.stereo):
+                        dec = [0,0]
+                    else:
+                        dec = 0
+                    count += n
+                    samps += n
+                else:
+                    # Read & Render next sample for stereo songs
+                    if(self.stereo):
+                        dec = song.read(stereo=True,signal=True)
+                        # Render without normalizing
+                        if(not self.normalize):
+                            valL = int(max*limit(dec[0]))
+                            valR = int(max*limit(dec[1]))
+                            if(bytes == 1):
+                                valL += maxI
+                                valR += maxI
+                            valL = valL.to_bytes(bytes, byteorder="little", signed=sgned)
+                            valR = valR.to_bytes(bytes, byteorder="little", signed=sgned)
+                            frames.append(valL)
+                            frames.append(valR)
+                        # Normalize ON -- read frame & prepare for normalizing
+                        else:
+                            if(abs(dec[0])>peak):
+                                peak = abs(dec[0])
+                            if(abs(dec[1])>peak):
+                                peak = abs(dec[1])
+                            prenorm.append(dec)
+                    # Render the next sample for mono songs.
+                    else:
+                        dec = song.read(stereo=False,signal=True)
+                        # Render without normalizing
+                        if(not self.normalize):
+                            val = int(max*limit(dec))
+                            if(bytes == 1):
+                                val += maxI
+                            val = val.to_bytes(bytes, byteorder="little", signed=sgned)
+                            frames.append(val)
+                        # Normalize ON -- Read sample & prepare for normalization
+                        else:
+                            if(abs(dec)>peak):
+                                peak = abs(dec)
+                            prenorm.append(dec)
+                    song.step(1)
+                    count += 1
+                    samps += 1
+
+                # Every 512 frames, update progress counter.
+                if(count > 512):
+                    elp = time.perf_counter()-startTime
+                    self.show_progress(samps, snglen, elp)
+                    count = 0
+            # If we're normalizing, we need to scale everything now that we know
+            # the final peak value
+            if(self.normalize):
+                # Calculate ratio between peak value & signal maximum
+                # All frames will be scaled by this
+                rtio = (MAX_VAL * 0.9999) / peak
+                for sp in prenorm:
+                    # Normalize & render for stereo songs
+                    if(self.stereo):
+                        dec = [sp[0]*rtio,sp[1]*rtio]
+                        valL = int(dec[0]*max)
+                        valR = int(dec[1]*max)
+                        if(bytes == 1):
+                            valL += maxI
+                            valR += maxI
+                        valL = valL.to_bytes(bytes, byteorder="little", signed=sgned)
+                        valR = valR.to_bytes(bytes, byteorder="little", signed=sgned)
+                        frames.append(valL)
+                        frames.append(valR)
+                    # Normalize & render for mono songs
+                    else:
+                        dec = sp*rtio
+                        val = int(dec*max)
+                        if(bytes == 1):
+                            val += maxI
+                        val = val.to_bytes(bytes, byteorder="little", signed=sgned)
+                        frames.append(val)
+            # Add a bit of decay to the end of the song, to avoid popping.
+            for i in range(decay):
+                # Scalar to fade the sample out as i approaches decay.
+                tmp = 1-(i/decay)
+                # Calculate & render decay for stereo songs
+                if(self.stereo):
+                    tmp = [dec[0]*tmp,dec[1]*tmp]
+                    valL = int(max*tmp[0])
+                    valR = int(max*tmp[1])
+                    if(bytes == 1):
+                        valL += maxI
+                        valR += maxI
+                    valL = valL.to_bytes(bytes, byteorder="little", signed=sgned)
+                    valR = valR.to_bytes(bytes, byteorder="little", signed=sgned)
+                    frames.append(valL)
+                    frames.append(valR)
+                # Calculate & render decay for mono songs
+                else:
+                    tmp *= dec
+                    val = int(max*dec)
+                    if(bytes == 1):
+                        val += maxI
+                    val = val.to_bytes(bytes, byteorder="little", signed=sgned)
+                    frames.append(val)
+
+            # One last update to progress printouts -- so we end on 100%.
+            self.show_progress(samps, snglen, elp, True)
+
+            # Write all rendered samples to the WAV file & close it.
+            out.writeframes(b''.join(frames))
+            out.close()
+
+            # We're done! Print how long it took.
+            renderTime = time.perf_counter()-startTime
+            print("\nSONG RENDER TIME: " + str(int(renderTime*100)/100) + "                        ")
+            if(self.cull != None):
+                print("Culled tails: " + str(self.culled))
+        self.baked.clear()
+        print("BATCH COMPLETE!")
+        renderTime = time.perf_counter()-totalStartTime
+        print("TOTAL RENDER TIME: " + str(int(renderTime*100)/100))
+
+    def show_progress(self, samps, snglen, elp, full=False):
+        """ Prints the render progress line.
+
+            Arguments:
+            samps -- Number of samples rendered so far.
+            snglen -- Song length, in samples.
+            elp -- Time elapsed, in seconds.
+            full -- If true, the progress bar is drawn full.
+        """
+
+        sys.stdout.write("\r")
+        ppct = samps/snglen
+        sys.stdout.write("PROGRESS: " + '{:>5}'.format(str(int(ppct*10000)/100)))
+        sys.stdout.write(" : RATE: " + '{:>9}'.format(str(int(samps/elp*100)/100)))
+        sys.stdout.write(" : [")
+        i = -0.015
+        while(i < 1):
+            i += 0.05
+            if(full or ppct >= i):
+                sys.stdout.write("*")
+            else:
+                sys.stdout.write(" ")
+        sys.stdout.write("]")
+        sys.stdout.flush()
+
+    def parseModule(self, stng, type, line=0):
+        """ Parses a SynthCorona module from a string.
+
+            This is the method to use if you have a full description string to
+            parse. This uses popModule to isolate operands in binary operations
+            & then wraps them in operator modules as necessary.
+
+            In this method, binary operators are parsed left-to-right, which is in
+            turn the only order of operations in Synth-Corona.
+            So A+B*C = (A+B)*C != A+(B*C)
+
+            Use any grouping module (Pattern, Set, Series) to change the order of
+            operations if necessary.
+
+            Previously created modules/Insts/Sequences can be referenced by
+            name. They will be copied into the new module via clone().
+
+            Arguments:
+            stng -- String containing the module description.
+            type -- Tells us what the module is for. Options: INST, TONE, SEQN, MDLE
+            line -- Current parser line; for error reporting.
+
+            Returns the SynthCorona module.
+        """
+
+        # Parses the first standalone module & sends us [mdl, remaining string]
+        modA = self.popModule(stng, type,line)
+        modA, stng = modA[0], modA[1]
+
+        # Now loop through additional operators & modules until we reach end of line.
+        while(stng != "" and not stng.isspace()):
+            # Whether modA needs to be wrapped in a Cross module.
+            cross = False
+            # Constant-rate indicator. -1 means skip; Any positive value is read as
+            # the rate value for a Const module.
+            const = -1
+            # If const != -1, this indicates whether our Const module should loop.
+            cloop = False
+            # Attack value for constant module
+            catk = 0
+            # Release value for constant module
+            crels = -1
+            # The operator string
+            op = stng.lstrip()[0]
+            stng = stng[1:len(stng)].lstrip()
+
+            if(op == "c"):
+                op = stng[0]
+                stng = stng[1:len(stng)].lstrip()
+                const = 1                
+                # Const currently offers 4 meta tags:
+                #     RATE, R - Playback rate modifier
+                #     LOOP, L - Whether to loop the module
+                #     ATK - Looping attack point
+                #     REL - Looping release point
+                if(len(stng)>0 and stng[0] == "<"):
+                    meta = self.parseMeta(stng,line)
+                    meta, stng = meta[0], meta[1]
+                    #meta = meta[1:len(meta)-1].strip().split(",")
+                    for mt in meta:
+                        if(mt.startswith(("REL","rel"))):
+                            mt = mt.split("=")[1].strip()
+                            crels = float(mt)
+                            if(crels == None or crels <= 0):
+                                crels = -1
+                        elif(mt.startswith(("R", "r", "RATE", "rate"))):
+                            const = float(mt.split("=")[1])
+                            if(const == None or const < 1):
+                                const = 1
+                        elif(mt.startswith(("L", "l", "LOOP", "loop"))):
+                            mt = mt.split("=")[1].strip()
+                            cloop = mt.startswith(("T","t","1"))
+                        elif(mt.startswith(("ATK","atk","ATTACK","attack"))):
+                            mt = mt.split("=")[1].strip()
+                            catk = float(mt)
+                            if(catk == None or catk < 0):
+                                catk = 0
+                                
+            # x indicates a Cross module; flag Cross & carry on
+            if(op == "x"):
+                op = stng[0]
+                stng = stng[1:len(stng)].lstrip()
+                cross = True
+            
+            # Separate out any meta data for the given operation.
+            meta = self.parseMeta(stng,line)
+            meta, stng = meta[0], meta[1]
+
+            # Pop the second operand.
+            mdl = self.popModule(stng, type, line)
+            mdl, stng = mdl[0], mdl[1]
+
+            # Match up our binary operator & wrap them all into a module
+            # + indicates Addition
+            if(op == "+"):                        # addition
+                alead = True
+                for mt in meta:
+                    if(mt.startswith(("LEAD","LD","lead","ld"))):
+                        mt = mt.split("=")[1]
+                        alead = not (mt.startswith("B") or mt.startswith("b"))
+                if(alead and const_value(mdl) != None):
+                    modA = Offset(modA, const_value(mdl))
+                else:
+                    modA = Add(modA, mdl, alead)
+            # - indicates Subtraction
+            elif(op == "-"):                        # subtraction
+                alead = True
+                for mt in meta:
+                    if(mt.startswith(("LEAD","LD","lead","ld"))):
+                        mt = mt.split("=")[1]
+                        alead = not (mt.startswith("B") or mt.startswith("b"))
+                modA = Subtract(modA, mdl,alead)
+            # r indicates Repetition
+            elif(op == "r"):                        # repetition
+                atk = 0
+                rels = -1
+                for mt in meta:
+                    if(mt.startswith(("REL","rel"))):
+                        mt = mt.split("=")[1].strip()
+                        rels = float(mt)
+                        if(rels == None or rels <= 0):
+                            rels = -1
+                    elif(mt.startswith(("ATK","atk","ATTACK","attack"))):
+                        mt = mt.split("=")[1].strip()
+                        atk = float(mt)
+                        if(atk == None or atk < 0):
+                            atk = 0
+                modA = Repeat(modA, mdl, atk, rels)
+            # * indicates Multiplication.
+            elif(op == "*"):                        # multiplication
+                alead = True
+                for mt in meta:
+                    if(mt.startswith(("LEAD","LD","lead","ld"))):
+                        mt = mt.split("=")[1]
+                        alead = not (mt.startswith("B") or mt.startswith("b"))
+                if(alead and const_value(mdl) != None):
+                    modA = Gain(modA, const_value(mdl))
+                else:
+                    modA = Multiply(modA, mdl, alead)
+            # / indicates Division.
+            elif(op == "/"):                        # division
+                alead = True
+                for mt in meta:
+                    if(mt.startswith(("LEAD","LD","lead","ld"))):
+                        mt = mt.split("=")[1]
+                        alead = not (mt.startswith("B") or mt.startswith("b"))
+                modA = Divide(modA, mdl)
+            # % indicates Modulus.
+            elif(op == "%"):                        # modulus
+                alead = True
+                for mt in meta:
+                    if(mt.startswith(("LEAD","LD","lead","ld"))):
+                        mt = mt.split("=")[1]
+                        alead = not (mt.startswith("B") or mt.startswith("b"))
+                modA = Modulus(modA, mdl)
+            # i indicates Interpolation.
+            elif(op == "i"):
+                width = Val(1)
+                for mt in meta:
+                    # Width is the duration of the interpolation.
+                    if(mt.startswith(("WID", "WIDTH", "w", "W"))):
+                        mt = mt.split("=")[1]
+                        if(mt in self.modules):
+                            width = self.modules[mt].clone()
+                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
+                            invert = False
+                            if(mt.startswith("-")):
+                                invert = True
+                                mt = mt[1:len(mt)]
+                            num = ""
+                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
+                                num = num + mt[0]
+                                mt = mt[1:len(mt)]
+                            num = float(num)
+                            width = Val(num)
+                            if(invert):
+                                width = Invert(width)
+                        #mt = mt.split("=")[1]
+                        #width = float(mt)
+                        #if(width == None or width <= 0):
+                        #    width = 1
+                modA = LinInterp(modA, mdl, width)
+            # l indicates Level/Volume. 0 is silent, 9 is max, -x is inverted.
+            elif(op == "l"):
+                alead = True
+                for mt in meta:
+                    if(mt.startswith(("LEAD","LD","lead","ld"))):
+                        mt = mt.split("=")[1]
+                        alead = not (mt.startswith("B") or mt.startswith("b"))
+                if(alead and const_value(mdl) != None):
+                    modA = Gain(modA, as_decimal(const_value(mdl)))
+                else:
+                    modA = Level(modA, mdl, alead)
+            # v indicates an Envelope. This applies volume control in constant time.
+            elif(op == "v"):
+                rate = 1
+                loop = False
+                atk = 0
+                rels = -1
+                for mt in meta:
+                    if(mt.startswith(("REL","rel"))):
+                        mt = mt.split("=")[1].strip()
+                        rels = float(mt)
+                        if(rels == None or rels <= 0):
+                            rels = -1
+                    elif(mt.startswith(("R","r","RATE","rate"))):
+                        mt = mt.split("=")[1].strip()
+                        rate = float(mt)
+                        if(rate == None or rate <= 0):
+                            rate = 1
+                    elif(mt.startswith(("L","l","LOOP","loop"))):
+                        mt = mt.split("=")[1].strip()
+                        loop = mt.startswith(("T","t","1"))
+                    elif(mt.startswith(("ATK","atk","ATTACK","attack"))):
+                        mt = mt.split("=")[1].strip()
+                        atk = float(mt)
+                        if(atk == None or atk < 0):
+                            atk = 0
+                modA = Envelope(modA, mdl,
+                        (self.tempo*self.beat)/(60*self.rate)*rate,loop,atk,rels)
+                modA.baked = self.baked
+            # s indicates Speed/Playback rate. This is applied to constant time
+            # updates as well, so it does affect pitch!
+            elif(op == "s"):
+                alead = True
+                for mt in meta:
+                    if(mt.startswith(("LEAD","LD","lead","ld"))):
+                        mt = mt.split("=")[1]
+                        alead = not (mt.startswith("B") or mt.startswith("b"))
+                if(alead and const_value(mdl) != None):
+                    modA = FixedSpeed(modA, const_value(mdl))
+                else:
+                    modA = Speed(modA, mdl, alead)
+            # n indicates Length override.
+            elif(op == "n"):
+                modA = Length(modA, mdl)
+            elif(op == "j"):
+                modA = Release(modA, mdl)
+            elif(op == "k"):
+                modA = Attack(modA, mdl)
+            elif(op == "m"):                        # clip
+                alead = True
+                knee = Val(0)
+                for mt in meta:
+                    if(mt.startswith(("LEAD","LD","lead","ld"))):
+                        mt = mt.split("=")[1]
+                        alead = not (mt.startswith("B") or mt.startswith("b"))
+                    if(mt.startswith(("KNEE","knee","KN","kn"))):
+                        mt = mt.split("=")[1]
+                        if(mt in self.modules):
+                            knee = self.modules[mt].clone()
+                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
+                            invert = False
+                            if(mt.startswith("-")):
+                                invert = True
+                                mt = mt[1:len(mt)]
+                            num = ""
+                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
+                                num = num + mt[0]
+                                mt = mt[1:len(mt)]
+                            num = float(num)
+                            knee = Val(num)
+                            if(invert):
+                                knee = Invert(knee)
+                modA = Limit(modA, mdl, alead, knee)
+            # y is a Delay; u is a multi-tap Delay, with TAPS & GAINS lists.
+            elif(op == "y" or op == "u"):
+                wet = Val(1)
+                dry = Val(1)
+                fdbk = Val(0)
+                taps = [1]
+                gains = []
+                for mt in meta:
+                    if(mt.startswith(("TAPS","taps","TP","tp"))):
+                        mt = mt.split("=")[1]
+                        taps = [float(t) for t in mt.split(";") if t.strip() != ""]
+                    elif(mt.startswith(("GAINS","gains","GN","gn"))):
+                        mt = mt.split("=")[1]
+                        gains = [float(g) for g in mt.split(";") if g.strip() != ""]
+                    elif(mt.startswith(("WET","wet"))):
+                        mt = mt.split("=")[1]
+                        if(mt in self.modules):
+                            wet = self.modules[mt].clone()
+                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
+                            invert = False
+                            if(mt.startswith("-")):
+                                invert = True
+                                mt = mt[1:len(mt)]
+                            num = ""
+                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
+                                num = num + mt[0]
+                                mt = mt[1:len(mt)]
+                            num = float(num)
+                            wet = Val(num)
+                            if(invert):
+                                wet = Invert(wet)            
+                    elif(mt.startswith(("DRY","dry"))):
+                        mt = mt.split("=")[1]
+                        if(mt in self.modules):
+                            dry = self.modules[mt].clone()
+                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
+                            invert = False
+                            if(mt.startswith("-")):
+                                invert = True
+                                mt = mt[1:len(mt)]
+                            num = ""
+                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
+                                num = num + mt[0]
+                                mt = mt[1:len(mt)]
+                            num = float(num)
+                            dry = Val(num)
+                            if(invert):
+                                dry = Invert(knee)
+                    elif(mt.startswith(("FEEDBACK","FDBK","feedback","fdbk","FD","fd"))):
+                        mt = mt.split("=")[1]
+                        if(mt in self.modules):
+                            fdbk = self.modules[mt].clone()
+                        elif(mt != "" and (mt[0].isnumeric() or mt[0]=="." or mt[0]=="-")):
+                            invert = False
+                            if(mt.startswith("-")):
+                                invert = True
+                                mt = mt[1:len(mt)]
+                            num = ""
+                            while(len(mt)>0 and (mt[0].isnumeric() or mt[0] == ".")):
+                                num = num + mt[0]
+                                mt = mt[1:len(mt)]
+                            num = float(num)
+                            fdbk = Val(num)
+                            if(invert):
+                                fdbk = Invert(fdbk)
+                fpstp = (60*self.rate)/(self.tempo*self.beat)
+                if(op == "u"):
+                    if(len(taps) == 0):
+                        raise SCParseError("Multi-tap delay needs at least one tap.",line)
+                    modA = MultiTap(modA,mdl,fpstp,taps,gains,fdbk,wet,dry)
+                else:
+                    modA = Delay(modA,mdl,fpstp,fdbk,wet,dry)
+                if(self.cull_gate != None):
+                    modA.quietgate = self.cull_gate
+                    modA.quiethold = self.cull_samps
+                    modA.parent = self
+            # h is a Reverb, with B as the decay time.
+            elif(op == "h"):
+                size = 1
+                wet = Val(0.3)
+                dry = Val(1)
+                for mt in meta:
+                    if(mt.startswith(("SIZE","size","SZ","sz"))):
+                        mt = mt.split("=")[1].strip()
+                        size = float(mt)
+                        if(size <= 0):
+                            size = 1
+                    elif(mt.startswith(("WET","wet"))):
+                        wet = self.metaModule(mt.split("=")[1])
+                    elif(mt.startswith(("DRY","dry"))):
+                        dry = self.metaModule(mt.split("=")[1])
+                fpstp = (60*self.rate)/(self.tempo*self.beat)
+                modA = Reverb(modA,mdl,fpstp,self.rate,size,wet,dry)
+                if(self.cull_gate != None):
+                    modA.quietgate = self.cull_gate
+                    modA.quiethold = self.cull_samps
+                    modA.parent = self
+            elif(op == "p"):
+                alead = True
+                for mt in meta:
+                    if(mt.startswith(("LEAD","LD","lead","ld"))):
+                        mt = mt.split("=")[1]
+                        alead = not (mt.startswith("B") or mt.startswith("b"))
+                if(alead and const_value(mdl) != None):
+                    modA = FixedPitch(modA, const_value(mdl))
+                else:
+                    modA = Pitch(modA, mdl, alead)
+                                 
+            # If we need to, wrap the operation module in a Cross module.
+            if(cross):
+                modA = Cross(modA)
+                # If we need to, wrap the operation module in a Const module.
+            if(const>0):
+                modA = Const(modA,(self.tempo*self.beat)/(60*self.rate),const,cloop,catk,crels)
+        return modA
+
+    def popModule(self, stng, type, line=0):
+        """ 'Pops' the first fully-described module off the front of the given
+            string and parses it.
+            This method handles parsing of all modules except binary operators,
+            which are handled by parseModule(). Given a string describing a
+            binary operation, this method will parse the first operand.
+            This method is called by parseModule() & is mostly intended to reduce
+            code repetition within that method.
+            Keyword arguments:
+            stng -- String containing the full module description.
+            type -- Tells us what this module is for. Options: INST, TONE, SEQN, MDLE.
+            line -- Current parser line; for error reporting.
+            Returns a 2-tuple: (parsed first module, remaining string).
+        """
+
+        # The module we're parsing.
+        modA = None
+        # Whether we will need to wrap with an Invert (indicated by a '-')
+        invert = False
+        # Whether we will need to wrap with an Absolute value (indicated by a 't')
+        absolute = False
+        # Constant-rate indicator. -1 means skip; Any positive value is read as
+        # the rate value for a Const module.
+        const = -1
+        # If const != -1, this indicates whether our Const module should loop.
+        cloop = False
+        # Attack value for constant module
+        catk = 0
+        # Release value for constant module
+        crels = -1
+
+        stng = stng.lstrip()
+        # Whether we are done pulling prefixes from the string (like "-", "c", "t")
+        pfx = True
+
+        while(pfx):
+            # Throw an error if we are grabbing an empty module.
+            if(stng == "" or stng.isspace()):
+                raise SCParseError("Empty module at " + self.curParseModule + ".",line)
+                return (Val(0), "")
+            # A '-' indicates that we will invert the popped module (Invert).
+            if(stng[0] == "-"):
+                stng = stng[1:len(stng)]
+                invert = not invert
+            # A 'c' indicates that we will apply a constant-rate module (Const).
+            elif(stng[0] == "c"):
+                const = 1
+                stng = stng[1:len(stng)].lstrip()
+                # Const currently offers 2 meta tags: 'r' or 'rate' for the speed,
+                # and 'l' or 'loop' for whether to loop the results.
+                if(len(stng)>0 and stng[0] == "<"):
+                    meta = self.parseMeta(stng)
+                    meta, stng = meta[0], meta[1]
+                    #meta = meta[1:len(meta)-1].strip().split(",")
+                    for mt in meta:
+                        if(mt.startswith(("REL","rel"))):
+                            mt = mt.split("=")[1].strip()
+                            crels = float(mt)
+                            if(crels == None or crels <= 0):
+                                crels = -1
+                        elif(mt.startswith(("R", "r", "RATE", "rate"))):
+                            const = float(mt.split("=")[1])
+                            if(const == None or const < 1):
+                                const = 1
+                        elif(mt.startswith(("L", "l", "LOOP", "loop"))):
+                            mt = mt.split("=")[1].strip()
+                            cloop = mt.startswith(("T","t","1"))
+                        elif(mt.startswith(("ATK","atk","ATTACK","attack"))):
+                            mt = mt.split("=")[1].strip()
+                            catk = float(mt)
+                            if(catk == None or catk < 0):
+                                catk = 0
+            elif(stng[0] == "t"):
+                stng = stng[1:len(stng)]
+                absolute = True
+            else:
+                pfx = False
+
+        value = None
+        # For TONE or generic modules, 2-char pitch literal ("d4").
+        if((type == TONE or type == MDLE) and stng[0:2] in self.tones):
+            value = self.tones[stng[0:2]]
+            stng = stng[2:len(stng)]
+        # For TONE or generic modules, 3-char pitch literal ("C#4")
+        elif((type == TONE or type == MDLE) and stng[0:3] in self.tones):
+            value = self.tones[stng[0:3]]
+            stng = stng[3:len(stng)]
+        # Numeric literal
+        elif(stng[0].isnumeric() or stng[0] == "."):
+            num = ""
+            while(len(stng)>0 and (stng[0].isnumeric() or stng[0] == ".")):
+                num = num + stng[0]
+                stng = stng[1:len(stng)]
+            value = float(num)
+
+        # A value module, either from pitch or numerics parsed above
+        if(value != None):
+            vlength = 1
+            if(len(stng)>0 and stng[0] == "<"):
+                meta = self.parseMeta(stng)
+                meta, stng = meta[0], meta[1]
+                #meta = meta[1:len(meta)-1].strip().split(",")
+                for mt in meta:
+                    if(mt.startswith(("LEN","len","LN","ln"))):
+                        mt = mt.split("=")[1].strip()
+                        vlength = float(mt)
+            modA = Val(value, vlength)
+        # Oscillator ("oSIN", "oPLS<DUTY=0.25>", "oNSE<MODE=SHORT>", etc.)
+        # (Other names starting with "o" are looked up as usual.)
+        elif((type == INST or type == MDLE) and osc_shape(stng) != None):
+            shape = osc_shape(stng)
+            stng = stng[len(shape)+1:len(stng)]
+            olength = 1
+            duty = None
+            orate = 16
+            short = False
+            meta = self.parseMeta(stng)
+            meta, stng = meta[0], meta[1]
+            for mt in meta:
+                mt = mt.strip()
+                if(mt.startswith(("LEN","len","LN","ln"))):
+                    mt = mt.split("=")[1].strip()
+                    olength = float(mt)
+                elif(mt.startswith(("DUTY","duty","DT","dt"))):
+                    duty = self.metaModule(mt.split("=")[1])
+                elif(mt.startswith(("RATE","rate","R","r"))):
+                    mt = mt.split("=")[1].strip()
+                    orate = float(mt)
+                    if(orate <= 0):
+                        orate = 16
+                elif(mt.startswith(("MODE","mode","M","m"))):
+                    mt = mt.split("=")[1].strip()
+                    short = mt.startswith(("S","s"))
+            if(shape == "NSE"):
+                modA = Noise(short, olength, orate)
+            else:
+                modA = Osc(shape, olength, duty)
+        # Pattern
+        elif(stng[0] == "["):
+            set = self.extractPattern(stng,line)
+            stng, modA = set[1], self.parsePattern(set[0], type)
+        # Set
+        elif(stng[0] == "{"):
+            set = self.extractSet(stng,line)
+            stng, modA = set[1], self.parseSet(set[0], type)
+        # Series
+        elif(stng[0] == "("):
+            set = self.extractSeries(stng,line)
+            stng, modA = set[1], self.parseSeries(set[0], type)
+        # Otherwise, check if it is a reference to another module.
+        else:
+            i = 0
+            while(i < len(stng) and stng[i] not in RESERVED):
+                i+= 1
+            name = stng[0:i]
+            stng = stng[i:len(stng)]
+            meta = self.parseMeta(stng)
+            meta, stng = meta[0], meta[1]
+            if(type == INST or type == MDLE):
+                if(name in self.insts):
+                    modA = self.insts[name].clone()
+                    for mt in meta:
+                        mt = mt.strip()
+                        if(mt.startswith(("MODULE", "MDL", "module", "mdl"))):
+                            modA = modA.mdl
+                        elif(mt.startswith(("period", "PERIOD", "prd", "PRD"))):
+                            mt = mt.split("=")[1].lstrip()
+                            modA.period = int(mt)
+                        elif(mt.startswith(("loop", "LOOP", "l", "L"))):
+                            mt = mt.split("=")[1].lstrip()
+                            modA.loop = mt.startswith("t") or mt.startswith("T") or mt.startswith("1")
+                        elif(mt.startswith(("sus", "SUS", "SUSTAIN", "sustain", "s", "S"))):
+                            mt = mt.split("=")[1].lstrip()
+                            modA.sus = mt.startswith("t") or mt.startswith("T") or mt.startswith("1")
+                        elif(mt.startswith(("BASE","base"))):
+                            mt = mt.split("=")[1].lstrip()
+                            ins = self.insts[mt]
+                            if(ins != None):
+                                period = ins.period
+                                loop = ins.loop
+                                sus = ins.sus
+                elif(name in self.modules):
+                    modA = self.modules[name].clone()
+                else:
+                    raise SCParseError("Invalid inst: " + name, line)
+                    #print("Error! Invalid inst: " + name + ". Line: " + str(line))
+            elif(type == TONE):
+                if(name in self.tones):
+                    vlength = 1
+                    for mt in meta:
+                        if(mt.startswith(("LEN","len","LN","ln"))):
+                            mt = mt.split("=")[1].strip()
+                            vlength = float(mt)
+                            if(vlength == None or vlength <= 0):
+                                vlength = 1
+                    modA = Val(self.tones[name], vlength)
+                elif(name in self.modules):
+                    modA = self.modules[name].clone()
+                else:
+                    # this is an error
+                    raise SCParseError("Invalid Pitch: " + name, line)
+                    #print("Error! Invalid Pitch: " + name)
+            elif(type == SEQN):
+                if(name in self.seqs):
+                    modA = self.seqs[name].clone()
+                elif(name in self.modules):
+                    modA = SeqBlock(self.modules(),Val(0))
+                else:
+                    # this is an error
+                    raise SCParseError("Invalid Sequence: " + name,line)
+                    #print("Error! Invalid Sequence: \"" + name + "\"")
+        # at this point, we need modA & to've cut modA out of stng
+        # now we'll test for operatens, and add them
+        # wrap modA with any single operatens
+        if(invert):
+            modA = Invert(modA)
+        if(absolute):
+            modA = AbsVal(modA)
+        if(const>0):
+            modA = Const(modA,(self.tempo*self.beat)/(60*self.rate),const,cloop,catk,crels)
+
+        return (modA, stng)
+    
+    def metaModule(self, stng):
+        """ Parses a meta tag value that can be a number or a module name.
+
+            Arguments:
+            stng -- The value, e.g. "0.5", "-2" or "LFO".
+
+            Returns the module, or Val(0) if nothing could be parsed.
+        """
+
+        stng = stng.strip()
+        if(stng in self.modules):
+            return self.modules[stng].clone()
+        invert = False
+        if(stng.startswith("-")):
+            invert = True
+            stng = stng[1:len(stng)]
+        num = ""
+        while(len(stng)>0 and (stng[0].isnumeric() or stng[0] == ".")):
+            num = num + stng[0]
+            stng = stng[1:len(stng)]
+        if(num == ""):
+            return Val(0)
+        mdl = Val(float(num))
+        if(invert):
+            mdl = Invert(mdl)
+        return mdl
+
+    def parseMeta(self, stng, line=0):
+        """ Separates out individual meta tags from a meta description.
+
+            Tags must be delimited by commas.
+
+            Arguments:
+            stng -- The meta description. This can include brackets, or not.
+        """
+
+        stng = stng.lstrip()
+
+        if(len(stng)<=0):
+            return ([], stng)
+
+        meta = []
+        if(stng[0] == "<"):
+            endmeta = stng.find(">")
+            if(endmeta<0):
+                raise SCParseError("Missing '>' in meta tag.",line)
+            meta = stng[1:endmeta]
+            stng = stng[endmeta+1:len(stng)]
+            meta = meta.strip().split(",")
+
+        return (meta, stng)
+
+    def extractPattern(self, stng, line=0):
+        """ Separates out a Pattern description from a larger description
+            string, and trims away the brackets.
+
+            Arguments:
+            stng -- A module description.
+            line -- Current parser line, for error reporting.
+
+            Returns a 2-tuple: (pattern description, remaining string)
+        """
+
+        inx = 0
+        brackets = 0
+
+        while(inx < len(stng)):
+            if(stng[inx] == "["):
+                brackets += 1
+            elif(stng[inx] == "]"):
+                brackets -= 1
+            inx += 1
+            if(brackets == 0):
+                return (stng[1:inx-1], stng[inx:len(stng)])
+        if(brackets > 0):
+            raise SCParseError("Expected ']'.",line)
+            #print("Error: Expecting ']' in line " + str(line) + ".")
+        else:
+            raise SCParseError("Expected '['.",line)
+            #print("Error: Expecting '[' in line " + str(line) + ".")
+
+    def extractSet(self, stng, line=0):
+        """ Separates out a Set description from a larger description
+            string, and trims away the brackets.
+
+            Arguments:
+            stng -- A module description.
+            line -- Current parser line, for error reporting.
+
+            Returns a 2-tuple: (set description, remaining string)
+        """
+
+        inx = 0
+        brackets = 0
+
+        while(inx < len(stng)):
+            if(stng[inx] == "{"):
+                brackets += 1
+            elif(stng[inx] == "}"):
+                brackets -= 1
+            inx += 1
+            if(brackets == 0):
+                return (stng[1:inx-1], stng[inx:len(stng)])
+        if(brackets > 0):
+            raise SCParseError("Expected '}'.",line)
+        else:
+            raise SCParseError("Expected '{'.",line)
+
+    def extractSeries(self, stng,line=0):
+        """ Separates out a Series description from a larger description
+            string, and trims away the brackets.
+
+            Arguments:
+            stng -- A module description.
+            line -- Current parser line, for error reporting.
+
+            Returns a 2-tuple: (series description, remaining string)
+        """
+
+        inx = 0
+        brackets = 0
+
+        while(inx < len(stng)):
+            if(stng[inx] == "("):
+                brackets += 1
+            elif(stng[inx] == ")"):
+                brackets -= 1
+            inx += 1
+            if(brackets == 0):
+                return (stng[1:inx-1], stng[inx:len(stng)])
+        if(brackets > 0):
+            raise SCParseError("Expecting ')'.",line)
+        else:
+            raise SCParseError("Expecting '('.",line)
+
+    def parseSongLine(self, stng, mdls, line=0):
+        """ Parses a list of Sequence modules, to be added to the Song.
+
+            This is called for each non-empty line of the SNG chunk, and newly
+            parsed Sequences are added to mdls.
+
+            Arguments:
+            stng -- String representing the line of Sequences.
+            mdls -- List of Song modules. We append new Sequences to this.
+            line -- Current parser line, for error reporting.
+        """
+
+        bits = []
+        brace = 0
+        bracket = 0
+        paren = 0
+        meta = 0
+        inx = 0
+        while(inx < len(stng)):
+            if(stng[inx]=="," and brace == 0
+                    and bracket == 0 and paren == 0 and meta == 0):
+                bits.append(stng[0:inx])
+                stng = stng[inx+1:len(stng)]
+                inx = 0
+            else:
+                if(stng[inx]=="["):
+                    bracket += 1
+                elif(stng[inx]=="]"):
+                    bracket -= 1
+                elif(stng[inx]=="{"):
+                    brace += 1
+                elif(stng[inx]=="}"):
+                    brace -= 1
+                elif(stng[inx]=="("):
+                    paren += 1
+                elif(stng[inx]==")"):
+                    paren -= 1
+                elif(stng[inx]=="<"):
+                    meta += 1
+                elif(stng[inx]==">"):
+                    meta -= 1
+                inx += 1
+        if(len(stng)>0):
+            bits.append(stng)
+
+        for ln in bits:
+            ln = ln.strip()
+            mdls.append(self.parseModule(ln,SEQN,line))
+
+    def parsePattern(self, stng, type, line=0):
+        """ Parse a Pattern module.
+
+            This uses parseModule() for each module, then wraps the list with
+            a Pattern module.
+
+            Arguments:
+            stng -- Pattern description string (bounding brackets removed)
+            type -- The type of module we're parsing. Options: INST, TONE, SEQN, MDLE.
+            line -- Current parser line, for error-reporting.
+        """
+
+        bits = []
+        brace = 0
+        bracket = 0
+        paren = 0
+        meta = 0
+        inx = 0
+        while(inx < len(stng)):
+            if(stng[inx]=="," and brace == 0
+                    and bracket == 0 and paren == 0 and meta == 0):
+                bits.append(stng[0:inx])
+                stng = stng[inx+1:len(stng)]
+                inx = 0
+            else:
+                if(stng[inx]=="["):
+                    bracket += 1
+                elif(stng[inx]=="]"):
+                    bracket -= 1
+                elif(stng[inx]=="{"):
+                    brace += 1
+                elif(stng[inx]=="}"):
+                    brace -= 1
+                elif(stng[inx]=="("):
+                    paren += 1
+                elif(stng[inx]==")"):
+                    paren -= 1
+                elif(stng[inx]=="<"):
+                    meta += 1
+                elif(stng[inx]==">"):
+                    meta -= 1
+                inx += 1
+        if(len(stng)>0):
+            bits.append(stng)
+        ary = []
+        for ln in bits:
+            ary.append(self.parseModule(ln.strip(), type, line))
+        pat = Pattern(ary)
+        # Patterns of constant values play from a flat table.
+        entries = table_entries(pat)
+        if(entries != None):
+            return Table(entries)
+        return pat
+
+    def parseSet(self, stng, type, line=0):
+        """ Parse a Set module.
+
+            This uses parseModule() for each module, then wraps the list with
+            a Set module.
+
+            Arguments:
+            stng -- Set description string (bounding brackets removed)
+            type -- The type of module we're parsing. Options: INST, TONE, SEQN, MDLE.
+            line -- Current parser line, for error-reporting.
+        """
+
+        bits = []
+        brace = 0
+        bracket = 0
+        paren = 0
+        meta = 0
+        inx = 0
+        while(inx < len(stng)):
+            if(stng[inx]=="," and brace == 0
+                    and bracket == 0 and paren == 0 and meta == 0):
+                bits.append(stng[0:inx])
+                stng = stng[inx+1:len(stng)]
+                inx = 0
+            else:
+                if(stng[inx]=="["):
+                    bracket += 1
+                elif(stng[inx]=="]"):
+                    bracket -= 1
+                elif(stng[inx]=="{"):
+                    brace += 1
+                elif(stng[inx]=="}"):
+                    brace -= 1
+                elif(stng[inx]=="("):
+                    paren += 1
+                elif(stng[inx]==")"):
+                    paren -= 1
+                elif(stng[inx]=="<"):
+                    meta += 1
+                elif(stng[inx]==">"):
+                    meta -= 1
+                inx += 1
+        if(len(stng)>0):
+            bits.append(stng)
+
+        ary = []
+        for ln in bits:
+            ary.append(self.parseModule(ln.strip(), type, line))
+        return Set(ary)
+
+    def parseSeries(self, stng, type, line=0):
+        """ Parse a Series module.
+
+            This uses parseModule() for each module, then wraps the list with
+            a Series module.
+
+            Arguments:
+            stng -- Series description string (bounding brackets removed)
+            type -- The type of module we're parsing. Options: INST, TONE, SEQN, MDLE.
+            line -- Current parser line, for error-reporting.
+        """
+
+        bits = []
+        brace = 0
+        bracket = 0
+        paren = 0
+        meta = 0
+        inx = 0
+        while(inx < len(stng)):
+            if(stng[inx]=="," and brace == 0
+                    and bracket == 0 and paren == 0 and meta == 0):
+                bits.append(stng[0:inx])
+                stng = stng[inx+1:len(stng)]
+                inx = 0
+            else:
+                if(stng[inx]=="["):
+                    bracket += 1
+                elif(stng[inx]=="]"):
+                    bracket -= 1
+                elif(stng[inx]=="{"):
+                    brace += 1
+                elif(stng[inx]=="}"):
+                    brace -= 1
+                elif(stng[inx]=="("):
+                    paren += 1
+                elif(stng[inx]==")"):
+                    paren -= 1
+                elif(stng[inx]=="<"):
+                    meta += 1
+                elif(stng[inx]==">"):
+                    meta -= 1
+                inx += 1
+        if(len(stng)>0):
+            bits.append(stng)
+
+        ary = []
+        for ln in bits:
+            ary.append(self.parseModule(ln.strip(), type, line))
+        # A Series of single constant values plays from a table.
+        entries = []
+        for mdl in ary:
+            sub = table_entries(mdl)
+            if(sub == None or len(sub) != 1):
+                entries = None
+                break
+            entries.extend(sub)
+        if(entries):
+            return Table(entries, True)
+        return Series(ary)
+
+
+class SeqLine(SCModule):
+    """ Represents a single line of a Sequence module.
+
+        This corresponds to a single line of the SEQ chunk of a SC file.
+        SeqLine has a single module determining pitch and can play only 1
+        instrument at a time. This is similar to a monophonic "voice" within
+        a piece, though different Instruments can be used in the same SeqLine.
+    """
+
+    # Reads reset pitch & pan modules, and set our Inst's pitch.
+    read_stateful = True
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("cur", "curInx", "curInst", "rel_at")
+    # Caches and links back up the tree, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + SCModule.PAN_CACHE + ("parent", "seq")
+
+    def __init__(self, parent, pitch, pat, pan=None, transpose=0):
+        """ Initializes with the given parent and pitch module and the given
+            pattern.
+
+            The pattern data is extracted by SynthCorona.parse() into a list.
+            Each index is either an Instrument or a string: "-" or " ",
+            with hyphens indicating sustain & spaces indicating release/silence.
+
+            Arguments:
+            parent -- The SynthCorona module to which this part belongs.
+            pitch -- Pitch module.
+            pat -- Pattern data list.
+            pan -- Pan module. Defaults to Val(0) (centered) if none is given.
+            transpose -- Pitch transposition amount.
+        """
+
+        self.parent = parent
+        self.seq = None
+        self.pat = pat
+        self.pitch = pitch
+        self.transpose = 0
+        self.pan = pan
+        if(self.pan == None):
+            self.pan = Val(0)
+        self.cur = 0
+        self.curInx = 0
+        if(self.pat[self.curInx] == None or self.pat[self.curInx] == "-"):
+            self.curInst = None
+        else:
+            self.curInst = self.pat[self.curInx]
+        self.build_events()
+        self.set_events()
+
+    def build_events(self):
+        """ Run-length encodes the pattern into note events.
+
+            A run is a note or rest step followed by any number of sustain
+            ("-") steps. For each step we store the last step of its run
+            (which is where a playing note is released), and the index of the
+            next note-on, so we never have to scan the pattern while playing.
+        """
+
+        ln = len(self.pat)
+        # Last step index of the run containing each step.
+        self.run_end = [0]*ln
+        # Index of the first note-on at or after each step (ln if none).
+        self.next_on = [ln]*(ln+1)
+        end = ln-1
+        for i in range(ln-1, -1, -1):
+            if(i < ln-1 and self.pat[i+1] != "-"):
+                end = i
+            self.run_end[i] = end
+            if(self.pat[i] != None and self.pat[i] != "-"):
+                self.next_on[i] = i
+            else:
+                self.next_on[i] = self.next_on[i+1]
+
+    def set_events(self):
+        """ Sets the time (within the current step) of the next release
+            event. This is only called when we move to a new step.
+        """
+
+        if(self.curInx < len(self.pat) and self.run_end[self.curInx] == self.curInx):
+            self.rel_at = self.parent.framesperstep-self.parent.rel_time
+        else:
+            self.rel_at = float("inf")
+
+    def can_sleep(self):
+        """ Reports whether this line can skip being stepped while it rests,
+            i.e. its pitch and pan modules are constants, so their state
+            doesn't matter. (See Sequence.index_lines.)
+        """
+
+        return const_value(self.pitch) != None and const_value(self.pan) != None
+
+    def step(self, delta, const=-1):
+        self.cur += delta
+        if(const != ADJUST):
+            self.pitch.step(self.parent.frameslice, 1)
+            self.pan.step(self.parent.frameslice,1)
+            if(self.curInst != None):
+                if(self.cur >= self.rel_at):
+                    self.curInst.stop()
+                    self.seq.tails.append(self.curInst.clone())
+                    self.curInst = None
+                elif(self.curInst.stopped):
+                    self.seq.tails.append(self.curInst.clone())
+                    self.curInst = None
+                else:
+                    lane = self.curInst.voice_lane()
+                    if(lane != None):
+                        # stepped along with the Sequence's other voices
+                        batch = self.seq.voices.get(lane.key)
+                        if(batch == None):
+                            self.seq.voices[lane.key] = [lane]
+                        else:
+                            batch.append(lane)
+                    else:
+                        self.curInst.step(delta,const)
+
+        if(self.cur >= self.parent.framesperstep):
+            self.cur %= self.parent.framesperstep
+            self.curInx += 1
+            if(not self.done()):
+                if(self.pat[self.curInx] != "-"):
+                    self.curInst = self.pat[self.curInx]
+            self.set_events()
+
+    def advance(self, delta):
+        """ Steps the line between note events (see Sequence.step()), where
+            we know the note can't be released and the step can't change.
+            The Sequence keeps the step clock (cur) for us.
+
+            Returns True if our Inst has stopped by itself, and gone to the
+            tails.
+
+            Arguments:
+            delta -- Time to step by (Sequences always use const=1).
+        """
+        self.pitch.step(self.parent.frameslice, 1)
+        self.pan.step(self.parent.frameslice,1)
+        inst = self.curInst
+        if(inst == None):
+            return False
+        if(inst.stopped):
+            self.seq.tails.append(inst.clone())
+            self.curInst = None
+            return True
+        lane = inst.voice_lane()
+        if(lane != None):
+            batch = self.seq.voices.get(lane.key)
+            if(batch == None):
+                self.seq.voices[lane.key] = [lane]
+            else:
+                batch.append(lane)
+        else:
+            inst.step(delta,1)
+        return False
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(stereo):
+            return self.read_gained(PAN_IDENTITY,tails,signal)
+        else:
+            if(self.pitch.done()):
+                extra = self.pitch.get_extra()
+                self.pitch.reset()
+                self.pitch.step(extra,ADJUST)
+            if(self.curInst != None):
+                # old baked-freqs route
+                #freq = self.parent.freqs[int(self.pitch.read(stereo=False,signal=False))]
+                #if(self.curInst.freq != freq):
+                #    self.curInst.set_freq(freq)
+
+                # new pitch-only route
+                pitch = self.pitch.read(stereo=False,signal=False)+self.transpose
+                if(self.curInst.pitch != pitch):
+                    self.curInst.set_pitch(pitch)
+                
+                return self.curInst.read(stereo=False,signal=False)
+            else:
+                return 0
+
+    def read_gained(self, gains, tails=False, signal=True):
+        if(self.pitch.done()):
+            extra = self.pitch.get_extra()
+            self.pitch.reset()
+            self.pitch.step(extra,ADJUST)
+        if(self.pan.done()):
+            extra = self.pan.get_extra()
+            self.pan.reset()
+            self.pan.step(extra,ADJUST)
+        if(self.curInst != None):
+            # old baked-freqs route
+            #freq = self.parent.freqs[int(self.pitch.read(stereo=False,signal=False))]
+            #if(self.curInst.freq != freq):
+            #    self.curInst.set_freq(freq)
+            
+            # new pitch-only route
+            pitch = self.pitch.read(stereo=False,signal=False)+self.transpose
+            if(self.curInst.pitch != pitch):
+               self.curInst.set_pitch(pitch)
+            lane = self.curInst.voice_lane()
+            if(lane != None):
+                return lane.read(self.fuse_pan(gains))
+            return self.curInst.read_gained(self.fuse_pan(gains))
+        else:
+            return [0,0]
+
+    def reset(self):
+        self.curInx = 0
+        self.cur = 0
+        for p in self.pat:
+            if(p != None and p != "-"):
+                p.clear()
+        if(self.pat[0] != "-"):
+            self.curInst = self.pat[0]
+        self.set_events()
+
+    def clear(self):
+        self.curInx = 0
+        self.cur = 0
+        self.pitch.clear()
+        self.pan.clear()
+        for p in self.pat:
+            if(p != None and p != "-"):
+                p.clear()
+        if(self.pat[0] != "-"):
+            self.curInst = self.pat[0]
+        self.set_events()
+
+    def done(self):
+        return self.curInx >= len(self.pat)
+
+    def has_tails(self):
+        # SeqLine does not deal with tails
+        return False
+
+    def silent_for(self):
+        # read() resets pitch & pan modules as they finish, so we can only
+        # skip reads if those are constants.
+        if(self.curInst != None or not self.can_sleep()):
+            return 0
+        if(self.done()):
+            return float("inf")
+        on = self.next_on[self.curInx+1]
+        # keep a sample in hand, in case the step clock rounds early
+        return quiet_samples((on-self.curInx)*self.parent.framesperstep - self.cur)
+
+    def set_pitch(self,pitch):
+        # this sets the transposition amount, not the pitch module
+        self.transpose = pitch
+    
+    def get_extra(self):
+        if(self.done()):
+            return self.cur
+        else:
+            return 0
+
+    def calc_length(self):
+        return len(self.pat)*self.parent.framesperstep
+
+    def clone(self):
+        patclone = []
+        for p in self.pat:
+            if(p != None and p != "-"):
+                patclone.append(p.clone())
+            else:
+                patclone.append(p)
+        return SeqLine(self.parent, self.pitch.clone(), patclone, self.pan.clone(),self.transpose)
+
+    def to_string(self):
+        """ Compiles and returns a string representing this SeqLine.
+
+            This was probably for testing something -- it isn't pretty.
+        """
+        return ("LINE: " + self.pitch.to_string() + ": " + self.pat.to_string())
+
+class Sequence(SCModule):
+    """ Contains sequence data (in the form of SeqLines) for a section/pattern
+        within a song.
+
+        Sequences are Modules, so they can be combined/manipulated as with
+        any other module, though this must be done under the BLK (Block) header
+        of a SC file.
+    """
+
+    # Reads reset the pan module as it finishes.
+    read_stateful = True
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("stopped", "tails", "cur", "curInx", "active", "sleeping", "finished",
+            "next_evt")
+    # Caches and links back up the tree, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + SCModule.PAN_CACHE + ("parent", "voices")
+
+    def __init__(self, lines, parent, pan=None, pitch=0):
+        """ Initializer.
+
+            Arguments:
+            lines -- The SeqLines that comprise this Sequence.
+            parent -- The SynthCorona parent.
+            pan -- Option panning module (pans the whole pattern).
+            pitch -- Optional pitch shift value (not a module)
+        """
+
+        self.parent = parent
+        self.lines = lines
+        self.pan = pan
+        if(self.pan == None):
+            self.pan = Val(0)
+        self.pitch = pitch
+        self.stopped = False
+        self.len = 0
+        for l in lines:
+            l.seq = self
+            if(l.length() > self.len):
+                self.len = l.length()
+        self.tails = []
+        # Oscillator voices to step this sample, by instrument (see step()).
+        self.voices = dict()
+        self.index_lines()
+
+    def index_lines(self):
+        """ Sets up the active line index.
+
+            Every SeqLine is stepped by the same amounts, so they all share
+            one step clock (cur/curInx), which we keep here as well. A line
+            that is resting and has constant pitch and pan doesn't need to be
+            stepped at all: it goes to sleep until its next note-on, and is
+            then synced to our clock. Only lines in self.active are stepped
+            and read; self.finished counts lines that are done.
+
+            The clock also tells us when the next note event is due (see
+            set_events()): until then, lines are only advanced.
+        """
+
+        self.cur = 0
+        self.curInx = 0
+        self.active = []
+        self.sleeping = dict()
+        self.finished = 0
+        # step clock time of the next event; 0 has the first step find it
+        self.next_evt = 0
+        for i in range(len(self.lines)):
+            if(self.lines[i].done()):
+                self.finished += 1
+            else:
+                self.active.append(i)
+
+    def wake(self, inx):
+        """ Syncs a sleeping line to the step clock, and makes it active
+            (or finished, if it has reached its end).
+
+            Arguments:
+            inx -- Index of the line in self.lines.
+        """
+
+        ln = self.lines[inx]
+        ln.cur = self.cur
+        ln.curInx = self.curInx
+        if(ln.done()):
+            self.finished += 1
+        else:
+            ln.curInst = ln.pat[ln.curInx]
+            ln.set_events()
+            bisect.insort(self.active, inx)
+
+    def set_events(self):
+        """ Finds when the next note event is due on the step clock: the
+            next step, or the release of a note that ends in this one (see
+            SeqLine.set_events()). Until then, every active line goes on
+            playing what it is playing.
+        """
+
+        nxt = self.lines[0].parent.framesperstep
+        for i in self.active:
+            ln = self.lines[i]
+            if(ln.curInst != None and ln.rel_at < nxt):
+                nxt = ln.rel_at
+        self.next_evt = nxt
+
+    def step(self, delta, const=-1):
+        if(const == STOP):
+            self.stopped = True
+            self.invalidate_length()
+            return
+        if(not self.stopped):
+            self.pan.step(delta,1)
+            if(len(self.lines) > 0 and self.cur + delta < self.next_evt):
+                # Between events, lines only need to play on; their clocks
+                # are the same as ours.
+                cur = self.cur + delta
+                idle = None
+                for i in self.active:
+                    ln = self.lines[i]
+                    ln.cur = cur
+                    if(ln.advance(delta) and ln.can_sleep()):
+                        if(idle == None):
+                            idle = []
+                        idle.append(i)
+                        wake = ln.next_on[ln.curInx+1]
+                        if(wake in self.sleeping):
+                            self.sleeping[wake].append(i)
+                        else:
+                            self.sleeping[wake] = [i]
+                if(idle != None):
+                    self.active = [i for i in self.active if i not in idle]
+                if(len(self.voices) > 0):
+                    for lanes in self.voices.values():
+                        step_voices(lanes, 1)
+                    self.voices.clear()
+                self.cur = cur
+                return
+            idle = []
+            for i in self.active:
+                ln = self.lines[i]
+                # Const is always 1, so you can speed up Seq's without
+                # changing instrument pitches.
+                # However, this means we MUST update Seq's once per sample.
+                ln.step(delta,1)
+                if(ln.done()):
+                    idle.append(i)
+                    self.finished += 1
+                elif(ln.curInst == None and ln.can_sleep()):
+                    idle.append(i)
+                    wake = ln.next_on[ln.curInx+1]
+                    if(wake in self.sleeping):
+                        self.sleeping[wake].append(i)
+                    else:
+                        self.sleeping[wake] = [i]
+            if(len(idle) > 0):
+                self.active = [i for i in self.active if i not in idle]
+            # Lines leave plain oscillator voices (see Inst.voice_lane()) to
+            # us, so all the voices of an instrument are stepped in one go.
+            if(len(self.voices) > 0):
+                for lanes in self.voices.values():
+                    step_voices(lanes, 1)
+                self.voices.clear()
+            # Same clock as SeqLine.step, so sleeping lines can be synced.
+            if(len(self.lines) > 0):
+                fps = self.lines[0].parent.framesperstep
+                self.cur += delta
+                if(self.cur >= fps):
+                    self.cur %= fps
+                    self.curInx += 1
+                    if(self.curInx in self.sleeping):
+                        for i in self.sleeping.pop(self.curInx):
+                            self.wake(i)
+                self.set_events()
+
+    def step_tails(self, delta, const=-1):
+        for t in list(self.tails):
+            # just a regular step here: we're stepping the Insts in tails
+            t.step(delta,1)
+            if(t.done() or self.cull(t)):
+                self.tails.remove(t)
+                if(self.stopped):
+                    self.invalidate_length()
+
+    def cull(self, t):
+        """ Checks whether a tail has stayed below the silence threshold
+            (CULL in the CFG chunk) for long enough that we can drop it.
+
+            The level checked is the tail's last output, before any
+            Sequence-level panning.
+
+            Arguments:
+            t -- The tail Inst.
+        """
+
+        gate = self.parent.cull_gate
+        if(gate == None):
+            return False
+        last = t.last
+        if(type(last) == list):
+            amp = max(abs(last[0]),abs(last[1]))
+        else:
+            amp = abs(last)
+        if(amp >= gate):
+            t.quiet = 0
+            return False
+        t.quiet += 1
+        if(t.quiet > self.parent.cull_samps):
+            self.parent.culled += 1
+            return True
+        return False
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(stereo):
+            return self.read_gained(PAN_IDENTITY,tails,signal)
+        if(tails):
+            sum = 0
+            for t in self.tails:
+                # we always set tails=F because tails should be an Inst--
+                # tails is more for Sequences
+                sum += t.read(False,stereo,signal)
+            return sum
+        else:
+            sum = 0
+            if(not self.stopped):
+                for i in self.active:
+                    sum += self.lines[i].read(tails,stereo,signal)
+            return sum
+
+    def read_gained(self, gains, tails=False, signal=True):
+        sum = [0,0]
+        if(tails):
+            gains = self.fuse_pan(gains)
+            for t in self.tails:
+                # we always set tails=F because tails should be an Inst--
+                # tails is more for Sequences
+                val = t.read_gained(gains,False,signal)
+                sum[0] += val[0]
+                sum[1] += val[1]
+        else:
+            if(self.pan.done()):
+                extra = self.pan.get_extra()
+                self.pan.reset()
+                self.pan.step(extra,ADJUST)
+            gains = self.fuse_pan(gains)
+            if(not self.stopped):
+                for i in self.active:
+                    val = self.lines[i].read_gained(gains,tails,signal)
+                    sum[0] += val[0]
+                    sum[1] += val[1]
+        return sum
+
+    def reset(self):
+        self.pan.reset()
+        for ln in self.lines:
+            ln.reset()
+        self.index_lines()
+        if(self.stopped):
+            self.invalidate_length()
+        self.stopped = False
+
+    def clear(self):
+        self.pan.clear()
+        for ln in self.lines:
+            ln.clear()
+        self.index_lines()
+        #self.tails = []
+        if(self.stopped):
+            self.invalidate_length()
+        self.stopped = False
+
+    def done(self):
+        if(not self.stopped):
+            return self.finished >= len(self.lines)
+        else:
+            return len(self.tails) == 0
+
+    def has_tails(self):
+        return len(self.tails) > 0
+
+    def silent_for(self):
+        if(len(self.tails) > 0 or const_value(self.pan) == None):
+            return 0
+        if(self.stopped):
+            return float("inf")
+        quiet = float("inf")
+        for i in self.active:
+            quiet = min(quiet, self.lines[i].silent_for())
+            if(quiet <= 0):
+                return 0
+        if(len(self.sleeping) > 0):
+            fps = self.lines[0].parent.framesperstep
+            quiet = min(quiet, quiet_samples((min(self.sleeping)-self.curInx)*fps - self.cur))
+        return quiet
+
+    def set_pitch(self, pitch):
+        if(pitch != self.pitch):
+            self.pitch = pitch
+            # Sequence tells its SeqLines what transpose value to have
+            for l in self.lines:
+                l.set_pitch(pitch)
+
+    def get_extra(self):
+        return self.lines[0].get_extra()
+
+    def calc_length(self):
+        if(not self.stopped):
+            return self.len
+        else:
+            len = 0
+            for t in self.tails:
+                if(t.length() > len):
+                    len = t.length()
+            return len
+
+    def clone(self):
+        tlines = []
+        for l in self.lines:
+            tlines.append(l.clone())
+        return Sequence(tlines, self.parent, self.pan.clone(), self.pitch)
+
+class SeqBlock(SCModule):
+    """ Sequence wrapper for modules. When Sequence modules are parsed by the
+        BLK/PAT chunk, they will be packaged in this.
+
+        Like basic Sequences, this has a Sequence-level panning module, pan,
+        which defaults to centered.
+    """
+
+    # Reads reset the pan module as it finishes.
+    read_stateful = True
+
+    # Caches, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + SCModule.PAN_CACHE
+
+    def __init__(self, module, pan=None):
+        """ Initializer.
+
+            Arguments:
+            module -- The module to be wrapped. Should contain Sequence data.
+            pan -- Optional panning module. Defaults to Val(0)
+        """
+
+        self.module = module
+        if(pan == None):
+            pan = Val(0)
+        self.pan = pan
+        self.own(self.module)
+
+    def step(self, delta, const=-1):
+        self.pan.step(delta,const)
+        self.module.step(delta,const)
+
+    def step_tails(self, delta, const=-1):
+        self.module.step_tails(delta,const)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(stereo):
+            return self.read_gained(PAN_IDENTITY,tails,signal)
+        else:
+            return self.module.read(tails,stereo,signal)
+
+    def read_gained(self, gains, tails=False, signal=True):
+        if(self.pan.done()):
+            extra = self.pan.get_extra()
+            self.pan.reset()
+            self.pan.step(extra,ADJUST)
+        return self.module.read_gained(self.fuse_pan(gains),tails,signal)
+
+    def reset(self):
+        self.pan.reset()
+        self.module.reset()
+
+    def clear(self):
+        self.pan.clear()
+        self.module.clear()
+
+    def done(self):
+        return self.module.done()
+
+    def has_tails(self):
+        return self.module.has_tails()
+
+    def silent_for(self):
+        if(const_value(self.pan) == None):
+            return 0
+        return self.module.silent_for()
+
+    def set_pitch(self, pitch):
+        self.module.set_pitch(pitch)
+
+    def get_extra(self):
+        return self.module.get_extra()
+
+    def calc_length(self):
+        return self.module.length()
+
+    def clone(self):
+        return SeqBlock(self.module.clone(),self.pan.clone())
+
+class Song(SCModule):
+    """ Module class representing a song.
+
+        This is primarily composed of a list of Sequences (or SeqBlock), which
+        are run and read one after the other.
+    """
+
+    # Reads go on to Sequences.
+    read_stateful = True
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("curInx", "tails")
+    # Name and link back up the tree, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + ("parent", "name")
+
+    def __init__(self, pat, parent, name=""):
+        """ Initializer.
+
+            Arguments:
+            pat -- Sequence pattern that comprises the Song.
+            parent -- SynthCorona that is running this show.
+            name -- Name to render this Song under. Empty string will use
+                    the name from the source file.
+        """
+
+        self.name = name
+        self.pat = pat
+        self.own(self.pat)
+        self.curInx = 0
+        self.parent = parent
+        self.tails = []
+
+    def step(self, delta, const=-1):
+        # SongTaps may only join SongShares started on the same sample
+        sharing = self.parent.sharing
+        if(len(sharing) > 0):
+            for share in sharing.values():
+                share.open = False
+            sharing.clear()
+        # Step Sequences that are sustaining (self.tails)
+        for t in list(self.tails):
+            t.step_tails(delta, const)
+            if(t.done() and not t.has_tails()):
+                self.tails.remove(t)
+        if(self.curInx < len(self.pat)):
+            self.pat[self.curInx].step(delta,delta)
+            # Step sustained notes in current Sequence
+            self.pat[self.curInx].step_tails(delta,delta)
+            if(self.pat[self.curInx].done()):
+                self.pat[self.curInx].step(0,STOP)
+                if(getattr(self.pat[self.curInx], "no_tails", None) == None):
+                    self.tails.append(self.pat[self.curInx])
+                self.curInx += 1
+
+    def read(self,tails=False,stereo=True,signal=False):
+        if(stereo):
+            sum = [0,0]
+            if(self.curInx < len(self.pat)):
+                val = self.pat[self.curInx].read(tails,stereo,signal)
+                sum[0] += val[0]
+                sum[1] += val[1]
+                if(getattr(self.pat[self.curInx], "no_tails", None) == None):
+                    val = self.pat[self.curInx].read(True,stereo,signal)
+                    sum[0] += val[0]
+                    sum[1] += val[1]
+            for t in self.tails:
+                val = t.read(True,stereo,signal)
+                sum[0] += val[0]
+                sum[1] += val[1]
+            return sum
+        else:
+            sum = 0
+            if(self.curInx < len(self.pat)):
+                sum += self.pat[self.curInx].read(tails,stereo,signal)
+                if(getattr(self.pat[self.curInx], "no_tails", None) == None):
+                    # add tails from current Sequence.
+                    sum += self.pat[self.curInx].read(True,stereo,signal)
+            for t in self.tails:
+                # add tails from past Sequences.
+                sum += t.read(True,stereo,signal)
+            return sum
+
+    def reset(self):
+        self.clear()
+
+    def clear(self):
+        self.curInx = 0
+        for p in self.pat:
+            p.clear()
+
+    def done(self):
+        return len(self.tails) == 0 and (self.curInx >= len(self.pat))
+
+    def has_tails(self):
+        return len(self.tails) > 0
+
+    def silent_for(self):
+        quiet = float("inf")
+        if(self.curInx < len(self.pat)):
+            quiet = self.pat[self.curInx].silent_for()
+        for t in self.tails:
+            if(quiet <= 0):
+                break
+            quiet = min(quiet, t.silent_for())
+        if(quiet == float("inf")):
+            return 0
+        return quiet
+
+    def get_extra(self):
+        return self.curInx-len(self.pat)
+
+    def calc_length(self):
+        sum = 0
+        for mdl in self.pat:
+            sum += mdl.length()
+        return sum
+
+class Inst(SCModule):
+    """ Module representing an instrument/synth.
+
+        Along with core module functions, Insts also have set_freq(), which
+        sets the current pitch.
+
+        Insts also have several unique properties:
+        period -- Indicates the length of 1 period of the core waveform.
+        loop -- Whether this Inst should loop after its module has finished.
+        sus -- Whether this Inst should sustain (until module completion), after stop().
+        pan -- Instrument-level pan module.
+
+        Pitch is achieved by playing the module at a rate based on the frequency
+        and the wave period. This rate affects delta in step() calls, but it does
+        not affect const, (the constant-time argument).
+
+        Similarly, Inst always uses const to step, to prevent other adjustments
+        to delta from affecting the pitch. The main exception to this is the
+        Speed module, which does affect pitch (by changing the const value).
+
+        Because of the above, you can easily nest Insts within other Insts
+        without affecting pitch.
+    """
+
+    # Reads keep the last value, for releases & culling.
+    read_stateful = True
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("stopped", "release", "rate", "pitch", "freq", "last", "last_pan", "quiet")
+    # Name, caches and link back up the tree, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + SCModule.PAN_CACHE + ("parent", "lane", "name")
+
+    def __init__(self, parent, module, prd=-1, loop=True, sus=False, pan=None):
+        """ Initializer.
+
+            Arguments:
+            parent -- SynthCorona parent.
+            module -- Module for creating the Inst's sound.
+            prd -- Period length. If -1, we will use module.length(), which will
+                work as long as the module describes exactly 1 oscillation.
+            loop -- Whether to loop our module. Default: True.
+            sus -- Whether to sustain our module. Default: False. If true, loop is overrided to False.
+            pan -- Instrument-level panning module. Defaults to centered.
+        """
+
+        if(sus):
+            loop = False
+        if(loop and type(module) == LinInterp):
+            # A looping ramp is restarted as soon as it ends, so it plays the
+            # same as a one-entry Table, which voices can be batched on.
+            entries = table_entries(module)
+            if(entries != None):
+                module = Table(entries)
+        self.parent = parent
+        self.mdl = module
+        self.own(self.mdl)
+        self.stopped = False
+        self.release = None
+        if(prd < 1):
+            self.period = self.mdl.length()
+        else:
+            self.period = prd
+        self.loop = loop
+        self.sus = sus
+        self.pan = pan
+        if(self.pan == None):
+            self.pan = Val(0)
+        self.rate = 0
+        self.pitch = 0
+        # replacing frequency with pitch
+        #self.freq = 1
+        self.last = 0
+        self.last_pan = PAN_IDENTITY
+        # How long we've been below the cull threshold, as a tail.
+        self.quiet = 0
+
+    #def set_freq(self, freq):
+    #    self.freq = freq
+    #    self.rate = self.freq*self.period/self.parent.rate
+    #    self.mdl.set_freq(freq)
+    def set_pitch(self, pitch):
+        if(pitch != self.pitch):
+            self.pitch = pitch
+            self.rate = lookup_freq(self.pitch)*self.period/self.parent.rate
+            self.mdl.set_pitch(pitch)
+
+    def step(self, delta, const=-1):
+        if(const < 0):
+            # bypass rate adjustment
+            if(const == ADJUST):
+                if(self.stopped):
+                    self.release.step(delta,const)
+                else:
+                    self.mdl.step(delta,const)
+                return
+            # stop command
+            elif(const == STOP):
+                self.mdl.step(0,RELEASE)
+                self.pan.step(0,RELEASE)
+                if(self.sus):
+                    self.release = self.mdl
+                else:
+                    if(not self.mdl.done()):
+                        self.release = Multiply(self.mdl, Const(LinInterp(Val(1),Val(0),Val(self.parent.rel_time)),1,loop=False),False)
+                    else:
+                        last = apply_gains(self.last,self.last_pan)
+                        self.release = Const(LinInterp(StereoVal([last[0],last[1]]),Val(0),Val(self.parent.rel_time)),1)
+                self.own(self.release)
+                self.stopped = True
+                self.invalidate_length()
+                return
+            # release command -- pass this forward to our module
+            elif(const == RELEASE):
+                self.mdl.step(0,const)
+                self.pan.step(0,const)
+                return
+            # otherwise, set const to delta
+            else:
+                const=delta
+        self.pan.step(const*self.rate,const)
+        if(self.stopped):
+            self.release.step(const*self.rate, const)
+        else:
+            self.mdl.step(const*self.rate, const)
+            if(self.done()):
+                if(self.loop):
+                    extra = self.get_extra()
+                    self.reset()
+                    # ADJUST Const tells Inst to bypass its freq. rate
+                    self.step(extra,ADJUST)
+                else:
+                    self.stop()
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(stereo):
+            return self.read_gained(PAN_IDENTITY,tails,signal)
+        else:
+            if(self.stopped):
+                val = self.release.read(tails,stereo,signal)
+                self.last = [val,val]
+                return val
+            else:
+                if(self.loop or not self.done()):
+                    val = self.mdl.read(tails,stereo,signal)
+                    self.last = [val,val]
+                    return val
+                else:
+                    return 0
+
+    def read_gained(self, gains, tails=False, signal=True):
+        if(self.pan.done()):
+            extra = self.pan.get_extra()
+            self.pan.reset()
+            self.pan.step(extra,ADJUST)
+        gains = self.fuse_pan(gains)
+        if(self.stopped):
+            # last is kept before the outer pans; it seeds our own release.
+            self.last = self.release.read(tails,True,signal)
+            self.last_pan = self.pan_own
+            return apply_gains(self.last,gains)
+        else:
+            if(self.loop or not self.done()):
+                self.last = self.mdl.read(tails,True,signal)
+                self.last_pan = self.pan_own
+                return apply_gains(self.last,gains)
+            else:
+                return [0,0]
+
+    def reset(self):
+        self.mdl.reset()
+        self.pan.reset()
+
+    def clear(self):
+        if(self.stopped):
+            self.invalidate_length()
+        self.release = None
+        self.stopped = False
+        self.own(self.mdl)
+        self.mdl.clear()
+        self.pan.clear()
+
+    def done(self):
+        if(self.stopped):
+            return self.release.done()
+        else:
+            return self.mdl.done()
+
+    def has_tails(self):
+        return False # maybe? or should we do self.stopped and not self.release.done()?
+
+    def get_extra(self):
+        if(self.stopped):
+            return self.release.get_extra()
+        else:
+            return self.mdl.get_extra()
+
+    def quiet_fields(self):
+        return ("pan",)
+
+    def cse_links(self):
+        return (("mdl","own"),)
+
+    def clone(self):
+        cp = Inst(self.parent, self.mdl.clone(), self.period, self.loop, self.sus, self.pan.clone())
+        cp.stopped = self.stopped
+        if(self.release != None):
+            cp.release = self.release.clone()
+            cp.own(cp.release)
+        else:
+            cp.release = None
+        cp.rate = self.rate
+        #cp.freq = self.freq
+        cp.pitch = self.pitch
+        cp.name = self.name
+        return cp
+
+    def calc_length(self):
+        if(self.stopped):
+            return self.release.length()
+        else:
+            return self.mdl.length()
+
+    def stop(self):
+        self.step(0,STOP)
+
+    # Name of the INS definition this Inst was made from (None if unnamed).
+    name = None
+
+    # Cached result of voice_lane(); False until it has been checked.
+    lane = False
+
+    def voice_lane(self):
+        """ Returns a VoiceLane for stepping this Inst in a batch with other
+            voices of the same instrument, or None if it isn't a plain
+            oscillator voice: a looping Table or an Osc (with a fixed duty),
+            inside one or more looping Insts with constant pans, and any
+            fixed Gains or Levels. See step_voices().
+        """
+        if(self.stopped):
+            return None
+        if(self.lane == False):
+            self.lane = None
+            chain = []
+            # pan matrices & gain factors between the Insts, outermost first
+            ops = []
+            mdl = self
+            while(True):
+                if(type(mdl) == Inst and mdl.loop and not mdl.sus and not mdl.stopped
+                        and const_value(mdl.pan) != None):
+                    if(len(chain) > 0):
+                        ops.append((pan_gains(const_value(mdl.pan)), None))
+                    chain.append(mdl)
+                    mdl = mdl.mdl
+                elif(type(mdl) == Gain):
+                    ops.append((None, mdl.k))
+                    mdl = mdl.a
+                elif(type(mdl) == Level and mdl.a_lead and const_value(mdl.b) != None):
+                    ops.append((None, as_decimal(const_value(mdl.b))))
+                    mdl = mdl.a
+                else:
+                    break
+            if(type(mdl) == Table and not mdl.series):
+                self.lane = VoiceLane(mdl, chain, ops[::-1])
+            elif(type(mdl) == Osc and (mdl.shape != "PLS" or const_value(mdl.duty) != None)):
+                self.lane = VoiceLane(mdl, chain, ops[::-1])
+        return self.lane
+
+class VoiceLane:
+    """ Steps and reads an oscillator voice (see Inst.voice_lane()) without
+        going through its Insts. The voice's state stays in its Table or Osc,
+        so the Insts can take over again at any point (i.e. when the note is
+        released).
+
+        Pans, gain levels and duty cycles are constants, so their modules
+        aren't stepped; they would only be reset as they finish.
+    """
+
+    def __init__(self, wave, chain, ops):
+        """ Initializer.
+
+            Arguments:
+            wave -- The voice's Table or Osc.
+            chain -- The Insts around the wave, outermost first.
+            ops -- (gain matrix, factor) pairs applied to the wave's value
+                   below the outermost Inst, innermost first. Each pair has
+                   one or the other; the matrices are the nested Insts' pans.
+        """
+
+        self.wave = wave
+        self.table = None
+        if(type(wave) == Table):
+            self.table = wave
+            # Tables of one instrument share their entry lists
+            self.key = id(wave.lens)
+        else:
+            # Oscs step the same way if their cycles are the same length
+            self.key = (Osc, wave.len)
+        self.top = chain[0]
+        # the innermost Inst sets the rate the wave is stepped at
+        self.inner = chain[-1]
+        # each looping Inst gets a turn at restarting the wave
+        self.wraps = len(chain)
+        self.ops = ops
+
+    def read(self, gains):
+        """ Reads the voice in stereo, as Inst.read_gained() would.
+
+            Arguments:
+            gains -- Gain matrix to apply (see pan_gains()).
+        """
+        if(self.table == None):
+            val = self.wave.read(False,True,True)
+        elif(self.table.inx >= self.table.count):
+            val = [0,0]
+        else:
+            val = self.table.value(True)
+        for g, k in self.ops:
+            if(g == None):
+                val = [val[0]*k,val[1]*k]
+            else:
+                val = apply_gains(val, g)
+        top = self.top
+        gains = top.fuse_pan(gains)
+        top.last = val
+        top.last_pan = top.pan_own
+        return apply_gains(val, gains)
+
+class NoteMark(SCModule):
+    """ Stands in for an Inst in a SeqLine's pattern while
+        SynthCorona.compile_song() plays through a Song, noting in the
+        Timeline when the note starts, is released, and finishes.
+
+        A looping Inst that doesn't sustain always fades out over rel_time
+        once it's released, whatever it was playing, so we only time its
+        release. Any other Inst decides for itself when it finishes, so it is
+        kept as our voice and played as usual.
+    """
+
+    # Reads start notes.
+    read_stateful = True
+
+    # Left out of fingerprint(), like an Inst's name.
+    NOT_KEYED = SCModule.NOT_KEYED + ("name",)
+
+    # Whether reads go on to our voice. SynthCorona.measure_song() turns
+    # this off for voices whose reads can't change when they finish.
+    read_voice = True
+
+    def __init__(self, timeline, seqline, name, voice=None):
+        """ Initializer.
+
+            Arguments:
+            timeline -- The Timeline to note events in.
+            seqline -- The SeqLine we are in.
+            name -- Name of the Inst we stand in for.
+            voice -- The Inst, if it has to be played (see above).
+        """
+
+        self.timeline = timeline
+        self.seqline = seqline
+        self.line = timeline.add_line(seqline)
+        self.name = name
+        self.voice = voice
+        self.note = None
+        self.pitch = 0
+        self.stopped = False
+        self.release = None
+        self.last = 0
+        self.quiet = 0
+
+    def voice_lane(self):
+        return None
+
+    def set_pitch(self, pitch):
+        self.pitch = pitch
+        if(self.voice != None):
+            self.voice.set_pitch(pitch)
+
+    def step(self, delta, const=-1):
+        if(const == STOP):
+            self.stop()
+            return
+        if(self.voice != None):
+            self.voice.step(delta,const)
+            if(self.voice.stopped and not self.stopped):
+                # the voice has finished by itself
+                self.stopped = True
+                self.timeline.note_off(self.note)
+        elif(self.release != None and const != ADJUST and const != RELEASE):
+            if(const == DELTA):
+                const = delta
+            self.release.step(const,const)
+        if(self.stopped and self.done()):
+            self.timeline.note_end(self.note)
+
+    def stop(self):
+        if(self.voice != None):
+            self.voice.stop()
+        else:
+            self.release = Const(LinInterp(Val(1),Val(0),Val(self.timeline.rel_time)),1,loop=False)
+        self.stopped = True
+        self.invalidate_length()
+        self.timeline.note_off(self.note)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(stereo):
+            return self.read_gained(PAN_IDENTITY,tails,signal)
+        if(self.note == None):
+            self.note = self.timeline.note_on(self)
+        if(self.voice != None and self.read_voice):
+            val = self.voice.read(tails,stereo,signal)
+            self.last = self.voice.last
+            return val
+        return 0
+
+    def read_gained(self, gains, tails=False, signal=True):
+        if(self.note == None):
+            self.note = self.timeline.note_on(self)
+        if(self.voice != None and self.read_voice):
+            val = self.voice.read_gained(gains,tails,signal)
+            self.last = self.voice.last
+            return val
+        return [0,0]
+
+    def step_tails(self, delta, const=-1):
+        pass
+
+    def reset(self):
+        if(self.voice != None):
+            self.voice.reset()
+
+    def clear(self):
+        if(self.voice != None):
+            self.voice.clear()
+        if(self.stopped):
+            self.invalidate_length()
+        self.note = None
+        self.stopped = False
+        self.release = None
+
+    def done(self):
+        if(self.voice != None):
+            return self.voice.done()
+        if(self.release != None):
+            return self.release.done()
+        return False
+
+    def has_tails(self):
+        return False
+
+    def get_extra(self):
+        if(self.voice != None):
+            return self.voice.get_extra()
+        if(self.release != None):
+            return self.release.get_extra()
+        return 0
+
+    def calc_length(self):
+        if(self.voice != None):
+            return self.voice.length()
+        if(self.release != None):
+            return self.release.length()
+        return 0
+
+    def clone(self):
+        voice = None
+        if(self.voice != None):
+            voice = self.voice.clone()
+        cp = NoteMark(self.timeline, self.seqline, self.name, voice)
+        cp.note = self.note
+        cp.pitch = self.pitch
+        cp.stopped = self.stopped
+        cp.read_voice = self.read_voice
+        if(self.release != None):
+            cp.release = self.release.clone()
+        return cp
+
+class Timeline:
+    """ The notes of a Song, laid out in samples. Made by
+        SynthCorona.compile_song().
+
+        Each SeqLine played is listed in lines, as the fingerprints of its
+        pitch and pan modules. Each note is a list of:
+            on -- Sample the note starts on.
+            off -- Sample the note is released on (it plays its release
+                    from here).
+            end -- Sample after the last one the note sounds on.
+            inst -- Name of the Inst playing it.
+            line -- Index of the SeqLine in lines.
+            pitch -- Pitch at the start, in cents, transposition included.
+            transpose -- Transposition of the SeqLine at the start.
+            pan -- The SeqLine's pan at the start (None in mono songs).
+        Notes still sounding when the Song ends get length as their off/end.
+    """
+
+    # Fields of a note, in order.
+    NOTE_FIELDS = ("on", "off", "end", "inst", "line", "pitch", "transpose", "pan")
+
+    def __init__(self, name, rate, rel_time=0):
+        """ Initializer.
+
+            Arguments:
+            name -- Name of the Song.
+            rate -- Sample rate.
+            rel_time -- Release time of Insts, in samples.
+        """
+
+        self.name = name
+        self.rate = rate
+        self.rel_time = rel_time
+        # Song length, in samples.
+        self.length = 0
+        self.lines = []
+        self.notes = []
+        # The sample being played (while compiling).
+        self.now = 0
+        # SeqLine objects -> line index (while compiling).
+        self.line_inx = dict()
+
+    def add_line(self, ln):
+        """ Lists a SeqLine, and returns its index.
+
+            Arguments:
+            ln -- The SeqLine.
+        """
+
+        if(id(ln) not in self.line_inx):
+            self.line_inx[id(ln)] = len(self.lines)
+            self.lines.append([ln.pitch.fingerprint(), ln.pan.fingerprint()])
+        return self.line_inx[id(ln)]
+
+    def note_on(self, mark):
+        """ Starts a note for a NoteMark, and returns its index.
+
+            Arguments:
+            mark -- The NoteMark.
+        """
+
+        ln = mark.seqline
+        self.notes.append([self.now, None, None, mark.name, mark.line,
+                mark.pitch, ln.transpose, ln.pan_val])
+        return len(self.notes)-1
+
+    def note_off(self, note):
+        """ Notes the release of a note, after the current sample.
+
+            Arguments:
+            note -- Index of the note (None if it never started).
+        """
+
+        if(note != None and self.notes[note][1] == None):
+            self.notes[note][1] = self.now+1
+
+    def note_end(self, note):
+        """ Notes the end of a note's release, after the current sample.
+
+            Arguments:
+            note -- Index of the note (None if it never started).
+        """
+
+        if(note != None and self.notes[note][2] == None):
+            self.notes[note][2] = self.now+1
+
+    def finish(self, length):
+        """ Sets the Song length, and closes off any notes still sounding.
+
+            Arguments:
+            length -- Song length, in samples.
+        """
+
+        self.length = length
+        self.line_inx = dict()
+        for note in self.notes:
+            if(note[1] == None):
+                note[1] = length
+            if(note[2] == None):
+                note[2] = length
+
+    def events(self):
+        """ Returns the note events in order, as (sample, kind, note index)
+            tuples, where kind is "on" or "off". Releases come before
+            note-ons on the same sample.
+        """
+
+        evts = []
+        for i in range(len(self.notes)):
+            evts.append((self.notes[i][0], 1, i))
+            evts.append((self.notes[i][1], 0, i))
+        evts.sort()
+        return [(t, ("off", "on")[kind], i) for t, kind, i in evts]
+
+    def to_json(self):
+        """ Returns the Timeline as compact JSON (see timeline_from_json()).
+        """
+
+        return json.dumps({"name": self.name, "rate": self.rate,
+                "length": self.length, "fields": self.NOTE_FIELDS,
+                "lines": self.lines, "notes": self.notes}, separators=(",",":"))
+
+class Val(SCModule):
+    """ Module representing a single fixed value.
+
+        This module has length 1 and always returns its value on read().
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("cur",)
+
+    def __init__(self, val=0, ln=1):
+        self.val = val
+        self.cur = 0
+        self.no_tails = True
+        self.len = ln
+
+    def step(self, delta, const=-1):
+        if(const >= 0 or const == DELTA or const == ADJUST):
+            self.cur += delta
+
+    def step_tails(self, delta, const=-1):
+        #self.step(delta, const)
+        pass
+
+    # 'tails' here is irrelevant; search for "no_tails" property to avoid doubling
+    def read(self,tails=False,stereo=True,signal=True):
+        if(stereo):
+            return [self.val,self.val]
+        else:
+            return self.val
+
+    def reset(self):
+        self.cur = 0
+
+    def clear(self):
+        self.cur = 0
+
+    def done(self):
+        return self.cur >= self.len
+
+    def has_tails(self):
+        return False
+    
+    def get_extra(self):
+        if(self.done()):
+            return self.cur-self.len
+        else:
+            return 0
+
+    def pure(self):
+        return True
+
+    def value_at(self, t):
+        return self.val
+
+    def clone(self):
+        tmp = Val(self.val, self.len)
+        tmp.cur = self.cur
+        return tmp
+
+    def calc_length(self):
+        return self.len
+
+    #def set_freq(self, freq):
+    #    pass
+    def set_pitch(self, pitch):
+        pass
+
+class StereoVal(SCModule):
+    """ Module representing a single value, in stereo.
+
+        Right now, the only we place we use this is when creating tails to fade
+        out instruments. It isn't necessary for general purposes, as simply
+        panning a Val module covers that better.
+
+        Like Val, StereoVal has a length of 1.
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("cur",)
+
+    def __init__(self, val=[0,0], ln=1):
+        """ Initializer.
+
+            Arguments:
+            val -- The value, as a 2-tuple or 2-list.
+            ln -- The module length. Defaults to 1.
+        """
+
+        self.val = val
+        self.cur = 0
+        self.no_tails = True
+        self.len = ln
+
+    def step(self, delta, const=-1):
+        if(const >= 0 or const == DELTA or const == ADJUST):
+            self.cur += delta
+
+    def step_tails(self, delta, const=-1):
+        self.step(delta, const)
+
+    # 'tails' here is irrelevant; search for "no_tails" property to avoid doubling
+    def read(self,tails=False,stereo=True,signal=True):
+        if(stereo):
+            return self.val
+        else:
+            return self.val[0]
+
+    def reset(self):
+        self.cur = 0
+
+    def clear(self):
+        self.cur = 0
+
+    def done(self):
+        return self.cur >= self.len
+
+    def has_tails(self):
+        return False
+    
+    def get_extra(self):
+        if(self.done()):
+            return self.cur-self.len
+        else:
+            return 0
+
+    def pure(self):
+        return True
+
+    def value_at(self, t):
+        return self.val[0]
+
+    def clone(self):
+        tmp = StereoVal(self.val, self.len)
+        tmp.cur = self.cur
+        return tmp
+
+    def calc_length(self):
+        return self.len
+
+    #def set_freq(self, freq):
+    #    pass
+    def set_pitch(self, pitch):
+        pass
+
+class Osc(SCModule):
+    """ Module computing a basic waveform directly from its phase.
+
+        One cycle of the wave takes the module's length (1 by default), so
+        an Inst plays it at pitch just like a one-period Pattern. The shapes
+        follow the matching core.sc waves, peaking at +/-MAX_VAL:
+        SIN -- Sine.
+        TRI -- Triangle, starting at 0 & rising.
+        SAW -- Falling saw, from MAX_VAL to -MAX_VAL.
+        SQR -- Square; high for the first half.
+        PLS -- Pulse; high for the first 'duty' of the cycle.
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("cur",)
+
+    SHAPES = ("SIN", "TRI", "SAW", "SQR", "PLS")
+
+    def __init__(self, shape, ln=1, duty=None):
+        """ Initializer.
+
+            Arguments:
+            shape -- One of SHAPES.
+            ln -- The module length (one cycle).
+            duty -- Module giving the PLS duty cycle, in [0,1]. Defaults to 0.5.
+        """
+
+        self.shape = shape
+        self.len = ln
+        self.duty = duty
+        if(self.duty == None):
+            self.duty = Val(0.5)
+        self.own(self.duty)
+        self.cur = 0
+        self.no_tails = True
+
+    def step(self, delta, const=-1):
+        if(const != STOP and const != RELEASE):
+            self.cur += delta
+        self.duty.step(delta,const)
+        if(self.duty.done()):
+            extra = self.duty.get_extra()
+            self.duty.reset()
+            self.duty.step(extra,ADJUST)
+
+    def step_tails(self, delta, const=-1):
+        pass
+
+    # 'tails' here is irrelevant; search for "no_tails" property to avoid doubling
+    def read(self,tails=False,stereo=True,signal=True):
+        duty = None
+        if(self.shape == "PLS"):
+            duty = self.duty.read(False,False,signal)
+        val = self.wave(self.cur, duty)
+        if(stereo):
+            return [val,val]
+        else:
+            return val
+
+    def wave(self, cur, duty):
+        """ Returns the wave's value at the given time.
+
+            Arguments:
+            cur -- Time into the wave (one cycle is our length).
+            duty -- The PLS duty cycle (unused for other shapes).
+        """
+
+        phase = cur / self.len
+        phase = phase - math.floor(phase)
+        if(self.shape == "SIN"):
+            val = MAX_VAL*math.sin(2*math.pi*phase)
+        elif(self.shape == "TRI"):
+            if(phase < 0.25):
+                val = MAX_VAL*4*phase
+            elif(phase < 0.75):
+                val = MAX_VAL*(2-4*phase)
+            else:
+                val = MAX_VAL*(4*phase-4)
+        elif(self.shape == "SAW"):
+            val = MAX_VAL*(1-2*phase)
+        elif(self.shape == "SQR"):
+            val = MAX_VAL if phase < 0.5 else -MAX_VAL
+        else:
+            val = MAX_VAL if phase < duty else -MAX_VAL
+        return val
+
+    def reset(self):
+        self.cur = 0
+
+    def clear(self):
+        self.cur = 0
+        self.duty.clear()
+
+    def done(self):
+        return self.cur >= self.len
+
+    def has_tails(self):
+        return False
+
+    def get_extra(self):
+        if(self.done()):
+            return self.cur-self.len
+        else:
+            return 0
+
+    def pure(self):
+        return self.shape != "PLS" or self.duty.pure()
+
+    def value_at(self, t):
+        duty = None
+        if(self.shape == "PLS"):
+            duty = looped_at(self.duty, t)
+        return self.wave(t, duty)
+
+    def clone(self):
+        tmp = Osc(self.shape, self.len, self.duty.clone())
+        tmp.cur = self.cur
+        return tmp
+
+    def calc_length(self):
+        return self.len
+
+    #def set_freq(self, freq):
+    #    pass
+    def set_pitch(self, pitch):
+        pass
+
+class Noise(SCModule):
+    """ Module producing chip-style noise from a linear feedback shift register.
+
+        The register is 15 bits, like the NES noise channel. LONG mode taps
+        bit 1 (a 32767-step sequence); SHORT mode taps bit 6 (a short, more
+        tonal loop). The register is clocked 'rate' times per cycle, so an
+        Inst's pitch sets the clock speed. Output is +/-MAX_VAL.
+
+        Values are generated a block at a time by generate().
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("cur", "reg", "block", "inx", "clocked")
+
+    # Number of register clocks generated per block.
+    BLOCK = 256
+
+    # Reads advance the noise clock.
+    read_timed = True
+
+    def __init__(self, short=False, ln=1, rate=16):
+        """ Initializer.
+
+            Arguments:
+            short -- Whether to use SHORT mode.
+            ln -- The module length (one cycle).
+            rate -- Register clocks per cycle.
+        """
+
+        self.short = short
+        self.len = ln
+        self.rate = rate
+        self.cur = 0
+        self.no_tails = True
+        self.reg = 1
+        self.block = self.generate(self.BLOCK)
+        self.inx = 0
+        # Clocks taken so far in the current cycle.
+        self.clocked = 0
+
+    def generate(self, n):
+        """ Clocks the register n times & returns the outputs as an array.
+
+            Arguments:
+            n -- Number of values to generate.
+        """
+
+        out = array('d', [0.0]*n)
+        reg = self.reg
+        tap = 6 if self.short else 1
+        for i in range(n):
+            fb = (reg ^ (reg >> tap)) & 1
+            reg = (reg >> 1) | (fb << 14)
+            out[i] = -MAX_VAL if reg & 1 else MAX_VAL
+        self.reg = reg
+        return out
+
+    def advance(self):
+        """ Moves to the next register value, generating a new block if needed.
+        """
+
+        self.inx += 1
+        if(self.inx >= len(self.block)):
+            self.block = self.generate(self.BLOCK)
+            self.inx = 0
+
+    def step(self, delta, const=-1):
+        if(const != STOP and const != RELEASE):
+            self.cur += delta
+
+    def step_tails(self, delta, const=-1):
+        pass
+
+    # 'tails' here is irrelevant; search for "no_tails" property to avoid doubling
+    def read(self,tails=False,stereo=True,signal=True):
+        clock = int(self.cur * self.rate / self.len)
+        while(self.clocked < clock):
+            self.advance()
+            self.clocked += 1
+        val = self.block[self.inx]
+        if(stereo):
+            return [val,val]
+        else:
+            return val
+
+    def reset(self):
+        # A new cycle starts on a new clock; the register keeps running.
+        self.cur = 0
+        self.clocked = 0
+        self.advance()
+
+    def clear(self):
+        self.cur = 0
+        self.clocked = 0
+        self.reg = 1
+        self.block = self.generate(self.BLOCK)
+        self.inx = 0
+
+    def done(self):
+        return self.cur >= self.len
+
+    def has_tails(self):
+        return False
+
+    def get_extra(self):
+        if(self.done()):
+            return self.cur-self.len
+        else:
+            return 0
+
+    def clone(self):
+        # Built without __init__, which would generate a block to throw away.
+        tmp = Noise.__new__(Noise)
+        tmp.short = self.short
+        tmp.len = self.len
+        tmp.rate = self.rate
+        tmp.no_tails = True
+        tmp.cur = self.cur
+        tmp.reg = self.reg
+        tmp.block = array('d', self.block)
+        tmp.inx = self.inx
+        tmp.clocked = self.clocked
+        return tmp
+
+    def calc_length(self):
+        return self.len
+
+    #def set_freq(self, freq):
+    #    pass
+    def set_pitch(self, pitch):
+        pass
+
+class Pattern(SCModule):
+    """ Represents a sequence of modules, to be played one after the other.
+
+        This differs from Series in that Pattern plays through each of its
+        modules before finishing. Series plays through its current module,
+        finishes, then plays the next one after reset().
+
+        Accordingly, the length of Pattern is the sum of the lengths of its
+        modules.
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("curInx", "extra", "live")
+
+    def __init__(self, pat=(Val(0),Val(1))):
+        """ Initializer
+
+            Arguments:
+            pat -- The pattern, as a list of Modules.
+        """
+
+        self.pat = pat
+        self.own(self.pat)
+        self.curInx = 0
+        self.extra = 0
+        self.can_tail = tail_flags(self.pat)
+        self.live = live_tails(self.pat, self.can_tail)
+
+    def step(self, delta, const=-1):
+        if(not self.done()):
+            self.pat[self.curInx].step(delta, const)
+            while(not self.done() and self.pat[self.curInx].done()):
+                self.extra = self.pat[self.curInx].get_extra()
+                self.pat[self.curInx].reset()
+                self.note_tails(self.curInx)
+                self.curInx += 1
+                if(not self.done()):
+                    self.pat[self.curInx].step(self.extra,ADJUST)
+
+    def note_tails(self, inx):
+        """ Adds a module we're moving on from to the live tails index, if
+            it has any tails.
+
+            Arguments:
+            inx -- Index of the module in the pattern.
+        """
+
+        if(self.can_tail[inx] and inx not in self.live and self.pat[inx].has_tails()):
+            bisect.insort(self.live, inx)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(tails):
+            inxs = with_current(self.live, self.curInx, len(self.pat))
+            if(stereo):
+                sum = [0,0]
+                for i in inxs:
+                    val = self.pat[i].read(tails,stereo,signal)
+                    sum[0] += val[0]
+                    sum[1] += val[1]
+                return sum
+            else:
+                sum = 0
+                for i in inxs:
+                    sum += self.pat[i].read(tails,stereo,signal)
+                return sum
+        else:
+            if(not self.done()):
+                return self.pat[self.curInx].read(tails,stereo,signal)
+            else:
+                if(stereo):
+                    return [0,0]
+                else:
+                    return 0
+
+    def step_tails(self, delta, const=-1):
+        for i in with_current(self.live, self.curInx, len(self.pat)):
+            self.pat[i].step_tails(delta, const)
+        self.live = prune_tails(self.pat, self.live)
+
+    def reset(self):
+        if(not self.done()):
+            self.pat[self.curInx].reset()
+            self.note_tails(self.curInx)
+        self.curInx = 0
+
+    def clear(self):
+        self.curInx = 0
+        for p in self.pat:
+            p.clear()
+        self.live = live_tails(self.pat, self.can_tail)
+
+    def done(self):
+        return self.curInx>=len(self.pat)
+
+    def has_tails(self):
+        for m in self.pat:
+            if(m.has_tails()):
+                return True
+        return False
+
+    def silent_for(self):
+        if(self.done()):
+            return 0
+        quiet = self.pat[self.curInx].silent_for()
+        for i in self.live:
+            if(quiet <= 0):
+                break
+            if(i != self.curInx):
+                quiet = min(quiet, self.pat[i].silent_for())
+        return quiet
+
+    def get_extra(self):
+        if(self.done()):
+            return self.extra
+        else:
+            return 0
+
+    def cse_links(self):
+        return (("pat","own"),)
+
+    def pure(self):
+        for p in self.pat:
+            if(not p.pure()):
+                return False
+        return True
+
+    def value_at(self, t):
+        for p in self.pat:
+            ln = p.length()
+            if(t < ln):
+                return p.value_at(t)
+            t -= ln
+        return 0
+
+    def clone(self):
+        pt = []
+        for p in self.pat:
+            pt.append(p.clone())
+        tmp = Pattern(pt)
+        tmp.curInx = self.curInx
+        tmp.extra = self.extra
+        return tmp
+
+    def calc_length(self):
+        sum = 0
+        for p in self.pat:
+            sum += p.length()
+        return sum
+
+    #def set_freq(self, freq):
+    #    for p in self.pat:
+    #        p.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        for p in self.pat:
+            p.set_pitch(pitch)
+
+class Set(SCModule):
+    """ Module for selecting random modules from a set.
+
+        Each time Set is reset (or initialized), a random module is selected,
+        and it will be played the next time through.
+
+        Note: If the modules in the Set have differing lengths, Set.length()
+        will yield unpredictable results. Generally, this is not a problem,
+        but it may cause some unexpected behavior (i.e., the progress bar
+        might exceed 100%).
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("curMod", "curInx", "live")
+
+    # Copies each make their own random choices, so they can't be shared.
+    shareable = False
+
+    def __init__(self, set=[Val(0)]):
+        self.set = set
+        self.own(self.set)
+        self.choose()
+        self.can_tail = tail_flags(self.set)
+        self.live = live_tails(self.set, self.can_tail)
+
+    def choose(self):
+        """ Picks the module to play next, keeping its index in curInx.
+        """
+        self.curInx = random.randrange(len(self.set))
+        self.curMod = self.set[self.curInx]
+
+    def step(self, delta, const=-1):
+        self.curMod.step(delta, const)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(tails):
+            inxs = with_current(self.live, self.curInx, len(self.set))
+            if(stereo):
+                sum = [0,0]
+                for i in inxs:
+                    val = self.set[i].read(tails,stereo,signal)
+                    sum[0] += val[0]
+                    sum[1] += val[1]
+                return sum
+            else:
+                sum = 0
+                for i in inxs:
+                    sum += self.set[i].read(tails,stereo,signal)
+                return sum
+        else:
+            return self.curMod.read(tails,stereo,signal)
+
+    def step_tails(self, delta, const=-1):
+        for i in with_current(self.live, self.curInx, len(self.set)):
+            self.set[i].step_tails(delta, const)
+        self.live = prune_tails(self.set, self.live)
+
+    def reset(self):
+        self.curMod.reset()
+        inx = self.curInx
+        if(self.can_tail[inx] and inx not in self.live and self.curMod.has_tails()):
+            bisect.insort(self.live, inx)
+        self.choose()
+        if(self.cached_len != None and self.curMod.length() != self.cached_len):
+            self.invalidate_length()
+
+    def clear(self):
+        for m in self.set:
+            m.clear()
+        self.live = live_tails(self.set, self.can_tail)
+        self.choose()
+        if(self.cached_len != None and self.curMod.length() != self.cached_len):
+            self.invalidate_length()
+
+    def done(self):
+        return self.curMod.done()
+
+    def has_tails(self):
+        for m in self.set:
+            if(m.has_tails()):
+                return True
+        return False
+
+    def silent_for(self):
+        quiet = self.curMod.silent_for()
+        for i in self.live:
+            if(quiet <= 0):
+                break
+            if(self.set[i] is not self.curMod):
+                quiet = min(quiet, self.set[i].silent_for())
+        return quiet
+
+    def get_extra(self):
+        return self.curMod.get_extra()
+
+    def clone(self):
+        st = []
+        for s in self.set:
+            st.append(s.clone())
+        tmp = Set(st)
+        tmp.curInx = self.curInx
+        tmp.curMod = tmp.set[self.curInx]
+        return tmp
+
+    def calc_length(self):
+        return self.curMod.length()
+
+    #def set_freq(self, freq):
+    #    for m in self.set:
+    #        m.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        for m in self.set:
+            m.set_pitch(pitch)
+
+class Series(SCModule):
+    """ Module for playing a series of modules as part of a longer pattern.
+
+        Series differs from Pattern in that Series plays modules one at a time--
+        when the current module is finished, Series is done(), and SC moves on.
+        Each time Series is reset, it moves on to the next module in the
+        sequence.
+
+        Note: clear() will fully reset Series, setting the first module to
+        current. Also, different clones of Series operate independently, which
+        means that Series might not work as planned in some situations.
+        Generally, if you have to reference the module containing Series multiple
+        times in the SC code, it won't work properly. Try rephrasing it to use
+        Repeat instead, if possible.
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("curInx",)
+
+    # Reads move on to the next module when one finishes.
+    read_timed = True
+
+    def __init__(self, srs=[Val(0)]):
+        self.srs = srs
+        self.own(self.srs)
+        self.curInx = 0
+
+    def step(self, delta, const=-1):
+        self.srs[self.curInx].step(delta, const)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(tails):
+            if(stereo):
+                cur = self.srs[self.curInx]
+                sum = [0,0]
+                for mdl in self.srs:
+                    if(mdl != cur and getattr(mdl, "no_tails", None) == None):
+                        val = mdl.read(tails,stereo,signal)
+                        sum[0] += val[0]
+                        sum[1] += val[1]
+                    elif(mdl == cur):
+                        val = mdl.read(tails,stereo,signal)
+                        sum[0] += val[0]
+                        sum[1] += val[1]
+                return sum
+            else:
+                cur = self.srs[self.curInx]
+                sum = 0
+                for mdl in self.srs:
+                    if(mdl != cur and getattr(mdl, "no_tails", None) == None):
+                        sum += mdl.read(tails,stereo,signal)
+                    elif(mdl == cur):
+                        sum += mdl.read(tails,stereo,signal)
+                return sum
+        else:
+            if(self.srs[self.curInx].done()):
+                # This section probably should never happen -- should we just return 0?
+                extra = self.srs[self.curInx].get_extra()
+                self.srs[self.curInx].reset()
+                self.srs[self.curInx].step(extra,ADJUST)
+            return self.srs[self.curInx].read(tails,stereo,signal)
+
+    def step_tails(self, delta, const=-1):
+        for mdl in self.srs:
+            mdl.step_tails(delta, const)
+
+    def reset(self):
+        self.srs[self.curInx].reset()
+        self.curInx += 1
+        if(self.curInx >= len(self.srs)):
+            self.curInx = 0
+        if(self.cached_len != None and self.srs[self.curInx].length() != self.cached_len):
+            self.invalidate_length()
+
+    def clear(self):
+        self.curInx = 0
+        for m in self.srs:
+            m.clear()
+        if(self.cached_len != None and self.srs[self.curInx].length() != self.cached_len):
+            self.invalidate_length()
+
+    def done(self):
+        return self.srs[self.curInx].done()
+
+    def has_tails(self):
+        for m in self.srs:
+            if(m.has_tails()):
+                return True
+        return False
+    
+    def get_extra(self):
+        return self.srs[self.curInx].get_extra()
+
+    def cse_links(self):
+        if(len(self.srs) == 1):
+            return (("srs","same"),)
+        else:
+            return (("srs","own"),)
+
+    def clone(self):
+        sr = []
+        for s in self.srs:
+            sr.append(s.clone())
+        tmp = Series(sr)
+        tmp.curInx = self.curInx
+        return tmp
+
+    def calc_length(self):
+        return self.srs[self.curInx].length()
+
+    #def set_freq(self, freq):
+    #    for s in self.srs:
+    #        s.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        for s in self.srs:
+            s.set_pitch(pitch)
+
+class Table(SCModule):
+    """ Module playing a fixed table of values, in place of a Pattern or
+        Series whose modules are all constant.
+
+        Each entry is a held value (from a Val) or a ramp (from a LinInterp
+        between constants), with its length. Instead of stepping, resetting
+        and handing extra time between nested modules, Table keeps the
+        current entry index and the time into that entry. The results are
+        identical to the Pattern or Series it replaces. Steps that cross
+        more than one entry (large steps at high pitches) find their entry
+        from the start times of the entries, in O(log n) (see seek()).
+
+        The parser builds these; see table_entries().
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("inx", "local", "extra")
+
+    # In series mode, reads move on to the next entry when one finishes.
+    @property
+    def read_timed(self):
+        return self.series
+
+    def __init__(self, entries, series=False):
+        """ Initializer.
+
+            Arguments:
+            entries -- List of (start, end, length, ramp) tuples.
+            series -- Whether to play like a Series (one entry per reset)
+                instead of a Pattern.
+        """
+
+        self.entries = entries
+        self.starts = [e[0] for e in entries]
+        self.ends = [e[1] for e in entries]
+        self.lens = [e[2] for e in entries]
+        self.ramps = [e[3] for e in entries]
+        self.count = len(entries)
+        # Time each entry starts at, and the total length.
+        self.offsets = []
+        self.total = 0
+        for ln in self.lens:
+            self.offsets.append(self.total)
+            self.total += ln
+        self.series = series
+        self.inx = 0
+        self.local = 0
+        self.extra = 0
+
+    def step(self, delta, const=-1):
+        if(self.series):
+            if(const != STOP and const != RELEASE):
+                self.local += delta
+            return
+        if(self.inx >= self.count):
+            return
+        if(const != STOP and const != RELEASE):
+            self.local += delta
+        if(self.local >= self.lens[self.inx]):
+            self.local -= self.lens[self.inx]
+            self.inx += 1
+            if(self.inx < self.count and self.local >= self.lens[self.inx]):
+                self.inx, self.local = self.seek(self.inx, self.local)
+            if(self.inx >= self.count):
+                self.extra = self.local
+
+    def seek(self, inx, local):
+        """ Finds the entry a time falls in, and the time into it, as
+            (inx, local); past the end, inx is count and local the extra.
+
+            Arguments:
+            inx -- An entry at or before the one we want.
+            local -- Time into that entry.
+        """
+
+        pos = self.offsets[inx] + local
+        if(pos >= self.total):
+            return self.count, pos - self.total
+        inx = bisect.bisect_right(self.offsets, pos, inx+1) - 1
+        return inx, pos - self.offsets[inx]
+
+    def value(self, stereo):
+        """ Reads the current entry.
+
+            Arguments:
+            stereo -- Whether to return a stereo pair.
+        """
+
+        inx = self.inx
+        if(self.ramps[inx]):
+            pct = self.local / self.lens[inx]
+            val = self.starts[inx]*(1-pct)+self.ends[inx]*pct
+        else:
+            val = self.starts[inx]
+        if(stereo):
+            return [val,val]
+        else:
+            return val
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(self.series):
+            if(not tails and self.local >= self.lens[self.inx]):
+                self.local = self.local - self.lens[self.inx]
+            return self.value(stereo)
+        if(self.inx >= self.count):
+            if(stereo):
+                return [0,0]
+            else:
+                return 0
+        return self.value(stereo)
+
+    def step_tails(self, delta, const=-1):
+        pass
+
+    def reset(self):
+        self.local = 0
+        if(self.series):
+            self.inx += 1
+            if(self.inx >= self.count):
+                self.inx = 0
+            if(self.cached_len != None and self.lens[self.inx] != self.cached_len):
+                self.invalidate_length()
+        else:
+            self.inx = 0
+
+    def clear(self):
+        self.local = 0
+        self.inx = 0
+        if(self.series and self.cached_len != None and self.lens[self.inx] != self.cached_len):
+            self.invalidate_length()
+
+    def done(self):
+        if(self.series):
+            return self.local >= self.lens[self.inx]
+        return self.inx >= self.count
+
+    def has_tails(self):
+        return False
+
+    def get_extra(self):
+        if(self.series):
+            if(self.done()):
+                return self.local - self.lens[self.inx]
+            return 0
+        if(self.done()):
+            return self.extra
+        else:
+            return 0
+
+    def pure(self):
+        # a Series only moves on when reset
+        return not self.series
+
+    def value_at(self, t):
+        if(t >= self.total):
+            return 0
+        inx = max(0, bisect.bisect_right(self.offsets, t) - 1)
+        t -= self.offsets[inx]
+        if(self.ramps[inx]):
+            pct = t / self.lens[inx]
+            return self.starts[inx]*(1-pct)+self.ends[inx]*pct
+        return self.starts[inx]
+
+    def clone(self):
+        # The entries never change, so clones can share them.
+        tmp = Table.__new__(Table)
+        tmp.entries = self.entries
+        tmp.starts = self.starts
+        tmp.ends = self.ends
+        tmp.lens = self.lens
+        tmp.ramps = self.ramps
+        tmp.count = self.count
+        tmp.offsets = self.offsets
+        tmp.total = self.total
+        tmp.series = self.series
+        tmp.inx = self.inx
+        tmp.local = self.local
+        tmp.extra = self.extra
+        return tmp
+
+    def calc_length(self):
+        if(self.series):
+            return self.lens[self.inx]
+        return self.total
+
+    #def set_freq(self, freq):
+    #    pass
+
+    def set_pitch(self, pitch):
+        pass
+
+class Invert(SCModule):
+    """ Module for negation.
+
+        Multiplies all output by -1.
+    """
+
+    def __init__(self, mdl):
+        """ Initializer.
+
+            Arguments:
+            mdl -- The module to negate.
+        """
+
+        self.mdl = mdl
+        self.own(self.mdl)
+
+    def step(self, delta, const=-1):
+        self.mdl.step(delta, const)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        val = self.mdl.read(tails,stereo,signal)
+        if(stereo):
+            return [-val[0],-val[1]]
+        else:
+            return -val
+
+    def step_tails(self, delta, const=-1):
+        self.mdl.step_tails(delta, const)
+
+    def reset(self):
+        self.mdl.reset()
+
+    def clear(self):
+        self.mdl.clear()
+
+    def done(self):
+        return self.mdl.done()
+
+    def has_tails(self):
+        return self.mdl.has_tails()
+
+    def silent_for(self):
+        return self.mdl.silent_for()
+
+    def get_extra(self):
+        return self.mdl.get_extra()
+
+    def cse_links(self):
+        return (("mdl","same"),)
+
+    def pure(self):
+        return self.mdl.pure()
+
+    def value_at(self, t):
+        return -self.mdl.value_at(t)
+
+    def clone(self):
+        return Invert(self.mdl.clone())
+
+    def calc_length(self):
+        return self.mdl.length()
+
+    #def set_freq(self, freq):
+    #    self.mdl.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.mdl.set_pitch(pitch)
+
+class AbsVal(SCModule):
+    """ Module for absolute value.
+
+    """
+
+    def __init__(self, mdl):
+        """ Initializer.
+
+            Arguments:
+            mdl -- Input module.
+        """
+
+        self.mdl = mdl
+        self.own(self.mdl)
+
+    def step(self, delta, const=-1):
+        self.mdl.step(delta, const)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        val = self.mdl.read(tails,stereo,signal)
+        if(stereo):
+            return [abs(val[0]),abs(val[1])]
+        else:
+            return abs(val)
+
+    def step_tails(self, delta, const=-1):
+        self.mdl.step_tails(delta, const)
+
+    def reset(self):
+        self.mdl.reset()
+
+    def clear(self):
+        self.mdl.clear()
+
+    def done(self):
+        return self.mdl.done()
+
+    def has_tails(self):
+        return self.mdl.has_tails()
+
+    def silent_for(self):
+        return self.mdl.silent_for()
+
+    def get_extra(self):
+        return self.mdl.get_extra()
+
+    def cse_links(self):
+        return (("mdl","same"),)
+
+    def pure(self):
+        return self.mdl.pure()
+
+    def value_at(self, t):
+        return abs(self.mdl.value_at(t))
+
+    def clone(self):
+        return AbsVal(self.mdl.clone())
+
+    def calc_length(self):
+        return self.mdl.length()
+
+    #def set_freq(self, freq):
+    #    self.mdl.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.mdl.set_pitch(pitch)
+
+class Level(SCModule):
+    """ Module for setting the volume of a module.
+
+        This uses signal values, so 9 is max volume; 0 is silence. Negative
+        level values will similarly invert the output.
+    """
+
+    def __init__(self, mdl, env, alead=True):
+        """ Initializer.
+
+            Arguments:
+            mdl -- The input module.
+            env -- The volume level module.
+            alead -- If true, we stop when mdl stops; otherwise, when env stops.
+        """
+
+        self.a = mdl
+        self.b = env
+        self.a_lead = alead
+        self.own(self.a, self.b)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+        self.b.step(delta, const)
+        if(self.a_lead):
+            if(self.b.done() and not self.a.done()):
+                extra = self.b.get_extra()
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+        else:
+            if(self.a.done() and not self.b.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        valA = self.a.read(tails,stereo,signal)
+        valB = self.b.read(False,stereo,True)
+        if(stereo):
+            return [valA[0]*as_decimal(valB[0]),valA[1]*as_decimal(valB[1])]
+        else:
+            return valA*as_decimal(valB)
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+        self.b.step_tails(delta,const)
+
+    def reset(self):
+        self.a.reset()
+        self.b.reset()
+
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+
+    def done(self):
+        if(self.a_lead):
+            return self.a.done()
+        else:
+            return self.b.done()
+
+    def has_tails(self):
+        return self.a.has_tails()
+
+    def silent_for(self):
+        quiet = self.a.silent_for()
+        # the level input can only go unread if reading it wouldn't change it
+        if(not self.b.stateless_reads()):
+            quiet = min(quiet, self.b.silent_for())
+        return quiet
+
+    def get_extra(self):
+        if(self.a_lead):
+            return self.a.get_extra()
+        else:
+            return self.b.get_extra()
+
+    def calc_length(self):
+        if(self.a_lead):
+            return self.a.length()
+        else:
+            return self.b.length()
+
+    def quiet_fields(self):
+        # the input that doesn't lead is only reset to keep up with the other
+        if(self.a_lead):
+            return ("b",)
+        else:
+            return ("a",)
+
+    def cse_links(self):
+        if(self.a_lead):
+            return (("a","same"),("b","trail"))
+        else:
+            return (("b","same"),("a","trail"))
+
+    def pure(self):
+        return self.a.pure() and self.b.pure()
+
+    def value_at(self, t):
+        valA, valB = operands_at(self, t)
+        return valA*as_decimal(valB)
+
+    def clone(self):
+        return Level(self.a.clone(), self.b.clone(), self.a_lead)
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Envelope(SCModule):
+    """ Volume envelope module.
+
+        This is similar to Level, except the volume module runs in constant
+        time, based on song steps. This lets you create an envelope that
+        doesn't vary based on Instrument pitch.
+
+        Like Level, this uses signal values, so 9 is max volume, 0 is silence.
+        Negative values will similarly invert the output.
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("cur", "stopped", "curve", "n", "fresh")
+    # Caches, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + ("bakes", "baked")
+    # The SynthCorona's curves, shared by Envelopes from other definitions
+    # (see SynthCorona.baked); None bakes only for this one and its clones.
+    baked = None
+
+    def __init__(self, mdl, env, rate=1, loop=False, atk=0, rels=-1):
+        """ Initializer.
+
+            Arguments:
+            mdl -- The input module.
+            env -- The envelope module.
+            rate -- Playback rate for the envelope module. 1 is in time with
+                    song steps; 2 is twice as fast; 0.5 half, etc.
+            loop -- Whether to loop when the volume module is finished.
+            atk  -- The attack marker, used when looping.
+            rels -- The release point, in song steps. Will loop up to this
+                    point until STOP, then will play through. -1 for no release.
+        """
+
+        self.a = mdl
+        self.b = env
+        self.own(self.a, self.b)
+        # so you don't have to spend an hour searching in the future --
+        # the reason Const does rate/frameslice & Envelope does just rate
+        # is that we actually are setting the rate in the parser
+        # (don't ask me why though)
+        self.rate = rate
+        self.loop = loop
+        self.attack = atk
+        self.release = rels
+        self.cur = 0
+        self.stopped = False
+        # Baked gain curves, shared between clones: {step size: curve}.
+        # See bake().
+        self.bakes = {}
+        # The curve we're playing from (None when stepping the envelope
+        # module itself), and how many steps into it we are.
+        self.curve = None
+        self.n = 0
+        # Whether a curve may be used from the current (fresh) state.
+        self.fresh = True
+
+    def bakeable(self):
+        """ Checks whether the envelope module can be baked: a Pattern-mode
+            Table in its starting state, with a first entry of some length.
+        """
+
+        return (type(self.b) == Table and not self.b.series and self.b.inx == 0
+                and self.b.local == 0 and self.b.lens[0] > 0)
+
+    def bake(self, step):
+        """ Pre-renders the gain curve for the envelope module, stepped from
+            its starting state by the given amount each sample.
+
+            The curve holds the gain (the decimal of the module's value) after
+            each step, until the module is done. It also keeps the module's
+            state where we must hand over to the module itself: at the release
+            point (the first step with cur >= release), and at the end.
+            Returns the curve, or None if it would be too long.
+
+            Arguments:
+            step -- Envelope module step size per sample (const*rate).
+        """
+
+        if(step in self.bakes):
+            return self.bakes[step]
+        # Envelopes from other definitions may have baked the same curve
+        baked = self.baked
+        if(baked == None):
+            baked = {}
+        key = (self.b.fingerprint(), self.release, step)
+        if(key in baked):
+            self.bakes[step] = baked[key]
+            return baked[key]
+        tbl = self.b
+        if(step <= 0 or tbl.calc_length()/step > ENV_BAKE_MAX):
+            self.bakes[step] = None
+            baked[key] = None
+            return None
+        starts, ends, lens, ramps, count = tbl.starts, tbl.ends, tbl.lens, tbl.ramps, tbl.count
+        gains = array('d')
+        inx = 0
+        local = 0
+        cur = 0
+        rels_at = -1
+        rels_state = None
+        if(ramps[0]):
+            gains.append((starts[0]*(1-0/lens[0])+ends[0]*(0/lens[0]))/MAX_VAL)
+        else:
+            gains.append(starts[0]/MAX_VAL)
+        while(inx < count):
+            local += step
+            if(local >= lens[inx]):
+                local -= lens[inx]
+                inx += 1
+                if(inx < count and local >= lens[inx]):
+                    inx, local = tbl.seek(inx, local)
+            cur += step
+            if(rels_at < 0 and self.release > 0 and cur >= self.release):
+                rels_at = len(gains)
+                rels_state = (inx, local)
+            if(inx >= count):
+                gains.append(0/MAX_VAL)
+            elif(ramps[inx]):
+                pct = local / lens[inx]
+                gains.append((starts[inx]*(1-pct)+ends[inx]*pct)/MAX_VAL)
+            else:
+                gains.append(starts[inx]/MAX_VAL)
+        curve = (gains, len(gains)-1, local, rels_at, rels_state)
+        self.bakes[step] = curve
+        baked[key] = curve
+        return curve
+
+    def unbake(self):
+        """ Stops playing from the baked curve, bringing the envelope module
+            to the state the curve had reached.
+        """
+
+        curve = self.curve
+        self.curve = None
+        self.fresh = False
+        end = curve[1]
+        if(self.n >= end):
+            self.b.inx = self.b.count
+            self.b.local = curve[2]
+            self.b.extra = curve[2]
+        elif(self.n == curve[3]):
+            self.b.inx, self.b.local = curve[4]
+        else:
+            for i in range(self.n):
+                self.b.step(self.step_size, DELTA)
+
+    def step(self, delta, const=-1):
+        if(self.curve != None and (const == ADJUST or (const >= 0 or const == DELTA)
+                and (delta if const == DELTA else const)*self.rate != self.step_size)):
+            self.unbake()
+        if(const == STOP or const == RELEASE):
+            self.a.step(0,const)
+            if(self.curve == None):
+                self.b.step(0,const)
+            self.stopped = True
+        elif(const == ADJUST):
+            self.cur += delta
+            self.fresh = False
+            self.b.step(delta, const)
+        elif(self.curve != None or (self.fresh and self.bakeable() and self.cur == 0)):
+            if(const == DELTA):
+                const = delta
+            if(self.curve == None):
+                self.step_size = const*self.rate
+                self.curve = self.bake(self.step_size)
+                if(self.curve == None):
+                    self.fresh = False
+                    self.step(delta, const)
+                    return
+            self.a.step(delta, const)
+            self.n += 1
+            self.cur += const*self.rate
+            if(self.release > 0):
+                if(not self.stopped and self.cur >= self.release):
+                    self.unbake()
+                    self.cur %= self.release
+                    self.cur += self.attack
+                    self.b.reset()
+                    self.b.step(self.cur,ADJUST)
+            if(self.a.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+            if(self.loop and self.curve != None and self.n >= self.curve[1]):
+                self.unbake()
+            if(self.loop and self.curve == None and self.b.done()):
+                extra = self.b.get_extra()
+                extra += self.attack
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+        else:
+            if(const == DELTA):
+                const = delta
+            self.fresh = False
+            self.a.step(delta, const)
+            self.b.step(const*self.rate, const)
+
+            self.cur += const*self.rate
+            # If a release point is set, we will loop at it until STOP, then play through
+            if(self.release > 0):
+                if(not self.stopped and self.cur >= self.release):
+                    self.cur %= self.release
+                    self.cur += self.attack
+                    self.b.reset()
+                    self.b.step(self.cur,ADJUST)
+
+            if(self.a.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+            if(self.loop and self.b.done()):
+                extra = self.b.get_extra()
+                extra += self.attack
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(self.curve != None):
+            gain = self.curve[0][min(self.n, self.curve[1])]
+            if(stereo):
+                valA = self.a.read(tails,stereo,signal)
+                return [valA[0]*gain,valA[1]*gain]
+            else:
+                return self.a.read(tails,stereo,signal)*gain
+        if(stereo):
+            valA = self.a.read(tails,stereo,signal)
+            valB = self.b.read(False,stereo,True)
+            return [valA[0]*as_decimal(valB[0]),valA[1]*as_decimal(valB[1])]
+        else:
+            return self.a.read(tails,stereo,signal)*as_decimal(self.b.read(False,stereo,True))
+
+    def step_tails(self, delta, const=-1):
+        if(const == DELTA):
+            const = delta
+        self.a.step_tails(delta,const)
+        self.b.step_tails(const*self.rate, const)
+
+    def reset(self):
+        #if(self.loop):
+        #    self.a.reset()
+        #    self.b.reset()
+        #    self.b.step(self.attack,ADJUST)
+        #    self.cur = self.attack
+        if(self.curve != None and self.attack == 0):
+            # back to the start of the curve
+            self.a.reset()
+            self.n = 0
+            self.cur = 0
+            return
+        if(self.curve != None):
+            self.unbake()
+        self.a.reset()
+        self.b.reset()
+        self.b.step(self.attack,ADJUST)
+        self.cur = self.attack
+        
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+        self.cur = 0
+        self.stopped = False
+        self.curve = None
+        self.n = 0
+        self.fresh = True
+
+    def done(self):
+        if(self.curve != None):
+            return self.n >= self.curve[1]
+        return self.b.done()
+
+    def has_tails(self):
+        return self.a.has_tails()
+
+    def get_extra(self):
+        if(self.curve != None):
+            if(self.n >= self.curve[1]):
+                return self.curve[2]
+            return 0
+        return self.b.get_extra()#/self.rate
+
+    def calc_length(self):
+        return self.b.length()/self.rate
+
+    def clone(self):
+        tmp = Envelope(self.a.clone(), self.b.clone(), self.rate, self.loop, self.attack, self.release)
+        tmp.stopped = self.stopped
+        tmp.cur = self.cur
+        tmp.bakes = self.bakes
+        tmp.baked = self.baked
+        tmp.curve = self.curve
+        tmp.n = self.n
+        tmp.fresh = self.fresh
+        if(self.curve != None):
+            tmp.step_size = self.step_size
+        return tmp
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Const(SCModule):
+    """ Plays a module in constant time, based on song steps.
+
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("cur", "stopped")
+
+    def __init__(self, mdl, frameslice, rate=1, loop=False, atk=0, rels=-1):
+        """ Initializer.
+
+            Arguments:
+            mdl -- Input module.
+            frameslice -- Ratio between song steps and samples (I think...
+                    anyway, this should be SynthCorona.frameslice)
+            rate -- Playback rate. 1 is in time with song steps; 2 is twice as
+                    fast; 0.5 half, etc.
+            loop -- Whether to loop the module once it's finished.
+            atk -- Attack point (for looping).
+            rels -- Release point (for looping). -1 for no release point.
+        """
+
+        self.mdl = mdl
+        self.own(self.mdl)
+        self.rate = rate*frameslice
+        self.frameslice = frameslice
+        self.loop = loop
+        self.attack = atk
+        self.release = rels
+        self.cur = 0
+        self.stopped = False
+
+    def step(self, delta, const=-1):
+        if(const == STOP or const == RELEASE):
+            self.mdl.step(0,const)
+            self.stopped = True
+        elif(const == ADJUST):
+            self.cur += delta
+            self.mdl.step(delta, ADJUST)
+        else:
+            if(const == DELTA):
+                const = delta
+            self.mdl.step(const*self.rate,const)
+
+            self.cur += const*self.rate
+            if(self.release > 0):
+                if(not self.stopped and self.cur >= self.release):
+                    self.cur %= self.release
+                    self.cur += self.attack
+                    self.mdl.reset()
+                    self.mdl.step(self.cur,ADJUST)
+
+            if(self.loop and self.mdl.done() and not self.stopped):
+                extra = self.mdl.get_extra()
+                extra += self.attack
+                self.mdl.reset()
+                self.mdl.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        return self.mdl.read(tails,stereo,signal)
+
+    def step_tails(self, delta, const=DELTA):
+        if(const == DELTA):
+            const = delta
+        self.mdl.step_tails(const*self.rate,const)
+
+    def reset(self):
+        #if(self.loop):
+        #    self.mdl.reset()
+        #    self.mdl.step(self.attack,ADJUST)
+        #    self.cur = self.attack
+        # making loop auto-loop only...
+        self.mdl.reset()
+        self.mdl.step(self.attack,ADJUST)
+        self.cur = self.attack
+
+    def clear(self):
+        self.mdl.clear()
+        self.cur = 0
+        self.stopped = False
+
+    def done(self):
+        return self.mdl.done()
+
+    def has_tails(self):
+        return self.mdl.has_tails()
+
+    def get_extra(self):
+        return self.mdl.get_extra()#/self.rate
+
+    def calc_length(self):
+        return self.mdl.length()/self.rate
+
+    def clone(self):
+        tmp = Const(self.mdl.clone(), 1, 1, self.loop, self.attack, self.release)
+        tmp.rate = self.rate
+        tmp.frameslice = self.frameslice
+        tmp.cur = self.cur
+        tmp.stopped = self.stopped
+        return tmp
+
+    #def set_freq(self, freq):
+    #    self.mdl.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.mdl.set_pitch(pitch)
+
+class Control(SCModule):
+    """ Runs a module at control rate rather than audio rate.
+
+        Steps are collected and passed on to the input module in one go
+        every `period` samples; between updates, the last value read is held
+        (or, with lerp, ramped toward from the previous update). Used by
+        SynthCorona.apply_control() for pitch, pan and envelope modules,
+        which rarely need per-sample evaluation.
+    """
+
+    # Reads take the next value.
+    read_stateful = True
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("count", "next", "delta", "const", "vals", "prev")
+
+    def __init__(self, mdl, period, lerp=False):
+        """ Initializer.
+
+            Arguments:
+            mdl -- Input module.
+            period -- Number of samples between updates. Need not be whole.
+            lerp -- Whether to interpolate between updates instead of holding.
+        """
+
+        self.mdl = mdl
+        self.own(self.mdl)
+        self.period = period
+        self.lerp = lerp
+        self.count = 0
+        self.next = period
+        self.delta = 0
+        self.const = 0
+        self.vals = dict()
+        self.prev = dict()
+
+    def flush(self):
+        if(self.delta != 0 or self.const != 0):
+            self.mdl.step(self.delta,self.const)
+            self.delta = 0
+            self.const = 0
+        if(self.lerp):
+            self.prev = self.vals
+        self.vals = dict()
+
+    def step(self, delta, const=-1):
+        if(const == STOP or const == RELEASE):
+            self.flush()
+            self.mdl.step(delta,const)
+        elif(const == ADJUST):
+            self.mdl.step(delta,const)
+            self.vals = dict()
+            self.prev = dict()
+        else:
+            if(const == DELTA):
+                const = delta
+            self.delta += delta
+            self.const += const
+            self.count += 1
+            if(self.count >= self.next):
+                self.next += self.period
+                self.flush()
+
+    def read(self,tails=False,stereo=True,signal=True):
+        key = (tails,stereo,signal)
+        val = self.vals.get(key)
+        if(val == None):
+            val = self.mdl.read(tails,stereo,signal)
+            self.vals[key] = val
+        if(self.lerp):
+            old = self.prev.get(key)
+            if(old != None):
+                frac = 1-(self.next-self.count)/self.period
+                if(stereo):
+                    return [old[0]+(val[0]-old[0])*frac,old[1]+(val[1]-old[1])*frac]
+                return old+(val-old)*frac
+        return val
+
+    def step_tails(self, delta, const=DELTA):
+        self.mdl.step_tails(delta,const)
+
+    def reset(self):
+        self.mdl.reset()
+        self.delta = 0
+        self.const = 0
+        self.vals = dict()
+        self.prev = dict()
+
+    def clear(self):
+        self.mdl.clear()
+        self.count = 0
+        self.next = self.period
+        self.delta = 0
+        self.const = 0
+        self.vals = dict()
+        self.prev = dict()
+
+    def done(self):
+        return self.mdl.done()
+
+    def has_tails(self):
+        return self.mdl.has_tails()
+
+    def get_extra(self):
+        return self.mdl.get_extra()
+
+    def calc_length(self):
+        return self.mdl.length()
+
+    def clone(self):
+        tmp = Control(self.mdl.clone(), self.period, self.lerp)
+        tmp.count = self.count
+        tmp.next = self.next
+        tmp.delta = self.delta
+        tmp.const = self.const
+        return tmp
+
+    #def set_freq(self, freq):
+    #    self.mdl.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.mdl.set_pitch(pitch)
+        self.vals = dict()
+
+class SongShare:
+    """ State shared by SongTaps whose modules started on the same sample, in
+        the same state: the one copy that is really stepped, and a log of the
+        calls made on it since start. Each entry holds the call, what done()
+        and get_extra() reported after it, and the value read (for reads).
+    """
+
+    def __init__(self, mdl):
+        self.mdl = mdl
+        self.log = []
+        # Position of log[0] among all calls made.
+        self.start = 0
+        # A copy of the module as it was at start, which taps falling out of
+        # step are rebuilt from; None until a second tap joins.
+        self.base = None
+        self.taps = 1
+        # Taps that have yet to make the last logged call.
+        self.behind = 0
+        # Whether taps may still join (only on the sample we started on).
+        self.open = True
+        # Whether reads are logged, as they change the module's state.
+        self.timed = not mdl.stateless_reads()
+        # The last read, if they aren't logged: when it was made (by call
+        # count, and the read arguments), and its value.
+        self.read_at = None
+        self.read_val = None
+
+class SongTap(SCModule):
+    """ Stands in for a voice's song-time module: an Envelope's envelope
+        module, or a Const's input. These are stepped in song steps, not by
+        pitch, so voices whose notes start on the same sample step them the
+        same way for as long as the notes play alike, and only one copy has
+        to be stepped and read. See SynthCorona.share_song_time().
+
+        On our first call, we join the SongShare started on this sample for
+        a module with the same fingerprint and state as ours, or start one.
+        Calls are made on the shared copy by the first tap to get to them,
+        and only checked against its log by the others. Should a call not
+        match the log (i.e. our note is released earlier), we take our own
+        copy of the module, as it was before the call, and carry on with
+        that (see detach()). Reads are logged as well if they change the
+        module's state (see SCModule.stateless_reads()).
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("count", "fresh")
+    # Left out of fingerprint(): the SynthCorona's open SongShares, and ours.
+    NOT_KEYED = SCModule.NOT_KEYED + ("sharing", "share")
+
+    # The SongShare we're in, if any. Until we join one (and once we've left
+    # it), we play our own module.
+    share = None
+
+    def __init__(self, mdl, sharing):
+        """ Initializer.
+
+            Arguments:
+            mdl -- The song-time module.
+            sharing -- The SynthCorona's SongShares open for joining, by key.
+        """
+
+        self.mdl = mdl
+        self.own(self.mdl)
+        self.sharing = sharing
+        # Calls made so far, while we're in a SongShare.
+        self.count = 0
+        # Whether we've had no calls since we were made or cleared.
+        self.fresh = True
+
+    def join(self):
+        """ Joins the SongShare for our module started on this sample, or
+            starts one. Our module must not have been called on yet.
+        """
+
+        self.fresh = False
+        key = (self.mdl.fingerprint(), module_key(self.mdl))
+        s = self.sharing.get(key)
+        if(s == None or not s.open):
+            self.sharing[key] = SongShare(self.mdl)
+            self.share = self.sharing[key]
+            self.count = 0
+            return
+        # our module is as the shared one was at start, and we won't call it
+        if(s.base == None):
+            s.base = self.mdl
+        s.taps += 1
+        self.share = s
+        self.count = s.start
+        if(len(s.log) > 0):
+            s.behind += 1
+
+    def position(self):
+        """ Returns a copy of the shared module, as it is at our position in
+            the log.
+        """
+
+        s = self.share
+        inx = self.count - s.start
+        if(inx == len(s.log)):
+            return s.mdl.clone()
+        mdl = s.base.clone()
+        for entry in s.log[0:inx]:
+            getattr(mdl, entry[0][0])(*entry[0][1:])
+        return mdl
+
+    def detach(self):
+        """ Leaves our SongShare, carrying on with our own copy of the module
+            as it is at our position in the log.
+        """
+
+        s = self.share
+        if(s.taps == 1):
+            # nobody else is left, so the shared copy is ours
+            self.mdl = s.mdl
+            s.open = False
+        else:
+            self.mdl = self.position()
+            if(self.count - s.start < len(s.log)):
+                s.behind -= 1
+        s.taps -= 1
+        self.share = None
+        self.own(self.mdl)
+
+    def follow(self, call):
+        """ Makes a call on the shared copy if we're the first tap to get to
+            it, or checks it against the log. Returns False (after detaching
+            us) if the caller must make the call on self.mdl.
+
+            Arguments:
+            call -- Tuple of the method's name and arguments.
+        """
+
+        s = self.share
+        inx = self.count - s.start
+        if(inx == len(s.log)):
+            if(s.taps == 1 and not s.open):
+                self.detach()
+                return False
+            if(s.behind == 0 and len(s.log) >= SHARE_LOG_MAX):
+                # the log is only kept back to the last point all taps got to
+                s.base = s.mdl.clone()
+                s.start += len(s.log)
+                s.log = []
+            val = getattr(s.mdl, call[0])(*call[1:])
+            s.log.append((call, s.mdl.done(), s.mdl.get_extra(), val))
+            s.behind = s.taps-1
+        elif(s.log[inx][0] == call):
+            if(inx+1 == len(s.log)):
+                s.behind -= 1
+        else:
+            self.detach()
+            return False
+        self.count += 1
+        return True
+
+    def source(self):
+        """ Returns the module we play: the shared one, or our own. Detaches
+            us if the shared one has moved on.
+        """
+
+        s = self.share
+        if(s == None):
+            return self.mdl
+        if(self.count - s.start != len(s.log)):
+            self.detach()
+            return self.mdl
+        return s.mdl
+
+    def step(self, delta, const=-1):
+        if(self.fresh):
+            self.join()
+        if(self.share != None and self.follow(("step",delta,const))):
+            return
+        self.mdl.step(delta,const)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        s = self.share
+        if(s == None):
+            return self.mdl.read(tails,stereo,signal)
+        if(s.timed):
+            if(not self.follow(("read",tails,stereo,signal))):
+                return self.mdl.read(tails,stereo,signal)
+            val = s.log[self.count-1-s.start][3]
+            if(stereo):
+                return [val[0],val[1]]
+            return val
+        if(self.count - s.start != len(s.log)):
+            return self.source().read(tails,stereo,signal)
+        at = (self.count,tails,stereo,signal)
+        if(s.read_at != at):
+            s.read_val = s.mdl.read(tails,stereo,signal)
+            s.read_at = at
+        if(stereo):
+            return [s.read_val[0],s.read_val[1]]
+        return s.read_val
+
+    def step_tails(self, delta, const=-1):
+        if(self.fresh):
+            self.join()
+        if(self.share != None and self.follow(("step_tails",delta,const))):
+            return
+        self.mdl.step_tails(delta,const)
+
+    def reset(self):
+        if(self.fresh):
+            self.join()
+        if(self.share != None and self.follow(("reset",))):
+            return
+        self.mdl.reset()
+
+    def clear(self):
+        if(self.share != None):
+            self.detach()
+        self.mdl.clear()
+        self.fresh = True
+
+    def done(self):
+        s = self.share
+        if(s == None):
+            return self.mdl.done()
+        inx = self.count - s.start
+        if(inx == len(s.log)):
+            return s.mdl.done()
+        if(inx == 0):
+            return s.base.done()
+        return s.log[inx-1][1]
+
+    def has_tails(self):
+        return self.source().has_tails()
+
+    def get_extra(self):
+        s = self.share
+        if(s == None):
+            return self.mdl.get_extra()
+        inx = self.count - s.start
+        if(inx == len(s.log)):
+            return s.mdl.get_extra()
+        if(inx == 0):
+            return s.base.get_extra()
+        return s.log[inx-1][2]
+
+    def calc_length(self):
+        return self.source().length()
+
+    def pure(self):
+        return self.mdl.pure()
+
+    def value_at(self, t):
+        return self.mdl.value_at(t)
+
+    def clone(self):
+        # A clone plays on its own, so it gets its own copy of the module.
+        if(self.share == None):
+            tmp = SongTap(self.mdl.clone(), self.sharing)
+        else:
+            tmp = SongTap(self.position(), self.sharing)
+        tmp.fresh = self.fresh
+        return tmp
+
+    #def set_freq(self, freq):
+    #    pass
+
+    def set_pitch(self, pitch):
+        # Song-time modules are never pitched (see share_song_time()).
+        pass
+
+class Common:
+    """ State shared by a CommonLead and its CommonTaps: the module, and a log
+        of the calls made on it that the taps haven't all caught up on yet.
+        Each entry holds the call, and what done() and get_extra() reported
+        after it.
+    """
+
+    def __init__(self, mdl):
+        self.mdl = mdl
+        self.log = []
+        # Position of log[0] among all calls made.
+        self.start = 0
+        self.taps = 0
+        # Log entries the taps have yet to catch up on, all told.
+        self.pending = 0
+        # The copy of this made by the latest CommonLead.clone().
+        self.latest = self
+        # The lead's last read: when it was made (by call count, and the read
+        # arguments), and its value.
+        self.read_at = None
+        self.read_val = None
+
+class CommonLead(SCModule):
+    """ Holds the one copy of a common subexpression that is really stepped.
+        See SynthCorona.merge_common().
+
+        Every call is passed on, then logged for the CommonTaps, which stand
+        in for the other copies.
+    """
+
+    def __init__(self, common):
+        """ Initializer.
+
+            Arguments:
+            common -- The Common state for the group.
+        """
+
+        self.common = common
+        self.mdl = common.mdl
+        self.own(self.mdl)
+
+    def log(self, call):
+        """ Adds a call to the log, once the last one has been caught up on.
+
+            Arguments:
+            call -- Tuple describing the call.
+        """
+
+        c = self.common
+        if(c.pending == 0 and len(c.log) > 0):
+            c.start += len(c.log)
+            c.log = []
+        c.log.append((call, self.mdl.done(), self.mdl.get_extra()))
+        c.pending += c.taps
+
+    def step(self, delta, const=-1):
+        self.mdl.step(delta,const)
+        self.log((delta,const))
+
+    def read(self,tails=False,stereo=True,signal=True):
+        c = self.common
+        c.read_val = self.mdl.read(tails,stereo,signal)
+        c.read_at = (c.start+len(c.log),tails,stereo,signal)
+        return c.read_val
+
+    def step_tails(self, delta, const=-1):
+        self.mdl.step_tails(delta,const)
+        self.log(("tails",delta,const))
+
+    def reset(self):
+        self.mdl.reset()
+        self.log(("reset",))
+
+    def clear(self):
+        self.mdl.clear()
+        self.log(("clear",))
+
+    def done(self):
+        return self.mdl.done()
+
+    def has_tails(self):
+        return self.mdl.has_tails()
+
+    def silent_for(self):
+        return self.mdl.silent_for()
+
+    def get_extra(self):
+        return self.mdl.get_extra()
+
+    def calc_length(self):
+        return self.mdl.length()
+
+    def pure(self):
+        return self.mdl.pure()
+
+    def value_at(self, t):
+        return self.mdl.value_at(t)
+
+    def clone(self):
+        # Taps are cloned after us, and pick up the new Common from latest.
+        cp = CommonLead(Common(self.mdl.clone()))
+        cp.common.log = list(self.common.log)
+        cp.common.start = self.common.start
+        cp.common.pending = self.common.pending
+        self.common.latest = cp.common
+        return cp
+
+    #def set_freq(self, freq):
+    #    self.mdl.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.mdl.set_pitch(pitch)
+        self.log(("pitch",pitch))
+
+class CommonTap(SCModule):
+    """ Stands in for a copy of a common subexpression, reading the one copy
+        held by a CommonLead. See SynthCorona.merge_common().
+
+        Calls are not passed on, as the lead gets the same ones first; they
+        are only checked against its log. As the lead may have moved on by
+        then (i.e. been reset after finishing), done() and get_extra() report
+        what the lead did after the same call. Reads reuse the lead's last
+        read, if nothing has been called on it since.
+
+        Should a call ever not match the lead's, we take our own copy of the
+        module and carry on with that (see detach()).
+    """
+
+    # Reads go to a module we don't own.
+    read_stateful = True
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("count", "entry")
+
+    # Our own copy of the module, once we've been detached from the lead.
+    mdl = None
+
+    def __init__(self, common, count=None):
+        """ Initializer.
+
+            Arguments:
+            common -- The Common state for the group.
+            count -- Number of calls made so far. Defaults to the lead's count.
+        """
+
+        self.common = common
+        common.taps += 1
+        if(count == None):
+            count = common.start + len(common.log)
+        self.count = count
+        self.entry = None
+        if(getattr(common.mdl, "no_tails", None) != None):
+            self.no_tails = True
+        common.mdl.cse_taps = common.mdl.cse_taps + (self,)
+
+    def follow(self, call):
+        """ Checks a call against the lead's log. Returns False (after
+            detaching us) if it doesn't match, in which case the caller must
+            make the call on self.mdl.
+
+            Arguments:
+            call -- Tuple describing the call.
+        """
+
+        c = self.common
+        inx = self.count - c.start
+        if(inx >= len(c.log) or c.log[inx][0] != call):
+            self.detach(inx)
+            return False
+        self.entry = c.log[inx]
+        self.count += 1
+        c.pending -= 1
+        return True
+
+    def detach(self, inx):
+        """ Leaves the group after falling out of step with the lead, which
+            merge_common() should never let happen. We take a copy of the
+            lead's module as it is now, which may be a few calls ahead of
+            where we were, and play that from here on, so the render goes on
+            rather than failing.
+
+            Arguments:
+            inx -- Our position in the lead's log.
+        """
+
+        c = self.common
+        if(inx < len(c.log)):
+            c.pending -= len(c.log)-inx
+        c.taps -= 1
+        c.mdl.cse_taps = tuple(t for t in c.mdl.cse_taps if t is not self)
+        self.mdl = c.mdl.clone()
+        self.own(self.mdl)
+        self.entry = None
+        self.invalidate_length()
+
+    def source(self):
+        """ Returns the module we read: the lead's, or our own once detached.
+        """
+
+        if(self.mdl != None):
+            return self.mdl
+        return self.common.mdl
+
+    def step(self, delta, const=-1):
+        if(self.mdl == None and self.follow((delta,const))):
+            return
+        self.mdl.step(delta,const)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        if(self.mdl != None):
+            return self.mdl.read(tails,stereo,signal)
+        c = self.common
+        if(c.read_at == (self.count,tails,stereo,signal)):
+            # the lead was just read the same way
+            if(stereo):
+                return [c.read_val[0],c.read_val[1]]
+            else:
+                return c.read_val
+        return c.mdl.read(tails,stereo,signal)
+
+    def step_tails(self, delta, const=-1):
+        if(self.mdl == None and self.follow(("tails",delta,const))):
+            return
+        self.mdl.step_tails(delta,const)
+
+    def reset(self):
+        if(self.mdl == None and self.follow(("reset",))):
+            return
+        self.mdl.reset()
+
+    def clear(self):
+        if(self.mdl == None and self.follow(("clear",))):
+            return
+        self.mdl.clear()
+
+    def done(self):
+        if(self.entry == None):
+            return self.source().done()
+        return self.entry[1]
+
+    def has_tails(self):
+        return self.source().has_tails()
+
+    def silent_for(self):
+        return self.source().silent_for()
+
+    def get_extra(self):
+        if(self.entry == None):
+            return self.source().get_extra()
+        return self.entry[2]
+
+    def calc_length(self):
+        return self.source().length()
+
+    def pure(self):
+        return self.source().pure()
+
+    def value_at(self, t):
+        return self.source().value_at(t)
+
+    def clone(self):
+        if(self.mdl != None):
+            return self.mdl.clone()
+        cp = CommonTap(self.common.latest, self.count)
+        cp.entry = self.entry
+        return cp
+
+    #def set_freq(self, freq):
+    #    pass
+
+    def set_pitch(self, pitch):
+        if(self.mdl == None and self.follow(("pitch",pitch))):
+            return
+        self.mdl.set_pitch(pitch)
+
+class Speed(SCModule):
+    """ Module for changing playback rate.
+
+        This module modifies both delta and const in step(), so it DOES affect
+        pitch when applied to Inst. However, I have done some witchcraft so if
+        you apply Speed to a Sequence module, it will not be passed down to
+        Insts, so pitch will not be affected.
+    """
+
+    # Caches, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + ("len_rate",)
+
+    def __init__(self, mdl, rate=Val(1), alead=True):
+        """ Initializer.
+
+            Arguments:
+            mdl -- Input module.
+            rate -- Playback rate module.
+            alead -- If true, we stop when mdl stops; otherwise, when rate stops.
+        """
+
+        self.mdl = mdl
+        self.rate = rate
+        self.a_lead = alead
+        self.own(self.mdl, self.rate)
+        # Rate value that the cached length was calculated with.
+        self.len_rate = None
+
+    def step(self, delta, const=-1):
+        if(const >= 0):
+            self.mdl.step(delta*self.rate.read(stereo=False,signal=False),const*self.rate.read(stereo=False,signal=False))
+        elif(const == DELTA):
+            self.mdl.step(delta*self.rate.read(stereo=False,signal=False),delta*self.rate.read(stereo=False,signal=False))
+        elif(const == STOP or const == RELEASE):
+            self.mdl.step(0,const)
+        elif(const == ADJUST):
+            self.mdl.step(delta, const)
+        self.rate.step(delta,const)
+        if(self.a_lead):
+            if(self.rate.done()):
+                extra = self.rate.get_extra()
+                self.rate.reset()
+                self.rate.step(extra, ADJUST)
+            if(self.cached_len != None and self.rate.read(stereo=False,signal=False) != self.len_rate):
+                self.invalidate_length()
+        else:
+            if(self.mdl.done()):
+                extra = self.mdl.get_extra()
+                self.mdl.reset()
+                self.mdl.step(extra, ADJUST)
+
+    def read(self, tails=False,stereo=True,signal=True):
+        return self.mdl.read(tails,stereo,signal)
+
+    def step_tails(self, delta, const=-1):
+        if(const < 0):
+            const = delta
+        self.mdl.step_tails(delta*self.rate.read(stereo=False,signal=False),const*self.rate.read(stereo=False,signal=False))
+
+    def reset(self):
+        self.mdl.reset()
+        self.rate.reset()
+
+    def clear(self):
+        self.mdl.clear()
+        self.rate.clear()
+
+    def done(self):
+        if(self.a_lead):
+            return self.mdl.done()
+        else:
+            return self.rate.done()
+
+    def has_tails(self):
+        return self.mdl.has_tails()
+
+    def get_extra(self):
+        if(self.a_lead):
+            return self.mdl.get_extra()
+        else:
+            return self.rate.get_extra()
+
+    def calc_length(self):
+        if(self.a_lead):
+            rt = self.rate.read(stereo=False,signal=False)
+            self.len_rate = rt
+            if(rt == 0):
+                rt = 0.0000000001
+            return self.mdl.length()/rt
+        else:
+            return self.rate.length()
+
+    def pure(self):
+        rt = const_value(self.rate)
+        return rt != None and rt > 0 and self.mdl.pure()
+
+    def value_at(self, t):
+        t = t*const_value(self.rate)
+        if(self.a_lead):
+            return self.mdl.value_at(t)
+        else:
+            return looped_at(self.mdl, t)
+
+    def clone(self):
+        return Speed(self.mdl.clone(), self.rate.clone(), self.a_lead)
+
+    #def set_freq(self, freq):
+    #    self.mdl.set_freq(freq)
+    #    self.rate.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.mdl.set_pitch(pitch)
+        self.rate.set_pitch(pitch)
+
+class FixedSpeed(SCModule):
+    """ Module for changing playback rate by a fixed ratio.
+
+        The parser uses this in place of Speed when the rate is a constant and
+        the input module leads.
+    """
+
+    def __init__(self, mdl, rate):
+        """ Initializer.
+
+            Arguments:
+            mdl -- Input module.
+            rate -- Playback rate.
+        """
+
+        self.mdl = mdl
+        self.ratio = rate
+        self.own(self.mdl)
+
+    def step(self, delta, const=-1):
+        if(const >= 0):
+            self.mdl.step(delta*self.ratio,const*self.ratio)
+        elif(const == DELTA):
+            self.mdl.step(delta*self.ratio,delta*self.ratio)
+        elif(const == STOP or const == RELEASE):
+            self.mdl.step(0,const)
+        elif(const == ADJUST):
+            self.mdl.step(delta, const)
+
+    def read(self, tails=False,stereo=True,signal=True):
+        return self.mdl.read(tails,stereo,signal)
+
+    def step_tails(self, delta, const=-1):
+        if(const < 0):
+            const = delta
+        self.mdl.step_tails(delta*self.ratio,const*self.ratio)
+
+    def reset(self):
+        self.mdl.reset()
+
+    def clear(self):
+        self.mdl.clear()
+
+    def done(self):
+        return self.mdl.done()
+
+    def has_tails(self):
+        return self.mdl.has_tails()
+
+    def silent_for(self):
+        if(self.ratio <= 0):
+            return 0
+        return quiet_samples(self.mdl.silent_for()/self.ratio)
+
+    def get_extra(self):
+        return self.mdl.get_extra()
+
+    def calc_length(self):
+        rt = self.ratio
+        if(rt == 0):
+            rt = 0.0000000001
+        return self.mdl.length()/rt
+
+    def pure(self):
+        return self.ratio > 0 and self.mdl.pure()
+
+    def value_at(self, t):
+        return self.mdl.value_at(t*self.ratio)
+
+    def clone(self):
+        return FixedSpeed(self.mdl.clone(), self.ratio)
+
+    #def set_freq(self, freq):
+    #    self.mdl.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.mdl.set_pitch(pitch)
+
+class LinInterp(SCModule):
+    """ Module for linear interpolation between two modules.
+
+        Both modules are updated for the duration. Their outputs are blended
+        based on how far we are through the LinInterp width.
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("cur", "last_width")
+
+    # Reads pick up changes in the width, unless it's a constant.
+    @property
+    def read_timed(self):
+        return const_value(self.width) == None
+
+    def __init__(self, a, b, wid=Val(1)):
+        """ Initializer.
+
+            Arguments:
+            a -- The start module.
+            b -- The end module.
+            wid -- Interpolation width (length).
+        """
+
+        self.a = a
+        self.b = b
+        self.width = wid
+        self.own(self.a, self.b, self.width)
+        self.cur = 0
+        self.no_tails = True
+        self.last_width = self.width.read(False,False,False)
+
+    def step(self, delta, const=-1):
+        if(const != STOP and const != RELEASE):
+            self.cur += delta
+        self.width.step(delta,const)
+        if(self.width.done() and not self.done()):
+            extra = self.width.get_extra()
+            self.width.reset()
+            self.width.step(extra,ADJUST)
+        self.a.step(delta,const)
+        if(self.a.done() and not self.done()):
+            extra = self.a.get_extra()
+            self.a.reset()
+            self.a.step(extra,ADJUST)
+        self.b.step(delta,const)
+        if(self.b.done() and not self.done()):
+            extra = self.b.get_extra()
+            self.b.reset()
+            self.b.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        width = self.width.read(False,False,signal)
+        if(width != self.last_width):
+            self.last_width = width
+            self.invalidate_length()
+        pct = self.cur / self.last_width
+        valA = self.a.read(tails,stereo,signal)
+        valB = self.b.read(tails,stereo,signal)
+        if(stereo):
+            return [valA[0]*(1-pct)+valB[0]*pct,valA[1]*(1-pct)+valB[1]*pct]
+        else:
+            return valA*(1-pct)+valB*pct
+
+    def step_tails(self, delta, const=-1):
+        self.width.step_tails(delta, const)
+        self.a.step_tails(delta, const)
+        self.b.step_tails(delta, const)
+
+    def reset(self):
+        self.cur = 0
+        #self.width.reset()
+        self.a.reset()
+        self.b.reset()
+
+    def clear(self):
+        self.cur = 0
+        self.width.clear()
+        self.a.clear()
+        self.b.clear()
+
+    def done(self):
+        return self.cur >= self.last_width
+
+    def has_tails(self):
+        return False
+    
+    def get_extra(self):
+        if(self.done()):
+            return self.cur-self.last_width
+        else:
+            return 0
+
+    def pure(self):
+        return const_value(self.width) != None and self.a.pure() and self.b.pure()
+
+    def value_at(self, t):
+        pct = t / const_value(self.width)
+        valA = looped_at(self.a, t)
+        valB = looped_at(self.b, t)
+        return valA*(1-pct)+valB*pct
+
+    def clone(self):
+        tmp = LinInterp(self.a.clone(), self.b.clone(), self.width.clone())
+        tmp.cur = self.cur
+        return tmp
+
+    def calc_length(self):
+        return self.last_width
+
+    #def set_freq(self, freq):
+    #    self.width.set_freq(freq)
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.width.set_pitch(pitch)
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Multiply(SCModule):
+    """ Module that multiplies two inputs together.
+    """
+
+    def __init__(self, a, b, alead=True):
+        """ Initializer.
+
+            Arguments:
+            a -- Input A
+            b -- Input B
+            alead -- If true, we stop when A stops; otherwise when B stops.
+        """
+
+        self.a = a
+        self.b = b
+        self.a_lead = alead
+        self.own(self.a, self.b)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+        self.b.step(delta, const)
+        if(self.a_lead):
+            if(self.b.done() and not self.a.done()):
+                extra = self.b.get_extra()
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+        else:
+            if(self.a.done() and not self.b.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        valA = self.a.read(tails,stereo,signal)
+        valB = self.b.read(tails,stereo,False)
+        if(stereo):
+            return [valA[0]*valB[0],valA[1]*valB[1]]
+        else:
+            return valA * valB
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+        self.b.step_tails(delta,const)
+
+    def reset(self):
+        self.a.reset()
+        self.b.reset()
+
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+
+    def done(self):
+        if(self.a_lead):
+            return self.a.done()
+        else:
+            return self.b.done()
+
+    def has_tails(self):
+        return self.a.has_tails() or self.b.has_tails()
+
+    def silent_for(self):
+        # silence in either input silences the product, but the other input
+        # can only go unread if reading it wouldn't change it
+        qa = self.a.silent_for()
+        qb = self.b.silent_for()
+        quiet = min(qa, qb)
+        if(self.b.stateless_reads()):
+            quiet = max(quiet, qa)
+        if(self.a.stateless_reads()):
+            quiet = max(quiet, qb)
+        return quiet
+
+    def get_extra(self):
+        if(self.a_lead):
+            return self.a.get_extra()
+        else:
+            return self.b.get_extra()
+
+    def quiet_fields(self):
+        # the input that doesn't lead is only reset to keep up with the other
+        if(self.a_lead):
+            return ("b",)
+        else:
+            return ("a",)
+
+    def cse_links(self):
+        if(self.a_lead):
+            return (("a","same"),("b","trail"))
+        else:
+            return (("b","same"),("a","trail"))
+
+    def pure(self):
+        return self.a.pure() and self.b.pure()
+
+    def value_at(self, t):
+        valA, valB = operands_at(self, t)
+        return valA * valB
+
+    def clone(self):
+        return Multiply(self.a.clone(), self.b.clone(), self.a_lead)
+
+    def calc_length(self):
+        if(self.a_lead):
+            return self.a.length()
+        else:
+            return self.b.length()
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Gain(SCModule):
+    """ Module that multiplies its input by a fixed factor.
+
+        The parser uses this in place of Multiply or Level when B is a
+        constant and A leads. For Level, the factor is already converted from
+        a signal value (see as_decimal).
+    """
+
+    def __init__(self, a, k):
+        """ Initializer.
+
+            Arguments:
+            a -- Input module.
+            k -- Multiplication factor.
+        """
+
+        self.a = a
+        self.k = k
+        self.own(self.a)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        val = self.a.read(tails,stereo,signal)
+        if(stereo):
+            return [val[0]*self.k,val[1]*self.k]
+        else:
+            return val*self.k
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+
+    def reset(self):
+        self.a.reset()
+
+    def clear(self):
+        self.a.clear()
+
+    def done(self):
+        return self.a.done()
+
+    def has_tails(self):
+        return self.a.has_tails()
+
+    def silent_for(self):
+        return self.a.silent_for()
+
+    def get_extra(self):
+        return self.a.get_extra()
+
+    def quiet_fields(self):
+        return ("k",)
+
+    def cse_links(self):
+        return (("a","same"),)
+
+    def pure(self):
+        return self.a.pure()
+
+    def value_at(self, t):
+        return self.a.value_at(t)*self.k
+
+    def clone(self):
+        return Gain(self.a.clone(), self.k)
+
+    def calc_length(self):
+        return self.a.length()
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+
+class Divide(SCModule):
+    """ Module that divides two inputs.
+    """
+
+    def __init__(self, a, b, alead=True):
+        """ Initializer.
+
+            Arguments:
+            a -- Input A.
+            b -- Input B.
+            alead -- If true, we stop when A stops; otherwise, when B stops.
+        """
+        self.a = a
+        self.b = b
+        self.a_lead = alead
+        self.own(self.a, self.b)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+        self.b.step(delta, const)
+        if(self.a_lead):
+            if(self.b.done() and not self.a.done()):
+                extra = self.b.get_extra()
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+        else:
+            if(self.a.done() and not self.b.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        valA = self.a.read(tails,stereo,signal)
+        valB = self.b.read(tails,stereo,False)
+        if(stereo):
+            return [valA[0]/valB[0],valA[1]/valB[1]]
+        else:
+            return valA/valB
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+        self.b.step_tails(delta,const)
+
+    def reset(self):
+        self.a.reset()
+        self.b.reset()
+
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+
+    def done(self):
+        if(self.a_lead):
+            return self.a.done()
+        else:
+            return self.b.done()
+
+    def has_tails(self):
+        return self.a.has_tails() or self.b.has_tails()
+        
+    def get_extra(self):
+        if(self.a_lead):
+            return self.a.get_extra()
+        else:
+            return self.b.get_extra()
+
+    def quiet_fields(self):
+        # the input that doesn't lead is only reset to keep up with the other
+        if(self.a_lead):
+            return ("b",)
+        else:
+            return ("a",)
+
+    def cse_links(self):
+        if(self.a_lead):
+            return (("a","same"),("b","trail"))
+        else:
+            return (("b","same"),("a","trail"))
+
+    def pure(self):
+        return self.a.pure() and self.b.pure()
+
+    def value_at(self, t):
+        valA, valB = operands_at(self, t)
+        return valA/valB
+
+    def clone(self):
+        return Divide(self.a.clone(), self.b.clone(), self.a_lead)
+
+    def calc_length(self):
+        return lcm(self.a.length(), self.b.length())
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Add(SCModule):
+    """ Module that adds two inputs.
+    """
+
+    def __init__(self, a, b, alead=True):
+        """ Initializer.
+
+            Arguments:
+            a -- Input A.
+            b -- Input B.
+            alead -- If true, we stop when A stops; otherwise, when B stops.
+        """
+
+        self.a = a
+        self.b = b
+        self.a_lead = alead
+        self.own(self.a, self.b)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+        self.b.step(delta, const)
+        if(self.a_lead):
+            if(self.b.done() and not self.a.done()):
+                extra = self.b.get_extra()
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+        else:
+            if(self.a.done() and not self.b.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        valA = self.a.read(tails,stereo,signal)
+        valB = self.b.read(tails,stereo,signal)
+        if(stereo):
+            return [valA[0]+valB[0],valA[1]+valB[1]]
+        else:
+            return valA+valB
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+        self.b.step_tails(delta,const)
+
+    def reset(self):
+        self.a.reset()
+        self.b.reset()
+
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+
+    def done(self):
+        if(self.a_lead):
+            return self.a.done()
+        else:
+            return self.b.done()
+
+    def has_tails(self):
+        return self.a.has_tails() or self.b.has_tails()
+
+    def silent_for(self):
+        return min(self.a.silent_for(), self.b.silent_for())
+
+    def get_extra(self):
+        if(self.a_lead):
+            return self.a.get_extra()
+        else:
+            return self.b.get_extra()
+
+    def quiet_fields(self):
+        # the input that doesn't lead is only reset to keep up with the other
+        if(self.a_lead):
+            return ("b",)
+        else:
+            return ("a",)
+
+    def cse_links(self):
+        if(self.a_lead):
+            return (("a","same"),("b","trail"))
+        else:
+            return (("b","same"),("a","trail"))
+
+    def pure(self):
+        return self.a.pure() and self.b.pure()
+
+    def value_at(self, t):
+        valA, valB = operands_at(self, t)
+        return valA+valB
+
+    def clone(self):
+        return Add(self.a.clone(), self.b.clone(), self.a_lead)
+
+    def calc_length(self):
+        if(self.a_lead):
+            return self.a.length()
+        else:
+            return self.b.length()
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Offset(SCModule):
+    """ Module that adds a fixed value to its input.
+
+        The parser uses this in place of Add when B is a constant and A leads,
+        so there is no B module to step, reset or read.
+    """
+
+    def __init__(self, a, k):
+        """ Initializer.
+
+            Arguments:
+            a -- Input module.
+            k -- Value to add.
+        """
+
+        self.a = a
+        self.k = k
+        self.own(self.a)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        val = self.a.read(tails,stereo,signal)
+        if(stereo):
+            return [val[0]+self.k,val[1]+self.k]
+        else:
+            return val+self.k
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+
+    def reset(self):
+        self.a.reset()
+
+    def clear(self):
+        self.a.clear()
+
+    def done(self):
+        return self.a.done()
+
+    def has_tails(self):
+        return self.a.has_tails()
+        
+    def get_extra(self):
+        return self.a.get_extra()
+
+    def quiet_fields(self):
+        return ("k",)
+
+    def cse_links(self):
+        return (("a","same"),)
+
+    def pure(self):
+        return self.a.pure()
+
+    def value_at(self, t):
+        return self.a.value_at(t)+self.k
+
+    def clone(self):
+        return Offset(self.a.clone(), self.k)
+
+    def calc_length(self):
+        return self.a.length()
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+
+class Subtract(SCModule):
+    """ Module that subtracts two inputs.
+    """
+
+    def __init__(self, a, b, alead=True):
+        """ Initializer.
+
+            Arguments:
+            a -- Input A.
+            b -- Input B.
+            alead -- If true, we stop when A stops; otherwise, when B stops.
+        """
+
+        self.a = a
+        self.b = b
+        self.a_lead = alead
+        self.own(self.a, self.b)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+        self.b.step(delta, const)
+        if(self.a_lead):
+            if(self.b.done() and not self.a.done()):
+                extra = self.b.get_extra()
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+        else:
+            if(self.a.done() and not self.b.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        valA = self.a.read(tails,stereo,signal)
+        valB = self.b.read(tails,stereo,signal)
+        if(stereo):
+            return [valA[0]-valB[0],valA[1]-valB[1]]
+        else:
+            return valA-valB
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+        self.b.step_tails(delta,const)
+
+    def reset(self):
+        self.a.reset()
+        self.b.reset()
+
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+
+    def done(self):
+        if(self.a_lead):
+            return self.a.done()
+        else:
+            return self.b.done()
+
+    def has_tails(self):
+        return self.a.has_tails() or self.b.has_tails()
+
+    def silent_for(self):
+        return min(self.a.silent_for(), self.b.silent_for())
+
+    def get_extra(self):
+        if(self.a_lead):
+            return self.a.get_extra()
+        else:
+            return self.b.get_extra()
+
+    def quiet_fields(self):
+        # the input that doesn't lead is only reset to keep up with the other
+        if(self.a_lead):
+            return ("b",)
+        else:
+            return ("a",)
+
+    def cse_links(self):
+        if(self.a_lead):
+            return (("a","same"),("b","trail"))
+        else:
+            return (("b","same"),("a","trail"))
+
+    def pure(self):
+        return self.a.pure() and self.b.pure()
+
+    def value_at(self, t):
+        valA, valB = operands_at(self, t)
+        return valA-valB
+
+    def clone(self):
+        return Subtract(self.a.clone(), self.b.clone(), self.a_lead)
+
+    def calc_length(self):
+        if(self.a_lead):
+            return self.a.length()
+        else:
+            return self.b.length()
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Modulus(SCModule):
+    """ Module that performs modulus on two inputs.
+    """
+
+    def __init__(self, a, b, alead=True):
+        """ Initializer.
+
+            Arguments:
+            a -- Input A, the numerator.
+            b -- Input B, the denominator.
+            alead -- If true, we stop when A stops; otherwise, when B stops.
+        """
+
+        self.a = a
+        self.b = b
+        self.a_lead = alead
+        self.own(self.a, self.b)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+        self.b.step(delta, const)
+        if(self.a_lead):
+            if(self.b.done() and not self.a.done()):
+                extra = self.b.get_extra()
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+        else:
+            if(self.a.done() and not self.b.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        valA = self.a.read(tails,stereo,signal)
+        valB = self.b.read(tails,stereo,signal)
+        if(stereo):
+            return [valA[0]%valB[0],valA[1]%valB[1]]
+        else:
+            return valA%valB
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+        self.b.step_tails(delta,const)
+
+    def reset(self):
+        self.a.reset()
+        self.b.reset()
+
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+
+    def done(self):
+        if(self.a_lead):
+            return self.a.done()
+        else:
+            return self.b.done()
+
+    def has_tails(self):
+        return self.a.has_tails() or self.b.has_tails()
+
+    def get_extra(self):
+        if(self.a_lead):
+            return self.a.get_extra()
+        else:
+            return self.b.get_extra()
+
+    def quiet_fields(self):
+        # the input that doesn't lead is only reset to keep up with the other
+        if(self.a_lead):
+            return ("b",)
+        else:
+            return ("a",)
+
+    def cse_links(self):
+        if(self.a_lead):
+            return (("a","same"),("b","trail"))
+        else:
+            return (("b","same"),("a","trail"))
+
+    def pure(self):
+        return self.a.pure() and self.b.pure()
+
+    def value_at(self, t):
+        valA, valB = operands_at(self, t)
+        return valA%valB
+
+    def clone(self):
+        return Modulus(self.a.clone(), self.b.clone(), self.a_lead)
+
+    def calc_length(self):
+        if(self.a_lead):
+            return self.a.length()
+        else:
+            return self.b.length()
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Repeat(SCModule):
+    """ Module that loops an input a given number of times.
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("resets", "cur", "stopped")
+    # Caches, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + ("len_reps",)
+
+    def __init__(self, mdl, x, atk=0, rels=-1):
+        """ Initializer.
+
+            Arguments:
+            mdl -- Input module.
+            x -- The number of times to repeat.
+            atk -- The attack point (before this will only be played initially)
+            rels -- The release point (after this will only play on the last round, or after RELEASE/STOP; -1 for no release point)
+        """
+
+        self.a = mdl
+        self.b = x
+        self.own(self.a, self.b)
+        # Repeat count that the cached length was calculated with.
+        self.len_reps = None
+        self.resets = 1
+        self.attack = atk
+        self.release = rels
+        self.cur = 0
+        self.stopped = False
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+        self.b.step(delta, const)
+        self.cur += delta
+        if(const == STOP or const == RELEASE):
+            self.stopped = True
+
+        if(self.b.done() and not self.done()):
+            extra = self.b.get_extra()
+            self.b.reset()
+            self.b.step(extra,ADJUST)
+
+        reps = self.b.read(tails=False,stereo=False,signal=False)
+        if(self.cached_len != None and reps != self.len_reps):
+            self.invalidate_length()
+        if(self.release > 0):
+            while((not self.stopped and (reps < 0 or self.resets < reps)) and self.cur >= self.release):
+                self.cur %= self.release
+                self.cur += self.attack
+                self.a.reset()
+                self.a.step(self.cur,ADJUST)
+                self.resets += 1
+        while(self.a.done() and (reps < 0 or self.resets < reps)):
+            extra = self.a.get_extra()
+            extra += self.attack
+            self.cur = extra
+            self.a.reset()
+            self.a.step(extra,ADJUST)
+            self.resets += 1
+
+    def read(self,tails=False,stereo=True,signal=True):
+        return self.a.read(tails,stereo,signal)
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+
+    def reset(self):
+        self.a.reset()
+        self.a.step(self.attack,ADJUST)
+        self.resets = 1
+        self.cur = self.attack
+
+    def clear(self):
+        self.a.clear()
+        self.resets = 1
+        self.cur = 0
+        self.stopped = False
+
+    def done(self):
+        return self.a.done()
+
+    def has_tails(self):
+        return self.a.has_tails()
+
+    def silent_for(self):
+        quiet = self.a.silent_for()
+        if(self.release > 0 and not self.stopped):
+            # we jump back to the attack point at the release point
+            quiet = min(quiet, quiet_samples(self.release-self.cur))
+        return quiet
+
+    def get_extra(self):
+        return self.a.get_extra()
+
+    def pure(self):
+        # the release point depends on when we're told to stop
+        return self.release <= 0 and const_value(self.b) != None and self.a.pure()
+
+    def value_at(self, t):
+        ln = self.a.length()
+        loop = ln - self.attack
+        if(t < ln or loop <= 0):
+            return self.a.value_at(t)
+        # after the first round, each round starts from the attack point
+        rnd = int((t-ln) // loop)
+        reps = const_value(self.b)
+        if(reps >= 0):
+            rnd = min(rnd, reps-2)
+        if(rnd < 0):
+            return self.a.value_at(t)
+        return self.a.value_at(self.attack + t-ln - rnd*loop)
+
+    def clone(self):
+        tmp = Repeat(self.a.clone(), self.b.clone(), self.attack, self.release)
+        tmp.resets = self.resets
+        tmp.cur = self.cur
+        tmp.stopped = self.stopped
+        return tmp
+
+    def calc_length(self):
+        self.len_reps = self.b.read(stereo=False,signal=False)
+        if(self.len_reps<0):
+            return 9999999999999
+        else:
+            return self.a.length()*self.len_reps
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Cross(SCModule):
+    """ Module for "crossing" a binary operation.
+
+        Normal binary operators run both operand modules (A and B)
+        simultaneously. Cross operations slow down the B module so that A
+        completes a full cycle for each step of B. In a sense, we compute
+        "all of A for each of B".
+
+        Here's an example:
+        Consider [1,2,3,4]*[1,0] --
+        Regularly, our output is [1*1,2*0,3*1,4*0] = [1,0,3,0]
+        If we take the cross of this, [1,2,3,4]x*[1,0] --
+        We get [1*1,2*1,3*1,4*1,1*0,2*0,3*0,4*0] = [1,2,3,4, 0,0,0,0]
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("acount", "bstep", "cur")
+
+    def __init__(self, mdl):
+        """ Initializer.
+
+            Arguments:
+            mdl -- Input module. Must be a binary operation.
+        """
+        if(hasattr(mdl, "a") and hasattr(mdl, "b")):
+            self.op = mdl
+        else:
+            raise SCParseError("Invalid Operator for Cross module.",line)
+            self.op = mdl
+        self.own(self.op)
+        self.acount = 1
+        self.bstep = -1
+        self.cur = 0
+        self.len = self.length()
+
+    def step(self, delta, const=-1):
+        if(self.bstep < 0):
+            self.bstep = 1/(self.op.a.length())
+            self.len = self.length()
+        self.op.a.step(delta,const)
+        self.acount -= delta*self.bstep
+        if(self.op.a.done() or self.acount > 0):
+            self.op.b.step(delta*self.bstep,const)
+            if(self.op.a.done() and not self.done()):
+                extra = self.op.a.get_extra()
+                self.op.a.reset()
+                self.op.a.step(extra,ADJUST)
+                self.bstep = 1/self.op.a.length()
+                self.len = self.length()
+                self.acount = 1
+        else:
+            extra = -self.acount * self.op.a.length()
+            self.op.b.step(delta*self.bstep,const)
+            self.op.a.reset()
+            self.op.a.step(extra,ADJUST)
+            self.bstep = 1/self.op.a.length()
+            self.len = self.length()
+            self.acount += 1
+        self.cur += delta
+
+    def read(self,tails=False,stereo=True,signal=True):
+        return self.op.read(tails,stereo,signal)
+
+    def step_tails(self, delta, const=-1):
+        self.op.a.step_tails(delta,const)
+        self.op.b.step_tails(delta*self.bstep,const)
+
+    def reset(self):
+        self.op.reset()
+        self.cur = 0
+        self.acount = 1
+        self.bstep = 1/(self.op.a.length())
+        self.len = self.length()
+
+    def clear(self):
+        self.op.clear()
+        self.cur = 0
+        self.acount = 1
+        self.bstep = 1/self.op.a.length()
+        self.len = self.length()
+
+    def done(self):
+        return self.cur >= self.len
+
+    def has_tails(self):
+        return self.op.has_tails()
+
+    def get_extra(self):
+        if(self.done()):
+            return self.cur-self.len
+        else:
+            return 0
+
+    def clone(self):
+        tmp = Cross(self.op.clone())
+        tmp.bstep = self.bstep
+        tmp.cur = self.cur
+        tmp.acount = self.acount
+        tmp.len = self.len
+        return tmp
+
+    def calc_length(self):
+        return self.op.a.length()*self.op.b.length()
+
+    #def set_freq(self, freq):
+    #    self.op.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.op.set_pitch(pitch)
+
+class Length(SCModule):
+    """ Overrides the length of a given module. This will:
+        - Repeat the module if it stops before length is met.
+        - Halt the module early if the length is met before it ends
+          (may cause pops!)
+
+        This module takes two inputs, A and B, where A is the signal module
+        and B determines the length.
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("cur",)
+
+    def __init__(self, a, b):
+        """ Initializer.
+
+            Arguments:
+            A - The signal module, to be length-overridden.
+            B - The length.
+        """
+
+        self.a = a
+        self.b = b
+        self.own(self.a, self.b)
+        self.cur = 0
+
+    def step(self, delta, const=-1):
+        self.cur += delta
+        self.a.step(delta,const)
+        self.b.step(delta,const)
+
+        if(not self.done()):
+            if(self.a.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+            if(self.b.done()):
+                extra = self.b.get_extra()
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+        if(self.cached_len != None and self.b.read(stereo=False) != self.cached_len):
+            self.invalidate_length()
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+        self.b.step_tails(delta,const)
+
+    def read(self, tails=False,stereo=True,signal=True):
+        return self.a.read(tails,stereo,signal)
+
+    def reset(self):
+        self.cur = 0
+        self.a.reset()
+        self.b.reset()
+
+    def clear(self):
+        self.cur = 0
+        self.a.reset()
+        self.b.reset()
+
+    def done(self):
+        return self.cur >= self.b.read(stereo=False)
+
+    def has_tails(self):
+        return False
+
+    def get_extra(self):
+        if(self.done()):
+            return self.cur - self.b.read(stereo=False)
+        else:
+            return 0
+
+    def calc_length(self):
+        return self.b.read(stereo=False)
+
+    #def set_freq(self,freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self,pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+    def clone(self):
+        tmp = Length(self.a.clone(),self.b.clone())
+        tmp.cur = self.cur
+        return tmp
+
+class Limit(SCModule):
+    """ Module that limits (clips) the input signal to a given value.
+        Along with the input module and clipping module, Limit also has
+        a knee module (supplied via meta tags), which can create a buffer
+        area for soft clipping.
+
+        As an example, "Am6" will limit the signal provided by module "A"
+        to 6, and all values above that will be hard-clipped to 6.
+
+        However, "Am<KNEE=2>6" will soft limit "A" to 6, with values above
+        4 (the limit, 6, minus the knee, 2) being reduced by the following 
+        equation:
+
+        Where "x" is signal value, "k" is knee, and "m" is limit.
+
+        f(x) = k(1-(1/((1/k)(x+k-m)+1))) + (m-k)
+
+        In this function, f(x) = (m-k) when x = (m-k),
+        and f(x) approaches m as x approaches infinity
+        (so the signal always falls beneath the limit).
+    """
+
+    def __init__(self, a, b, alead=True, knee=Val(0)):
+        """ Initializer.
+
+            Arguments:
+            a -- Input module.
+            b -- Clip module
+            knee -- Knee module.
+            alead -- If true, we stop when A stops; otherwise, when B stops.
+        """
+
+        self.a = a
+        self.b = b
+        self.knee = knee
+        self.a_lead = alead
+        self.own(self.a, self.b, self.knee)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+        self.b.step(delta, const)
+        self.knee.step(delta, const)
+        if(self.a_lead):
+            if(self.b.done() and not self.a.done()):
+                extra = self.b.get_extra()
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+        else:
+            if(self.a.done() and not self.b.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+        if(self.knee.done()):
+            extra = self.knee.get_extra()
+            self.knee.reset()
+            self.knee.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        valA = self.a.read(tails,stereo,signal)
+        valB = self.b.read(False,stereo,signal)
+        knee = self.knee.read(False,stereo,signal)
+
+        if(stereo):
+            if(abs(valA[0])>(abs(valB[0])-abs(knee[0]))):
+                valA[0] = self.limit(valA[0],valB[0],knee[0])
+            if(abs(valA[1])>(abs(valB[1])-abs(knee[1]))):
+                valA[1] = self.limit(valA[1],valB[1],knee[1])
+            return valA
+        else:
+            if(abs(valA)>(abs(valB)-abs(knee))):
+                valA = self.limit(valA,valB,knee)
+            return valA
+
+    def limit(self,inp,clp,kne):
+        sign = 1
+        if(inp < 0):
+            sign = -1
+        inp = abs(inp)
+        clp = abs(clp)
+        kne = abs(kne)
+        if(kne == 0):
+            return sign*clp
+        return sign*(kne*(1-(1/((1/kne)*(inp+kne-clp)+1)))+(clp-kne))
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta,const)
+        self.b.step_tails(delta,const)
+        self.knee.step_tails(delta,const)
+
+    def reset(self):
+        self.a.reset()
+        self.b.reset()
+        self.knee.reset()
+
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+        self.knee.clear()
+
+    def done(self):
+        if(self.a_lead):
+            return self.a.done()
+        else:
+            return self.b.done()
+
+    def has_tails(self):
+        return self.a.has_tails()
+
+    def get_extra(self):
+        if(self.a_lead):
+            return self.a.get_extra()
+        else:
+            return self.b.get_extra()
+
+    def clone(self):
+        cln = Limit(self.a.clone(), self.b.clone(), self.a_lead, self.knee.clone())
+        return cln
+
+    def calc_length(self):
+        if(self.a_lead):
+            return self.a.length()
+        else:
+            return self.b.length()
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+    #    self.knee.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+        self.knee.set_pitch(pitch)
+
+class Attack(SCModule):
+    """ Module for setting an attack looping point.
+        Whenever this module loops, it will adjust its input module
+        forward by the Attack value.
+    """
+
+    def __init__(self, mdl, attk):
+        """ Initializer.
+
+            Arguments:
+            mdl -- The input module.
+            attk -- The attack value module.
+        """
+
+        self.a = mdl
+        self.b = attk
+        self.own(self.a, self.b)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+        self.b.step(delta, const)
+
+        if(self.b.done()):
+            extra = self.b.get_extra()
+            self.b.reset()
+            self.b.step(extra, ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        val = self.a.read(tails,stereo,signal)
+        if(stereo):
+            return [-val[0],-val[1]]
+        else:
+            return -val
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta, const)
+
+    def reset(self):
+        self.a.reset()
+        self.a.step(self.b.read(tails=False,stereo=False,signal=False),ADJUST)
+
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+
+    def done(self):
+        return self.a.done()
+
+    def has_tails(self):
+        return self.a.has_tails()
+
+    def get_extra(self):
+        return self.a.get_extra()
+
+    def clone(self):
+        return Attack(self.a.clone(),self.b.clone())
+
+    def calc_length(self):
+        return self.a.length()
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Release(SCModule):
+    """ Module for setting an release looping point.
+        If this module has not been stopped by RELEASE, it will
+        halt its input module at the given release point.
+
+        A value of -1 indicates no release point.
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("last_rel", "cur", "stopped")
+
+    def __init__(self, mdl, rel):
+        """ Initializer.
+
+            Arguments:
+            mdl -- The input module.
+            rel -- The attack value module.
+        """
+
+        self.a = mdl
+        self.b = rel
+        self.own(self.a, self.b)
+        self.last_rel = -1
+        self.cur = 0
+        self.stopped = False
+
+    def step(self, delta, const=-1):
+        self.b.step(delta,const)
+        if(self.b.done() and not self.done()):
+            extra = self.b.get_extra()
+            self.b.reset()
+            self.b.step(extra,ADJUST)
+
+        self.last_rel = self.b.read(stereo=False,signal=False)
+        if(const == STOP or const == RELEASE):
+            self.stopped = True
+            self.a.step(delta,const)
+        elif(const == ADJUST):
+            self.a.step(delta,const)
+            self.cur += delta
+        else:
+            if(self.stopped or self.cur < self.last_rel or self.last_rel <= 0):
+                self.a.step(delta,const)
+                self.cur += delta
+            else:
+                extra = self.cur - self.last_rel
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+                self.cur = extra
+
+    def read(self,tails=False,stereo=True,signal=True):
+        val = self.a.read(tails,stereo,signal)
+        if(stereo):
+            return [-val[0],-val[1]]
+        else:
+            return -val
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta, const)
+        self.b.step_tails(delta, const)
+
+    def reset(self):
+        self.a.reset()
+        self.cur = 0
+
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+        self.last_rel = -1
+        self.stopped = False
+        self.cur = 0
+
+    def done(self):
+        return self.a.done()
+
+    def has_tails(self):
+        return self.a.has_tails()
+    
+    def get_extra(self):
+        return self.a.get_extra()
+
+    def clone(self):
+        rl = Release(self.a.clone(),self.b.clone())
+        rl.cur = self.cur
+        rl.last_rel = self.last_rel
+        rl.stopped = self.stopped
+        return rl
+
+    def calc_length(self):
+        return self.a.length()
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+    #    self.b.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        self.a.set_pitch(pitch)
+        self.b.set_pitch(pitch)
+
+class Delay(SCModule):
+    """ Delay Module
+    """
+
+    # Reads feed the delay line.
+    read_stateful = True
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("bufL", "bufR", "head", "size", "bufamt", "lastbufread", "lastdly", "quiettime", "cut")
+    # Link to the SynthCorona counting culled tails, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + ("parent",)
+
+    # Reads feed the delay line, so copies can't share one.
+    shareable = False
+
+    def __init__(self, mdl, dly, fpstep, fdbk=Val(0), wet=Val(1), dry=Val(1)):
+        self.mdl = mdl
+        self.own(self.mdl)
+        self.dly = dly
+        self.fdbk = fdbk
+        self.wet = wet
+        self.dry = dry
+        self.fpstep = fpstep
+        # Delay buffer: a circular buffer (one array per channel; mono uses
+        # the left). head is the oldest frame, size the number of frames held.
+        self.bufL = array('d', [0.0]*16)
+        self.bufR = array('d', [0.0]*16)
+        self.head = 0
+        self.size = 0
+        self.bufamt = -1
+        self.lastbufread = 0
+        self.lastdly = -1
+        # amount of time the buffer has been quiet
+        self.quiettime = 0
+        # buffer read values beneath this are considered silence
+        self.quietgate = 0.1
+        # minimum quiet time before we're done (the buffer length is used
+        # if that's longer)
+        self.quiethold = 0
+        # the SynthCorona when CULL is set, so we can end on quiethold alone
+        self.parent = None
+        # whether we've been culled
+        self.cut = False
+
+    def step(self, delta, const=-1):
+        if(not self.mdl.done()):
+            self.mdl.step(delta, const)
+        self.dly.step(delta, const)
+        if(self.dly.done()):
+            extra = self.dly.get_extra()
+            self.dly.reset()
+            self.dly.step(extra,ADJUST)
+        self.fdbk.step(delta, const)
+        if(self.fdbk.done()):
+            extra = self.fdbk.get_extra()
+            self.fdbk.reset()
+            self.fdbk.step(extra,ADJUST)
+        self.wet.step(delta, const)
+        if(self.wet.done()):
+            extra = self.wet.get_extra()
+            self.wet.reset()
+            self.wet.step(extra,ADJUST)
+        self.dry.step(delta, const)
+        if(self.dry.done()):
+            extra = self.dry.get_extra()
+            self.dry.reset()
+            self.dry.step(extra,ADJUST)
+
+    def step_tails(self, delta, const=-1):
+        self.mdl.step_tails(delta, const)
+        self.dly.step_tails(delta, const)
+        self.fdbk.step_tails(delta, const)
+        self.wet.step_tails(delta, const)
+        self.dry.step_tails(delta, const)
+
+    def grow_buff(self, cap):
+        """ Moves the buffer into arrays of at least the given capacity.
+
+            Arguments:
+            cap -- The number of frames the buffer must be able to hold.
+        """
+
+        cap = max(cap, 2*len(self.bufL))
+        newL = array('d', [0.0]*cap)
+        newR = array('d', [0.0]*cap)
+        for i in range(self.size):
+            j = (self.head+i) % len(self.bufL)
+            newL[i] = self.bufL[j]
+            newR[i] = self.bufR[j]
+        self.bufL = newL
+        self.bufR = newR
+        self.head = 0
+
+    def push_buff(self, l, r=0.0):
+        """ Adds a frame to the end of the buffer.
+
+            Arguments:
+            l -- Left (or mono) value.
+            r -- Right value.
+        """
+
+        if(self.size >= len(self.bufL)):
+            self.grow_buff(self.size+1)
+        i = (self.head+self.size) % len(self.bufL)
+        self.bufL[i] = l
+        self.bufR[i] = r
+        self.size += 1
+
+    def pop_buff(self, stereo=True):
+        """ Removes & returns the oldest frame in the buffer.
+
+            Arguments:
+            stereo -- Whether to return a stereo pair or a single value.
+        """
+
+        i = self.head
+        self.head = (self.head+1) % len(self.bufL)
+        self.size -= 1
+        if(stereo):
+            return [self.bufL[i],self.bufR[i]]
+        else:
+            return self.bufL[i]
+
+    def add_buff(self, inx, l, r=0.0):
+        """ Mixes values into a frame already in the buffer.
+
+            Arguments:
+            inx -- Position of the frame, counting from the oldest.
+            l -- Left (or mono) value to add.
+            r -- Right value to add.
+        """
+
+        i = (self.head+inx) % len(self.bufL)
+        self.bufL[i] += l
+        self.bufR[i] += r
+
+    # TODO: Move buffer reading to read_tails
+    # TODO:
+    def read(self, tails=False,stereo=True,signal=True):
+        if(stereo and type(self.lastbufread) == int):
+            self.lastbufread = [self.lastbufread, self.lastbufread]
+        elif(not stereo and type(self.lastbufread) == list):
+            self.lastbufread = 0.5 * (self.lastbufread[0] + self.lastbufread[1])
+            
+        curdly = abs(self.dly.read(tails,False,signal))
+        curdry = self.dry.read(False,stereo,signal)
+        curwet = self.wet.read(False,stereo,signal)
+        curfdbk = self.fdbk.read(False,stereo,signal)
+
+        if(not tails):
+            if(self.lastdly != curdly):
+                self.lastdly = curdly
+                self.bufamt = int(self.lastdly * self.fpstep + 0.5)
+                if(self.bufamt+1 > len(self.bufL)):
+                    self.grow_buff(self.bufamt+1)
+            # If the delay got shorter, drop the oldest frames so the echo
+            # follows the new delay time straight away.
+            if(self.bufamt > 0 and self.size > self.bufamt):
+                drop = self.size-self.bufamt
+                self.head = (self.head+drop) % len(self.bufL)
+                self.size = self.bufamt
+            
+            if(self.mdl.done()):
+                if(stereo):
+                    read = [0,0]
+                else:
+                    read = 0
+            else:
+                read = self.mdl.read(tails,stereo,signal)
+            if(self.size >= self.bufamt):
+                if(self.bufamt == 0):
+                    wet = read
+                else:
+                    wet = self.pop_buff(stereo)
+                self.lastbufread = wet               
+            
+                if(stereo):
+                    if(abs(wet[0])>self.quietgate or abs(wet[1])>self.quietgate):
+                        self.quiettime = 0
+                    else:
+                        self.quiettime += 1
+
+                    if(self.bufamt > 0):
+                        self.push_buff(read[0]+(wet[0]*curfdbk[0]),read[1]+(wet[1]*curfdbk[1]))
+                    return [(read[0]*curdry[0]) + (wet[0]*curwet[0]),(read[1]*curdry[1]) + (wet[1]*curwet[1])]
+                else:
+                    if(abs(wet)>self.quietgate):
+                        self.quiettime = 0
+                    else:
+                        self.quiettime += 1
+
+                    if(self.bufamt > 0):
+                        self.push_buff(read + (wet*curfdbk))
+                    return (read*curdry) + (wet*curwet)
+            else:
+                if(stereo):
+                    if(self.bufamt > 0):
+                        self.push_buff(read[0],read[1])
+                    if(abs(read[0])>self.quietgate or abs(read[1])>self.quietgate):
+                        self.quiettime = 0
+                    else:
+                        self.quiettime += 1
+                    return [(read[0]*curdry[0]) + (self.lastbufread[0]*curwet[0]), (read[1]*curdry[1]) + (self.lastbufread[1]*curwet[1])]
+                else:
+                    if(self.bufamt > 0):
+                        self.push_buff(read)
+                    if(abs(read)>self.quietgate):
+                        self.quiettime = 0
+                    else:
+                        self.quiettime += 1
+                    return (read*curdry) + (self.lastbufread*curwet)
+        else:
+            read = self.mdl.read(tails, stereo, signal)
+            # add the tails value to the newest frame in the buffer
+            # (or the one at the delay length, if the buffer is longer).
+            inx = min(self.size-1, self.bufamt)
+            if(stereo):
+                if(self.bufamt == 0):
+                    # in the case of a 0 delay, there is no buffer & read is wet & dry
+                    return [read[0]*curdry[0] + read[0]*curwet[0],read[1]*curdry[1] + read[1]*curwet[1]]
+                elif(inx >= 0):
+                    self.add_buff(inx,read[0]*curdry[0],read[1]*curdry[1])
+                return [read[0]*curdry[0],read[1]*curdry[1]]
+            else:
+                if(self.bufamt == 0):
+                    # in the case of a 0 delay, there is no buffer & read is wet & dry
+                    return read*curdry + read*curwet
+                elif(inx >= 0):
+                    self.add_buff(inx,read*curdry)
+                return read * curdry
+        
+    def reset(self):
+        self.mdl.reset()
+        self.dly.reset()
+        self.wet.reset()
+        self.dry.reset()
+        self.fdbk.reset()
+        
+    def clear(self):
+        self.mdl.clear()
+        self.dly.clear()
+        self.wet.clear()
+        self.dry.clear()
+        self.fdbk.clear()
+        self.head = 0
+        self.size = 0
+        self.lastbufread = 0
+        self.lastdly = -1
+        self.quiettime = 0
+        self.cut = False
+        
+    def done(self):
+        return tail_done(self, self.bufamt)
+        
+    def has_tails(self):
+        return self.mdl.has_tails()
+        
+    def get_extra(self):
+        return self.mdl.get_extra()
+        
+    def calc_length(self):
+        return self.mdl.length()
+        
+    #def set_freq(self,freq):
+    #    self.mdl.set_freq(freq)
+
+    def set_pitch(self,pitch):
+        self.mdl.set_pitch(pitch)
+        
+    def clone(self):
+        cln = Delay(self.mdl.clone(), self.dly.clone(), self.fpstep, self.fdbk.clone(), self.wet.clone(), self.dry.clone())
+        cln.bufL = array('d', self.bufL)
+        cln.bufR = array('d', self.bufR)
+        cln.head = self.head
+        cln.size = self.size
+        cln.bufamt = self.bufamt
+        cln.lastbufread = self.lastbufread
+        cln.lastdly = self.lastdly
+        cln.quiettime = self.quiettime
+        cln.quietgate = self.quietgate
+        cln.quiethold = self.quiethold
+        cln.parent = self.parent
+        cln.cut = self.cut
+        return cln
+
+class MultiTap(SCModule):
+    """ Multi-tap Delay Module
+
+        Reads several delayed copies of its input from one shared buffer.
+        Each tap is a multiple of the delay time, with its own gain.
+        Feedback is taken from the longest tap.
+    """
+
+    # Reads feed the delay line.
+    read_stateful = True
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("tapamt", "longest", "bufL", "bufR", "pos", "lastdly", "quiettime", "cut")
+    # Link to the SynthCorona counting culled tails, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + ("parent",)
+
+    # Reads feed the delay line, so copies can't share one.
+    shareable = False
+
+    def __init__(self, mdl, dly, fpstep, taps=[1], gains=[1], fdbk=Val(0), wet=Val(1), dry=Val(1)):
+        self.mdl = mdl
+        self.own(self.mdl)
+        self.dly = dly
+        self.fdbk = fdbk
+        self.wet = wet
+        self.dry = dry
+        self.fpstep = fpstep
+        self.taps = list(taps)
+        self.gains = list(gains)
+        while(len(self.gains) < len(self.taps)):
+            self.gains.append(1)
+        # Tap lengths in frames; the longest is last.
+        self.tapamt = [0]*len(self.taps)
+        self.longest = 0
+        # Delay buffer: a circular buffer (one array per channel; mono uses
+        # the left). pos is the slot the next frame is written to.
+        self.bufL = array('d', [0.0]*16)
+        self.bufR = array('d', [0.0]*16)
+        self.pos = 0
+        self.lastdly = -1
+        # amount of time the taps have been quiet
+        self.quiettime = 0
+        # tap values beneath this are considered silence
+        self.quietgate = 0.1
+        # minimum quiet time before we're done (the longest tap is used
+        # if that's longer)
+        self.quiethold = 0
+        # the SynthCorona when CULL is set, so we can end on quiethold alone
+        self.parent = None
+        # whether we've been culled
+        self.cut = False
+
+    def step(self, delta, const=-1):
+        if(not self.mdl.done()):
+            self.mdl.step(delta, const)
+        self.dly.step(delta, const)
+        if(self.dly.done()):
+            extra = self.dly.get_extra()
+            self.dly.reset()
+            self.dly.step(extra,ADJUST)
+        self.fdbk.step(delta, const)
+        if(self.fdbk.done()):
+            extra = self.fdbk.get_extra()
+            self.fdbk.reset()
+            self.fdbk.step(extra,ADJUST)
+        self.wet.step(delta, const)
+        if(self.wet.done()):
+            extra = self.wet.get_extra()
+            self.wet.reset()
+            self.wet.step(extra,ADJUST)
+        self.dry.step(delta, const)
+        if(self.dry.done()):
+            extra = self.dry.get_extra()
+            self.dry.reset()
+            self.dry.step(extra,ADJUST)
+
+    def step_tails(self, delta, const=-1):
+        self.mdl.step_tails(delta, const)
+        self.dly.step_tails(delta, const)
+        self.fdbk.step_tails(delta, const)
+        self.wet.step_tails(delta, const)
+        self.dry.step_tails(delta, const)
+
+    def grow_buff(self, cap):
+        """ Moves the buffer into arrays of at least the given capacity,
+            keeping the most recent frames.
+
+            Arguments:
+            cap -- The number of frames the buffer must be able to hold.
+        """
+
+        old = len(self.bufL)
+        cap = max(cap, 2*old)
+        newL = array('d', [0.0]*cap)
+        newR = array('d', [0.0]*cap)
+        for i in range(old):
+            j = (self.pos+i) % old
+            newL[cap-old+i] = self.bufL[j]
+            newR[cap-old+i] = self.bufR[j]
+        self.bufL = newL
+        self.bufR = newR
+        self.pos = 0
+
+    def read(self, tails=False,stereo=True,signal=True):
+        curdly = abs(self.dly.read(tails,False,signal))
+        curdry = self.dry.read(False,stereo,signal)
+        curwet = self.wet.read(False,stereo,signal)
+        curfdbk = self.fdbk.read(False,stereo,signal)
+
+        if(self.lastdly != curdly):
+            self.lastdly = curdly
+            self.tapamt = [int(t * curdly * self.fpstep + 0.5) for t in self.taps]
+            self.longest = max(self.tapamt)
+            if(self.longest+1 > len(self.bufL)):
+                self.grow_buff(self.longest+1)
+        cap = len(self.bufL)
+
+        if(tails):
+            # add the tails value to the newest frame in the buffer
+            read = self.mdl.read(tails, stereo, signal)
+            prv = (self.pos-1) % cap
+            if(stereo):
+                self.bufL[prv] += read[0]*curdry[0]
+                self.bufR[prv] += read[1]*curdry[1]
+                return [read[0]*curdry[0],read[1]*curdry[1]]
+            else:
+                self.bufL[prv] += read*curdry
+                return read*curdry
+
+        if(self.mdl.done()):
+            if(stereo):
+                read = [0,0]
+            else:
+                read = 0
+        else:
+            read = self.mdl.read(tails,stereo,signal)
+
+        if(stereo):
+            wetL = wetR = 0
+            backL = backR = 0
+            for i in range(len(self.tapamt)):
+                if(self.tapamt[i] == 0):
+                    tapL, tapR = read[0], read[1]
+                else:
+                    j = (self.pos-self.tapamt[i]) % cap
+                    tapL, tapR = self.bufL[j], self.bufR[j]
+                wetL += tapL*self.gains[i]
+                wetR += tapR*self.gains[i]
+                if(self.tapamt[i] == self.longest):
+                    backL, backR = tapL, tapR
+            self.bufL[self.pos] = read[0] + backL*curfdbk[0]
+            self.bufR[self.pos] = read[1] + backR*curfdbk[1]
+            self.pos = (self.pos+1) % cap
+            if(abs(wetL)>self.quietgate or abs(wetR)>self.quietgate):
+                self.quiettime = 0
+            else:
+                self.quiettime += 1
+            return [(read[0]*curdry[0]) + (wetL*curwet[0]),(read[1]*curdry[1]) + (wetR*curwet[1])]
+        else:
+            wet = 0
+            back = 0
+            for i in range(len(self.tapamt)):
+                if(self.tapamt[i] == 0):
+                    tap = read
+                else:
+                    tap = self.bufL[(self.pos-self.tapamt[i]) % cap]
+                wet += tap*self.gains[i]
+                if(self.tapamt[i] == self.longest):
+                    back = tap
+            self.bufL[self.pos] = read + back*curfdbk
+            self.pos = (self.pos+1) % cap
+            if(abs(wet)>self.quietgate):
+                self.quiettime = 0
+            else:
+                self.quiettime += 1
+            return (read*curdry) + (wet*curwet)
+
+    def reset(self):
+        self.mdl.reset()
+        self.dly.reset()
+        self.wet.reset()
+        self.dry.reset()
+        self.fdbk.reset()
+
+    def clear(self):
+        self.mdl.clear()
+        self.dly.clear()
+        self.wet.clear()
+        self.dry.clear()
+        self.fdbk.clear()
+        for i in range(len(self.bufL)):
+            self.bufL[i] = 0.0
+            self.bufR[i] = 0.0
+        self.pos = 0
+        self.lastdly = -1
+        self.quiettime = 0
+        self.cut = False
+
+    def done(self):
+        return tail_done(self, self.longest)
+
+    def has_tails(self):
+        return self.mdl.has_tails()
+
+    def get_extra(self):
+        return self.mdl.get_extra()
+
+    def calc_length(self):
+        return self.mdl.length()
+
+    #def set_freq(self,freq):
+    #    self.mdl.set_freq(freq)
+
+    def set_pitch(self,pitch):
+        self.mdl.set_pitch(pitch)
+
+    def clone(self):
+        cln = MultiTap(self.mdl.clone(), self.dly.clone(), self.fpstep, self.taps, self.gains, self.fdbk.clone(), self.wet.clone(), self.dry.clone())
+        cln.bufL = array('d', self.bufL)
+        cln.bufR = array('d', self.bufR)
+        cln.pos = self.pos
+        cln.tapamt = list(self.tapamt)
+        cln.longest = self.longest
+        cln.lastdly = self.lastdly
+        cln.quiettime = self.quiettime
+        cln.quietgate = self.quietgate
+        cln.quiethold = self.quiethold
+        cln.parent = self.parent
+        cln.cut = self.cut
+        return cln
+
+class Reverb(SCModule):
+    """ Reverb Module
+
+        A four-line feedback delay network. The input is fed into four
+        delay lines of co-prime lengths, whose outputs are mixed back into
+        each other (through a Hadamard matrix) with a gain that gives the
+        requested decay time.
+
+        The network runs in blocks as long as the shortest line. What the
+        lines put out over a block was written before it started, so that
+        output is read out in one go, and each frame's input is only held
+        until the block is full; then the whole block is mixed & written
+        back at once (see feed() and flush()).
+    """
+
+    # Reads feed the delay lines.
+    read_stateful = True
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("bufs", "pos", "gains", "lastdecay", "tailin", "quiettime", "cut",
+            "inL", "inR", "outL", "outR")
+    # Link to the SynthCorona counting culled tails, left out of fingerprint().
+    NOT_KEYED = SCModule.NOT_KEYED + ("parent",)
+
+    # Delay line lengths for a room size of 1, in milliseconds.
+    LINE_MS = (29.7, 37.1, 41.1, 43.7)
+
+    # Reads feed the delay lines, so copies can't share them.
+    shareable = False
+
+    def __init__(self, mdl, decay, fpstep, rate, size=1, wet=Val(0.3), dry=Val(1)):
+        self.mdl = mdl
+        self.own(self.mdl)
+        self.decay = decay
+        self.wet = wet
+        self.dry = dry
+        self.fpstep = fpstep
+        self.rate = rate
+        self.size = size
+        # One preallocated buffer per line; each is read & then rewritten
+        # at the same position, so its length is its delay.
+        self.lens = [max(1, int(ms*size*rate/1000)) for ms in self.LINE_MS]
+        self.bufs = [array('d', [0.0]*n) for n in self.lens]
+        self.pos = [0]*4
+        self.gains = [0.0]*4
+        self.lastdecay = -1
+        # Frames per block: no line reads back what the block writes.
+        self.block = min(self.lens)
+        # inputs held for the current block, and the network's output for it
+        self.inL = []
+        self.inR = []
+        self.prime()
+        # input from released tails, fed in with the next frame
+        self.tailin = [0.0, 0.0]
+        # amount of time the network has been quiet
+        self.quiettime = 0
+        # output values beneath this are considered silence
+        self.quietgate = 0.1
+        # minimum quiet time before we're done (the longest line is used
+        # if that's longer)
+        self.quiethold = 0
+        # the SynthCorona when CULL is set, so we can end on quiethold alone
+        self.parent = None
+        # whether we've been culled
+        self.cut = False
+
+    def step(self, delta, const=-1):
+        if(not self.mdl.done()):
+            self.mdl.step(delta, const)
+        self.decay.step(delta, const)
+        if(self.decay.done()):
+            extra = self.decay.get_extra()
+            self.decay.reset()
+            self.decay.step(extra,ADJUST)
+        self.wet.step(delta, const)
+        if(self.wet.done()):
+            extra = self.wet.get_extra()
+            self.wet.reset()
+            self.wet.step(extra,ADJUST)
+        self.dry.step(delta, const)
+        if(self.dry.done()):
+            extra = self.dry.get_extra()
+            self.dry.reset()
+            self.dry.step(extra,ADJUST)
+
+    def step_tails(self, delta, const=-1):
+        self.mdl.step_tails(delta, const)
+        self.decay.step_tails(delta, const)
+        self.wet.step_tails(delta, const)
+        self.dry.step_tails(delta, const)
+
+    def feed(self, inL, inR):
+        """ Runs the network for one frame & returns its (left, right) output.
+
+            Arguments:
+            inL -- Left input; fed into lines 0 & 1.
+            inR -- Right input; fed into lines 2 & 3.
+        """
+
+        n = len(self.inL)
+        self.inL.append(inL + self.tailin[0])
+        self.inR.append(inR + self.tailin[1])
+        self.tailin = [0.0, 0.0]
+        out = (self.outL[n], self.outR[n])
+        if(n+1 >= self.block):
+            self.flush()
+        return out
+
+    def flush(self):
+        """ Mixes the inputs held since the block began into the lines,
+            and starts the next block from there.
+        """
+
+        n = len(self.inL)
+        if(n > 0):
+            bufs, pos, g = self.bufs, self.pos, self.gains
+            a = ring_read(bufs[0], pos[0], n)
+            b = ring_read(bufs[1], pos[1], n)
+            c = ring_read(bufs[2], pos[2], n)
+            d = ring_read(bufs[3], pos[3], n)
+            # 4x4 Hadamard mix (scaled to keep it lossless)
+            ab = [x+y for x, y in zip(a, b)]
+            cd = [x+y for x, y in zip(c, d)]
+            amb = [x-y for x, y in zip(a, b)]
+            cmd = [x-y for x, y in zip(c, d)]
+            g0, g1, g2, g3 = g[0]*0.5, g[1]*0.5, g[2]*0.5, g[3]*0.5
+            ring_write(bufs[0], pos[0], [i + g0*(x+y) for i, x, y in zip(self.inL, ab, cd)])
+            ring_write(bufs[1], pos[1], [i + g1*(x+y) for i, x, y in zip(self.inL, amb, cmd)])
+            ring_write(bufs[2], pos[2], [i + g2*(x-y) for i, x, y in zip(self.inR, ab, cd)])
+            ring_write(bufs[3], pos[3], [i + g3*(x-y) for i, x, y in zip(self.inR, amb, cmd)])
+            for i in range(4):
+                pos[i] = (pos[i]+n) % self.lens[i]
+            self.inL = []
+            self.inR = []
+        self.prime()
+
+    def prime(self):
+        """ Reads the lines' output for the block starting now.
+        """
+
+        n = self.block
+        bufs, pos = self.bufs, self.pos
+        a = ring_read(bufs[0], pos[0], n)
+        b = ring_read(bufs[1], pos[1], n)
+        c = ring_read(bufs[2], pos[2], n)
+        d = ring_read(bufs[3], pos[3], n)
+        self.outL = [0.5*(x+y) for x, y in zip(a, c)]
+        self.outR = [0.5*(x+y) for x, y in zip(b, d)]
+
+    def read(self, tails=False,stereo=True,signal=True):
+        curdecay = abs(self.decay.read(tails,False,signal))
+        curdry = self.dry.read(False,stereo,signal)
+        curwet = self.wet.read(False,stereo,signal)
+
+        if(self.lastdecay != curdecay):
+            # the held frames were fed in at the old gains
+            self.flush()
+            self.lastdecay = curdecay
+            # Line gains for a 60dB drop over the decay time.
+            rt = curdecay * self.fpstep
+            for i in range(4):
+                if(rt > 0):
+                    self.gains[i] = 10**(-3*self.lens[i]/rt)
+                else:
+                    self.gains[i] = 0.0
+
+        if(not tails and self.mdl.done()):
+            if(stereo):
+                read = [0,0]
+            else:
+                read = 0
+        else:
+            read = self.mdl.read(tails,stereo,signal)
+
+        if(tails):
+            # Tails only feed the network; the main read returns its output.
+            if(stereo):
+                self.tailin[0] += read[0]*curdry[0]
+                self.tailin[1] += read[1]*curdry[1]
+                return [read[0]*curdry[0],read[1]*curdry[1]]
+            else:
+                self.tailin[0] += read*curdry
+                self.tailin[1] += read*curdry
+                return read*curdry
+
+        if(stereo):
+            outL, outR = self.feed(read[0], read[1])
+        else:
+            outL, outR = self.feed(read, read)
+        if(abs(outL)>self.quietgate or abs(outR)>self.quietgate):
+            self.quiettime = 0
+        else:
+            self.quiettime += 1
+        if(stereo):
+            return [(read[0]*curdry[0]) + (outL*curwet[0]),(read[1]*curdry[1]) + (outR*curwet[1])]
+        else:
+            return (read*curdry) + (0.5*(outL+outR)*curwet)
+
+    def reset(self):
+        self.mdl.reset()
+        self.decay.reset()
+        self.wet.reset()
+        self.dry.reset()
+
+    def clear(self):
+        self.mdl.clear()
+        self.decay.clear()
+        self.wet.clear()
+        self.dry.clear()
+        self.bufs = [array('d', [0.0]*n) for n in self.lens]
+        self.pos = [0]*4
+        self.lastdecay = -1
+        self.tailin = [0.0, 0.0]
+        self.quiettime = 0
+        self.cut = False
+        self.inL = []
+        self.inR = []
+        self.prime()
+
+    def done(self):
+        return tail_done(self, self.lens[3])
+
+    def has_tails(self):
+        return self.mdl.has_tails()
+
+    def get_extra(self):
+        return self.mdl.get_extra()
+
+    def calc_length(self):
+        return self.mdl.length()
+
+    #def set_freq(self,freq):
+    #    self.mdl.set_freq(freq)
+
+    def set_pitch(self,pitch):
+        self.mdl.set_pitch(pitch)
+
+    def clone(self):
+        cln = Reverb(self.mdl.clone(), self.decay.clone(), self.fpstep, self.rate, self.size, self.wet.clone(), self.dry.clone())
+        cln.bufs = [array('d', b) for b in self.bufs]
+        cln.pos = list(self.pos)
+        cln.gains = list(self.gains)
+        cln.lastdecay = self.lastdecay
+        cln.tailin = list(self.tailin)
+        cln.inL = list(self.inL)
+        cln.inR = list(self.inR)
+        cln.outL = self.outL
+        cln.outR = self.outR
+        cln.quiettime = self.quiettime
+        cln.quietgate = self.quietgate
+        cln.quiethold = self.quiethold
+        cln.parent = self.parent
+        cln.cut = self.cut
+        return cln
+
+class Pitch(SCModule):
+    """ Module for pitch shifting.
+
+        Adds a given value to all pitch sets.
+    """
+
+    # Reads pass changes in the shift on to our input.
+    read_stateful = True
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("lastpitch", "lastshift", "shift", "lastfreq")
+
+    def __init__(self, a, b=Val(0), alead=True):
+        """ Initializer.
+
+            Arguments:
+            a - The input/source module.
+            b - The pitch transposition (in cents +/-)
+            alead - Which module determines the overall length.
+        """
+
+        self.a = a
+        self.b = b
+        self.alead = alead
+        self.own(self.a, self.b)
+        self.lastpitch = 0
+        self.lastshift = b.read(False,False,False)
+        self.a.set_pitch(self.lastshift)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+        self.b.step(delta, const)
+        if(self.alead):
+            if(self.b.done() and not self.a.done()):
+                extra = self.b.get_extra()
+                self.b.reset()
+                self.b.step(extra,ADJUST)
+        else:
+            if(self.a.done() and not self.b.done()):
+                extra = self.a.get_extra()
+                self.a.reset()
+                self.a.step(extra,ADJUST)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        val = self.a.read(tails,stereo,signal)
+        shift = self.b.read(False,False,False)
+        if(shift != self.lastshift):
+            self.lastshift = shift
+            shifted = self.lastpitch + self.lastshift
+            self.a.set_pitch(shifted)
+            #shifted = self.lastfreq * (2**(1/1200.0))**self.shift
+            #self.a.set_freq(shifted)
+        if(stereo):
+            return [-val[0],-val[1]]
+        else:
+            return -val
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta, const)
+        self.b.step_tails(delta, const)
+
+    def reset(self):
+        self.a.reset()
+        #self.b.reset()
+        #self.shift = self.b.read(False,False,False)
+
+    def clear(self):
+        self.a.clear()
+        self.b.clear()
+        self.shift = self.b.read(False,False,False)
+
+    def done(self):
+        if(self.alead):
+            return self.a.done()
+        else:
+            return self.b.done()
+
+    def has_tails(self):
+        return self.a.has_tails() or self.b.has_tails()
+    
+    def get_extra(self):
+        if(self.alead):
+            return self.a.get_extra()
+        else:
+            return self.b.get_extra()
+
+    def clone(self):
+        cln = Pitch(self.a.clone(),self.b.clone(),self.alead)
+        cln.lastpitch = self.lastpitch
+        cln.lastshift = self.lastshift
+        return cln
+
+    def calc_length(self):
+        if(self.alead):
+            return self.a.length()
+        else:
+            return self.b.length()
+
+    #def set_freq(self, freq):
+    #    self.lastfreq = freq
+    #    shifted = self.lastfreq * (2**(1/1200.0))**self.shift
+    #    self.a.set_freq(shifted)
+
+    def set_pitch(self, pitch):
+        if(pitch != self.lastpitch):
+            self.lastpitch = pitch
+            shifted = self.lastpitch + self.lastshift
+            self.a.set_pitch(shifted)
+
+class FixedPitch(SCModule):
+    """ Module for pitch shifting by a fixed amount.
+
+        The parser uses this in place of Pitch when the shift is a constant
+        and the input module leads.
+    """
+
+    # Playback state, left out of fingerprint().
+    STATE_FIELDS = ("lastpitch",)
+
+    def __init__(self, a, shift):
+        """ Initializer.
+
+            Arguments:
+            a - The input/source module.
+            shift - The pitch transposition (in cents +/-)
+        """
+
+        self.a = a
+        self.shift = shift
+        self.own(self.a)
+        self.lastpitch = 0
+        self.a.set_pitch(self.shift)
+
+    def step(self, delta, const=-1):
+        self.a.step(delta, const)
+
+    def read(self,tails=False,stereo=True,signal=True):
+        # output is negated, same as Pitch
+        val = self.a.read(tails,stereo,signal)
+        if(stereo):
+            return [-val[0],-val[1]]
+        else:
+            return -val
+
+    def step_tails(self, delta, const=-1):
+        self.a.step_tails(delta, const)
+
+    def reset(self):
+        self.a.reset()
+
+    def clear(self):
+        self.a.clear()
+
+    def done(self):
+        return self.a.done()
+
+    def has_tails(self):
+        return self.a.has_tails()
+    
+    def get_extra(self):
+        return self.a.get_extra()
+
+    def clone(self):
+        cln = FixedPitch(self.a.clone(),self.shift)
+        cln.lastpitch = self.lastpitch
+        return cln
+
+    def calc_length(self):
+        return self.a.length()
+
+    #def set_freq(self, freq):
+    #    self.a.set_freq(freq)
+
+    def set_pitch(self, pitch):
+        if(pitch != self.lastpitch):
+            self.lastpitch = pitch
+            self.a.set_pitch(self.lastpitch + self.shift)
+
+
+def gcd(a, b):
+    """ Calculates greatest common denominator.
+
+        Arguments:
+        a -- Input A.
+        b -- Inpubt B.
+    """
+    while(b > 0):
+        a, b = b, a % b
+    return a
+
+def lcm(a, b):
+    """ Calculates least common multiple.
+
+        Arguments:
+        a -- Input A.
+        b -- Input B.
+    """
+
+    return a*b/gcd(a,b)
+
+def tail_flags(mdls):
+    """ Returns, for each module in a list, whether it can carry tails
+        (i.e. it isn't marked no_tails).
+
+        Arguments:
+        mdls -- The list of modules.
+    """
+    return [getattr(mdl, "no_tails", None) == None for mdl in mdls]
+
+def live_tails(mdls, flags):
+    """ Returns the sorted indices of modules in a list that currently
+        have tails.
+
+        Arguments:
+        mdls -- The list of modules.
+        flags -- Their tail_flags().
+    """
+    return [i for i in range(len(mdls)) if flags[i] and mdls[i].has_tails()]
+
+def prune_tails(mdls, live):
+    """ Drops modules whose tails have finished from a live tails index.
+
+        Arguments:
+        mdls -- The list of modules.
+        live -- Sorted indices of modules with tails.
+    """
+    for i in live:
+        if(not mdls[i].has_tails()):
+            return [j for j in live if mdls[j].has_tails()]
+    return live
+
+def with_current(live, cur, count):
+    """ Returns a live tails index with the current module's index merged
+        in (in order), as the current module is always read for tails.
+
+        Arguments:
+        live -- Sorted indices of modules with tails.
+        cur -- Index of the current module.
+        count -- Number of modules; cur at or past this means there's none.
+    """
+    if(cur >= count or cur in live):
+        return live
+    inxs = list(live)
+    bisect.insort(inxs, cur)
+    return inxs
+
+def quiet_samples(time):
+    """ Converts a time until some module could sound (in samples) to a
+        safe count for silent_for(), with one sample held back for rounding.
+
+        Arguments:
+        time -- The time until the module could sound.
+    """
+    if(time == float("inf")):
+        return time
+    return max(0, int(time)-1)
+
+def tail_done(mdl, length):
+    """ Checks whether a Delay, MultiTap or Reverb has finished: its input
+        is done and its output has been quiet for as long as its buffer. If
+        CULL is set (mdl.parent is then the SynthCorona), staying quiet for
+        the CULL hold is enough, and the tail is counted as culled.
+
+        Arguments:
+        mdl -- The Delay, MultiTap or Reverb.
+        length -- The length of its buffer (in samples).
+    """
+    if(not mdl.mdl.done() or mdl.quiettime <= mdl.quiethold):
+        return False
+    if(mdl.quiettime > length):
+        return True
+    if(mdl.parent == None):
+        return False
+    if(not mdl.cut):
+        mdl.cut = True
+        mdl.parent.culled += 1
+    return True
+
+def has_sets(mdl):
+    """ Checks whether a module tree holds any Sets (which make random
+        choices as they're reset, cleared and copied).
+
+        Arguments:
+        mdl -- The module to check.
+    """
+    stack = [mdl]
+    while(len(stack) > 0):
+        mdl = stack.pop()
+        if(type(mdl) == Set):
+            return True
+        stack.extend(mdl.children())
+    return False
+
+def song_timed(mdl):
+    """ Checks whether a song-time module tree (see SongTap) may be shared
+        between voices. It may not if it is a constant or a Table (which
+        step as cheaply as a SongTap), if it makes random choices, if it
+        takes the voice's pitch, or if it has read_stateful modules (whose
+        reads depend on more than the calls made on them).
+
+        Arguments:
+        mdl -- The module to check.
+    """
+    if(const_value(mdl) != None or isinstance(mdl, (Val, StereoVal, Table))):
+        return False
+    if(module_key(mdl) == None):
+        return False
+    stack = [mdl]
+    while(len(stack) > 0):
+        mdl = stack.pop()
+        if(mdl.read_stateful or isinstance(mdl, (Inst, NoteMark, SeqLine, Sequence,
+                SeqBlock, Song, Pitch, FixedPitch, CommonLead, SongTap))):
+            return False
+        stack.extend(mdl.children())
+    return True
+
+def reads_time(mdl):
+    """ Checks whether reading a module (not its inputs) can change when it,
+        or the Insts it plays, will finish: read_timed modules, Delays,
+        MultiTaps and Reverbs timing their tails (see tail_done()), and
+        modules passing pitches on to Insts or reading modules they don't
+        own.
+
+        Arguments:
+        mdl -- The module to check.
+    """
+    return mdl.read_timed or isinstance(mdl, (Delay, MultiTap, Reverb, Pitch, CommonTap, SeqLine))
+
+def has_timed_reads(mdl):
+    """ Checks whether reading a module tree can change when it finishes
+        (see reads_time()), or make random choices, as Insts' pans are reset
+        when they're read.
+
+        Arguments:
+        mdl -- The module to check.
+    """
+    stack = [mdl]
+    while(len(stack) > 0):
+        mdl = stack.pop()
+        if(reads_time(mdl) or isinstance(mdl, Inst) and has_sets(mdl.pan)):
+            return True
+        stack.extend(mdl.children())
+    return False
+
+def ring_read(buf, pos, n):
+    """ Returns n values from a ring buffer, starting at pos.
+
+        Arguments:
+        buf -- The buffer; at least n long.
+        pos -- Index of the first value.
+        n -- Number of values.
+    """
+    end = pos + n
+    if(end <= len(buf)):
+        return buf[pos:end]
+    return buf[pos:] + buf[:end-len(buf)]
+
+def ring_write(buf, pos, vals):
+    """ Writes values into a ring buffer, starting at pos.
+
+        Arguments:
+        buf -- The array('d') buffer; at least as long as vals.
+        pos -- Index for the first value.
+        vals -- List of values.
+    """
+    end = pos + len(vals)
+    if(end <= len(buf)):
+        buf[pos:end] = array('d', vals)
+    else:
+        split = len(buf) - pos
+        buf[pos:] = array('d', vals[:split])
+        buf[:end-len(buf)] = array('d', vals[split:])
+
+def looped_at(mdl, t):
+    """ Evaluates a pure module that is reset whenever it finishes (like the
+        input of an operator that doesn't lead) at the given time.
+
+        Arguments:
+        mdl -- The module to evaluate.
+        t -- Time since the module was cleared.
+    """
+    ln = mdl.length()
+    if(ln > 0 and t >= ln):
+        t = t % ln
+    return mdl.value_at(t)
+
+def step_voices(lanes, const):
+    """ Steps a batch of oscillator voices of one instrument (see
+        Inst.voice_lane()), with the same results as stepping each Inst.
+
+        Arguments:
+        lanes -- VoiceLanes whose Tables share their entries, or whose Oscs
+                 share their length.
+        const -- Constant time value (not a command signal).
+    """
+    table = lanes[0].table
+    if(table == None):
+        # as Inst.step() loops an Osc: step, then restart with the extra time
+        ln = lanes[0].wave.len
+        for lane in lanes:
+            osc = lane.wave
+            cur = osc.cur + const*lane.inner.rate
+            wraps = lane.wraps
+            while(cur >= ln and wraps > 0):
+                wraps -= 1
+                cur = 0 + (cur - ln)
+            osc.cur = cur
+        return
+    lens = table.lens
+    count = table.count
+    for lane in lanes:
+        tbl = lane.table
+        inx = tbl.inx
+        local = tbl.local
+        if(inx < count):
+            local += const*lane.inner.rate
+            if(local >= lens[inx]):
+                local -= lens[inx]
+                inx += 1
+                if(inx < count and local >= lens[inx]):
+                    inx, local = table.seek(inx, local)
+                if(inx >= count):
+                    tbl.extra = local
+        # as Inst.step() loops the Table: reset, then step by the extra time
+        wraps = lane.wraps
+        while(inx >= count and wraps > 0):
+            wraps -= 1
+            local = 0 + tbl.extra
+            inx = 0
+            if(local >= lens[inx]):
+                local -= lens[inx]
+                inx += 1
+                if(inx < count and local >= lens[inx]):
+                    inx, local = table.seek(inx, local)
+                if(inx >= count):
+                    tbl.extra = local
+        tbl.inx = inx
+        tbl.local = local
+
+def operands_at(mdl, t):
+    """ Evaluates both inputs of a two-input operator at the given time,
+        looping the one that doesn't lead. Returns (A, B).
+
+        Arguments:
+        mdl -- The operator module.
+        t -- Time since the operator was cleared.
+    """
+    if(mdl.a_lead):
+        return mdl.a.value_at(t), looped_at(mdl.b, t)
+    else:
+        return looped_at(mdl.a, t), mdl.b.value_at(t)
+
+def table_entries(mdl):
+    """ Returns the Table entries that reproduce a module, or None if it
+        can't be made into a table.
+
+        Constant Vals become held entries; LinInterps between constants (with
+        a constant width) become ramps. Patterns (and Pattern-mode Tables)
+        made only of these are flattened into one list.
+
+        Arguments:
+        mdl -- The module to convert.
+    """
+    val = const_value(mdl)
+    if(val != None):
+        return [(val, val, mdl.length(), False)]
+    if(type(mdl) == LinInterp):
+        a, b, w = const_value(mdl.a), const_value(mdl.b), const_value(mdl.width)
+        if(a == None or b == None or w == None or mdl.cur != 0):
+            return None
+        return [(a, b, mdl.last_width, True)]
+    if(type(mdl) == Pattern):
+        if(mdl.curInx != 0):
+            return None
+        entries = []
+        for p in mdl.pat:
+            sub = table_entries(p)
+            if(sub == None):
+                return None
+            entries.extend(sub)
+        if(len(entries) == 0):
+            return None
+        return entries
+    if(type(mdl) == Table and not mdl.series and mdl.inx == 0 and mdl.local == 0):
+        return list(mdl.entries)
+    return None
+
+def timeline_from_json(text):
+    """ Loads a Timeline saved with Timeline.to_json().
+
+        Arguments:
+        text -- The JSON text.
+    """
+    data = json.loads(text)
+    tl = Timeline(data["name"], data["rate"])
+    tl.length = data["length"]
+    tl.lines = data["lines"]
+    fields = data["fields"]
+    for note in data["notes"]:
+        tl.notes.append([note[fields.index(f)] for f in Timeline.NOTE_FIELDS])
+    return tl
+
+def module_key(mdl, memo=None, timing=False):
+    """ Returns a key describing a module tree's structure and state, such
+        that two trees with equal keys behave identically when stepped and
+        read the same way. Returns None if the tree has modules that can't be
+        shared (see SCModule.shareable), such as random elements (a Set), as
+        copies of it would each make their own choices.
+
+        Arguments:
+        mdl -- The module to describe.
+        memo -- Dict of keys already found, by module id. Pass the same dict
+            when keying many modules from one tree.
+        timing -- If true, leaves out each module's quiet_fields(), so the key
+            only describes when the tree steps and finishes, not what it reads.
+    """
+    if(isinstance(mdl, SCModule)):
+        if(memo != None and id(mdl) in memo):
+            return memo[id(mdl)]
+        if(not mdl.shareable):
+            return None
+        skip = mdl.NOT_KEYED
+        if(timing):
+            skip = skip + mdl.quiet_fields()
+        key = [type(mdl).__name__]
+        for name in sorted(vars(mdl)):
+            if(name in skip):
+                continue
+            sub = module_key(getattr(mdl, name), memo, timing)
+            if(sub == None):
+                key = None
+                break
+            key.append((name, sub))
+        if(key != None):
+            key = tuple(key)
+        if(memo != None):
+            memo[id(mdl)] = key
+        return key
+    if(isinstance(mdl, (list, tuple, array))):
+        items = ["list"]
+        for m in mdl:
+            key = module_key(m, memo, timing)
+            if(key == None):
+                return None
+            items.append(key)
+        return tuple(items)
+    if(isinstance(mdl, dict)):
+        items = ["dict"]
+        for k in sorted(mdl, key=repr):
+            key = module_key(mdl[k], memo, timing)
+            if(key == None):
+                return None
+            items.append((repr(k), key))
+        return tuple(items)
+    if(mdl == None or isinstance(mdl, (int, float, str, bool))):
+        return (type(mdl).__name__, mdl)
+    return ("obj", id(mdl))
+
+def value_digest(val):
+    """ Returns a string describing a module attribute for fingerprints
+        (see SCModule.fingerprint()).
+
+        Arguments:
+        val -- The attribute value.
+    """
+    if(isinstance(val, SCModule)):
+        return val.fingerprint()
+    if(isinstance(val, (list, tuple))):
+        return "[" + ",".join([value_digest(v) for v in val]) + "]"
+    if(isinstance(val, dict)):
+        return "{" + ",".join(sorted([repr(k) + ":" + value_digest(val[k]) for k in val])) + "}"
+    if(val == None or isinstance(val, (int, float, str, bool, array))):
+        return repr(val)
+    if(isinstance(val, (Common, SongShare))):
+        return "<" + val.mdl.fingerprint() + ">"
+    # i.e. the SynthCorona; its settings aren't part of the module
+    return type(val).__name__
+
+def timing_core(mdl):
+    """ Follows "same" links (see SCModule.cse_links()) down from a module,
+        to the one that decides when it finishes.
+
+        Arguments:
+        mdl -- The module to start from.
+    """
+    while(True):
+        if(type(mdl) == list and len(mdl) == 1):
+            mdl = mdl[0]
+        if(not isinstance(mdl, SCModule)):
+            return mdl
+        lead = None
+        for field, how in mdl.cse_links():
+            if(how == "same"):
+                lead = getattr(mdl, field)
+        if(lead == None):
+            return mdl
+        mdl = lead
+
+def const_value(mdl):
+    """ Returns the fixed value of a constant module, or None if the module
+        can change over time.
+
+        Constants are plain Vals (as parsed from numbers and note names), and
+        negated Vals.
+
+        Arguments:
+        mdl -- The module to check.
+    """
+    if(type(mdl) == Val):
+        return mdl.val
+    if(type(mdl) == Invert and type(mdl.mdl) == Val):
+        return -mdl.mdl.val
+    return None
+
+def as_decimal(val):
+    """ Converts SC signal values into decimals.
+
+        Signal values range from -9 to 9, so this simply returns the input
+        divided by 9.
+
+        Arguments:
+        val -- The value to convert to decimal.
+    """
+
+    dec = val/MAX_VAL
+    return dec
+
+def limit(val):
+    """ Hard limits the given signal value.
+
+        This limits to +/-0.9999 * MAX.
+
+        Arguments:
+        val -- The signal value to limit.
+    """
+
+    if(val >= MAX_VAL):
+        return MAX_VAL * 0.9999
+    elif(val <= -MAX_VAL):
+        return -MAX_VAL * 0.9999
+    else:
+        return val
+
+def osc_shape(stng):
+    """ Returns the shape named by an oscillator description ("oSIN",
+        "oPLS<DUTY=0.25>", etc.), or None if it doesn't start with one.
+
+        Arguments:
+        stng -- Module description string.
+    """
+    if(not stng.startswith("o")):
+        return None
+    i = 1
+    while(i < len(stng) and stng[i] not in RESERVED):
+        i += 1
+    shape = stng[1:i]
+    if(shape in Osc.SHAPES or shape == "NSE"):
+        return shape
+    return None
+
+def calc_freq(disp):
+    """ Calculates the frequency of a given pitch.
+
+        This calculation is performed in cents-above-A0. We use A4 as a reference,
+        so the given displacement is shifted by -5700 (the distance from A4 down 
+        to A0 in cents).
+
+        Arguments:
+        disp -- The pitch, expressed as "cents from A0".
+    """
+    return 440.0 * (2**(1/1200.0))**(disp-5700)
+
+# Pre-baked frequency for every cent in the 10 octaves of the tones array.
+# Shared by all SynthCorona instances; built once on import.
+FREQS = [calc_freq(i) for i in range(12001)]
+
+def lookup_freq(disp):
+    """ Looks up the frequency of a given pitch in the FREQS table.
+
+        Whole cents read straight from the table. Fractional cents (as in
+        pitch slides) and pitches outside the table fall back to calc_freq,
+        so every pitch gets exactly the frequency calc_freq would give.
+
+        Arguments:
+        disp -- The pitch, expressed as "cents from A0".
+    """
+    inx = int(disp)
+    if(inx != disp or inx < 0 or inx > 12000):
+        return calc_freq(disp)
+    return FREQS[inx]
+
+def pan_gains(pan):
+    """ Calculates the gain matrix for a pan amount.
+
+        The matrix is a tuple (ll, lr, rl, rr), giving the output pair
+        [ll*L + lr*R, rl*L + rr*R]. It does the same job as pan(), but
+        matrices can be combined with mul_gains() so that nested pans are
+        applied in one go.
+
+        Arguments:
+        pan -- The panning adjustment, from -9 (100% L) to 9 (100% R).
+    """
+    pan /= 9
+    if(abs(pan)>1):
+        pan = pan/abs(pan)
+    if(pan == 0):
+        return PAN_IDENTITY
+    elif(pan < 0):
+        return (1,-pan,0,1+pan)
+    else:
+        return (1-pan,0,pan,1)
+
+def mul_gains(a, b):
+    """ Combines two gain matrices: b is applied first, then a.
+
+        Arguments:
+        a -- The outer gain matrix.
+        b -- The inner gain matrix.
+    """
+    if(a is PAN_IDENTITY):
+        return b
+    if(b is PAN_IDENTITY):
+        return a
+    return (a[0]*b[0]+a[1]*b[2], a[0]*b[1]+a[1]*b[3],
+            a[2]*b[0]+a[3]*b[2], a[2]*b[1]+a[3]*b[3])
+
+def apply_gains(vals, gains):
+    """ Applies a gain matrix to a stereo pair.
+
+        Arguments:
+        vals -- The stereo pair of signal values.
+        gains -- The gain matrix (see pan_gains()).
+    """
+    if(gains is PAN_IDENTITY):
+        return vals
+    return [gains[0]*vals[0]+gains[1]*vals[1], gains[2]*vals[0]+gains[3]*vals[1]]
+
+def pan(vals, pan):
+    """ Calculates panning.
+
+        Pan amounts range from -9 (100% L) to 9 (100% R). Excessive values
+        will be clipped.
+
+        Arguments:
+        vals -- The stereo pair of signal values.
+        pan -- The panning adjustment.
+    """
+    # pan values should range from -9 (100% L) to 9 (100% R)
+    pan /= 9
+    # clips pan to a max of 100% in either direction
+    if(abs(pan)>1):
+        pan = pan/abs(pan)
+    if(pan == 0):
+        return vals
+    elif(pan < 0):
+        lpan = abs(pan)
+        rtol = vals[1]*lpan
+        #print("PAN=" + str(pan) + "|rtol: " + str(rtol))
+        return [vals[0]+rtol,vals[1]-rtol]
+    else:
+        ltor = vals[0]*pan
+        #print("PAN=" + str(pan) + "|ltor: " + str(ltor))
+        return [vals[0]-ltor,vals[1]+ltor]
@@ -387,6 +387,16 @@ WV_NSE_RSINE_16 <PRD=4>: [(0i9)i9,9i(9i0),(0i-9)i-9,-9i(-9i0)]s[(RAND_5s16)*8]
 WV_NSE_RSINE_4 <PRD=4>: [(0i9)i9,9i(9i0),(0i-9)i-9,-9i(-9i0)]s[(RAND_5s4)*8]
 WV_NSE_DOUBLEBIT <PRD=1>: [RANDV_5*{1,-1}]s[RAND_5*8]
 WV_NSE_SUPERCHEAP <PRD=8>: {0,1,2,3,4,5,6,7,8,9}*{1,-1}
+WV_NSE_LFSR_128 <PRD=1>: oNSE<RATE=128>
+WV_NSE_LFSR_64 <PRD=1>: oNSE<RATE=64>
+WV_NSE_LFSR_32 <PRD=1>: oNSE<RATE=32>
+WV_NSE_LFSR_16 <PRD=1>: oNSE<RATE=16>
+WV_NSE_LFSR_8 <PRD=1>: oNSE<RATE=8>
+WV_NSE_LFSR_SHORT_128 <PRD=1>: oNSE<RATE=128,MODE=SHORT>
+WV_NSE_LFSR_SHORT_64 <PRD=1>: oNSE<RATE=64,MODE=SHORT>
+WV_NSE_LFSR_SHORT_32 <PRD=1>: oNSE<RATE=32,MODE=SHORT>
+WV_NSE_LFSR_SHORT_16 <PRD=1>: oNSE<RATE=16,MODE=SHORT>
+WV_NSE_LFSR_SHORT_8 <PRD=1>: oNSE<RATE=8,MODE=SHORT>
 
 
 // ~~ CHIPPY WAVES ~~
@@ -427,3 +437,14 @@ KICK_OCEAN <BASE=WV_SINE_OCEAN, LOOP=F, SUS=T>: WV_SINE_OCEANs<lead=B>SPD_KICK_S
 
 KICK_CRUNCHY_RING<BASE=KICK_CRUNCHY>: [KICK_CRUNCHYi<w=40>KICK_RING,KICK_RINGv[9i<w=2>0]]
 KICK_OCEAN_RING<BASE=KICK_OCEAN>: [KICK_OCEANi<w=40>KICK_RING,KICK_RINGv[9i<w=2>0]]
+
+// ~~ LFSR DRUM KIT ~~
+// Noise drums on the shift-register noise waves. Unlike the Set-based noise
+// waves, these make no random choices, and sound the same every render.
+SNARE_LFSR <BASE=WV_NSE_LFSR_32>: WV_NSE_LFSR_32vEV_PER_SNARE
+SNARE_LFSR_STAC <BASE=WV_NSE_LFSR_32>: WV_NSE_LFSR_32vEV_PER_SNARE_STAC
+HAT_LFSR <BASE=WV_NSE_LFSR_SHORT_16>: WV_NSE_LFSR_SHORT_16vEV_PER_CLICK_STAC
+HAT_LFSR_OPEN <BASE=WV_NSE_LFSR_SHORT_16>: WV_NSE_LFSR_SHORT_16vEV_PER_CLICK_SUS
+CRASH_LFSR <BASE=WV_NSE_LFSR_128>: WV_NSE_LFSR_128vEV_PER_SUS
+TOM_LFSR <BASE=WV_NSE_LFSR_SHORT_32>: WV_NSE_LFSR_SHORT_32vEV_PER_TOM
+CHP_NOISE_LFSR <BASE=WV_NSE_LFSR_8>: WV_NSE_LFSR_8vEV_PER_STAC
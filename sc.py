@@ -1,6 +1,10 @@
 from SynthCorona import SynthCorona
 from sys import argv
 
+# --json writes each song's note timeline instead of rendering it
+tojson = "--json" in argv
+argv = [arg for arg in argv if arg != "--json"]
+
 if(len(argv)>1):
     stng = argv[1]
 else:
@@ -24,4 +28,7 @@ if(ext > 0):
 
 tone = SynthCorona()
 tone.parse(stng)
-tone.render()
+if(tojson):
+    tone.compile()
+else:
+    tone.render()
@@ -2,7 +2,7 @@
 # Reads an SC File & draws waveforms for each Instrument in it.
 
 from PIL import Image, ImageDraw
-from SynthCorona import SynthCorona, Repeat, Val
+from SynthCorona import SynthCorona, Repeat, Val, looped_at
 from sys import argv
 
 if(len(argv)>1):
@@ -73,17 +73,23 @@ for ky in kys:
     frames = []
     img = Image.new("1",(width,height))
     draw = ImageDraw.Draw(img)
-    if(freq <= 0):
-        inst.set_freq(1)
-        len = int(inst.period*reps)/inst.rate
+    if(freq <= 0 and inst.mdl.pure()):
+        # simple waveforms can be drawn straight from the module
+        len = inst.period*reps
+        for i in range(wd):
+            frames.append(looped_at(inst.mdl, i*len/wd))
     else:
-        inst.set_freq(freq)
-        len = int(inst.length()*reps)
-    chnk = int(len/wd)
-    for i in range(wd):
-        frames.append(inst.read(stereo=False))
-        for i in range(chnk):
-            inst.step(1,1)
+        if(freq <= 0):
+            inst.set_freq(1)
+            len = int(inst.period*reps)/inst.rate
+        else:
+            inst.set_freq(freq)
+            len = int(inst.length()*reps)
+        chnk = int(len/wd)
+        for i in range(wd):
+            frames.append(inst.read(stereo=False))
+            for i in range(chnk):
+                inst.step(1,1)
     hscale = (height-(2*BRD))/9.0/2
     mid = height/2
     last = (BRD,mid)